@@ -0,0 +1,337 @@
+"""
+🚨 Detecção de Anomalias por Categoria (streaming)
+Sinaliza gastos fora do padrão enquanto as transações chegam
+
+- Média e variância por categoria atualizadas a cada transação
+  (Welford): O(1) por transação, sem guardar o histórico
+- Transação atípica: valor acima de média + outlier_z desvios
+  (na escala log: gastos têm cauda longa)
+- Pico de categoria: gasto do mês corrente acima de média +
+  spike_z desvios dos meses anteriores (sinalizado uma vez por mês;
+  meses sem gasto entram como zero)
+- Estado compacto: 9 números por categoria num array('d');
+  to_bytes/from_bytes e save_detectors/load_detectors para
+  persistir entre execuções
+
+Só despesas. Picos supõem ordem cronológica aproximada: transação de
+um mês já encerrado atualiza a média da categoria, mas não os picos.
+"""
+
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Union
+import math
+import os
+import struct
+import sys
+
+from financial_analysis import Transaction, TransactionBatch
+
+
+MAGIC = b"GFANOMAL"
+SCHEMA_VERSION = 1
+
+# Campos de cada categoria no array de estado
+N, MEAN, M2, PERIOD, PERIOD_TOTAL, FLAGGED, PERIODS, PERIOD_MEAN, PERIOD_M2 = range(9)
+FIELDS = 9
+
+_HEADER = struct.Struct("<8sHI")
+_LENGTH = struct.Struct("<I")
+
+
+@dataclass(frozen=True)
+class DetectorConfig:
+    """Limites da detecção (um objeto compartilhado por todos os usuários)"""
+    outlier_z: float = 3.5
+    spike_z: float = 3.0
+    min_samples: int = 8  # transações da categoria antes de sinalizar
+    min_periods: int = 3  # meses encerrados antes de sinalizar picos
+    min_std: float = 0.05  # desvio mínimo na escala log (~5%)
+    log_amounts: bool = True
+
+
+DEFAULT_CONFIG = DetectorConfig()
+
+
+@dataclass
+class Anomaly:
+    """Transação atípica ou pico de categoria"""
+    kind: str  # 'outlier' ou 'spike'
+    category: str
+    date: str
+    transaction_id: str
+    amount: float  # valor da transação ou total do mês até ela
+    expected: float  # valor típico ou média mensal
+    score: float  # desvios acima do esperado
+    
+    @property
+    def message(self) -> str:
+        if self.kind == 'outlier':
+            return (
+                f"🚨 Gasto atípico em {self.category}: R$ {self.amount:,.2f} "
+                f"(típico R$ {self.expected:,.2f})"
+            )
+        return (
+            f"📈 {self.category} disparou em {self.date[:7]}: R$ {self.amount:,.2f} "
+            f"(média mensal R$ {self.expected:,.2f})"
+        )
+
+
+def _month(value: str) -> int:
+    """'AAAA-MM-DD' → ano*12 + mês - 1 (ValueError se inválida)"""
+    if value[4:5] != "-":
+        raise ValueError(value)
+    month = int(value[5:7])
+    if not 1 <= month <= 12:
+        raise ValueError(value)
+    return int(value[:4]) * 12 + month - 1
+
+
+class AnomalyDetector:
+    """
+    Estado de detecção de um usuário
+    
+    Uso:
+        detector = AnomalyDetector()
+        for anomaly in detector.observe(transaction):
+            print(anomaly.message)
+    """
+    
+    __slots__ = ("config", "_slots", "_stats")
+    
+    def __init__(self, config: DetectorConfig = DEFAULT_CONFIG):
+        self.config = config
+        # categoria → posição do bloco no array
+        self._slots: Dict[str, int] = {}
+        self._stats = array("d")
+    
+    def __len__(self) -> int:
+        return len(self._slots)
+    
+    def _slot(self, category: str) -> int:
+        slot = self._slots.get(category)
+        if slot is None:
+            slot = self._slots[category] = len(self._stats)
+            self._stats.extend((0.0, 0.0, 0.0, -1.0, 0.0, 0.0, 0.0, 0.0, 0.0))
+        return slot
+    
+    # ==================== OBSERVAÇÃO ====================
+    
+    def observe_values(
+        self,
+        transaction_id: str,
+        day: str,
+        category: str,
+        amount: float,
+        kind: str = 'expense'
+    ) -> List[Anomaly]:
+        """
+        Atualiza o estado com uma transação e devolve as anomalias dela
+        
+        A transação é comparada com o histórico anterior a ela e só
+        depois entra nas médias.
+        """
+        if kind != 'expense':
+            return []
+        
+        config = self.config
+        stats = self._stats
+        i = self._slot(category)
+        anomalies = []
+        
+        # Transação atípica (Welford sobre o valor, escala log)
+        x = math.log1p(abs(amount)) if config.log_amounts else amount
+        n = stats[i + N]
+        mean = stats[i + MEAN]
+        if n >= config.min_samples:
+            std = max(math.sqrt(stats[i + M2] / (n - 1)), config.min_std)
+            score = (x - mean) / std
+            if score > config.outlier_z:
+                expected = math.expm1(mean) if config.log_amounts else mean
+                anomalies.append(Anomaly('outlier', category, day, transaction_id, amount, expected, score))
+        
+        n += 1
+        delta = x - mean
+        mean += delta / n
+        stats[i + N] = n
+        stats[i + MEAN] = mean
+        stats[i + M2] += delta * (x - mean)
+        
+        # Pico do mês
+        try:
+            month = _month(day)
+        except (TypeError, ValueError):
+            return anomalies
+        
+        current = stats[i + PERIOD]
+        if month < current:
+            return anomalies
+        if month > current:
+            if current >= 0:
+                self._close_periods(i, month - current)
+            stats[i + PERIOD] = month
+            stats[i + PERIOD_TOTAL] = 0.0
+            stats[i + FLAGGED] = 0.0
+        
+        total = stats[i + PERIOD_TOTAL] + amount
+        stats[i + PERIOD_TOTAL] = total
+        
+        periods = stats[i + PERIODS]
+        if not stats[i + FLAGGED] and periods >= config.min_periods:
+            period_mean = stats[i + PERIOD_MEAN]
+            std = math.sqrt(stats[i + PERIOD_M2] / (periods - 1)) if periods > 1 else 0.0
+            # Piso relativo: meses idênticos não sinalizam por centavos
+            std = max(std, abs(period_mean) * config.min_std)
+            if std > 0 and (total - period_mean) / std > config.spike_z:
+                stats[i + FLAGGED] = 1.0
+                anomalies.append(Anomaly(
+                    'spike', category, day, transaction_id, total, period_mean, (total - period_mean) / std
+                ))
+        
+        return anomalies
+    
+    def _close_periods(self, i: int, elapsed: int):
+        """Encerra o mês corrente e os `elapsed - 1` meses seguintes sem gasto"""
+        stats = self._stats
+        
+        # Mês corrente: um passo de Welford
+        n = stats[i + PERIODS] + 1
+        delta = stats[i + PERIOD_TOTAL] - stats[i + PERIOD_MEAN]
+        mean = stats[i + PERIOD_MEAN] + delta / n
+        m2 = stats[i + PERIOD_M2] + delta * (stats[i + PERIOD_TOTAL] - mean)
+        
+        # Meses vazios: combina um grupo de k zeros (média 0, M2 0) em O(1)
+        k = elapsed - 1
+        if k > 0:
+            combined = n + k
+            m2 += mean * mean * n * k / combined
+            mean = mean * n / combined
+            n = combined
+        
+        stats[i + PERIODS] = n
+        stats[i + PERIOD_MEAN] = mean
+        stats[i + PERIOD_M2] = m2
+    
+    def observe(self, transaction: Transaction) -> List[Anomaly]:
+        """Atualiza com uma Transaction"""
+        return self.observe_values(
+            transaction.id, transaction.date, transaction.category, transaction.amount, transaction.type
+        )
+    
+    def observe_batch(self, transactions: Union[Iterable[Transaction], TransactionBatch]) -> List[Anomaly]:
+        """Atualiza com várias transações, em ordem; anomalias de todas"""
+        observe = self.observe_values
+        anomalies = []
+        
+        if isinstance(transactions, TransactionBatch):
+            rows = zip(transactions.ids, transactions.dates, transactions.categories, transactions.amounts, transactions.types)
+            for row in rows:
+                if row[4] == 'expense':
+                    anomalies.extend(observe(*row))
+            return anomalies
+        
+        for t in transactions:
+            if t.type == 'expense':
+                anomalies.extend(observe(t.id, t.date, t.category, t.amount, t.type))
+        return anomalies
+    
+    # ==================== CONSULTA ====================
+    
+    def category_stats(self, category: str) -> Optional[Dict[str, float]]:
+        """Média/desvio por transação e por mês de uma categoria (None se nunca vista)"""
+        i = self._slots.get(category)
+        if i is None:
+            return None
+        
+        stats = self._stats
+        n, periods = stats[i + N], stats[i + PERIODS]
+        mean = stats[i + MEAN]
+        return {
+            "transactions": int(n),
+            "typical_amount": math.expm1(mean) if self.config.log_amounts else mean,
+            "std": math.sqrt(stats[i + M2] / (n - 1)) if n > 1 else 0.0,
+            "months": int(periods),
+            "monthly_mean": stats[i + PERIOD_MEAN],
+            "monthly_std": math.sqrt(stats[i + PERIOD_M2] / (periods - 1)) if periods > 1 else 0.0,
+        }
+    
+    # ==================== PERSISTÊNCIA ====================
+    
+    def to_bytes(self) -> bytes:
+        """Estado serializado: cabeçalho + nomes das categorias + array"""
+        names = "\0".join(sorted(self._slots, key=self._slots.get)).encode("utf-8")
+        return (
+            _HEADER.pack(MAGIC, SCHEMA_VERSION, len(self._slots))
+            + _LENGTH.pack(len(names)) + names
+            + self._stats.tobytes()
+        )
+    
+    @classmethod
+    def from_bytes(cls, data: bytes, config: DetectorConfig = DEFAULT_CONFIG) -> "AnomalyDetector":
+        """
+        Restaura o estado gravado por to_bytes
+        
+        Raises:
+            ValueError: Dados inválidos ou de outra versão
+        """
+        if len(data) < _HEADER.size + _LENGTH.size:
+            raise ValueError("estado do detector truncado")
+        magic, version, categories = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("assinatura inválida (não é estado do detector)")
+        if version != SCHEMA_VERSION:
+            raise ValueError(f"versão de esquema não suportada: {version} (esperado {SCHEMA_VERSION})")
+        
+        offset = _HEADER.size
+        (size,) = _LENGTH.unpack_from(data, offset)
+        offset += _LENGTH.size
+        names = data[offset:offset + size].decode("utf-8").split("\0") if categories else []
+        offset += size
+        
+        detector = cls(config)
+        detector._stats.frombytes(data[offset:])
+        if len(names) != categories or len(detector._stats) != categories * FIELDS:
+            raise ValueError("estado do detector inconsistente")
+        # Nomes internados: milhões de usuários compartilham as mesmas strings
+        detector._slots = {sys.intern(name): index * FIELDS for index, name in enumerate(names)}
+        return detector
+
+
+def save_detectors(path: Union[str, Path], detectors: Mapping[str, AnomalyDetector]):
+    """
+    Grava os detectores de vários usuários num arquivo
+    
+    Registros (tamanho + user_id, tamanho + estado); arquivo temporário
+    + rename.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        for user_id, detector in detectors.items():
+            key = user_id.encode("utf-8")
+            state = detector.to_bytes()
+            f.write(_LENGTH.pack(len(key)) + key + _LENGTH.pack(len(state)) + state)
+    
+    os.replace(tmp_path, path)
+
+
+def load_detectors(path: Union[str, Path], config: DetectorConfig = DEFAULT_CONFIG) -> Dict[str, AnomalyDetector]:
+    """Lê o arquivo gravado por save_detectors"""
+    data = Path(path).read_bytes()
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("assinatura inválida (não é arquivo de detectores)")
+    
+    view = memoryview(data)
+    offset = len(MAGIC)
+    detectors = {}
+    while offset < len(data):
+        (size,) = _LENGTH.unpack_from(view, offset)
+        user_id = bytes(view[offset + 4:offset + 4 + size]).decode("utf-8")
+        offset += 4 + size
+        (size,) = _LENGTH.unpack_from(view, offset)
+        detectors[user_id] = AnomalyDetector.from_bytes(bytes(view[offset + 4:offset + 4 + size]), config)
+        offset += 4 + size
+    return detectors
@@ -0,0 +1,445 @@
+"""
+Benchmark de Carga HTTP
+
+Dispara uma mistura de requisições (progressive, optimized, compare)
+com N clientes concorrentes e mede vazão e p50/p95/p99 por rota.
+
+Alvos:
+- asgi: main.app em processo (httpx.ASGITransport), sem rede;
+  mede a aplicação e a cadeia de middleware
+- uvicorn: sockets reais contra workers uvicorn iniciados aqui
+  (ou um servidor já no ar, --url); inclui HTTP e o cliente httpx,
+  que na mesma máquina disputa CPU com o servidor
+
+Payloads das metas de usuários sintéticos (workload_generator na raiz
+do repositório): --variants metas, semente fixa, as mesmas para todas
+as rotas. O cache de respostas acerta parte das requisições, como em
+produção.
+Cada rodada repete o mesmo plano (--rounds); de cada métrica vale o
+melhor valor entre as rodadas, o que filtra interferência da máquina.
+
+Baseline em JSON (benchmarks/baselines/load_<alvo>.json):
+--save grava o resultado; --check compara e sai com código 1 se
+vazão cair ou p95 subir além de --threshold (fração).
+
+Uso (a partir de api/):
+    python -m benchmarks.bench_load
+    python -m benchmarks.bench_load --concurrency 32 --requests 10000 --check
+    python -m benchmarks.bench_load --target uvicorn --workers 2 --save
+    python -m benchmarks.bench_load --target uvicorn --url http://127.0.0.1:8000
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+# Limites altos: todos os clientes saem do mesmo IP; logs descartados
+BENCH_ENV = {
+    "RATE_LIMIT_PER_MINUTE": "1000000000",
+    "RATE_LIMIT_PER_HOUR": "1000000000",
+    "LOG_SINK": os.devnull,
+}
+for _key, _value in BENCH_ENV.items():
+    os.environ.setdefault(_key, _value)
+
+import httpx
+
+
+API_DIR = Path(__file__).resolve().parent.parent
+
+# Gerador de carga na raiz do repositório (no fim do path: não encobre módulos da API)
+if str(API_DIR.parent) not in sys.path:
+    sys.path.append(str(API_DIR.parent))
+
+from workload_generator import GENERATOR_VERSION, SyntheticGoal, WorkloadGenerator
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+SCHEMA_VERSION = 1
+
+ROUTES = {
+    "progressive": "/api/v1/protocols/progressive",
+    "optimized": "/api/v1/protocols/optimized",
+    "compare": "/api/v1/protocols/compare",
+}
+
+DEFAULT_MIX = "progressive=5,optimized=3,compare=2"
+
+# Métricas comparadas com a baseline: (nome, True se maior é melhor)
+CHECKED_METRICS = (("throughput_rps", True), ("p95_ms", False))
+
+
+# ==================== CARGA ====================
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """'progressive=5,optimized=3' → pesos por rota"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ROUTES:
+            raise ValueError(f"Rota desconhecida na mistura: {name!r} (esperado {', '.join(ROUTES)})")
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("Mistura vazia")
+    return mix
+
+
+def goal_body(goal: SyntheticGoal) -> Dict[str, Any]:
+    """Meta do gerador → GoalInput (prazo pelo aporte mensal, dentro dos limites da API)"""
+    remaining = max(goal.target_amount - goal.initial_amount, 0.0)
+    periods = math.ceil(remaining / goal.monthly_contribution) if goal.monthly_contribution > 0 else 120
+    return {
+        "target_amount": min(max(goal.target_amount, 10.0), 1_000_000.0),
+        "periods": min(max(periods, 3), 120),
+    }
+
+
+def protocol_body(goal: SyntheticGoal) -> Dict[str, float]:
+    """
+    Plano da meta → ProgressiveProtocolInput
+    
+    Plano progressivo: start/step/cap do gerador. Plano fixo: sobe de
+    1 até o aporte mensal em um ano. Valores levados aos limites do
+    schema e da validação comportamental (teto >= início + 2 incrementos).
+    """
+    if goal.progression:
+        start, step, cap = goal.progression["start"], goal.progression["step"], goal.progression["cap"]
+    else:
+        start, step, cap = 1.0, goal.monthly_contribution / 12, goal.monthly_contribution
+    
+    start = round(min(max(start, 1.0), 100.0), 2)
+    step = round(min(max(step, 0.5), 50.0), 2)
+    floor = math.ceil((start + 2 * step) * 100) / 100
+    return {"start_value": start, "increment": step, "cap": round(min(max(cap, floor, 10.0), 2000.0), 2)}
+
+
+def make_payloads(route: str, goals: List[SyntheticGoal]) -> List[bytes]:
+    """Corpos JSON da rota, um por meta (aprovados pela validação comportamental)"""
+    if route == "optimized":
+        return [json.dumps(goal_body(goal)).encode() for goal in goals]
+    return [
+        json.dumps({"goal": goal_body(goal), "protocol": protocol_body(goal)}).encode()
+        for goal in goals
+    ]
+
+
+def synthetic_goals(count: int, seed: int) -> List[SyntheticGoal]:
+    """As primeiras `count` metas dos usuários 0, 1, 2... da semente"""
+    generator = WorkloadGenerator(seed=seed)
+    goals: List[SyntheticGoal] = []
+    index = 0
+    while len(goals) < count:
+        goals.extend(generator.user(index).goals)
+        index += 1
+    return goals[:count]
+
+
+def make_plan(mix: Dict[str, float], requests: int, variants: int, seed: int) -> List[Tuple[str, bytes]]:
+    """Sequência de (rota, corpo), reprodutível pela semente"""
+    rng = random.Random(seed)
+    goals = synthetic_goals(variants, seed)
+    payloads = {name: make_payloads(name, goals) for name in mix}
+    names = rng.choices(list(mix), weights=list(mix.values()), k=requests)
+    return [(name, rng.choice(payloads[name])) for name in names]
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    plan: List[Tuple[str, bytes]],
+    concurrency: int
+) -> Tuple[Dict[str, List[float]], Dict[str, int], float]:
+    """
+    Executa o plano com `concurrency` clientes
+    
+    Returns:
+        (latências em ms por rota, erros por rota, segundos totais)
+    """
+    latencies: Dict[str, List[float]] = {name: [] for name, _ in plan}
+    errors: Dict[str, int] = {name: 0 for name in latencies}
+    pending = iter(plan)
+    headers = {"content-type": "application/json"}
+    
+    async def worker():
+        for name, body in pending:
+            started = time.perf_counter()
+            try:
+                response = await client.post(ROUTES[name], content=body, headers=headers)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies[name].append((time.perf_counter() - started) * 1000)
+            else:
+                errors[name] += 1
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+def percentile(values: List[float], q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100)[q - 1]
+
+
+def summarize(latencies: Dict[str, List[float]], errors: Dict[str, int], elapsed: float) -> Dict[str, Any]:
+    """Vazão e percentis por rota e no total"""
+    def stats(values: List[float], failed: int) -> Dict[str, Any]:
+        return {
+            "requests": len(values) + failed,
+            "errors": failed,
+            "throughput_rps": round(len(values) / elapsed, 1),
+            "mean_ms": round(statistics.fmean(values), 3) if values else 0.0,
+            "p50_ms": round(percentile(values, 50), 3),
+            "p95_ms": round(percentile(values, 95), 3),
+            "p99_ms": round(percentile(values, 99), 3),
+        }
+    
+    every = [v for values in latencies.values() for v in values]
+    return {
+        "routes": {name: stats(latencies[name], errors[name]) for name in sorted(latencies)},
+        "total": stats(every, sum(errors.values())),
+        "elapsed_s": round(elapsed, 3),
+    }
+
+
+# ==================== ALVOS ====================
+
+def best_of(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Melhor valor de cada métrica entre rodadas (vazão máxima, latências mínimas)"""
+    def merge(sections: List[Dict[str, Any]]) -> Dict[str, Any]:
+        merged = {}
+        for metric in sections[0]:
+            values = [section[metric] for section in sections]
+            merged[metric] = max(values) if metric == "throughput_rps" else min(values)
+        merged["errors"] = max(section["errors"] for section in sections)
+        return merged
+    
+    return {
+        "routes": {name: merge([r["routes"][name] for r in results]) for name in results[0]["routes"]},
+        "total": merge([r["total"] for r in results]),
+        "elapsed_s": min(r["elapsed_s"] for r in results),
+    }
+
+
+async def best_round(client, plan, warmup, concurrency, rounds) -> Dict[str, Any]:
+    """Aquecimento + `rounds` execuções do plano, combinadas por best_of"""
+    await run_load(client, warmup, concurrency)
+    return best_of([summarize(*await run_load(client, plan, concurrency)) for _ in range(max(rounds, 1))])
+
+
+async def bench_asgi(plan, warmup, concurrency, rounds) -> Dict[str, Any]:
+    """main.app em processo"""
+    from main import app
+    
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        return await best_round(client, plan, warmup, concurrency, rounds)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_uvicorn(workers: int, timeout: float = 30.0) -> Tuple[subprocess.Popen, str]:
+    """Inicia `uvicorn main:app` e espera o /health responder"""
+    port = _free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+        ],
+        cwd=API_DIR,
+        env={**os.environ, **BENCH_ENV},
+    )
+    url = f"http://127.0.0.1:{port}"
+    
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn encerrou com código {process.returncode}")
+        try:
+            if httpx.get(f"{url}/health", timeout=1.0).status_code == 200:
+                return process, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    
+    process.terminate()
+    raise RuntimeError(f"uvicorn não respondeu em {timeout:.0f}s")
+
+
+async def bench_http(url, plan, warmup, concurrency, rounds) -> Dict[str, Any]:
+    """Servidor real, conexões keep-alive (uma por cliente)"""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30.0) as client:
+        return await best_round(client, plan, warmup, concurrency, rounds)
+
+
+# ==================== BASELINE ====================
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Regressões além do limite
+    
+    Returns:
+        Uma linha por métrica piorada (vazia se nenhuma)
+    """
+    regressions = []
+    sections = [("total", current["total"], baseline["total"])]
+    sections += [
+        (name, current["routes"][name], baseline["routes"][name])
+        for name in current["routes"] if name in baseline["routes"]
+    ]
+    
+    for name, now, before in sections:
+        for metric, higher_is_better in CHECKED_METRICS:
+            old, new = before[metric], now[metric]
+            if not old:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            if worse > threshold:
+                regressions.append(f"{name}.{metric}: {old} → {new} ({change:+.1%})")
+        if now["errors"] > before["errors"]:
+            regressions.append(f"{name}.errors: {before['errors']} → {now['errors']}")
+    
+    return regressions
+
+
+def print_report(result: Dict[str, Any], baseline: Optional[Dict[str, Any]]):
+    config = result["config"]
+    print("=" * 86)
+    print(
+        f"CARGA HTTP — alvo {config['target']}, {config['concurrency']} clientes, "
+        f"{config['requests']} requisições ({config['mix']})"
+    )
+    print("=" * 86)
+    print(f"{'rota':<14}{'reqs':>8}{'erros':>7}{'req/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'Δ req/s':>10}{'Δ p95':>9}")
+    
+    rows = [*result["routes"].items(), ("total", result["total"])]
+    for name, stats in rows:
+        delta = ""
+        if baseline is not None:
+            before = baseline["total"] if name == "total" else baseline["routes"].get(name)
+            if before and before["throughput_rps"] and before["p95_ms"]:
+                delta = (
+                    f"{stats['throughput_rps'] / before['throughput_rps'] - 1:>+10.1%}"
+                    f"{stats['p95_ms'] / before['p95_ms'] - 1:>+9.1%}"
+                )
+        print(
+            f"{name:<14}{stats['requests']:>8}{stats['errors']:>7}{stats['throughput_rps']:>10,.0f}"
+            f"{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}{delta}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de carga HTTP")
+    parser.add_argument("--target", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--url", help="Servidor já no ar (alvo uvicorn; não inicia workers)")
+    parser.add_argument("--workers", type=int, default=2, help="Workers uvicorn iniciados")
+    parser.add_argument("--concurrency", type=int, default=16, help="Clientes concorrentes")
+    parser.add_argument("--requests", type=int, default=5000, help="Requisições medidas")
+    parser.add_argument("--warmup", type=int, default=500, help="Requisições de aquecimento")
+    parser.add_argument("--rounds", type=int, default=5, help="Rodadas (melhor valor de cada métrica)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Pesos por rota")
+    parser.add_argument("--variants", type=int, default=200, help="Metas sintéticas distintas (payloads por rota)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", type=Path, help="Arquivo da baseline (padrão: baselines/load_<alvo>.json)")
+    parser.add_argument("--save", action="store_true", help="Grava o resultado como baseline")
+    parser.add_argument("--check", action="store_true", help="Falha (código 1) em regressão")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Piora tolerada (fração; máquinas compartilhadas oscilam ~15%%)")
+    args = parser.parse_args()
+    
+    mix = parse_mix(args.mix)
+    plan = make_plan(mix, args.requests, args.variants, args.seed)
+    warmup = make_plan(mix, args.warmup, args.variants, args.seed + 1)
+    baseline_path = args.baseline or BASELINE_DIR / f"load_{args.target}.json"
+    
+    if args.target == "asgi":
+        result = asyncio.run(bench_asgi(plan, warmup, args.concurrency, args.rounds))
+    elif args.url:
+        result = asyncio.run(bench_http(args.url.rstrip("/"), plan, warmup, args.concurrency, args.rounds))
+    else:
+        process, url = start_uvicorn(args.workers)
+        try:
+            result = asyncio.run(bench_http(url, plan, warmup, args.concurrency, args.rounds))
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+    
+    result = {
+        "schema": SCHEMA_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": environment(),
+        "config": {
+            "target": args.target,
+            "workers": None if args.target == "asgi" or args.url else args.workers,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "rounds": args.rounds,
+            "mix": args.mix,
+            "variants": args.variants,
+            "seed": args.seed,
+            "workload": GENERATOR_VERSION,
+        },
+        **result,
+    }
+    
+    baseline = None
+    if baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        if baseline.get("schema") != SCHEMA_VERSION:
+            print(f"⚠️  Baseline {baseline_path} com esquema {baseline.get('schema')}: ignorada")
+            baseline = None
+    
+    print_report(result, baseline)
+    
+    if args.save:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(result, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"\nBaseline gravada em {baseline_path}")
+    
+    if not args.check:
+        return
+    if baseline is None:
+        print(f"\n❌ Sem baseline em {baseline_path} (rode com --save)")
+        sys.exit(2)
+    if baseline["config"] != result["config"] or baseline["environment"] != result["environment"]:
+        print("\n⚠️  Configuração ou ambiente diferentes da baseline: comparação aproximada")
+    
+    regressions = compare(result, baseline, args.threshold)
+    if regressions:
+        print(f"\n❌ Regressões além de {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\n✅ Sem regressões além de {args.threshold:.0%} (baseline de {baseline['created_at']})")
+
+
+if __name__ == "__main__":
+    main()
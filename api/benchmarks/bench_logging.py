@@ -0,0 +1,83 @@
+"""
+Benchmark do Pipeline de Logs
+
+Custo por registro no caminho da requisição:
+print() de dict (anterior) vs LogPipeline.emit() (fila).
+Os dois escrevem no mesmo arquivo temporário; o tempo
+de serialização e escrita do pipeline é medido à parte
+(na API roda na thread de fundo, fora do event loop).
+
+Uso (a partir de api/):
+    python -m benchmarks.bench_logging
+    python -m benchmarks.bench_logging --records 500000
+"""
+
+from contextlib import redirect_stdout
+from datetime import datetime
+import argparse
+import os
+import tempfile
+import time
+
+from logpipeline import LogPipeline
+
+
+def make_entry(i: int) -> dict:
+    return {
+        "method": "POST",
+        "path": "/api/v1/protocols/progressive",
+        "status_code": 200,
+        "duration_ms": round(0.5 + (i % 100) / 100, 2),
+        "decision": "processed"
+    }
+
+
+def bench_print(records: int, path: str) -> float:
+    with open(path, "w", encoding="utf-8") as f, redirect_stdout(f):
+        started = time.perf_counter()
+        for i in range(records):
+            log_entry = {"timestamp": datetime.now().isoformat(), **make_entry(i)}
+            print(f"[LOG] {log_entry}")
+        return time.perf_counter() - started
+
+
+def bench_emit(records: int, path: str):
+    # Fases separadas: a thread de escrita disputaria o GIL com a medição
+    pipeline = LogPipeline(sink=path, max_queue=records + 1, autostart=False)
+
+    started = time.perf_counter()
+    for i in range(records):
+        pipeline.emit("request", make_entry(i))
+    emit_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    pipeline.flush()
+    write_time = time.perf_counter() - started
+
+    return emit_time, write_time, pipeline.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline de logs")
+    parser.add_argument("--records", type=int, default=200_000, help="Registros por variante")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        print_time = bench_print(args.records, os.path.join(tmp, "print.log"))
+        emit_time, write_time, stats = bench_emit(args.records, os.path.join(tmp, "pipeline.jsonl"))
+    
+    per_record = lambda seconds: seconds / args.records * 1e6
+    
+    print("=" * 64)
+    print(f"PIPELINE DE LOGS — {args.records:,} registros")
+    print("=" * 64)
+    print(f"{'variante':<36}{'µs/registro':>14}{'total (s)':>14}")
+    print(f"{'print() no caminho da requisição':<36}{per_record(print_time):>14.3f}{print_time:>14.3f}")
+    print(f"{'emit() no caminho da requisição':<36}{per_record(emit_time):>14.3f}{emit_time:>14.3f}")
+    print(f"{'escrita em lote (thread de fundo)':<36}{per_record(write_time):>14.3f}{write_time:>14.3f}")
+    print(f"\nRedução no caminho da requisição: {print_time / emit_time:.1f}x")
+    print(f"Escritos: {stats['written']:,}  lotes: {stats['batches']:,}  descartados: {stats['dropped']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark das Métricas
+
+1. Custo de instrumentação: ns por observe() / inc() / timer
+2. Onde vai o p99 do /api/v1/protocols/compare: requisições com
+   entradas distintas (sem cache) e quantis por estágio lidos
+   dos próprios histogramas, como o Prometheus calcularia.
+
+Uso (a partir de api/):
+    python -m benchmarks.bench_metrics
+    python -m benchmarks.bench_metrics --requests 5000
+"""
+
+from contextlib import redirect_stdout
+import argparse
+import asyncio
+import io
+import os
+import random
+import time
+
+os.environ.setdefault("RATE_LIMIT_PER_MINUTE", "100000000")
+os.environ.setdefault("RATE_LIMIT_PER_HOUR", "100000000")
+
+import httpx
+
+from main import app
+from metrics import REQUEST_LATENCY, STAGE_LATENCY, MetricsRegistry
+
+
+def bench_overhead(operations: int = 200_000):
+    registry = MetricsRegistry()
+    histogram = registry.histogram("h_seconds", "h", ["route"])
+    counter = registry.counter("c_total", "c", ["route"])
+    
+    results = {}
+    
+    started = time.perf_counter()
+    for _ in range(operations):
+        histogram.labels("/api/v1/protocols/compare").observe(0.0012)
+    results["histogram.labels().observe()"] = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    for _ in range(operations):
+        counter.labels("/api/v1/protocols/compare").inc()
+    results["counter.labels().inc()"] = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    for _ in range(operations):
+        with histogram.labels("/api/v1/protocols/compare").time():
+            pass
+    results["with histogram.time()"] = time.perf_counter() - started
+    
+    return {name: seconds / operations * 1e9 for name, seconds in results.items()}
+
+
+async def drive_compare(requests: int, seed: int = 42):
+    rng = random.Random(seed)
+    transport = httpx.ASGITransport(app=app)
+    
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(requests):
+            periods = rng.randint(3, 120)
+            payload = {
+                # Entradas distintas: sem hit de cache, todos os estágios rodam
+                "goal": {"target_amount": round(rng.uniform(100, 50_000), 2), "periods": periods},
+                "protocol": {
+                    "start_value": round(rng.uniform(1, 50), 2),
+                    "increment": round(rng.uniform(0.5, 20), 2),
+                    "cap": round(rng.uniform(100, 2000), 2)
+                }
+            }
+            await client.post("/api/v1/protocols/compare", json=payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das métricas")
+    parser.add_argument("--requests", type=int, default=3000, help="Requisições ao compare")
+    args = parser.parse_args()
+    
+    print("=" * 64)
+    print("CUSTO DE INSTRUMENTAÇÃO (ns por operação)")
+    print("=" * 64)
+    for name, ns in bench_overhead().items():
+        print(f"{name:<40}{ns:>10.0f}")
+    
+    with redirect_stdout(io.StringIO()):
+        asyncio.run(drive_compare(args.requests))
+    
+    print()
+    print("=" * 64)
+    print(f"COMPARE — {args.requests} requisições sem cache (ms, estimado por bucket)")
+    print("=" * 64)
+    print(f"{'componente':<34}{'p50':>10}{'p99':>10}{'média':>10}")
+    
+    rows = [("requisição (cadeia completa)", REQUEST_LATENCY.labels("/api/v1/protocols/compare", "POST"))]
+    rows += [
+        (f"estágio {stage}", STAGE_LATENCY.labels("compare", stage))
+        for stage in ("engine", "insights", "serialization")
+    ]
+    
+    for name, child in rows:
+        mean = child.sum / child.count if child.count else 0.0
+        print(
+            f"{name:<34}{child.quantile(0.5) * 1000:>10.3f}"
+            f"{child.quantile(0.99) * 1000:>10.3f}{mean * 1000:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
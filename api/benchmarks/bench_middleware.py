@@ -0,0 +1,171 @@
+"""
+Benchmark da Cadeia de Middleware
+
+Compara a latência da cadeia ASGI pura (main.app) com a pilha
+anterior: funções @app.middleware("http") (BaseHTTPMiddleware),
+validação chamando request.json() e o endpoint parseando de novo.
+
+As duas apps compartilham as mesmas rotas; só a pilha muda.
+Requisições em processo (ASGI transport), sem rede.
+
+Uso (a partir de api/):
+    python -m benchmarks.bench_middleware
+    python -m benchmarks.bench_middleware --requests 5000
+"""
+
+from contextlib import redirect_stdout
+from typing import Dict, List
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import time
+
+os.environ.setdefault("RATE_LIMIT_PER_MINUTE", "100000000")
+os.environ.setdefault("RATE_LIMIT_PER_HOUR", "100000000")
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+
+from main import app
+from middleware import (
+    RateLimiter,
+    SECURITY_HEADERS,
+    _behavior_rejection,
+)
+
+
+PAYLOADS = {
+    "/api/v1/protocols/progressive": {
+        "goal": {"target_amount": 1000, "periods": 12},
+        "protocol": {"start_value": 1, "increment": 2, "cap": 100}
+    },
+    "/api/v1/protocols/optimized": {"target_amount": 5000, "periods": 24},
+    "/api/v1/protocols/compare": {
+        "goal": {"target_amount": 1000, "periods": 12},
+        "protocol": {"start_value": 1, "increment": 2, "cap": 100}
+    },
+}
+
+
+def build_legacy_app() -> FastAPI:
+    """Pilha anterior: BaseHTTPMiddleware + corpo lido duas vezes"""
+    legacy = FastAPI()
+    legacy.router.routes.extend(app.router.routes)
+    limiter = RateLimiter(requests_per_minute=10**8, requests_per_hour=10**8)
+    
+    legacy.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    
+    @legacy.middleware("http")
+    async def validation_middleware(request: Request, call_next):
+        if "/protocols/" in request.url.path and request.method == "POST":
+            body_bytes = await request.body()
+            body = await request.json()
+            
+            # Starlette 0.27: o corpo consumido precisa ser reinjetado
+            async def replay():
+                return {"type": "http.request", "body": body_bytes, "more_body": False}
+            request._receive = replay
+            
+            rejection = _behavior_rejection(body)
+            if rejection:
+                return JSONResponse(status_code=422, content={"reason": rejection[1]})
+        return await call_next(request)
+    
+    @legacy.middleware("http")
+    async def rate_limit_middleware(request: Request, call_next):
+        allowed, error_msg = limiter.check_limit(request.client.host if request.client else "unknown")
+        if not allowed:
+            return JSONResponse(status_code=429, content={"reason": error_msg})
+        return await call_next(request)
+    
+    @legacy.middleware("http")
+    async def security_headers_middleware(request: Request, call_next):
+        response = await call_next(request)
+        for name, value in SECURITY_HEADERS:
+            response.headers[name.decode()] = value.decode()
+        return response
+    
+    @legacy.middleware("http")
+    async def log_decisions(request: Request, call_next):
+        start_time = time.perf_counter()
+        response = await call_next(request)
+        log_entry = {
+            "method": request.method,
+            "path": request.url.path,
+            "status_code": response.status_code,
+            "duration_ms": round((time.perf_counter() - start_time) * 1000, 2),
+        }
+        print(f"[LOG] {log_entry}")
+        return response
+    
+    return legacy
+
+
+async def measure(target, requests: int) -> Dict[str, List[float]]:
+    """Latência (ms) por rota, requisições sequenciais"""
+    transport = httpx.ASGITransport(app=target)
+    samples: Dict[str, List[float]] = {path: [] for path in PAYLOADS}
+    
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Aquecimento
+        for path, payload in PAYLOADS.items():
+            await client.post(path, json=payload)
+        
+        for i in range(requests):
+            path = list(PAYLOADS)[i % len(PAYLOADS)]
+            started = time.perf_counter()
+            response = await client.post(path, json=PAYLOADS[path])
+            samples[path].append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200, response.text
+    
+    return samples
+
+
+def percentile(values: List[float], q: float) -> float:
+    return statistics.quantiles(values, n=100)[int(q) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da cadeia de middleware")
+    parser.add_argument("--requests", type=int, default=3000, help="Requisições por pilha")
+    args = parser.parse_args()
+    
+    stacks = {"ASGI puro": app, "BaseHTTPMiddleware": build_legacy_app()}
+    results = {}
+    
+    # Logs das duas pilhas vão para o descarte
+    with redirect_stdout(io.StringIO()):
+        for name, target in stacks.items():
+            results[name] = asyncio.run(measure(target, args.requests))
+    
+    print("=" * 78)
+    print(f"CADEIA DE MIDDLEWARE — {args.requests} requisições por pilha (ms)")
+    print("=" * 78)
+    print(f"{'rota':<34}{'pilha':<22}{'p50':>7}{'p95':>7}{'p99':>7}")
+    
+    for path in PAYLOADS:
+        for name in stacks:
+            values = results[name][path]
+            print(
+                f"{path:<34}{name:<22}"
+                f"{percentile(values, 50):>7.3f}{percentile(values, 95):>7.3f}{percentile(values, 99):>7.3f}"
+            )
+    
+    totals = {name: statistics.fmean(v for vs in results[name].values() for v in vs) for name in stacks}
+    print(f"\nMédia geral: ASGI puro {totals['ASGI puro']:.3f} ms  |  "
+          f"BaseHTTPMiddleware {totals['BaseHTTPMiddleware']:.3f} ms  "
+          f"({totals['BaseHTTPMiddleware'] / totals['ASGI puro']:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark do Profiling por Requisição
+
+Latência da cadeia (main.app) sem o middleware de profiling, com ele
+instalado mas sem perfilar (taxa 0), e perfilando todas as
+requisições nos dois modos.
+
+Uso (a partir de api/):
+    python -m benchmarks.bench_profiling
+    python -m benchmarks.bench_profiling --requests 5000
+"""
+
+from contextlib import redirect_stdout
+import argparse
+import asyncio
+import io
+import statistics
+import tempfile
+
+from benchmarks.bench_middleware import PAYLOADS, measure, percentile
+from main import app
+from profiling import ProfilingMiddleware, RequestProfiler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do profiling por requisição")
+    parser.add_argument("--requests", type=int, default=3000, help="Requisições por variante")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        variants = {
+            "desligado (fora da cadeia)": app,
+            "instalado, taxa 0": ProfilingMiddleware(app, RequestProfiler(tmp, sample_rate=0.0)),
+            "sampling, taxa 1": ProfilingMiddleware(app, RequestProfiler(tmp, sample_rate=1.0, max_files=10)),
+            "deterministic, taxa 1": ProfilingMiddleware(
+                app, RequestProfiler(tmp, mode="deterministic", sample_rate=1.0, max_files=10)
+            ),
+        }
+        
+        results = {}
+        with redirect_stdout(io.StringIO()):
+            for name, target in variants.items():
+                samples = asyncio.run(measure(target, args.requests))
+                results[name] = [v for values in samples.values() for v in values]
+    
+    print("=" * 70)
+    print(f"PROFILING — {args.requests} requisições por variante, {len(PAYLOADS)} rotas (ms)")
+    print("=" * 70)
+    print(f"{'variante':<32}{'média':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    
+    for name, values in results.items():
+        print(
+            f"{name:<32}{statistics.fmean(values):>9.3f}"
+            f"{percentile(values, 50):>9.3f}{percentile(values, 95):>9.3f}{percentile(values, 99):>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Benchmark do Rate Limiter
+
+Compara o limiter de janela deslizante (O(1)) com o limiter
+antigo de listas de timestamps, com clientes a 1000 req/h.
+
+O custo do antigo cresce com o histórico do cliente;
+o do novo fica plano.
+
+Uso (a partir de api/):
+    python -m benchmarks.bench_rate_limiter
+    python -m benchmarks.bench_rate_limiter --clients 100000 --rounds 40 --legacy-clients 500
+"""
+
+from collections import defaultdict
+from typing import Callable, Dict, List
+import argparse
+import time
+import tracemalloc
+
+from middleware import RateLimiter
+
+
+class LegacyRateLimiter:
+    """Implementação anterior: listas de timestamps por cliente (referência)"""
+    
+    def __init__(self, requests_per_minute: int, requests_per_hour: int, clock: Callable[[], float]):
+        self.rpm = requests_per_minute
+        self.rph = requests_per_hour
+        self.clock = clock
+        self.minute_requests: Dict[str, list] = defaultdict(list)
+        self.hour_requests: Dict[str, list] = defaultdict(list)
+    
+    def check_limit(self, client_id: str):
+        now = self.clock()
+        minute_ago = now - 60
+        hour_ago = now - 3600
+        
+        self.minute_requests[client_id] = [
+            ts for ts in self.minute_requests[client_id] if ts > minute_ago
+        ]
+        self.hour_requests[client_id] = [
+            ts for ts in self.hour_requests[client_id] if ts > hour_ago
+        ]
+        
+        if len(self.minute_requests[client_id]) >= self.rpm:
+            return False, "minute"
+        if len(self.hour_requests[client_id]) >= self.rph:
+            return False, "hour"
+        
+        self.minute_requests[client_id].append(now)
+        self.hour_requests[client_id].append(now)
+        return True, None
+
+
+class SimulatedClock:
+    """Relógio simulado: o benchmark controla o tempo"""
+    
+    def __init__(self):
+        self.now = 1_000_000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+def run_rounds(limiter, clock: SimulatedClock, client_ids: List[str], rounds: int, interval: float) -> List[float]:
+    """
+    Cada rodada: todos os clientes fazem uma requisição
+    
+    Returns:
+        ns por requisição em cada rodada
+    """
+    per_round = []
+    check = limiter.check_limit
+    
+    for _ in range(rounds):
+        clock.now += interval
+        started = time.perf_counter_ns()
+        for client_id in client_ids:
+            check(client_id)
+        per_round.append((time.perf_counter_ns() - started) / len(client_ids))
+    
+    return per_round
+
+
+def prefill_legacy(limiter: LegacyRateLimiter, clock: SimulatedClock, client_ids: List[str], history: int, interval: float):
+    """Coloca o limiter antigo em regime: `history` requisições na última hora"""
+    hour = [clock.now - interval * i for i in range(history, 0, -1)]
+    minute = [ts for ts in hour if ts > clock.now - 60]
+    
+    for client_id in client_ids:
+        limiter.hour_requests[client_id] = list(hour)
+        limiter.minute_requests[client_id] = list(minute)
+
+
+def summarize(label: str, samples: List[float]):
+    """Imprime custo por requisição ao longo das rodadas"""
+    checkpoints = sorted({0, len(samples) // 4, len(samples) // 2, 3 * len(samples) // 4, len(samples) - 1})
+    points = "  ".join(f"r{i + 1}={samples[i]:,.0f}" for i in checkpoints)
+    print(f"  {label:<28} ns/req: {points}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do rate limiter")
+    parser.add_argument("--clients", type=int, default=100_000, help="Clientes distintos (limiter novo)")
+    parser.add_argument("--legacy-clients", type=int, default=2_000, help="Clientes distintos (limiter antigo)")
+    parser.add_argument("--rate", type=int, default=1000, help="Requisições por hora por cliente")
+    parser.add_argument("--rounds", type=int, default=20, help="Rodadas medidas")
+    args = parser.parse_args()
+    
+    interval = 3600 / args.rate
+    limits = dict(requests_per_minute=10 * args.rate, requests_per_hour=10 * args.rate)
+    
+    print("=" * 70)
+    print(f"RATE LIMITER — {args.rate} req/h por cliente (uma requisição a cada {interval:.1f}s)")
+    print("=" * 70)
+    
+    # Novo: todos os clientes, memória medida
+    clock = SimulatedClock()
+    client_ids = [f"client-{i}" for i in range(args.clients)]
+    
+    limiter = RateLimiter(**limits, clock=clock)
+    samples = run_rounds(limiter, clock, client_ids, args.rounds, interval)
+    
+    # Memória medida à parte (tracemalloc distorce o tempo)
+    tracemalloc.start()
+    measured = RateLimiter(**limits, clock=clock)
+    run_rounds(measured, clock, client_ids, 1, interval)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del measured
+    
+    print(f"\nJanela deslizante — {args.clients:,} clientes")
+    summarize("em regime", samples)
+    print(f"  memória: {memory / args.clients:,.0f} bytes/cliente")
+    
+    clock.now += limiter.backend.idle_timeout + 1
+    started = time.perf_counter()
+    evicted = limiter.sweep()
+    print(f"  varredura de ociosos: {evicted:,} clientes em {(time.perf_counter() - started) * 1000:.1f} ms")
+    
+    # Antigo: histórico de uma hora cheia
+    clock = SimulatedClock()
+    legacy_ids = client_ids[:args.legacy_clients]
+    legacy = LegacyRateLimiter(**limits, clock=clock)
+    
+    print(f"\nListas de timestamps — {args.legacy_clients:,} clientes")
+    cold = run_rounds(legacy, clock, legacy_ids, args.rounds, interval)
+    summarize("histórico vazio", cold)
+    
+    prefill_legacy(legacy, clock, legacy_ids, args.rate, interval)
+    warm = run_rounds(legacy, clock, legacy_ids, args.rounds, interval)
+    summarize(f"histórico de {args.rate} req/h", warm)
+    
+    fresh = SimulatedClock()
+    baseline = run_rounds(RateLimiter(**limits, clock=fresh), fresh, legacy_ids, args.rounds, interval)
+    print(f"\nRazão antigo/novo em regime: {sum(warm) / sum(baseline):.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Benchmark de Inicialização (cold start)
+
+Cada medida roda num processo novo (nada em cache do interpretador):
+- import: `import main` (FastAPI, Pydantic, config, rotas)
+- pronto: do início do lifespan até /ready (aquecimento, se ligado)
+- 1º POST / 1º /openapi.json: primeira requisição de cada tipo,
+  direto no app ASGI (sem rede)
+- total: import + pronto + 1º POST (tempo até a primeira resposta útil)
+
+Variantes: padrão, OpenAPI pré-gerado (OPENAPI_CACHE) e pré-gerado
+com aquecimento (STARTUP_WARMUP). Com --uvicorn, mede também o tempo
+do spawn do servidor até o primeiro 200 em /health e em /ready
+(socket real). Mediana de --runs processos por variante.
+
+Uso (a partir de api/):
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --runs 10 --uvicorn
+"""
+
+from pathlib import Path
+from typing import Dict, List, Tuple
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+API_DIR = Path(__file__).resolve().parent.parent
+
+CHILD_ENV = {
+    "LOG_SINK": os.devnull,
+    "RATE_LIMIT_PER_MINUTE": "1000000000",
+    "RATE_LIMIT_PER_HOUR": "1000000000",
+}
+
+PAYLOAD = {
+    "goal": {"target_amount": 5000, "periods": 24},
+    "protocol": {"start_value": 2, "increment": 3, "cap": 300}
+}
+
+COLUMNS = ("import", "pronto", "1º POST", "1º openapi", "2º POST", "total")
+
+
+def child():
+    """Medidas de um processo recém-iniciado (JSON no stdout)"""
+    started = time.perf_counter()
+    import main
+    imported = time.perf_counter()
+    
+    import anyio
+    from startup import asgi_request, startup_state
+    
+    async def measure() -> Dict[str, float]:
+        body = json.dumps(PAYLOAD).encode()
+        async with main.app.router.lifespan_context(main.app):
+            lifespan = time.perf_counter()
+            while not startup_state.ready:
+                await anyio.sleep(0.0005)
+            ready = time.perf_counter()
+            
+            timings = {}
+            for name, method, path, payload in (
+                ("1º POST", "POST", "/api/v1/protocols/progressive", body),
+                ("1º openapi", "GET", main.app.openapi_url, b""),
+                ("2º POST", "POST", "/api/v1/protocols/progressive", body),
+            ):
+                t = time.perf_counter()
+                assert await asgi_request(main.app, method, path, payload) == 200
+                timings[name] = (time.perf_counter() - t) * 1000
+        
+        return {
+            "import": (imported - started) * 1000,
+            "pronto": (ready - lifespan) * 1000,
+            **timings,
+            "total": (imported - started + ready - lifespan) * 1000 + timings["1º POST"],
+        }
+    
+    print(json.dumps(anyio.run(measure)))
+
+
+def run_child(env: Dict[str, str]) -> Dict[str, float]:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--child"],
+        cwd=API_DIR, env={**os.environ, **CHILD_ENV, **env},
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def uvicorn_startup(env: Dict[str, str], timeout: float = 30.0) -> Dict[str, float]:
+    """Spawn do uvicorn até o primeiro 200 em /health e em /ready"""
+    import httpx
+    from benchmarks.bench_load import _free_port
+    
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning", "--no-access-log"],
+        cwd=API_DIR, env={**os.environ, **CHILD_ENV, **env},
+    )
+    
+    timings: Dict[str, float] = {}
+    try:
+        deadline = time.monotonic() + timeout
+        while len(timings) < 2 and time.monotonic() < deadline:
+            for path in ("/health", "/ready"):
+                if path in timings:
+                    continue
+                try:
+                    if httpx.get(url + path, timeout=1.0).status_code == 200:
+                        timings[path] = (time.perf_counter() - started) * 1000
+                except httpx.HTTPError:
+                    pass
+            time.sleep(0.005)
+    finally:
+        process.terminate()
+        process.wait()
+    
+    if len(timings) < 2:
+        raise RuntimeError(f"uvicorn não ficou pronto em {timeout:.0f}s")
+    return timings
+
+
+def import_breakdown(top: int = 8) -> List[Tuple[str, float]]:
+    """Módulos importados diretamente por main, mais caros primeiro (-X importtime)"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=API_DIR, env={**os.environ, **CHILD_ENV},
+        check=True, capture_output=True, text=True
+    ).stderr
+    
+    # Filhos diretos (profundidade 1) aparecem antes da linha do pai
+    children: List[Tuple[str, float]] = []
+    modules: List[Tuple[str, float]] = []
+    for line in stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        depth = (len(parts[2]) - len(parts[2].lstrip()) - 1) // 2
+        name = parts[2].strip()
+        if depth == 1:
+            children.append((name, int(parts[1]) / 1000))
+        elif depth == 0:
+            if name == "main":
+                modules = children
+            children = []
+    return sorted(modules, key=lambda item: -item[1])[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de inicialização da API")
+    parser.add_argument("--runs", type=int, default=5, help="Processos por variante (mediana)")
+    parser.add_argument("--uvicorn", action="store_true", help="Mede também o spawn do uvicorn")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        child()
+        return
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = str(Path(tmp) / "openapi.json")
+        subprocess.run(
+            [sys.executable, "-m", "startup", "openapi", "--output", cache],
+            cwd=API_DIR, env={**os.environ, **CHILD_ENV}, check=True, capture_output=True
+        )
+        
+        variants = {
+            "padrão": {},
+            "openapi pré-gerado": {"OPENAPI_CACHE": cache},
+            "pré-gerado + aquecimento": {"OPENAPI_CACHE": cache, "STARTUP_WARMUP": "true"},
+        }
+        
+        print("=" * 98)
+        print(f"INICIALIZAÇÃO — mediana de {args.runs} processos (ms)")
+        print("=" * 98)
+        print(f"{'variante':<26}" + "".join(f"{c:>12}" for c in COLUMNS))
+        for name, env in variants.items():
+            runs = [run_child(env) for _ in range(args.runs)]
+            print(f"{name:<26}" + "".join(f"{statistics.median(r[c] for r in runs):>12.1f}" for c in COLUMNS))
+        
+        if args.uvicorn:
+            print()
+            print(f"{'uvicorn (spawn →)':<26}{'/health':>12}{'/ready':>12}")
+            for name, env in variants.items():
+                runs = [uvicorn_startup(env) for _ in range(args.runs)]
+                print(f"{name:<26}" + "".join(f"{statistics.median(r[p] for r in runs):>12.1f}" for p in ("/health", "/ready")))
+    
+    print()
+    print("import main, por módulo (ms, acumulado):")
+    for module, ms in import_breakdown():
+        print(f"  {module:<24}{ms:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Cache de Respostas Determinísticas
+
+Os endpoints de protocolo são funções puras de GoalInput e
+ProgressiveProtocolInput. Mesma entrada, mesma resposta.
+
+Guarda os bytes já serializados (engine + insights + Pydantic
+calculados uma única vez) num LRU limitado, com ETag forte.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Optional, Tuple
+import hashlib
+import time
+
+from pydantic import BaseModel
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """Resposta serializada pronta para envio"""
+    body: bytes
+    etag: str
+    stored_at: float
+
+
+class ResponseCache:
+    """
+    LRU em memória de respostas serializadas
+    
+    O created_at da resposta é o do cálculo original: os bytes
+    ficam idênticos enquanto a entrada vive, o que mantém o ETag
+    forte válido. O TTL limita a idade desse timestamp.
+    """
+    
+    def __init__(self, max_entries: int = 4096, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def make_key(route: str, *models: BaseModel) -> Tuple[str, ...]:
+        """
+        Chave normalizada da requisição
+        
+        Usa os modelos já validados: 1000 e 1000.0, ordem de campos
+        e defaults omitidos viram a mesma chave.
+        """
+        return (route,) + tuple(model.model_dump_json() for model in models)
+    
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        """Busca resposta; conta hit ou miss"""
+        entry = self._entries.get(key)
+        
+        if entry is not None and time.monotonic() - entry.stored_at > self.ttl_seconds:
+            del self._entries[key]
+            entry = None
+        
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+    
+    def put(self, key: Hashable, body: bytes) -> CachedResponse:
+        """Armazena resposta e descarta a menos usada se cheio"""
+        entry = CachedResponse(
+            body=body,
+            etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            stored_at=time.monotonic()
+        )
+        
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        
+        return entry
+    
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], bytes]
+    ) -> CachedResponse:
+        """Retorna do cache ou calcula, serializa e armazena"""
+        entry = self.get(key)
+        if entry is None:
+            entry = self.put(key, compute())
+        return entry
+    
+    def clear(self):
+        """Esvazia o cache (estatísticas preservadas)"""
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, float]:
+        """Estatísticas de uso"""
+        lookups = self.hits + self.misses
+        
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Compara If-None-Match com o ETag (comparação fraca, RFC 9110)
+    
+    Aceita lista separada por vírgula, prefixo W/ e curinga *.
+    """
+    if not if_none_match:
+        return False
+    
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    
+    return False
@@ -33,6 +33,21 @@ class Settings(BaseSettings):
     rate_limit_per_minute: int = 60
     rate_limit_per_hour: int = 1000
     
+    # Middleware (cadeia ASGI de governança)
+    middleware_rate_limit: bool = True
+    middleware_behavior_validation: bool = True
+    middleware_security_headers: bool = True
+    middleware_decision_log: bool = True
+    middleware_metrics: bool = True  # /metrics (Prometheus)
+    
+    # Lote (/api/v1/protocols/batch)
+    batch_max_items: int = 50_000
+    batch_chunk_size: int = 1000
+    
+    # Cache de respostas (protocolos determinísticos)
+    response_cache_size: int = 4096
+    response_cache_ttl: int = 300
+    
     # Validação
     max_target_amount: float = 1_000_000.0
     min_target_amount: float = 10.0
@@ -46,11 +61,34 @@ class Settings(BaseSettings):
     
     # Logging
     log_level: str = "info"
+    log_sink: str = "stdout"  # ou caminho de arquivo (JSON lines)
+    log_queue_size: int = 10_000
+    log_batch_size: int = 256
+    log_flush_interval: float = 0.5
+    log_sample_high_water: float = 0.5
+    log_min_sample_rate: float = 0.05
+    decision_log_capacity: int = 10_000  # decisões em memória (consulta admin)
+    
+    # Admin (rotas /api/v1/admin/*, header X-Admin-Token)
+    admin_token: Optional[str] = None
+    
+    # Profiling por requisição (opt-in; desligado = fora da cadeia)
+    profiling_enabled: bool = False
+    profiling_sample_rate: float = 0.0  # fração perfilada sem header
+    profiling_mode: str = "sampling"  # ou "deterministic"
+    profiling_format: str = "collapsed"  # ou "speedscope"
+    profiling_interval: float = 0.001  # segundos entre amostras
+    profiling_dir: str = "profiles"
+    profiling_max_files: int = 100
+    
+    # Inicialização rápida (cold start)
+    openapi_cache: Optional[str] = None  # documento pré-gerado (python -m startup openapi)
+    startup_warmup: bool = False  # /ready só responde 200 após o aquecimento
     
     # Database (futuro)
     database_url: Optional[str] = None
     
-    # Redis (futuro)
+    # Redis (rate limiting distribuído)
     redis_url: Optional[str] = None
     
     # Auth (futuro)
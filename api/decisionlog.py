@@ -0,0 +1,300 @@
+"""
+Buffer de Decisões
+
+Anel de capacidade fixa com registros compactos:
+memória constante, o mais antigo sai quando enche.
+
+Índices secundários por decision_type e outcome
+(sequências em ordem crescente, mesma ordem do tempo):
+consultas por tipo + intervalo de tempo por busca binária,
+sem varrer o buffer.
+
+Escrita e consulta sob um lock: o lote NDJSON registra decisões
+a partir do threadpool, em paralelo ao event loop.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import sys
+import threading
+import time
+
+
+# (seq, timestamp, código do tipo, código do outcome, motivo, metadata)
+DecisionRecord = Tuple[int, float, int, int, str, Optional[Dict[str, Any]]]
+
+
+class _SeqIndex:
+    """
+    Sequências de um valor indexado, em ordem crescente
+    
+    Remoção só pelo início (o mais antigo): deslocamento lógico,
+    compactado quando metade da lista já saiu.
+    """
+    
+    __slots__ = ("seqs", "start")
+    
+    def __init__(self):
+        self.seqs: List[int] = []
+        self.start = 0
+    
+    def __len__(self) -> int:
+        return len(self.seqs) - self.start
+    
+    def append(self, seq: int):
+        self.seqs.append(seq)
+    
+    def evict(self, seq: int):
+        """Remove `seq` se for o mais antigo do índice"""
+        if self.start < len(self.seqs) and self.seqs[self.start] == seq:
+            self.start += 1
+            if self.start > 64 and self.start * 2 > len(self.seqs):
+                del self.seqs[:self.start]
+                self.start = 0
+
+
+class DecisionRingBuffer:
+    """
+    Últimas `capacity` decisões, indexadas
+    
+    Uso:
+        buffer = DecisionRingBuffer(capacity=10_000)
+        buffer.append("rate_limit", "rejected", "limite por minuto")
+        buffer.query(decision_type="rate_limit", since=time.time() - 3600)
+    """
+    
+    def __init__(self, capacity: int = 10_000, clock=time.time):
+        """
+        Args:
+            capacity: Máximo de decisões mantidas
+            clock: Fonte de tempo (segundos, não decrescente)
+        """
+        if capacity < 1:
+            raise ValueError("capacity deve ser positiva")
+        
+        self.capacity = capacity
+        self.clock = clock
+        
+        self._slots: List[Optional[DecisionRecord]] = [None] * capacity
+        self._next_seq = 0
+        
+        # Strings repetidas viram códigos (tipo/outcome) ou são internadas (motivo)
+        self._codes: Dict[str, int] = {}
+        self._names: List[str] = []
+        
+        self._by_type: Dict[int, _SeqIndex] = {}
+        self._by_outcome: Dict[int, _SeqIndex] = {}
+        
+        self.evicted = 0
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return min(self._next_seq, self.capacity)
+    
+    def _code(self, name: str) -> int:
+        code = self._codes.get(name)
+        if code is None:
+            code = self._codes[name] = len(self._names)
+            self._names.append(name)
+        return code
+    
+    @staticmethod
+    def _index(indexes: Dict[int, _SeqIndex], code: int) -> _SeqIndex:
+        index = indexes.get(code)
+        if index is None:
+            index = indexes[code] = _SeqIndex()
+        return index
+    
+    def append(
+        self,
+        decision_type: str,
+        outcome: str,
+        reason: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """
+        Registra decisão (O(1) amortizado)
+        
+        Returns:
+            Sequência atribuída
+        """
+        with self._lock:
+            return self._append(decision_type, outcome, reason, metadata)
+    
+    def _append(
+        self,
+        decision_type: str,
+        outcome: str,
+        reason: str,
+        metadata: Optional[Dict[str, Any]]
+    ) -> int:
+        seq = self._next_seq
+        slot = seq % self.capacity
+        old = self._slots[slot]
+        
+        if old is not None:
+            # Mais antigo do buffer: também o mais antigo dos seus índices
+            self._by_type[old[2]].evict(old[0])
+            self._by_outcome[old[3]].evict(old[0])
+            self.evicted += 1
+        
+        type_code = self._code(decision_type)
+        outcome_code = self._code(outcome)
+        
+        self._slots[slot] = (
+            seq,
+            self.clock(),
+            type_code,
+            outcome_code,
+            sys.intern(reason),
+            metadata or None
+        )
+        self._index(self._by_type, type_code).append(seq)
+        self._index(self._by_outcome, outcome_code).append(seq)
+        
+        self._next_seq = seq + 1
+        return seq
+    
+    # ==================== CONSULTA ====================
+    
+    def _timestamp(self, seq: int) -> float:
+        return self._slots[seq % self.capacity][1]
+    
+    def _bisect(self, seqs: Sequence[int], lo: int, timestamp: float) -> int:
+        """Primeira posição com timestamp >= `timestamp`"""
+        hi = len(seqs)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._timestamp(seqs[mid]) < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+    
+    def _to_dict(self, record: DecisionRecord) -> Dict[str, Any]:
+        seq, timestamp, type_code, outcome_code, reason, metadata = record
+        return {
+            "seq": seq,
+            "timestamp": datetime.fromtimestamp(timestamp).isoformat(),
+            "decision_type": self._names[type_code],
+            "outcome": self._names[outcome_code],
+            "reason": reason,
+            "metadata": dict(metadata) if metadata else {}
+        }
+    
+    def _candidates(
+        self,
+        decision_type: Optional[str],
+        outcome: Optional[str]
+    ) -> Optional[Tuple[Sequence[int], int]]:
+        """
+        Menor índice que atende aos filtros: (lista, início)
+        
+        None se algum filtro não tem registros.
+        """
+        indexes = []
+        
+        for name, by in ((decision_type, self._by_type), (outcome, self._by_outcome)):
+            if name is None:
+                continue
+            code = self._codes.get(name)
+            index = by.get(code) if code is not None else None
+            if index is None or not len(index):
+                return None
+            indexes.append(index)
+        
+        if not indexes:
+            # Sem filtro: todas as sequências vivas (range, sem alocar)
+            oldest = max(0, self._next_seq - self.capacity)
+            return range(oldest, self._next_seq), 0
+        
+        smallest = min(indexes, key=len)
+        return smallest.seqs, smallest.start
+    
+    def query(
+        self,
+        decision_type: Optional[str] = None,
+        outcome: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Decisões mais recentes primeiro
+        
+        Args:
+            decision_type: Filtro por tipo (rate_limit, absurd_goal, ...)
+            outcome: Filtro por resultado (approved, rejected)
+            since: Timestamp mínimo (inclusive, segundos)
+            until: Timestamp máximo (exclusive, segundos)
+            limit: Máximo de registros retornados
+        
+        Returns:
+            Lista de decisões (dicts)
+        """
+        with self._lock:
+            return self._query(decision_type, outcome, since, until, limit)
+    
+    def _query(
+        self,
+        decision_type: Optional[str],
+        outcome: Optional[str],
+        since: Optional[float],
+        until: Optional[float],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        candidates = self._candidates(decision_type, outcome)
+        if candidates is None:
+            return []
+        
+        seqs, start = candidates
+        lo = start if since is None else self._bisect(seqs, start, since)
+        hi = len(seqs) if until is None else self._bisect(seqs, lo, until)
+        
+        type_code = self._codes.get(decision_type) if decision_type is not None else None
+        outcome_code = self._codes.get(outcome) if outcome is not None else None
+        
+        results = []
+        for position in range(hi - 1, lo - 1, -1):
+            if len(results) >= limit:
+                break
+            
+            record = self._slots[seqs[position] % self.capacity]
+            if type_code is not None and record[2] != type_code:
+                continue
+            if outcome_code is not None and record[3] != outcome_code:
+                continue
+            
+            results.append(self._to_dict(record))
+        
+        return results
+    
+    def recent(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Últimas `limit` decisões, da mais antiga para a mais recente"""
+        with self._lock:
+            first = max(0, self._next_seq - min(limit, self.capacity))
+            return [
+                self._to_dict(self._slots[seq % self.capacity])
+                for seq in range(first, self._next_seq)
+            ]
+    
+    def stats(self) -> Dict[str, Any]:
+        """Ocupação e contagem atual por tipo/outcome"""
+        with self._lock:
+            return self._stats()
+    
+    def _stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self),
+            "capacity": self.capacity,
+            "total": self._next_seq,
+            "evicted": self.evicted,
+            "by_type": {
+                self._names[code]: len(index)
+                for code, index in self._by_type.items() if len(index)
+            },
+            "by_outcome": {
+                self._names[code]: len(index)
+                for code, index in self._by_outcome.items() if len(index)
+            }
+        }
@@ -5,7 +5,7 @@ Motor de cálculo e interpretação.
 Isolado. Testável. Reutilizável.
 """
 
-from .progression import ProgressiveEngine, ProgressionResult
+from .progression import ProgressiveEngine, ProgressionResult, CappedProgression
 from .insights import (
     generate_insight,
     generate_recommendation,
@@ -19,6 +19,7 @@ from .insights import (
 __all__ = [
     'ProgressiveEngine',
     'ProgressionResult',
+    'CappedProgression',
     'generate_insight',
     'generate_recommendation',
     'classify_status',
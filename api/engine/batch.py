@@ -0,0 +1,137 @@
+"""
+Batch Engine - Motor Vetorizado
+
+Mesma matemática do ProgressiveEngine, aplicada a milhares
+de pares meta/protocolo numa única chamada NumPy.
+
+Responsabilidade: CALCULAR em lote.
+O resultado bate exatamente com o engine escalar, inclusive no arredondamento.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+# Códigos de status (índice em STATUS_LABELS)
+STATUS_INCOMPLETE = 0
+STATUS_IN_PROGRESS = 1
+STATUS_REACHED = 2
+
+STATUS_LABELS = ("incomplete", "in_progress", "reached")
+
+
+@dataclass
+class BatchResult:
+    """
+    Resultado vetorizado (struct-of-arrays)
+
+    Cada array tem uma posição por item do lote.
+    """
+    total: np.ndarray
+    average: np.ndarray
+    peak: np.ndarray
+    viability: np.ndarray
+    status: np.ndarray
+    periods: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.total)
+
+    def status_labels(self) -> np.ndarray:
+        """Status em texto, igual a classify_status"""
+        return np.asarray(STATUS_LABELS)[self.status]
+
+
+def round2(values: np.ndarray) -> np.ndarray:
+    """
+    Arredonda para 2 casas exatamente como round(x, 2)
+
+    np.round escala por 100 e perde a representação decimal em
+    empates (2.675 → 2.67 no Python). Só os valores próximos de
+    meio centavo voltam para o round escalar.
+    """
+    scaled = values * 100
+    rounded = np.rint(scaled) / 100
+
+    fraction = np.abs(scaled - np.trunc(scaled))
+    near_tie = np.flatnonzero(np.abs(fraction - 0.5) < 1e-6)
+
+    for i in near_tie:
+        rounded.flat[i] = round(float(values.flat[i]), 2)
+
+    return rounded
+
+
+def calculate_batch(
+    target,
+    periods,
+    start,
+    increment,
+    cap
+) -> BatchResult:
+    """
+    Calcula progressões com teto em lote
+
+    Espelha CappedProgression operação por operação, para que
+    total, média e pico saiam idênticos ao cálculo escalar.
+    Escalares são propagados (broadcast) contra os arrays.
+
+    Args:
+        target: Valores alvo
+        periods: Números de períodos
+        start: Valores iniciais
+        increment: Incrementos por período
+        cap: Valores máximos
+
+    Returns:
+        Resultado vetorizado
+    """
+    target, n, s, d, c = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (target, periods, start, increment, cap))
+    )
+    n = np.maximum(n, 0)
+
+    # Termos antes do teto (k)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        steps = np.floor((c - s) / d) + 1
+
+    k = np.minimum(n, steps)
+    k = np.where(d == 0, n, k)
+    k = np.where(s > c, 1, k)
+    k = np.where(d < 0, np.where(s + d <= c, n, 1), k)
+    k = np.where(n == 0, 0, k)
+
+    # Soma: parte livre + parte no teto
+    total = k * s + d * k * (k - 1) / 2
+    rest = n - k
+    capped = np.where(d < 0, rest * c + d * rest * (rest - 1) / 2, rest * c)
+    total = np.where(rest > 0, total + capped, total)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        average = np.where(n > 0, total / n, 0.0)
+
+    # Pico: último termo em progressões crescentes, senão o inicial
+    last = n - 1
+    peak = np.where(last < k, s + last * d, c)
+    peak = np.where((d <= 0) | (s > c), s, peak)
+    peak = np.where(n == 0, 0.0, peak)
+
+    total = round2(total)
+
+    # Viabilidade sobre o total arredondado, como calculate_viability
+    with np.errstate(divide="ignore", invalid="ignore"):
+        viability = np.where(target > 0, np.minimum(1.0, total / target), 0.0)
+
+    status = np.full(viability.shape, STATUS_INCOMPLETE, dtype=np.int8)
+    status[viability >= 0.80] = STATUS_IN_PROGRESS
+    status[viability >= 1.0] = STATUS_REACHED
+
+    return BatchResult(
+        total=total,
+        average=round2(average),
+        peak=round2(peak),
+        viability=viability,
+        status=status,
+        periods=n.astype(np.int64)
+    )
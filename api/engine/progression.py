@@ -7,14 +7,142 @@ Não valida. Não interpreta. Não decide.
 A API governa. O engine executa.
 """
 
-from typing import List, Tuple
+import math
+from typing import List, Sequence, Tuple, Union, overload
 from dataclasses import dataclass
 
 
+# Até aqui calculate() devolve a progressão já em lista: com poucos
+# termos a lista custa menos que a visão preguiçosa
+SMALL_PERIODS = 8
+
+
+class CappedProgression(Sequence[float]):
+    """
+    Progressão aritmética com teto - forma fechada
+    
+    Equivale ao laço:
+        atual = start
+        repetir n vezes: emitir atual; atual = min(atual + increment, cap)
+    
+    Total, pico e média saem em O(1), a partir do período
+    em que o teto passa a valer. Os termos são calculados
+    sob demanda: a lista só existe se alguém iterar.
+    """
+    
+    __slots__ = ('start', 'increment', 'cap', 'periods', 'uncapped')
+    
+    def __init__(self, start: float, increment: float, cap: float, periods: int):
+        """
+        Args:
+            start: Valor inicial
+            increment: Incremento por período
+            cap: Valor máximo
+            periods: Número de períodos
+        """
+        self.start = start
+        self.increment = increment
+        self.cap = cap
+        self.periods = n = periods if periods > 0 else 0
+        
+        # Quantidade de termos antes do teto (k): termos 0..k-1 seguem
+        # a₁ + i×d; do termo k em diante o teto manda. Com incremento
+        # negativo o teto só corta o segundo termo, e a queda continua
+        # a partir dele. Calculado aqui, sem chamadas: com poucos
+        # períodos a construção é a maior parte do custo de calculate().
+        if n == 0:
+            k = 0
+        elif increment < 0:
+            k = n if start + increment <= cap else 1
+        elif start > cap:
+            k = 1
+        elif increment == 0:
+            k = n
+        else:
+            k = math.floor((cap - start) / increment) + 1
+            if k > n:
+                k = n
+        self.uncapped = k
+    
+    def term(self, i: int) -> float:
+        """Termo i (0-indexed) em O(1)"""
+        if i < self.uncapped:
+            return self.start + i * self.increment
+        if self.increment < 0:
+            return self.cap + (i - 1) * self.increment
+        return self.cap
+    
+    @property
+    def total(self) -> float:
+        """Soma da progressão: S = k×a₁ + d×k(k-1)/2 + parte do teto"""
+        n, k = self.periods, self.uncapped
+        total = k * self.start + self.increment * k * (k - 1) / 2
+        
+        rest = n - k
+        if rest > 0:
+            if self.increment < 0:
+                total += rest * self.cap + self.increment * rest * (rest - 1) / 2
+            else:
+                total += rest * self.cap
+        
+        return total
+    
+    @property
+    def peak(self) -> float:
+        """Maior termo da progressão"""
+        if self.periods == 0:
+            return 0
+        if self.increment <= 0 or self.start > self.cap:
+            return self.start
+        return self.term(self.periods - 1)
+    
+    @property
+    def average(self) -> float:
+        """Média por período"""
+        return self.total / self.periods if self.periods > 0 else 0
+    
+    def __len__(self) -> int:
+        return self.periods
+    
+    @overload
+    def __getitem__(self, index: int) -> float: ...
+    
+    @overload
+    def __getitem__(self, index: slice) -> List[float]: ...
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[float, List[float]]:
+        if isinstance(index, slice):
+            return [self.term(i) for i in range(*index.indices(self.periods))]
+        
+        if index < 0:
+            index += self.periods
+        if not 0 <= index < self.periods:
+            raise IndexError("índice fora da progressão")
+        
+        return self.term(index)
+    
+    def __iter__(self):
+        for i in range(self.periods):
+            yield self.term(i)
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (CappedProgression, list, tuple)):
+            return len(self) == len(other) and all(
+                a == b for a, b in zip(self, other)
+            )
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return (
+            f"CappedProgression(start={self.start}, increment={self.increment}, "
+            f"cap={self.cap}, periods={self.periods})"
+        )
+
+
 @dataclass
 class ProgressionResult:
     """Resultado bruto do cálculo"""
-    progression: List[float]
+    progression: Sequence[float]
     total: float
     periods: int
     average: float
@@ -54,6 +182,11 @@ class ProgressiveEngine:
         Fórmula base: aₙ = a₁ + (n-1) × d
         Com limitação: min(aₙ, cap)
         
+        Total, média e pico em forma fechada (O(1)).
+        A progressão é uma visão preguiçosa: só vira lista se iterada.
+        Com até SMALL_PERIODS períodos já sai em lista, com os mesmos
+        termos e a mesma soma de CappedProgression.
+        
         Args:
             start: Valor inicial
             increment: Incremento por período
@@ -62,25 +195,80 @@ class ProgressiveEngine:
         Returns:
             Resultado do cálculo puro
         """
-        progression = []
-        current = start
+        periods = self.periods
+        
+        if periods > SMALL_PERIODS:
+            progression = CappedProgression(start, increment, cap, periods)
+            total = progression.total
+            
+            return ProgressionResult(
+                progression=progression,
+                total=round(total, 2),
+                periods=periods,
+                average=round(total / periods, 2),
+                peak=round(progression.peak, 2)
+            )
         
-        for _ in range(self.periods):
-            progression.append(current)
-            current = min(current + increment, cap)
+        # Mesma conta de CappedProgression, sem chamadas: aqui o custo
+        # de construir objetos domina
+        if periods <= 0:
+            return ProgressionResult(progression=[], total=0.0, periods=periods, average=0, peak=0)
         
-        total = sum(progression)
-        average = total / self.periods if self.periods > 0 else 0
-        peak = max(progression) if progression else 0
+        if increment < 0:
+            k = periods if start + increment <= cap else 1
+        elif start > cap:
+            k = 1
+        elif increment == 0:
+            k = periods
+        else:
+            k = math.floor((cap - start) / increment) + 1
+            if k > periods:
+                k = periods
+        
+        progression = [start + i * increment for i in range(k)]
+        total = k * start + increment * k * (k - 1) / 2
+        
+        rest = periods - k
+        if rest > 0:
+            if increment < 0:
+                progression += [cap + (i - 1) * increment for i in range(k, periods)]
+                total += rest * cap + increment * rest * (rest - 1) / 2
+            else:
+                progression += [cap] * rest
+                total += rest * cap
+        
+        peak = start if increment <= 0 or start > cap else progression[-1]
         
         return ProgressionResult(
             progression=progression,
             total=round(total, 2),
-            periods=self.periods,
-            average=round(average, 2),
+            periods=periods,
+            average=round(total / periods, 2),
             peak=round(peak, 2)
         )
     
+    @staticmethod
+    def calculate_batch(target, periods, start, increment, cap):
+        """
+        Calcula muitas progressões com teto de uma vez (NumPy)
+        
+        Mesmo resultado de ProgressiveEngine(target, periods).calculate(...)
+        para cada posição, incluindo arredondamento, viabilidade e status.
+        
+        Args:
+            target: Array de valores alvo
+            periods: Array de números de períodos
+            start: Array de valores iniciais
+            increment: Array de incrementos
+            cap: Array de tetos
+        
+        Returns:
+            BatchResult com arrays de total, média, pico, viabilidade e status
+        """
+        from .batch import calculate_batch
+        
+        return calculate_batch(target, periods, start, increment, cap)
+    
     def optimize(self) -> ProgressionResult:
         """
         Calcula progressão otimizada para atingir exatamente o alvo
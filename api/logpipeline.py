@@ -0,0 +1,267 @@
+"""
+Pipeline de Logs Estruturados
+
+Quem loga só enfileira um registro compacto (O(1), sem I/O).
+Uma thread de fundo serializa em lote como JSON lines
+para stdout ou arquivo.
+
+Sob carga:
+- amostragem adaptativa dos registros amostráveis (requisições OK)
+  conforme a fila enche
+- fila cheia: registro descartado e contado, nunca bloqueia
+"""
+
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Optional, TextIO, Tuple
+import json
+import sys
+import threading
+import time
+
+from config import Settings, settings
+
+
+# (timestamp, evento, campos, taxa de amostragem)
+LogRecord = Tuple[float, str, Dict[str, Any], float]
+
+# Encoder reaproveitado: json.dumps com opções cria um por chamada
+_encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=str).encode
+
+
+class LogPipeline:
+    """
+    Logger assíncrono com fila limitada
+    
+    Uso:
+        pipeline = LogPipeline(sink="stdout")
+        pipeline.emit("request", {"path": "/health"}, sampled=True)
+        pipeline.close()  # flush no desligamento
+    """
+    
+    def __init__(
+        self,
+        sink: str = "stdout",
+        max_queue: int = 10_000,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        sample_high_water: float = 0.5,
+        min_sample_rate: float = 0.05,
+        autostart: bool = True
+    ):
+        """
+        Args:
+            sink: "stdout" ou caminho de arquivo (append)
+            max_queue: Registros pendentes antes de descartar
+            batch_size: Registros por escrita
+            flush_interval: Segundos máximos entre escritas
+            sample_high_water: Ocupação da fila (0-1) a partir da qual amostra
+            min_sample_rate: Menor fração mantida dos registros amostráveis
+            autostart: Inicia a thread de escrita no primeiro registro
+        """
+        self.sink = sink
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sample_high_water = sample_high_water
+        self.min_sample_rate = min_sample_rate
+        self.autostart = autostart
+        
+        self._queue: Deque[LogRecord] = deque()
+        self._wakeup = threading.Event()
+        self._write_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._stream: Optional[TextIO] = None
+        self._sample_credit = 0.0
+        
+        # Contadores
+        self.emitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.batches = 0
+        self.errors = 0
+    
+    @classmethod
+    def from_settings(cls, config: Settings) -> "LogPipeline":
+        """Cria pipeline a partir das configurações"""
+        return cls(
+            sink=config.log_sink,
+            max_queue=config.log_queue_size,
+            batch_size=config.log_batch_size,
+            flush_interval=config.log_flush_interval,
+            sample_high_water=config.log_sample_high_water,
+            min_sample_rate=config.log_min_sample_rate
+        )
+    
+    # ==================== PRODUTOR ====================
+    
+    def sample_rate(self, depth: Optional[int] = None) -> float:
+        """
+        Fração mantida dos registros amostráveis
+        
+        1.0 até a marca d'água; cai linearmente até min_sample_rate
+        com a fila cheia.
+        """
+        if depth is None:
+            depth = len(self._queue)
+        
+        fill = depth / self.max_queue
+        if fill <= self.sample_high_water:
+            return 1.0
+        
+        pressure = (fill - self.sample_high_water) / (1 - self.sample_high_water)
+        return max(self.min_sample_rate, 1.0 - pressure)
+    
+    def emit(self, event: str, fields: Dict[str, Any], sampled: bool = False) -> bool:
+        """
+        Enfileira um registro (não bloqueia, sem I/O)
+        
+        Args:
+            event: Tipo do registro (request, decision, ...)
+            fields: Campos do registro (sem valores sensíveis)
+            sampled: Se pode ser amostrado sob carga
+        
+        Returns:
+            True se enfileirado
+        """
+        self.emitted += 1
+        depth = len(self._queue)
+        
+        if depth >= self.max_queue:
+            self.dropped += 1
+            return False
+        
+        rate = 1.0
+        if sampled:
+            rate = self.sample_rate(depth)
+            if rate < 1.0:
+                # Amostragem determinística: acumula crédito até 1 registro
+                self._sample_credit += rate
+                if self._sample_credit < 1.0:
+                    self.sampled_out += 1
+                    return False
+                self._sample_credit -= 1.0
+        
+        self._queue.append((time.time(), event, fields, rate))
+        
+        if self._thread is None and self.autostart:
+            self.start()
+        elif depth + 1 >= self.batch_size:
+            self._wakeup.set()
+        
+        return True
+    
+    # ==================== ESCRITA ====================
+    
+    def start(self):
+        """Inicia a thread de escrita (idempotente)"""
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run,
+                name="log-pipeline",
+                daemon=True
+            )
+            self._thread.start()
+    
+    def _run(self):
+        while not self._stopping:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+    
+    def _open(self) -> TextIO:
+        if self.sink == "stdout":
+            # Resolvido a cada escrita: stdout pode ser trocado (testes, redirect)
+            return sys.stdout
+        if self._stream is None:
+            self._stream = open(self.sink, "a", encoding="utf-8")
+        return self._stream
+    
+    @staticmethod
+    def _serialize(record: LogRecord) -> str:
+        timestamp, event, fields, rate = record
+        entry = {
+            "timestamp": datetime.fromtimestamp(timestamp).isoformat(),
+            "event": event,
+            **fields
+        }
+        if rate < 1.0:
+            # Peso para reconstruir contagens a partir da amostra
+            entry["sample_rate"] = round(rate, 4)
+        return _encode(entry)
+    
+    def flush(self) -> int:
+        """
+        Escreve todos os registros pendentes
+        
+        Returns:
+            Quantidade escrita
+        """
+        written = 0
+        
+        with self._write_lock:
+            while self._queue:
+                batch = []
+                while self._queue and len(batch) < self.batch_size:
+                    batch.append(self._queue.popleft())
+                
+                try:
+                    stream = self._open()
+                    stream.write("".join(self._serialize(r) + "\n" for r in batch))
+                    stream.flush()
+                except (OSError, ValueError):
+                    # Destino indisponível: conta e segue, a API não para
+                    self.errors += 1
+                    self.dropped += len(batch)
+                    continue
+                
+                self.batches += 1
+                written += len(batch)
+        
+        self.written += written
+        return written
+    
+    def close(self, timeout: float = 5.0):
+        """
+        Para a thread e escreve o restante (chamar no shutdown)
+        
+        Pode ser reiniciado depois por start() ou pelo próximo emit().
+        """
+        with self._start_lock:
+            thread = self._thread
+            self._stopping = True
+            self._wakeup.set()
+            if thread is not None:
+                thread.join(timeout)
+            self._thread = None
+        
+        self.flush()
+        
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+    
+    def stats(self) -> Dict[str, Any]:
+        """Contadores do pipeline"""
+        return {
+            "sink": self.sink,
+            "emitted": self.emitted,
+            "written": self.written,
+            "dropped": self.dropped,
+            "sampled_out": self.sampled_out,
+            "batches": self.batches,
+            "errors": self.errors,
+            "queue_depth": len(self._queue),
+            "max_queue": self.max_queue,
+            "sample_rate": round(self.sample_rate(), 4)
+        }
+
+
+# Instância global
+log_pipeline = LogPipeline.from_settings(settings)
@@ -12,21 +12,37 @@ Responsabilidades:
 ✓ Nunca expor cálculos brutos
 """
 
-from fastapi import FastAPI, HTTPException, Request, status
-from fastapi.responses import JSONResponse
-from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ValidationError as PydanticValidationError
 from datetime import datetime
-from typing import Dict, Any
-
+from typing import Dict, Any, Callable, Iterator, List, Optional
+import asyncio
+import hmac
+import json
+
+from cache import ResponseCache, etag_matches
+from config import settings
+from logpipeline import log_pipeline
+from metrics import BEHAVIOR_REJECTIONS, CONTENT_TYPE, registry, stage_timer
+from middleware import (
+    SharedBodyRoute,
+    _behavior_rejection,
+    decision_logger,
+    install_governance_middleware,
+)
 from schemas import (
     GoalInput,
     ProgressiveProtocolInput,
+    BatchProtocolRequest,
     ProtocolRequest,
     ProtocolResponse,
     ProtocolStatus,
     ValidationError,
     HealthResponse
 )
+from startup import WarmupRequest, install_openapi_cache, startup_state, warm_up
 from engine import (
     ProgressiveEngine,
     generate_insight,
@@ -40,6 +56,29 @@ from engine import (
 
 # ==================== CONFIGURAÇÃO ====================
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Logs escritos em segundo plano; pendentes gravados ao encerrar
+    
+    Com STARTUP_WARMUP, o aquecimento roda em segundo plano:
+    /health responde de imediato, /ready só depois dele.
+    """
+    log_pipeline.start()
+    warmup = None
+    if settings.startup_warmup:
+        startup_state.ready = False
+        warmup = asyncio.create_task(warm_up(app, WARMUP_REQUESTS))
+    else:
+        startup_state.mark_ready()
+    
+    yield
+    
+    if warmup is not None:
+        warmup.cancel()
+    log_pipeline.close()
+
+
 app = FastAPI(
     title="Financial Protocol API",
     description=(
@@ -50,16 +89,59 @@ app = FastAPI(
     ),
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
-# CORS para permitir front-end
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Em produção, especificar domínios
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+# Rotas reaproveitam o corpo já parseado pela cadeia de governança
+app.router.route_class = SharedBodyRoute
+
+# Governança: log, security headers, CORS, rate limit, validação comportamental
+install_governance_middleware(app)
+
+# OpenAPI lido do arquivo pré-gerado (sem montar o schema no primeiro /docs)
+if settings.openapi_cache:
+    install_openapi_cache(app, settings.openapi_cache)
+
+# Aquecimento: uma requisição por caminho quente (passam pela cadeia
+# completa e aparecem nos logs com client "warmup")
+WARMUP_GOAL = {"target_amount": 1200, "periods": 12}
+WARMUP_PROTOCOL = {"start_value": 1, "increment": 5, "cap": 200}
+WARMUP_REQUESTS: List[WarmupRequest] = [
+    ("GET", "/health", None),
+    ("POST", "/api/v1/protocols/progressive", {"goal": WARMUP_GOAL, "protocol": WARMUP_PROTOCOL}),
+    ("POST", "/api/v1/protocols/optimized", WARMUP_GOAL),
+    ("POST", "/api/v1/protocols/compare", {"goal": WARMUP_GOAL, "protocol": WARMUP_PROTOCOL}),
+    ("GET", "/api/v1/protocols/info", None),
+    ("GET", app.openapi_url, None),
+]
+
+# Cache de respostas determinísticas (protocolos são funções puras da entrada)
+response_cache = ResponseCache(
+    max_entries=settings.response_cache_size,
+    ttl_seconds=settings.response_cache_ttl
+)
+
+# Métricas lidas na coleta do /metrics (sem custo por requisição)
+registry.callback(
+    "response_cache_hits_total", "Hits do cache de respostas",
+    lambda: response_cache.hits, kind="counter"
+)
+registry.callback(
+    "response_cache_misses_total", "Misses do cache de respostas",
+    lambda: response_cache.misses, kind="counter"
+)
+registry.callback(
+    "response_cache_hit_ratio", "Fração de hits do cache de respostas",
+    lambda: response_cache.stats()["hit_ratio"]
+)
+registry.callback(
+    "log_records_dropped_total", "Registros de log descartados (fila cheia ou erro de escrita)",
+    lambda: log_pipeline.dropped, kind="counter"
+)
+registry.callback(
+    "log_records_sampled_out_total", "Registros de log descartados pela amostragem adaptativa",
+    lambda: log_pipeline.sampled_out, kind="counter"
 )
 
 
@@ -114,6 +196,17 @@ async def health_check():
     )
 
 
+@app.get("/ready")
+async def readiness_check() -> JSONResponse:
+    """
+    Prontidão (readiness probe)
+    
+    503 enquanto o aquecimento (STARTUP_WARMUP) não termina.
+    """
+    code = status.HTTP_200_OK if startup_state.ready else status.HTTP_503_SERVICE_UNAVAILABLE
+    return JSONResponse(status_code=code, content=startup_state.to_dict())
+
+
 @app.post(
     "/api/v1/protocols/progressive",
     response_model=ProtocolResponse,
@@ -129,8 +222,9 @@ async def health_check():
 )
 async def create_progressive_protocol(
     goal: GoalInput,
-    protocol: ProgressiveProtocolInput
-) -> ProtocolResponse:
+    protocol: ProgressiveProtocolInput,
+    request: Request
+) -> Response:
     """
     Endpoint principal: Protocolo Progressivo
     
@@ -138,33 +232,47 @@ async def create_progressive_protocol(
     1. Validação (Pydantic automática)
     2. Cálculo (Engine)
     3. Interpretação (Insights)
-    4. Response estruturado
+    4. Response estruturado (cacheado por entrada)
     """
-    
-    # Inicializa engine
-    engine = ProgressiveEngine(
-        target=goal.target_amount,
-        periods=goal.periods
-    )
-    
-    # Calcula progressão
-    result = engine.calculate(
-        start=protocol.start_value,
-        increment=protocol.increment,
-        cap=protocol.cap
+    return _cached_response(
+        request,
+        ResponseCache.make_key("progressive", goal, protocol),
+        lambda: _render_json("progressive", lambda: _build_progressive_protocol(goal, protocol))
     )
+
+
+def _build_progressive_protocol(
+    goal: GoalInput,
+    protocol: ProgressiveProtocolInput
+) -> ProtocolResponse:
+    """Calcula e interpreta o protocolo progressivo"""
     
-    # Calcula viabilidade
-    viability = engine.calculate_viability(result.total)
+    with stage_timer("progressive", "engine"):
+        # Inicializa engine
+        engine = ProgressiveEngine(
+            target=goal.target_amount,
+            periods=goal.periods
+        )
+        
+        # Calcula progressão
+        result = engine.calculate(
+            start=protocol.start_value,
+            increment=protocol.increment,
+            cap=protocol.cap
+        )
+        
+        # Calcula viabilidade
+        viability = engine.calculate_viability(result.total)
     
-    # Gera insights
-    insight = generate_insight(result.total, goal.target_amount)
-    recommendation = generate_recommendation(
-        ratio=viability,
-        periods=goal.periods,
-        average=result.average
-    )
-    status_value = classify_status(viability)
+    with stage_timer("progressive", "insights"):
+        # Gera insights
+        insight = generate_insight(result.total, goal.target_amount)
+        recommendation = generate_recommendation(
+            ratio=viability,
+            periods=goal.periods,
+            average=result.average
+        )
+        status_value = classify_status(viability)
     
     # Monta response
     return ProtocolResponse(
@@ -198,33 +306,44 @@ async def create_progressive_protocol(
         "**Diferencial:** Resolve equação de PA para ajustar incrementos automaticamente."
     )
 )
-async def create_optimized_protocol(goal: GoalInput) -> ProtocolResponse:
+async def create_optimized_protocol(goal: GoalInput, request: Request) -> Response:
     """
     Endpoint: Protocolo Otimizado
     
     Calcula automaticamente os parâmetros ideais
     para atingir a meta exata.
     """
-    
-    # Inicializa engine
-    engine = ProgressiveEngine(
-        target=goal.target_amount,
-        periods=goal.periods
+    return _cached_response(
+        request,
+        ResponseCache.make_key("optimized", goal),
+        lambda: _render_json("optimized", lambda: _build_optimized_protocol(goal))
     )
+
+
+def _build_optimized_protocol(goal: GoalInput) -> ProtocolResponse:
+    """Calcula e interpreta o protocolo otimizado"""
     
-    # Calcula progressão otimizada
-    result = engine.optimize()
-    
-    # Calcula viabilidade (deve ser ~1.0)
-    viability = engine.calculate_viability(result.total)
-    
-    # Gera insights
-    insight = generate_insight(result.total, goal.target_amount)
-    recommendation = "Protocolo otimizado matematicamente. Siga a progressão sugerida."
-    status_value = "optimal"
+    with stage_timer("optimized", "engine"):
+        # Inicializa engine
+        engine = ProgressiveEngine(
+            target=goal.target_amount,
+            periods=goal.periods
+        )
+        
+        # Calcula progressão otimizada
+        result = engine.optimize()
+        
+        # Calcula viabilidade (deve ser ~1.0)
+        viability = engine.calculate_viability(result.total)
     
-    # Mensagem de maturidade
-    maturity_msg = generate_maturity_message(goal.periods)
+    with stage_timer("optimized", "insights"):
+        # Gera insights
+        insight = generate_insight(result.total, goal.target_amount)
+        recommendation = "Protocolo otimizado matematicamente. Siga a progressão sugerida."
+        status_value = "optimal"
+        
+        # Mensagem de maturidade
+        maturity_msg = generate_maturity_message(goal.periods)
     
     return ProtocolResponse(
         protocol_version="1.0",
@@ -256,34 +375,50 @@ async def create_optimized_protocol(goal: GoalInput) -> ProtocolResponse:
 )
 async def compare_protocols(
     goal: GoalInput,
-    protocol: ProgressiveProtocolInput
-) -> Dict[str, Any]:
+    protocol: ProgressiveProtocolInput,
+    request: Request
+) -> Response:
     """
     Compara protocolo manual vs otimizado
     
     Útil para mostrar ao usuário o potencial de otimização.
     """
-    
-    engine = ProgressiveEngine(
-        target=goal.target_amount,
-        periods=goal.periods
-    )
-    
-    # Calcula ambos
-    progressive = engine.calculate(
-        start=protocol.start_value,
-        increment=protocol.increment,
-        cap=protocol.cap
+    return _cached_response(
+        request,
+        ResponseCache.make_key("compare", goal, protocol),
+        lambda: _render_json("compare", lambda: _build_comparison(goal, protocol))
     )
+
+
+def _build_comparison(
+    goal: GoalInput,
+    protocol: ProgressiveProtocolInput
+) -> Dict[str, Any]:
+    """Calcula ambos os protocolos e gera insight comparativo"""
     
-    optimized = engine.optimize()
+    with stage_timer("compare", "engine"):
+        engine = ProgressiveEngine(
+            target=goal.target_amount,
+            periods=goal.periods
+        )
+        
+        # Calcula ambos
+        progressive = engine.calculate(
+            start=protocol.start_value,
+            increment=protocol.increment,
+            cap=protocol.cap
+        )
+        
+        optimized = engine.optimize()
     
-    # Gera insight comparativo
-    comparative = generate_comparative_insight(
-        progressive_total=progressive.total,
-        optimized_total=optimized.total,
-        target=goal.target_amount
-    )
+    with stage_timer("compare", "insights"):
+        # Gera insight comparativo
+        comparative = generate_comparative_insight(
+            progressive_total=progressive.total,
+            optimized_total=optimized.total,
+            target=goal.target_amount
+        )
+        progressive_status = classify_status(progressive.total / goal.target_amount)
     
     return {
         "protocol_version": "1.0",
@@ -291,7 +426,7 @@ async def compare_protocols(
             "progressive": {
                 "total": progressive.total,
                 "viability": round(progressive.total / goal.target_amount, 3),
-                "status": classify_status(progressive.total / goal.target_amount)
+                "status": progressive_status
             },
             "optimized": {
                 "total": optimized.total,
@@ -308,6 +443,235 @@ async def compare_protocols(
     }
 
 
+@app.post(
+    "/api/v1/protocols/batch",
+    summary="Processar Lote de Protocolos",
+    description=(
+        f"Processa até {settings.batch_max_items} protocolos progressivos numa requisição "
+        "(settings.batch_max_items; acima disso, 413).\n\n"
+        "**Retorno:** NDJSON em streaming, uma linha por item, na ordem de entrada. "
+        "Itens válidos seguem o formato de ProtocolResponse; "
+        "itens inválidos viram registro de rejeição sem derrubar o lote."
+    )
+)
+async def create_batch_protocols(batch: BatchProtocolRequest) -> StreamingResponse:
+    """
+    Endpoint: Lote de Protocolos Progressivos
+    
+    Processa em blocos pelo engine vetorizado.
+    Cada bloco é enviado assim que calculado: memória limitada
+    e primeiros resultados antes do fim do lote.
+    """
+    if len(batch.items) > settings.batch_max_items:
+        return JSONResponse(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            content=ValidationError(
+                decision="rejected",
+                reason=f"Lote com {len(batch.items)} itens excede o limite de {settings.batch_max_items}.",
+                field="items",
+                suggestion="Divida o lote em requisições menores."
+            ).model_dump(mode="json")
+        )
+    
+    return StreamingResponse(
+        _stream_batch(batch.items, settings.batch_chunk_size),
+        media_type="application/x-ndjson"
+    )
+
+
+def _stream_batch(items: List[Any], chunk_size: int) -> Iterator[bytes]:
+    """Gera o lote em blocos NDJSON"""
+    for offset in range(0, len(items), chunk_size):
+        chunk = items[offset:offset + chunk_size]
+        lines = _process_batch_chunk(chunk, offset)
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _process_batch_chunk(chunk: List[Any], offset: int) -> List[str]:
+    """
+    Valida, calcula e interpreta um bloco do lote
+    
+    Validação item a item (mesmas regras dos schemas e, se ligada,
+    a mesma validação comportamental que o middleware aplica aos
+    endpoints de item único), cálculo vetorizado, interpretação igual
+    ao endpoint progressivo.
+    """
+    lines: List[str] = [""] * len(chunk)
+    accepted: List[int] = []
+    requests: List[ProtocolRequest] = []
+    created_at = datetime.now().isoformat()
+    
+    for i, item in enumerate(chunk):
+        if not isinstance(item, dict):
+            lines[i] = json.dumps({
+                "index": offset + i,
+                **ValidationError(
+                    decision="rejected",
+                    reason="Item deve ser um objeto {goal, protocol}",
+                    suggestion="Revise os parâmetros do protocolo."
+                ).model_dump(mode="json")
+            }, ensure_ascii=False)
+            continue
+        
+        try:
+            request = ProtocolRequest.model_validate(item)
+        except PydanticValidationError as exc:
+            error = exc.errors()[0]
+            lines[i] = json.dumps({
+                "index": offset + i,
+                **ValidationError(
+                    decision="rejected",
+                    reason=error["msg"].removeprefix("Value error, "),
+                    field=".".join(str(loc) for loc in error["loc"]),
+                    suggestion="Revise os parâmetros do protocolo."
+                ).model_dump(mode="json")
+            }, ensure_ascii=False)
+            continue
+        
+        rejection = _behavior_rejection(item) if settings.middleware_behavior_validation else None
+        if rejection is not None:
+            decision_type, msg, suggestion = rejection
+            BEHAVIOR_REJECTIONS.labels(decision_type).inc()
+            decision_logger.log_decision(
+                decision_type=decision_type,
+                outcome="rejected",
+                reason=msg,
+                metadata={"endpoint": "/api/v1/protocols/batch", "index": offset + i}
+            )
+            lines[i] = json.dumps({
+                "index": offset + i,
+                **ValidationError(
+                    decision="rejected",
+                    reason=msg,
+                    suggestion=suggestion
+                ).model_dump(mode="json")
+            }, ensure_ascii=False)
+            continue
+        
+        requests.append(request)
+        accepted.append(i)
+    
+    if not requests:
+        return lines
+    
+    with stage_timer("batch", "engine"):
+        result = ProgressiveEngine.calculate_batch(
+            target=[r.goal.target_amount for r in requests],
+            periods=[r.goal.periods for r in requests],
+            start=[r.protocol.start_value for r in requests],
+            increment=[r.protocol.increment for r in requests],
+            cap=[r.protocol.cap for r in requests]
+        )
+        
+        totals = result.total.tolist()
+        averages = result.average.tolist()
+        peaks = result.peak.tolist()
+        viabilities = result.viability.tolist()
+    
+    with stage_timer("batch", "insights"):
+        payloads: List[Dict[str, Any]] = []
+        
+        for j, request in enumerate(requests):
+            goal = request.goal
+            viability = viabilities[j]
+            
+            payloads.append({
+                "index": offset + accepted[j],
+                "protocol_version": "1.0",
+                "protocol_type": "progressive",
+                "goal": {
+                    "target_amount": goal.target_amount,
+                    "periods": goal.periods
+                },
+                "result": {
+                    "total_accumulated": totals[j],
+                    "periods_completed": goal.periods,
+                    "average_per_period": averages[j],
+                    "peak_value": peaks[j]
+                },
+                "status": {
+                    "status": classify_status(viability),
+                    "viability": round(viability, 3),
+                    "insight": generate_insight(totals[j], goal.target_amount),
+                    "recommendation": generate_recommendation(
+                        ratio=viability,
+                        periods=goal.periods,
+                        average=averages[j]
+                    )
+                },
+                "created_at": created_at
+            })
+    
+    with stage_timer("batch", "serialization"):
+        for i, payload in zip(accepted, payloads):
+            lines[i] = json.dumps(payload, ensure_ascii=False)
+    
+    return lines
+
+
+def _render_json(route: str, build: Callable[[], Any]) -> bytes:
+    """Monta a resposta e serializa (serialização medida como estágio)"""
+    payload = build()
+    
+    with stage_timer(route, "serialization"):
+        if isinstance(payload, BaseModel):
+            return payload.model_dump_json().encode()
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _cached_response(
+    request: Request,
+    key: tuple,
+    render: Callable[[], bytes]
+) -> Response:
+    """
+    Responde a partir do cache de respostas
+    
+    ETag forte sobre os bytes; If-None-Match igual → 304 sem corpo.
+    """
+    entry = response_cache.get_or_compute(key, render)
+    headers = {"ETag": entry.etag}
+    
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return Response(
+        content=entry.body,
+        media_type="application/json",
+        headers=headers
+    )
+
+
+@app.get("/api/v1/cache/stats")
+async def cache_stats() -> Dict[str, Any]:
+    """
+    Estatísticas do cache de respostas
+    """
+    return {
+        "protocol_version": "1.0",
+        "response_cache": response_cache.stats()
+    }
+
+
+@app.get("/api/v1/logs/stats")
+async def log_stats() -> Dict[str, Any]:
+    """
+    Contadores do pipeline de logs (escritos, descartados, amostrados)
+    """
+    return {
+        "protocol_version": "1.0",
+        "log_pipeline": log_pipeline.stats()
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """
+    Métricas no formato Prometheus
+    """
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
+
+
 @app.get("/api/v1/protocols/info")
 async def protocol_info() -> Dict[str, Any]:
     """
@@ -337,35 +701,90 @@ async def protocol_info() -> Dict[str, Any]:
     }
 
 
-# ==================== LOGS E GOVERNANÇA ====================
+# ==================== ADMIN ====================
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """
+    Rotas admin exigem X-Admin-Token igual a settings.admin_token
+    
+    Sem token configurado, as rotas ficam desabilitadas.
+    """
+    if not settings.admin_token:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Rotas admin desabilitadas (ADMIN_TOKEN não configurado)."
+        )
+    
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Token admin inválido."
+        )
+
 
-@app.middleware("http")
-async def log_decisions(request: Request, call_next):
+@app.get("/api/v1/admin/decisions", dependencies=[Depends(require_admin)])
+async def admin_decisions(
+    decision_type: Optional[str] = None,
+    outcome: Optional[str] = "rejected",
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=1000)
+) -> Dict[str, Any]:
+    """
+    Decisões recentes (padrão: rejeições), mais recentes primeiro
+    
+    Consulta indexada por tipo/outcome e busca binária no intervalo
+    de tempo: não varre o buffer.
     """
-    Middleware para log de decisões (não de valores)
+    decisions = decision_logger.query(
+        decision_type=decision_type,
+        outcome=outcome or None,
+        since=since.timestamp() if since else None,
+        until=until.timestamp() if until else None,
+        limit=limit
+    )
     
-    Em produção, enviar para sistema de observabilidade.
+    return {
+        "protocol_version": "1.0",
+        "count": len(decisions),
+        "decisions": decisions,
+        "buffer": decision_logger.buffer.stats()
+    }
+
+
+@app.get("/api/v1/admin/profiles", dependencies=[Depends(require_admin)])
+async def admin_profiles(limit: int = Query(50, ge=1, le=1000)) -> Dict[str, Any]:
     """
-    start_time = datetime.now()
+    Perfis de requisição gravados, mais recentes primeiro
     
-    response = await call_next(request)
+    Gerados com PROFILING_ENABLED: header X-Profile (com X-Admin-Token)
+    ou amostragem (PROFILING_SAMPLE_RATE).
+    """
+    from profiling import request_profiler  # opcional: fora do import do app
     
-    duration = (datetime.now() - start_time).total_seconds()
+    profiles = request_profiler.recent(limit)
     
-    # Log estruturado (não contém valores sensíveis)
-    log_entry = {
-        "timestamp": start_time.isoformat(),
-        "method": request.method,
-        "path": request.url.path,
-        "status_code": response.status_code,
-        "duration_ms": round(duration * 1000, 2),
-        "decision": "processed" if response.status_code < 400 else "rejected"
+    return {
+        "protocol_version": "1.0",
+        "enabled": settings.profiling_enabled,
+        "mode": request_profiler.mode,
+        "sample_rate": request_profiler.sample_rate,
+        "count": len(profiles),
+        "profiles": profiles
     }
+
+
+@app.get("/api/v1/admin/profiles/{name}", dependencies=[Depends(require_admin)])
+async def admin_profile_file(name: str) -> FileResponse:
+    """Arquivo de um perfil (collapsed stacks ou JSON speedscope)"""
+    from profiling import request_profiler
     
-    # Em produção: enviar para CloudWatch, Datadog, etc.
-    print(f"[LOG] {log_entry}")
+    path = request_profiler.resolve(name)
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Perfil não encontrado.")
     
-    return response
+    media_type = "application/json" if name.endswith(".json") else "text/plain; charset=utf-8"
+    return FileResponse(path, media_type=media_type, filename=name)
 
 
 # ==================== STARTUP ====================
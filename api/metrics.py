@@ -0,0 +1,335 @@
+"""
+Métricas - Formato Prometheus
+
+Registro mínimo, sem dependência externa:
+contadores, histogramas (buckets fixos) e métricas calculadas
+na coleta (callbacks). Exposto em /metrics no formato texto 0.0.4.
+
+Custo no caminho da requisição: busca do filho por labels
+(dict) + bisect nos buckets + incremento sob lock.
+"""
+
+from bisect import bisect_left
+from typing import Callable, Dict, Iterator, Optional, Sequence, Tuple
+import math
+import threading
+import time
+
+
+# Latência HTTP (segundos)
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+
+# Estágios internos (engine, insights, serialização): microssegundos a ms
+STAGE_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.1
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+# ==================== MÉTRICAS ====================
+
+class _Metric:
+    """Base: nome, ajuda, labels e filhos por combinação de labels"""
+    
+    kind = "untyped"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        
+        # Sem labels: exposto com zero desde o início
+        if not self.labelnames:
+            self.labels()
+    
+    def _new_child(self):
+        raise NotImplementedError
+    
+    def labels(self, *values: str):
+        """Filho para a combinação de labels (criado na primeira vez)"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name}: esperado labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+    
+    def _samples(self) -> Iterator[str]:
+        raise NotImplementedError
+    
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}"
+        ]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+    
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+    
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    """Contador monotônico"""
+    
+    kind = "counter"
+    
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+    
+    def inc(self, amount: float = 1.0):
+        """Incrementa (métrica sem labels)"""
+        self.labels().inc(amount)
+    
+    def value(self, *labels: str) -> float:
+        child = self._children.get(labels)
+        return child.value if child else 0.0
+    
+    def _samples(self) -> Iterator[str]:
+        for values, child in list(self._children.items()):
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}{labels} {_format_value(child.value)}"
+
+
+class _Timer:
+    __slots__ = ("child", "started")
+    
+    def __init__(self, child: "_HistogramChild"):
+        self.child = child
+    
+    def __enter__(self) -> "_Timer":
+        self.started = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        self.child.observe(time.perf_counter() - self.started)
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count", "_lock")
+    
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # Contagem por bucket (não cumulativa); último = +Inf
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+    
+    def time(self) -> _Timer:
+        """Context manager que observa a duração do bloco"""
+        return _Timer(self)
+    
+    def quantile(self, q: float) -> float:
+        """
+        Quantil estimado por interpolação linear no bucket
+        
+        Mesma estimativa do histogram_quantile do Prometheus.
+        """
+        if not self.count:
+            return math.nan
+        
+        rank = q * self.count
+        cumulative = 0
+        lower = 0.0
+        
+        for upper, count in zip(self.buckets, self.counts):
+            if cumulative + count >= rank and count:
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+            lower = upper
+        
+        return self.buckets[-1]
+
+
+class Histogram(_Metric):
+    """Histograma com buckets fixos"""
+    
+    kind = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+    
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+    
+    def observe(self, value: float):
+        """Observa (métrica sem labels)"""
+        self.labels().observe(value)
+    
+    def _samples(self) -> Iterator[str]:
+        bucket_names = self.labelnames + ("le",)
+        
+        for values, child in list(self._children.items()):
+            with child._lock:
+                counts = list(child.counts)
+                total, count = child.sum, child.count
+            
+            cumulative = 0
+            for upper, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                labels = _format_labels(bucket_names, values + (_format_value(upper),))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+class CallbackMetric:
+    """
+    Valor lido na coleta (sem custo no caminho da requisição)
+    
+    Para estado que já existe em outro lugar: cache, fila de logs.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], float],
+        kind: str = "gauge"
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.kind = kind
+    
+    def render(self) -> str:
+        return "\n".join([
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            f"{self.name} {_format_value(self.callback())}"
+        ])
+
+
+# ==================== REGISTRO ====================
+
+class MetricsRegistry:
+    """Conjunto de métricas expostas em /metrics"""
+    
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+    
+    def register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Métrica duplicada: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+    
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+    
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+    
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], float],
+        kind: str = "gauge"
+    ) -> CallbackMetric:
+        return self.register(CallbackMetric(name, documentation, callback, kind))
+    
+    def get(self, name: str) -> Optional[object]:
+        return self._metrics.get(name)
+    
+    def render(self) -> str:
+        """Exposição no formato texto do Prometheus"""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+# Instância global
+registry = MetricsRegistry()
+
+REQUEST_LATENCY = registry.histogram(
+    "http_request_duration_seconds",
+    "Latência das requisições HTTP por rota",
+    ["route", "method"]
+)
+
+REQUESTS_TOTAL = registry.counter(
+    "http_requests_total",
+    "Requisições HTTP por rota e status",
+    ["route", "method", "status"]
+)
+
+STAGE_LATENCY = registry.histogram(
+    "protocol_stage_duration_seconds",
+    "Duração dos estágios do protocolo (engine, insights, serialization)",
+    ["route", "stage"],
+    buckets=STAGE_BUCKETS
+)
+
+RATE_LIMIT_REJECTIONS = registry.counter(
+    "rate_limit_rejections_total",
+    "Requisições rejeitadas pelo rate limit"
+)
+
+BEHAVIOR_REJECTIONS = registry.counter(
+    "behavior_rejections_total",
+    "Requisições rejeitadas pela validação comportamental",
+    ["decision_type"]
+)
+
+
+def stage_timer(route: str, stage: str) -> _Timer:
+    """Mede um estágio do protocolo: with stage_timer("compare", "engine"): ..."""
+    return STAGE_LATENCY.labels(route, stage).time()
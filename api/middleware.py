@@ -5,84 +5,108 @@ Rate limiting, validação de comportamento, proteção do usuário.
 Nível startup: simples, mas eficaz.
 """
 
-from fastapi import Request, HTTPException, status
+from fastapi import FastAPI, Request, Response, status
+from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from datetime import datetime, timedelta
-from typing import Dict, Optional
-from collections import defaultdict
+from fastapi.routing import APIRoute
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import json
 import time
 
+import anyio
+
+from config import Settings, settings
+from decisionlog import DecisionRingBuffer
+from logpipeline import LogPipeline, log_pipeline
+from metrics import (
+    BEHAVIOR_REJECTIONS,
+    RATE_LIMIT_REJECTIONS,
+    REQUEST_LATENCY,
+    REQUESTS_TOTAL,
+)
+from ratelimit import (
+    MemoryRateLimitBackend,
+    RateLimitBackend,
+    RedisRateLimitBackend,
+)
+from resp import RespError
+
 
 # ==================== RATE LIMITING ====================
 
 class RateLimiter:
     """
-    Rate Limiter simples em memória
+    Rate Limiter - janela deslizante
     
-    Em produção: usar Redis + distributed rate limiting
+    O armazenamento é um backend plugável:
+    - memória (padrão): por processo, O(1), ociosos removidos
+    - Redis (settings.redis_url): compartilhado entre workers
     """
     
     def __init__(
         self, 
         requests_per_minute: int = 60,
-        requests_per_hour: int = 1000
+        requests_per_hour: int = 1000,
+        backend: Optional[RateLimitBackend] = None,
+        clock: Callable[[], float] = time.time
     ):
+        """
+        Args:
+            requests_per_minute: Limite por minuto
+            requests_per_hour: Limite por hora
+            backend: Armazenamento dos contadores (padrão: memória)
+            clock: Fonte de tempo em segundos (relógio de parede:
+                janelas alinhadas entre processos)
+        """
         self.rpm = requests_per_minute
         self.rph = requests_per_hour
+        self.backend = backend or MemoryRateLimitBackend()
+        self.clock = clock
         
-        # Storage em memória (trocar por Redis em produção)
-        self.minute_requests: Dict[str, list] = defaultdict(list)
-        self.hour_requests: Dict[str, list] = defaultdict(list)
+        self.limits = ((60, self.rpm), (3600, self.rph))
+        self.messages = (
+            f"Limite de {self.rpm} requisições por minuto excedido.",
+            f"Limite de {self.rph} requisições por hora excedido.",
+        )
     
-    def _clean_old_requests(self, client_id: str):
-        """Remove requisições antigas"""
-        now = time.time()
-        minute_ago = now - 60
-        hour_ago = now - 3600
-        
-        # Limpa minuto
-        self.minute_requests[client_id] = [
-            ts for ts in self.minute_requests[client_id] 
-            if ts > minute_ago
-        ]
-        
-        # Limpa hora
-        self.hour_requests[client_id] = [
-            ts for ts in self.hour_requests[client_id] 
-            if ts > hour_ago
-        ]
+    def sweep(self) -> int:
+        """Remove clientes ociosos. Retorna quantos saíram."""
+        return self.backend.sweep(self.clock())
     
     def check_limit(self, client_id: str) -> tuple[bool, Optional[str]]:
         """
         Verifica se cliente está dentro do limite
         
+        Backend indisponível não derruba a API: a requisição passa.
+        
         Returns:
             (allowed, error_message)
         """
-        self._clean_old_requests(client_id)
-        
-        # Verifica minuto
-        minute_count = len(self.minute_requests[client_id])
-        if minute_count >= self.rpm:
-            return False, f"Limite de {self.rpm} requisições por minuto excedido."
+        try:
+            exceeded = self.backend.hit(client_id, self.clock(), self.limits)
+        except (OSError, RespError):
+            return True, None
         
-        # Verifica hora
-        hour_count = len(self.hour_requests[client_id])
-        if hour_count >= self.rph:
-            return False, f"Limite de {self.rph} requisições por hora excedido."
-        
-        # Registra requisição
-        now = time.time()
-        self.minute_requests[client_id].append(now)
-        self.hour_requests[client_id].append(now)
+        if exceeded is not None:
+            return False, self.messages[exceeded]
         
         return True, None
 
 
+def create_rate_limit_backend(redis_url: Optional[str]) -> RateLimitBackend:
+    """Backend Redis se configurado, senão memória"""
+    if redis_url:
+        return RedisRateLimitBackend.from_url(redis_url)
+    return MemoryRateLimitBackend()
+
+
 # Instância global (em produção, usar dependency injection)
 rate_limiter = RateLimiter(
-    requests_per_minute=60,
-    requests_per_hour=1000
+    requests_per_minute=settings.rate_limit_per_minute,
+    requests_per_hour=settings.rate_limit_per_hour,
+    backend=create_rate_limit_backend(settings.redis_url)
 )
 
 
@@ -162,10 +186,21 @@ class DecisionLogger:
     Log estruturado de decisões
     
     NÃO loga valores. Loga DECISÕES.
+    Escrita fora do event loop, pelo pipeline de logs.
     """
     
-    def __init__(self):
-        self.logs = []
+    def __init__(
+        self,
+        pipeline: Optional[LogPipeline] = None,
+        capacity: int = 10_000
+    ):
+        """
+        Args:
+            pipeline: Destino dos logs (padrão: pipeline global)
+            capacity: Decisões mantidas em memória para consulta
+        """
+        self.buffer = DecisionRingBuffer(capacity=capacity)
+        self.pipeline = pipeline or log_pipeline
     
     def log_decision(
         self,
@@ -183,41 +218,130 @@ class DecisionLogger:
             reason: Motivo da decisão
             metadata: Dados adicionais (sem informações sensíveis)
         """
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
+        self.buffer.append(decision_type, outcome, reason, metadata)
+        
+        # Decisões nunca são amostradas
+        self.pipeline.emit("decision", {
             "decision_type": decision_type,
             "outcome": outcome,
             "reason": reason,
             "metadata": metadata or {}
-        }
-        
-        self.logs.append(log_entry)
-        
-        # Em produção: enviar para CloudWatch, Datadog, etc.
-        print(f"[DECISION] {log_entry}")
+        })
     
     def get_recent_logs(self, limit: int = 100) -> list:
         """Retorna logs recentes"""
-        return self.logs[-limit:]
+        return self.buffer.recent(limit)
+    
+    def query(self, **filters) -> list:
+        """Consulta indexada (ver DecisionRingBuffer.query)"""
+        return self.buffer.query(**filters)
+
 
+decision_logger = DecisionLogger(capacity=settings.decision_log_capacity)
 
-decision_logger = DecisionLogger()
 
+# ==================== CORPO COMPARTILHADO ====================
 
-# ==================== MIDDLEWARE ====================
+# Chave no scope ASGI: (bytes do corpo, JSON já parseado)
+PARSED_BODY_KEY = "governance.parsed_body"
 
-async def rate_limit_middleware(request: Request, call_next):
+
+class SharedBodyRequest(Request):
     """
-    Middleware de rate limiting
+    Request que reaproveita o corpo já parseado pelo middleware
+    
+    O FastAPI chama body() e json() para montar os parâmetros:
+    aqui os dois saem do scope, sem segundo parse.
+    """
+    
+    async def body(self) -> bytes:
+        shared = self.scope.get(PARSED_BODY_KEY)
+        if shared is not None:
+            return shared[0]
+        return await super().body()
+    
+    async def json(self) -> Any:
+        shared = self.scope.get(PARSED_BODY_KEY)
+        if shared is not None:
+            return shared[1]
+        return await super().json()
+
+
+class SharedBodyRoute(APIRoute):
+    """Rota que entrega SharedBodyRequest ao endpoint"""
+    
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        
+        async def shared_body_handler(request: Request) -> Response:
+            return await handler(SharedBodyRequest(request.scope, request.receive))
+        
+        return shared_body_handler
+
+
+async def _read_body(receive: Receive) -> bytes:
+    """Lê o corpo completo da requisição"""
+    chunks = []
+    more_body = True
+    
+    while more_body:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        more_body = message.get("more_body", False)
+    
+    return b"".join(chunks)
+
+
+def _replay_body(body: bytes, receive: Receive) -> Receive:
+    """Receive que entrega o corpo já lido e depois delega (disconnect)"""
+    sent = False
+    
+    async def replay() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+    
+    return replay
+
+
+def _client_id(scope: Scope) -> str:
+    """Identifica cliente (em produção, usar auth token)"""
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+# ==================== MIDDLEWARE (ASGI PURO) ====================
+
+class RateLimitMiddleware:
     """
+    Middleware de rate limiting
     
-    # Identifica cliente (em produção, usar auth token)
-    client_id = request.client.host if request.client else "unknown"
+    Backends bloqueantes (Redis) rodam fora do event loop.
+    """
     
-    # Verifica limite
-    allowed, error_msg = rate_limiter.check_limit(client_id)
+    def __init__(self, app: ASGIApp, limiter: Optional[RateLimiter] = None):
+        self.app = app
+        self.limiter = limiter or rate_limiter
     
-    if not allowed:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        
+        client_id = _client_id(scope)
+        
+        if self.limiter.backend.blocking:
+            allowed, error_msg = await anyio.to_thread.run_sync(
+                self.limiter.check_limit, client_id
+            )
+        else:
+            allowed, error_msg = self.limiter.check_limit(client_id)
+        
+        if allowed:
+            return await self.app(scope, receive, send)
+        
+        RATE_LIMIT_REJECTIONS.inc()
         decision_logger.log_decision(
             decision_type="rate_limit",
             outcome="rejected",
@@ -225,7 +349,7 @@ async def rate_limit_middleware(request: Request, call_next):
             metadata={"client_id": client_id}
         )
         
-        return JSONResponse(
+        response = JSONResponse(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             content={
                 "protocol_version": "1.0",
@@ -234,103 +358,280 @@ async def rate_limit_middleware(request: Request, call_next):
                 "suggestion": "Aguarde antes de fazer nova requisição."
             }
         )
+        await response(scope, receive, send)
+
+
+def _behavior_rejection(body: Dict[str, Any]) -> Optional[Tuple[str, str, str]]:
+    """
+    Aplica BehaviorValidator ao corpo parseado
+    
+    Returns:
+        (decision_type, motivo, sugestão) ou None se aprovado
+    """
+    goal = body.get("goal", {})
+    
+    # Valida goal se presente
+    if "goal" in body:
+        valid, msg = behavior_validator.validate_goal_sanity(
+            target=goal.get("target_amount", 0),
+            periods=goal.get("periods", 0)
+        )
+        if not valid:
+            return (
+                "behavior_validation",
+                msg,
+                "Ajuste os parâmetros para valores educacionais."
+            )
+    
+    # Valida protocol se presente
+    if "protocol" in body:
+        protocol = body["protocol"]
+        valid, msg = behavior_validator.validate_protocol_safety(
+            start=protocol.get("start_value", 1),
+            increment=protocol.get("increment", 1),
+            cap=protocol.get("cap", 500),
+            periods=goal.get("periods", 12)
+        )
+        if not valid:
+            return (
+                "protocol_validation",
+                msg,
+                "Revise os parâmetros de progressão."
+            )
     
-    response = await call_next(request)
-    return response
+    return None
 
 
-async def validation_middleware(request: Request, call_next):
+class BehaviorValidationMiddleware:
     """
     Middleware de validação comportamental
     
-    Valida padrões antes de processar
+    Lê e parseia o corpo uma única vez. O resultado fica no scope
+    (PARSED_BODY_KEY) e o endpoint reaproveita via SharedBodyRoute.
     """
     
-    # Só valida endpoints de protocolo
-    if "/protocols/" not in request.url.path:
-        return await call_next(request)
-    
-    try:
-        # Parse body (se houver)
-        if request.method == "POST":
-            body = await request.json()
-            
-            # Valida goal se presente
-            if "goal" in body:
-                goal = body["goal"]
-                valid, msg = behavior_validator.validate_goal_sanity(
-                    target=goal.get("target_amount", 0),
-                    periods=goal.get("periods", 0)
-                )
-                
-                if not valid:
-                    decision_logger.log_decision(
-                        decision_type="behavior_validation",
-                        outcome="rejected",
-                        reason=msg,
-                        metadata={"endpoint": request.url.path}
-                    )
-                    
-                    return JSONResponse(
-                        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                        content={
-                            "protocol_version": "1.0",
-                            "decision": "rejected",
-                            "reason": msg,
-                            "suggestion": "Ajuste os parâmetros para valores educacionais."
-                        }
-                    )
-            
-            # Valida protocol se presente
-            if "protocol" in body:
-                protocol = body["protocol"]
-                goal = body.get("goal", {})
-                
-                valid, msg = behavior_validator.validate_protocol_safety(
-                    start=protocol.get("start_value", 1),
-                    increment=protocol.get("increment", 1),
-                    cap=protocol.get("cap", 500),
-                    periods=goal.get("periods", 12)
-                )
-                
-                if not valid:
-                    decision_logger.log_decision(
-                        decision_type="protocol_validation",
-                        outcome="rejected",
-                        reason=msg,
-                        metadata={"endpoint": request.url.path}
-                    )
-                    
-                    return JSONResponse(
-                        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                        content={
-                            "protocol_version": "1.0",
-                            "decision": "rejected",
-                            "reason": msg,
-                            "suggestion": "Revise os parâmetros de progressão."
-                        }
-                    )
-    
-    except Exception as e:
-        # Se erro no parse, deixa o FastAPI validar
-        pass
-    
-    response = await call_next(request)
-    return response
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        # Só valida POST em endpoints de protocolo
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or "/protocols/" not in scope["path"]
+        ):
+            return await self.app(scope, receive, send)
+        
+        body = await _read_body(receive)
+        receive = _replay_body(body, receive)
+        
+        try:
+            parsed = json.loads(body)
+        except ValueError:
+            # Se erro no parse, deixa o FastAPI validar
+            return await self.app(scope, receive, send)
+        
+        scope = {**scope, PARSED_BODY_KEY: (body, parsed)}
+        
+        try:
+            rejection = _behavior_rejection(parsed) if isinstance(parsed, dict) else None
+        except (AttributeError, TypeError):
+            # Estrutura inesperada: o schema rejeita com mensagem própria
+            rejection = None
+        
+        if rejection is None:
+            return await self.app(scope, receive, send)
+        
+        decision_type, msg, suggestion = rejection
+        BEHAVIOR_REJECTIONS.labels(decision_type).inc()
+        decision_logger.log_decision(
+            decision_type=decision_type,
+            outcome="rejected",
+            reason=msg,
+            metadata={"endpoint": scope["path"]}
+        )
+        
+        response = JSONResponse(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            content={
+                "protocol_version": "1.0",
+                "decision": "rejected",
+                "reason": msg,
+                "suggestion": suggestion
+            }
+        )
+        await response(scope, receive, send)
 
 
 # ==================== SECURITY HEADERS ====================
 
-async def security_headers_middleware(request: Request, call_next):
+SECURITY_HEADERS = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+]
+
+
+class SecurityHeadersMiddleware:
     """
     Adiciona headers de segurança
     """
-    response = await call_next(request)
     
-    # Security headers
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", []), *SECURITY_HEADERS]
+                }
+            await send(message)
+        
+        await self.app(scope, receive, send_with_headers)
+
+
+# ==================== LOG DE REQUISIÇÕES ====================
+
+class DecisionLogMiddleware:
+    """
+    Log de decisões por requisição (não de valores)
+    
+    Só enfileira no pipeline de logs: sem I/O no event loop.
+    Requisições aceitas podem ser amostradas sob carga; rejeições não.
+    """
+    
+    def __init__(self, app: ASGIApp, pipeline: Optional[LogPipeline] = None):
+        self.app = app
+        self.pipeline = pipeline or log_pipeline
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        
+        started = time.perf_counter()
+        status_code = 500
+        
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Log estruturado (não contém valores sensíveis)
+            processed = status_code < 400
+            self.pipeline.emit("request", {
+                "method": scope["method"],
+                "path": scope["path"],
+                "status_code": status_code,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                "decision": "processed" if processed else "rejected"
+            }, sampled=processed)
+
+
+# ==================== MÉTRICAS ====================
+
+class MetricsMiddleware:
+    """
+    Latência e contagem por rota (template, não caminho cru)
+    
+    Mais externo da cadeia: a latência inclui a governança.
+    Label da rota resolvido uma vez por caminho e guardado.
+    """
+    
+    # Limite de caminhos memorizados (caminhos com parâmetros variam)
+    MAX_CACHED_PATHS = 1024
+    
+    def __init__(self, app: ASGIApp, routes: List[BaseRoute]):
+        self.app = app
+        self.routes = routes
+        self._labels: Dict[str, str] = {}
+    
+    def _route_label(self, scope: Scope) -> str:
+        path = scope["path"]
+        label = self._labels.get(path)
+        if label is not None:
+            return label
+        
+        label = "unmatched"
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            # PARTIAL: caminho certo, método errado (405) — mesma rota
+            if match != Match.NONE:
+                label = getattr(route, "path", path)
+                break
+        
+        if len(self._labels) < self.MAX_CACHED_PATHS:
+            self._labels[path] = label
+        return label
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        
+        started = time.perf_counter()
+        status_code = 500
+        
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = self._route_label(scope)
+            method = scope["method"]
+            REQUEST_LATENCY.labels(route, method).observe(time.perf_counter() - started)
+            REQUESTS_TOTAL.labels(route, method, str(status_code)).inc()
+
+
+# ==================== CADEIA ====================
+
+def install_governance_middleware(app: FastAPI, config: Settings = settings):
+    """
+    Monta a cadeia de middleware conforme a configuração
+    
+    Ordem (externo → interno):
+    profiling → métricas → log → security headers → CORS → rate limit → validação → endpoint
+    
+    Profiling só entra com config.profiling_enabled.
+    
+    O endpoint recebe o corpo já parseado se as rotas usarem SharedBodyRoute.
+    """
+    # add_middleware empilha: o último adicionado é o mais externo
+    if config.middleware_behavior_validation:
+        app.add_middleware(BehaviorValidationMiddleware)
+    
+    if config.middleware_rate_limit:
+        app.add_middleware(RateLimitMiddleware)
+    
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=config.cors_origins,  # Em produção, especificar domínios
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    
+    if config.middleware_security_headers:
+        app.add_middleware(SecurityHeadersMiddleware)
+    
+    if config.middleware_decision_log:
+        app.add_middleware(DecisionLogMiddleware)
+    
+    if config.middleware_metrics:
+        app.add_middleware(MetricsMiddleware, routes=app.router.routes)
     
-    return response
+    if config.profiling_enabled:
+        from profiling import ProfilingMiddleware  # opcional: importado só quando ligado
+        app.add_middleware(ProfilingMiddleware)
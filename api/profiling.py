@@ -0,0 +1,441 @@
+"""
+Profiling por Requisição (opt-in)
+
+Uma requisição por vez é perfilada, escolhida por:
+- header X-Profile com X-Admin-Token válido (sob demanda)
+- amostragem aleatória (settings.profiling_sample_rate)
+
+Modos, sem dependência externa:
+- "sampling": thread de fundo lê a pilha da thread do event loop a
+  cada intervalo (sys._current_frames); custo baixo, estatístico
+- "deterministic": sys.setprofile conta o tempo de cada chamada
+  (exato, mas deixa a requisição várias vezes mais lenta)
+
+Pilhas agregadas em microssegundos, gravadas em
+settings.profiling_dir como collapsed stacks (flamegraph.pl,
+speedscope) ou JSON speedscope. Os arquivos mais antigos saem
+além de profiling_max_files.
+
+Desligado (padrão), o middleware nem entra na cadeia: custo zero.
+Durante o perfil, outras requisições do mesmo event loop aparecem
+nas pilhas (mesma thread).
+
+Só a thread do event loop é observada, nos dois modos: código que
+roda no threadpool (endpoints e dependências síncronos,
+anyio.to_thread, iteradores síncronos de StreamingResponse como o
+de /api/v1/protocols/batch) não aparece. Nesses casos o perfil mostra
+o event loop esperando a thread, não o trabalho feito nela.
+"""
+
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+import hmac
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+
+import anyio
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import Settings, settings
+
+
+MODES = ("sampling", "deterministic")
+FORMATS = ("collapsed", "speedscope")
+
+EXTENSIONS = {"collapsed": ".collapsed.txt", "speedscope": ".speedscope.json"}
+
+# Nomes gerados por RequestProfiler.new_name (evita path traversal no download)
+PROFILE_NAME = re.compile(r"^[0-9]{8}T[0-9]{6}-[0-9a-f]{6}-[A-Za-z0-9_.-]+\.(collapsed\.txt|speedscope\.json)$")
+
+# Pilha (raiz → folha) → microssegundos
+Stacks = Counter
+
+_LABELS: Dict[Any, str] = {}
+
+
+def _label(code) -> str:
+    """Nome do frame: função (arquivo:linha), memorizado por code object"""
+    label = _LABELS.get(code)
+    if label is None:
+        name = getattr(code, "co_qualname", code.co_name)
+        label = _LABELS[code] = f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return label
+
+
+# ==================== COLETORES ====================
+
+class StackSampler:
+    """
+    Amostrador de pilha de uma thread
+    
+    Cada amostra pesa o tempo desde a anterior (intervalos irregulares
+    sob carga continuam proporcionais).
+    """
+    
+    def __init__(self, thread_id: int, interval: float = 0.001):
+        """
+        Args:
+            thread_id: threading.get_ident() da thread observada
+            interval: Segundos entre amostras
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+    
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is None:
+                break
+            
+            stack = []
+            while frame is not None:
+                stack.append(_label(frame.f_code))
+                frame = frame.f_back
+            stack.reverse()
+            
+            self.stacks[tuple(stack)] += int((now - last) * 1_000_000)
+            self.samples += 1
+            last = now
+    
+    def start(self):
+        self._thread.start()
+    
+    def stop(self) -> Stacks:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+
+class TracingProfiler:
+    """
+    Profiler determinístico da thread atual (sys.setprofile)
+    
+    Tempo próprio de cada chamada atribuído à pilha completa.
+    Coroutines suspensas saem da pilha (evento return) e voltam ao
+    retomar, como chamadas novas.
+    """
+    
+    def __init__(self):
+        self.stacks: Stacks = Counter()
+        self.samples = 0
+        # [início, tempo dos filhos] em paralelo aos rótulos da pilha
+        self._frames: List[List[float]] = []
+        self._labels: List[str] = []
+    
+    def _callback(self, frame, event: str, arg):
+        now = time.perf_counter()
+        if event == "call" or event == "c_call":
+            label = _label(frame.f_code) if event == "call" else f"{getattr(arg, '__qualname__', repr(arg))} (builtin)"
+            self._frames.append([now, 0.0])
+            self._labels.append(label)
+            return
+        
+        # return / c_return / c_exception sem call visto: anterior ao start()
+        if not self._frames:
+            return
+        
+        started, children = self._frames.pop()
+        elapsed = now - started
+        # Microssegundos fracionários: truncar cada chamada curta somaria erro
+        self.stacks[tuple(self._labels)] += (elapsed - children) * 1_000_000
+        self.samples += 1
+        self._labels.pop()
+        if self._frames:
+            self._frames[-1][1] += elapsed
+    
+    def start(self):
+        sys.setprofile(self._callback)
+    
+    def stop(self) -> Stacks:
+        sys.setprofile(None)
+        self.stacks = Counter({stack: round(weight) for stack, weight in self.stacks.items()})
+        return self.stacks
+
+
+# ==================== FORMATOS ====================
+
+def to_collapsed(stacks: Stacks) -> str:
+    """Uma linha por pilha: 'raiz;...;folha microssegundos'"""
+    lines = [f"{';'.join(stack)} {weight}" for stack, weight in stacks.items() if stack and weight > 0]
+    return "\n".join(sorted(lines)) + "\n"
+
+
+def to_speedscope(stacks: Stacks, name: str) -> Dict[str, Any]:
+    """Perfil 'sampled' do speedscope (pesos em microssegundos)"""
+    frames: Dict[str, int] = {}
+    samples = []
+    weights = []
+    for stack, weight in stacks.items():
+        if not stack or weight <= 0:
+            continue
+        samples.append([frames.setdefault(label, len(frames)) for label in stack])
+        weights.append(weight)
+    
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": [{"name": label} for label in frames]},
+        "profiles": [{
+            "type": "sampled",
+            "name": name,
+            "unit": "microseconds",
+            "startValue": 0,
+            "endValue": sum(weights),
+            "samples": samples,
+            "weights": weights,
+        }],
+        "name": name,
+        "exporter": "financial-protocol-api",
+    }
+
+
+# ==================== PROFILER ====================
+
+class RequestProfiler:
+    """
+    Perfis de requisições gravados em disco
+    
+    Uso:
+        profiler = RequestProfiler("profiles", mode="sampling")
+        collector = profiler.begin()  # None se já há um perfil em curso
+        ...
+        stacks = profiler.end(collector)
+        profiler.save(stacks, "POST", "/api/v1/protocols/progressive", 200, 0.012)
+    """
+    
+    def __init__(
+        self,
+        directory: Union[str, Path] = "profiles",
+        mode: str = "sampling",
+        output_format: str = "collapsed",
+        interval: float = 0.001,
+        max_files: int = 100,
+        sample_rate: float = 0.0
+    ):
+        """
+        Args:
+            directory: Onde gravar os perfis (criado na primeira gravação)
+            mode: "sampling" ou "deterministic"
+            output_format: "collapsed" ou "speedscope"
+            interval: Segundos entre amostras (modo "sampling")
+            max_files: Perfis mantidos (os mais antigos são apagados)
+            sample_rate: Fração das requisições perfiladas sem header (0-1)
+        """
+        if mode not in MODES:
+            raise ValueError(f"Modo inválido: {mode!r} (esperado {', '.join(MODES)})")
+        if output_format not in FORMATS:
+            raise ValueError(f"Formato inválido: {output_format!r} (esperado {', '.join(FORMATS)})")
+        
+        self.directory = Path(directory)
+        self.mode = mode
+        self.output_format = output_format
+        self.interval = interval
+        self.max_files = max_files
+        self.sample_rate = sample_rate
+        self._active = threading.Lock()
+    
+    @classmethod
+    def from_settings(cls, config: Settings = settings) -> "RequestProfiler":
+        return cls(
+            directory=config.profiling_dir,
+            mode=config.profiling_mode,
+            output_format=config.profiling_format,
+            interval=config.profiling_interval,
+            max_files=config.profiling_max_files,
+            sample_rate=config.profiling_sample_rate
+        )
+    
+    def begin(self) -> Optional[Union[StackSampler, TracingProfiler]]:
+        """Inicia um perfil na thread atual (None se outro está em curso)"""
+        if not self._active.acquire(blocking=False):
+            return None
+        
+        if self.mode == "sampling":
+            collector = StackSampler(threading.get_ident(), self.interval)
+        else:
+            collector = TracingProfiler()
+        collector.start()
+        return collector
+    
+    def end(self, collector: Union[StackSampler, TracingProfiler]) -> Stacks:
+        """Para o coletor e libera o próximo perfil"""
+        try:
+            return collector.stop()
+        finally:
+            self._active.release()
+    
+    def new_name(self, method: str, path: str) -> str:
+        """Nome do arquivo: AAAAMMDDTHHMMSS-id-MÉTODO-caminho.extensão"""
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_")[:60] or "root"
+        return f"{datetime.now():%Y%m%dT%H%M%S}-{os.urandom(3).hex()}-{method}-{slug}{EXTENSIONS[self.output_format]}"
+    
+    def save(
+        self,
+        stacks: Stacks,
+        method: str,
+        path: str,
+        status_code: int,
+        duration: float,
+        name: Optional[str] = None
+    ) -> Path:
+        """
+        Grava o perfil e apaga os excedentes
+        
+        Args:
+            stacks: Pilhas agregadas (end())
+            method, path, status_code, duration: Descrição da requisição
+            name: Nome do arquivo (padrão: new_name())
+        
+        Returns:
+            Caminho do arquivo
+        """
+        title = f"{method} {path} → {status_code} em {duration * 1000:.1f} ms ({self.mode})"
+        
+        self.directory.mkdir(parents=True, exist_ok=True)
+        target = self.directory / (name or self.new_name(method, path))
+        if self.output_format == "collapsed":
+            content = f"# {title}\n" + to_collapsed(stacks)
+        else:
+            content = json.dumps(to_speedscope(stacks, title), ensure_ascii=False)
+        
+        tmp = target.with_name(target.name + ".tmp")
+        tmp.write_text(content, encoding="utf-8")
+        os.replace(tmp, target)
+        
+        self.prune()
+        return target
+    
+    def prune(self) -> int:
+        """Apaga os perfis mais antigos além de max_files. Retorna quantos saíram."""
+        files = self._files()
+        removed = 0
+        for old in files[self.max_files:]:
+            try:
+                old.unlink()
+                removed += 1
+            except OSError:
+                pass
+        return removed
+    
+    def _files(self) -> List[Path]:
+        """Perfis gravados, mais recentes primeiro"""
+        if not self.directory.is_dir():
+            return []
+        files = [p for p in self.directory.iterdir() if PROFILE_NAME.match(p.name)]
+        return sorted(files, key=lambda p: p.name, reverse=True)
+    
+    def recent(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Perfis mais recentes: nome, tamanho, data, método e rota"""
+        profiles = []
+        for p in self._files()[:limit]:
+            try:
+                stat = p.stat()
+            except OSError:
+                continue
+            created, _, method, _ = p.name.split("-", 3)
+            profiles.append({
+                "name": p.name,
+                "size_bytes": stat.st_size,
+                "created_at": datetime.strptime(created, "%Y%m%dT%H%M%S").isoformat(),
+                "method": method,
+                "format": "collapsed" if p.name.endswith(EXTENSIONS["collapsed"]) else "speedscope",
+            })
+        return profiles
+    
+    def resolve(self, name: str) -> Optional[Path]:
+        """Caminho de um perfil pelo nome (None se inválido ou inexistente)"""
+        if not PROFILE_NAME.match(name):
+            return None
+        path = self.directory / name
+        return path if path.is_file() else None
+
+
+request_profiler = RequestProfiler.from_settings()
+
+
+# ==================== MIDDLEWARE ====================
+
+def _wants_profile(scope: Scope) -> bool:
+    """Header X-Profile acompanhado de X-Admin-Token válido"""
+    token = settings.admin_token
+    if not token:
+        return False
+    
+    requested = False
+    admin = None
+    for key, value in scope["headers"]:
+        if key == b"x-profile":
+            requested = value not in (b"", b"0", b"false")
+        elif key == b"x-admin-token":
+            admin = value.decode("latin-1")
+    return requested and admin is not None and hmac.compare_digest(admin, token)
+
+
+class ProfilingMiddleware:
+    """
+    Perfila requisições marcadas (header admin) ou sorteadas
+    
+    A resposta do perfil leva X-Profile-Id com o nome do arquivo.
+    Gravação fora do event loop, depois da resposta.
+    """
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        profiler: Optional[RequestProfiler] = None,
+        rng: Callable[[], float] = random.random
+    ):
+        self.app = app
+        self.profiler = profiler or request_profiler
+        self.rng = rng
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        
+        profiler = self.profiler
+        if not (_wants_profile(scope) or (profiler.sample_rate > 0 and self.rng() < profiler.sample_rate)):
+            return await self.app(scope, receive, send)
+        
+        collector = profiler.begin()
+        if collector is None:
+            return await self.app(scope, receive, send)
+        
+        method = scope["method"]
+        path = scope["path"]
+        name = profiler.new_name(method, path)
+        header = (b"x-profile-id", name.encode("ascii"))
+        status_code = 500
+        started = time.perf_counter()
+        
+        async def send_with_profile_id(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), header]}
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            duration = time.perf_counter() - started
+            stacks = profiler.end(collector)
+            try:
+                await anyio.to_thread.run_sync(
+                    profiler.save, stacks, method, path, status_code, duration, name
+                )
+            except OSError:
+                # Disco cheio / sem permissão: a requisição não falha
+                pass
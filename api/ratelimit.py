@@ -0,0 +1,238 @@
+"""
+Backends de Rate Limiting
+
+Janela deslizante aproximada por duas janelas fixas:
+    estimativa = anterior × (fração restante da janela) + atual
+
+Memória: por processo, O(1) por requisição, ociosos removidos.
+RESP (Redis): compartilhado entre workers, um round trip por verificação.
+"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, List, Optional, Sequence, Tuple
+import hashlib
+
+from resp import RespConnectionPool, RespError
+
+
+# (janela em segundos, limite de requisições)
+Limit = Tuple[float, int]
+
+
+class RateLimitBackend(ABC):
+    """
+    Interface de armazenamento do rate limiter
+    
+    Verificação e registro são uma única operação atômica:
+    a requisição só é contada se estiver dentro de todos os limites.
+    """
+    
+    # Faz I/O de rede: o middleware chama fora do event loop
+    blocking = False
+    
+    @abstractmethod
+    def hit(self, client_id: str, now: float, limits: Sequence[Limit]) -> Optional[int]:
+        """
+        Verifica e registra uma requisição
+        
+        Args:
+            client_id: Identificador do cliente
+            now: Tempo atual (segundos)
+            limits: Limites a respeitar, em ordem de prioridade
+        
+        Returns:
+            Índice do primeiro limite excedido, ou None se permitido
+        """
+    
+    def sweep(self, now: float) -> int:
+        """Remove estado de clientes ociosos. Retorna quantos saíram."""
+        return 0
+
+
+# ==================== MEMÓRIA ====================
+
+class SlidingWindowCounter:
+    """
+    Contador de janela deslizante
+    
+    Estado fixo: três números por janela, O(1) por requisição.
+    """
+    
+    __slots__ = ("window", "index", "current", "previous")
+    
+    def __init__(self, window: float):
+        self.window = window
+        self.index = 0
+        self.current = 0
+        self.previous = 0
+    
+    def _roll(self, now: float):
+        """Avança para a janela fixa de `now`"""
+        index = int(now // self.window)
+        
+        if index == self.index:
+            return
+        
+        self.previous = self.current if index == self.index + 1 else 0
+        self.current = 0
+        self.index = index
+    
+    def estimate(self, now: float) -> float:
+        """Requisições estimadas nos últimos `window` segundos"""
+        self._roll(now)
+        elapsed = (now % self.window) / self.window
+        return self.previous * (1 - elapsed) + self.current
+    
+    def hit(self):
+        """Registra uma requisição na janela atual"""
+        self.current += 1
+
+
+class _ClientState:
+    """Estado compacto de um cliente"""
+    
+    __slots__ = ("counters", "last_seen")
+    
+    def __init__(self, limits: Sequence[Limit], now: float):
+        self.counters = [SlidingWindowCounter(window) for window, _ in limits]
+        self.last_seen = now
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    Backend em memória (por processo)
+    
+    Memória fixa por cliente. Clientes ficam em ordem de último
+    acesso: os ociosos estão no início e saem aos poucos.
+    """
+    
+    def __init__(self, idle_timeout: float = 7200.0, sweep_batch: int = 32):
+        """
+        Args:
+            idle_timeout: Segundos sem requisições até o cliente ser esquecido
+                (2h: as duas janelas de hora já zeraram)
+            sweep_batch: Máximo de clientes ociosos removidos por verificação
+        """
+        self.idle_timeout = idle_timeout
+        self.sweep_batch = sweep_batch
+        self.clients: "OrderedDict[str, _ClientState]" = OrderedDict()
+    
+    def _evict_idle(self, now: float, limit: Optional[int] = None) -> int:
+        """Remove clientes ociosos do início da fila"""
+        cutoff = now - self.idle_timeout
+        evicted = 0
+        
+        while self.clients and (limit is None or evicted < limit):
+            client_id, state = next(iter(self.clients.items()))
+            if state.last_seen > cutoff:
+                break
+            del self.clients[client_id]
+            evicted += 1
+        
+        return evicted
+    
+    def sweep(self, now: float) -> int:
+        return self._evict_idle(now)
+    
+    def hit(self, client_id: str, now: float, limits: Sequence[Limit]) -> Optional[int]:
+        self._evict_idle(now, self.sweep_batch)
+        
+        state = self.clients.get(client_id)
+        if state is None:
+            state = self.clients[client_id] = _ClientState(limits, now)
+        else:
+            self.clients.move_to_end(client_id)
+        state.last_seen = now
+        
+        for i, (counter, (_, limit)) in enumerate(zip(state.counters, limits)):
+            if counter.estimate(now) >= limit:
+                return i
+        
+        for counter in state.counters:
+            counter.hit()
+        
+        return None
+
+
+# ==================== RESP (REDIS) ====================
+
+# Verifica todos os limites e só então incrementa, no servidor (atômico).
+# KEYS: janela atual e anterior de cada limite, em pares.
+# ARGV: limite, peso da janela anterior e TTL de cada limite, em trios.
+# Retorna o índice (base 0) do primeiro limite excedido, ou -1.
+RATE_LIMIT_SCRIPT = """
+local limits = #KEYS / 2
+for i = 1, limits do
+    local current = tonumber(redis.call('GET', KEYS[2 * i - 1]) or '0')
+    local previous = tonumber(redis.call('GET', KEYS[2 * i]) or '0')
+    if previous * tonumber(ARGV[3 * i - 1]) + current >= tonumber(ARGV[3 * i - 2]) then
+        return i - 1
+    end
+end
+for i = 1, limits do
+    redis.call('INCR', KEYS[2 * i - 1])
+    redis.call('EXPIRE', KEYS[2 * i - 1], ARGV[3 * i])
+end
+return -1
+"""
+
+RATE_LIMIT_SCRIPT_SHA = hashlib.sha1(RATE_LIMIT_SCRIPT.encode()).hexdigest()
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Backend distribuído via protocolo Redis
+    
+    Todos os workers compartilham os contadores.
+    Um script Lua por verificação (um round trip): lê a janela atual
+    e a anterior de cada limite e só incrementa se todos passarem.
+    Verificação e registro acontecem no servidor, sem intercalação
+    com outros workers; rejeições não tocam nos contadores.
+    
+    O script vai inteiro (EVAL) na primeira chamada e depois só pelo
+    SHA1 (EVALSHA); se o servidor não o tiver (reinício, failover,
+    SCRIPT FLUSH), volta a EVAL.
+    
+    Chaves expiram sozinhas após duas janelas: sem varredura.
+    """
+    
+    blocking = True
+    
+    def __init__(self, pool: RespConnectionPool, prefix: str = "ratelimit"):
+        self.pool = pool
+        self.prefix = prefix
+        self._script_loaded = False
+    
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisRateLimitBackend":
+        """Cria backend a partir de redis://host:porta/db"""
+        return cls(RespConnectionPool.from_url(url, **kwargs))
+    
+    def _key(self, client_id: str, window: float, index: int) -> str:
+        return f"{self.prefix}:{client_id}:{int(window)}:{index}"
+    
+    def hit(self, client_id: str, now: float, limits: Sequence[Limit]) -> Optional[int]:
+        keys: List[str] = []
+        args: List[Any] = []
+        
+        for window, limit in limits:
+            index = int(now // window)
+            keys.append(self._key(client_id, window, index))
+            keys.append(self._key(client_id, window, index - 1))
+            args.extend((limit, repr(1 - (now % window) / window), int(window * 2)))
+        
+        if self._script_loaded:
+            reply = self.pool.pipeline([("EVALSHA", RATE_LIMIT_SCRIPT_SHA, len(keys), *keys, *args)])[0]
+            if not (isinstance(reply, RespError) and str(reply).startswith("NOSCRIPT")):
+                return self._result(reply)
+        
+        reply = self.pool.pipeline([("EVAL", RATE_LIMIT_SCRIPT, len(keys), *keys, *args)])[0]
+        self._script_loaded = not isinstance(reply, RespError)
+        return self._result(reply)
+    
+    @staticmethod
+    def _result(reply: Any) -> Optional[int]:
+        if isinstance(reply, RespError):
+            raise reply
+        return None if reply < 0 else reply
@@ -0,0 +1,227 @@
+"""
+Cliente RESP - Protocolo Redis Mínimo
+
+Só o necessário para o rate limiter distribuído:
+pipeline de comandos num único round trip e pool de conexões.
+Sem dependência externa.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional, Sequence
+from urllib.parse import urlparse
+import queue
+import socket
+import threading
+import time
+
+
+class RespError(Exception):
+    """Erro retornado pelo servidor (-ERR ...)"""
+
+
+def encode_command(*args: Any) -> bytes:
+    """Codifica um comando como array RESP de bulk strings"""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+class RespConnection:
+    """
+    Conexão TCP com servidor RESP
+    
+    Comandos enviados em lote: um sendall, N respostas lidas em sequência.
+    """
+    
+    def __init__(self, host: str, port: int, timeout: float = 1.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile("rb")
+    
+    def pipeline(self, commands: Sequence[Sequence[Any]]) -> List[Any]:
+        """Executa comandos num único round trip"""
+        self.sock.sendall(b"".join(encode_command(*command) for command in commands))
+        return [self._read_reply() for _ in commands]
+    
+    def execute(self, *args: Any) -> Any:
+        """Executa um comando"""
+        reply = self.pipeline([args])[0]
+        if isinstance(reply, RespError):
+            raise reply
+        return reply
+    
+    def _read_reply(self) -> Any:
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("Conexão RESP encerrada pelo servidor")
+        
+        kind, payload = line[:1], line[1:-2]
+        
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            return RespError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self.reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            return [self._read_reply() for _ in range(length)]
+        
+        raise ConnectionError(f"Resposta RESP inválida: {line!r}")
+    
+    def close(self):
+        try:
+            self.reader.close()
+        finally:
+            self.sock.close()
+
+
+class RespConnectionPool:
+    """
+    Pool de conexões RESP
+    
+    Conexões reaproveitadas entre requisições (e threads).
+    Conexão com erro de rede é descartada, não devolvida.
+    
+    Circuit breaker: depois de um erro de rede, o pool recusa na hora
+    (ConnectionError, sem tocar na rede) até passar o backoff, que
+    dobra a cada falha seguida (retry_backoff até max_retry_backoff).
+    Vencido o prazo, uma única requisição testa o servidor enquanto as
+    outras continuam recusadas; sucesso fecha o circuito. Sem isso,
+    com o servidor fora do ar, cada requisição esperaria o timeout de
+    conexão numa thread do pool.
+    """
+    
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        password: Optional[str] = None,
+        max_connections: int = 16,
+        timeout: float = 1.0,
+        retry_backoff: float = 0.5,
+        max_retry_backoff: float = 30.0
+    ):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+        
+        self._idle: "queue.LifoQueue[RespConnection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        
+        self._circuit = threading.Lock()
+        self._failures = 0
+        self._retry_at = 0.0
+    
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RespConnectionPool":
+        """Cria pool a partir de redis://[:senha@]host[:porta][/db]"""
+        parsed = urlparse(url)
+        db = parsed.path.lstrip("/")
+        
+        return cls(
+            host=parsed.hostname or "localhost",
+            port=parsed.port or 6379,
+            db=int(db) if db else 0,
+            password=parsed.password,
+            **kwargs
+        )
+    
+    def _connect(self) -> RespConnection:
+        connection = RespConnection(self.host, self.port, self.timeout)
+        
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        
+        for reply in connection.pipeline(setup) if setup else []:
+            if isinstance(reply, RespError):
+                connection.close()
+                raise reply
+        
+        return connection
+    
+    def _check_circuit(self):
+        """Recusa enquanto o backoff não vence; depois, libera uma tentativa"""
+        with self._circuit:
+            if not self._failures:
+                return
+            now = time.monotonic()
+            if now < self._retry_at:
+                raise ConnectionError(
+                    f"Servidor RESP indisponível (nova tentativa em {self._retry_at - now:.1f}s)"
+                )
+            # Meia-abertura: as demais esperam o resultado desta tentativa
+            self._retry_at = now + self.timeout
+    
+    def _record_failure(self):
+        with self._circuit:
+            self._failures += 1
+            backoff = min(self.max_retry_backoff, self.retry_backoff * 2 ** (self._failures - 1))
+            self._retry_at = time.monotonic() + backoff
+    
+    def _record_success(self):
+        if self._failures:
+            with self._circuit:
+                self._failures = 0
+                self._retry_at = 0.0
+    
+    @contextmanager
+    def connection(self) -> Iterator[RespConnection]:
+        """Empresta uma conexão do pool"""
+        self._check_circuit()
+        if not self._slots.acquire(timeout=self.timeout):
+            raise ConnectionError("Pool RESP esgotado")
+        
+        try:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                try:
+                    connection = self._connect()
+                except OSError:
+                    self._record_failure()
+                    raise
+            
+            try:
+                yield connection
+            except (OSError, ConnectionError):
+                connection.close()
+                self._record_failure()
+                raise
+            else:
+                self._idle.put(connection)
+                self._record_success()
+        finally:
+            self._slots.release()
+    
+    def pipeline(self, commands: Sequence[Sequence[Any]]) -> List[Any]:
+        """Executa comandos num único round trip, numa conexão do pool"""
+        with self.connection() as connection:
+            return connection.pipeline(commands)
+    
+    def close(self):
+        """Fecha conexões ociosas"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
@@ -6,7 +6,7 @@ Se o dado passou por aqui, ele está matematicamente e psicologicamente válido.
 """
 
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional, Literal
+from typing import Any, Dict, List, Optional, Literal
 from datetime import datetime
 
 
@@ -121,6 +121,38 @@ class ProtocolRequest(BaseModel):
         }
 
 
+class BatchProtocolRequest(BaseModel):
+    """
+    Lote de protocolos progressivos
+    
+    Itens são validados um a um no processamento:
+    um item inválido (inclusive o que nem é objeto) vira registro
+    de rejeição, não derruba o lote.
+    O máximo de itens (settings.batch_max_items) é conferido no endpoint.
+    """
+    items: List[Any] = Field(
+        ...,
+        min_length=1,
+        description="Itens no formato {goal, protocol}"
+    )
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "items": [
+                    {
+                        "goal": {"target_amount": 1000.0, "periods": 12},
+                        "protocol": {"start_value": 1.0, "increment": 2.0, "cap": 100.0}
+                    },
+                    {
+                        "goal": {"target_amount": 5000.0, "periods": 24},
+                        "protocol": {"start_value": 10.0, "increment": 5.0, "cap": 300.0}
+                    }
+                ]
+            }
+        }
+
+
 class ProtocolStatus(BaseModel):
     """Status do protocolo"""
     status: Literal["reached", "in_progress", "incomplete", "optimal"]
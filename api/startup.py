@@ -0,0 +1,241 @@
+"""
+Inicialização Rápida (cold start)
+
+Para autoscaling e deploys que sobem processos sob demanda:
+- OpenAPI pré-gerado: settings.openapi_cache aponta para um arquivo
+  gravado no build (python -m startup openapi). O documento é lido do
+  arquivo no primeiro acesso a /openapi.json ou /docs, em vez de
+  montado a partir das rotas e modelos. Uma impressão digital (versões
+  de FastAPI/Pydantic, rotas e fonte dos módulos da API) invalida o
+  arquivo quando o código muda: nesse caso o documento é gerado como
+  antes e o arquivo, regravado (se o diretório permitir escrita).
+- Aquecimento opcional (settings.startup_warmup): requisições internas
+  (ASGI, sem rede) passam pela cadeia completa antes de /ready
+  responder 200. Primeiras chamadas de Pydantic, engine, middleware e
+  OpenAPI acontecem aqui, não na primeira requisição de um usuário.
+  /health (liveness) responde desde o início; só /ready espera.
+
+Módulos opcionais (profiling, engine.batch) são importados no
+primeiro uso.
+
+Uso (a partir de api/):
+    python -m startup openapi
+    python -m startup openapi --output /srv/openapi.json
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+import argparse
+import hashlib
+import json
+import time
+
+import anyio
+import fastapi
+import pydantic
+from starlette.types import ASGIApp, Message
+
+from config import settings
+
+
+API_DIR = Path(__file__).resolve().parent
+SKIPPED_DIRS = {"tests", "benchmarks", "__pycache__"}
+
+# (método, caminho, corpo JSON ou None)
+WarmupRequest = Tuple[str, str, Optional[Dict[str, Any]]]
+
+
+# ==================== OPENAPI ====================
+
+def _source_files(directory: Path) -> List[Path]:
+    """Fonte da API (sem testes e benchmarks), independente do que já foi importado"""
+    return sorted(
+        path for path in directory.rglob("*.py")
+        if not SKIPPED_DIRS.intersection(path.relative_to(directory).parts[:-1])
+    )
+
+
+def openapi_fingerprint(app: fastapi.FastAPI, directory: Path = API_DIR) -> str:
+    """
+    Impressão digital do que define o documento OpenAPI
+    
+    Versões de FastAPI e Pydantic, metadados do app, rotas e o
+    conteúdo dos módulos da API (modelos, endpoints).
+    Barato: não monta o schema.
+    """
+    sha = hashlib.sha256()
+    sha.update(f"{fastapi.__version__}|{pydantic.VERSION}|{app.title}|{app.version}|{app.openapi_version}".encode())
+    for route in app.routes:
+        methods = ",".join(sorted(getattr(route, "methods", None) or ()))
+        sha.update(f"|{route.path}|{methods}|{getattr(route, 'name', '')}".encode())
+    for path in _source_files(directory):
+        sha.update(str(path.relative_to(directory)).encode())
+        sha.update(path.read_bytes())
+    return sha.hexdigest()
+
+
+def load_openapi(path: Union[str, Path], fingerprint: str) -> Optional[Dict[str, Any]]:
+    """Documento do arquivo, se existir e tiver a mesma impressão digital"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("fingerprint") != fingerprint:
+        return None
+    return data.get("openapi")
+
+
+def save_openapi(path: Union[str, Path], schema: Dict[str, Any], fingerprint: str):
+    """Grava o documento (arquivo temporário + rename)"""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps({"fingerprint": fingerprint, "openapi": schema}), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def install_openapi_cache(app: fastapi.FastAPI, path: Union[str, Path], directory: Path = API_DIR):
+    """
+    Troca app.openapi por uma versão que lê o documento pré-gerado
+    
+    Args:
+        app: Aplicação FastAPI
+        path: Arquivo do documento (gerado por `python -m startup openapi`)
+        directory: Diretório dos módulos que entram na impressão digital
+    """
+    generate = app.openapi
+    
+    def openapi() -> Dict[str, Any]:
+        if app.openapi_schema:
+            return app.openapi_schema
+        
+        fingerprint = openapi_fingerprint(app, directory)
+        schema = load_openapi(path, fingerprint)
+        if schema is None:
+            schema = generate()
+            try:
+                save_openapi(path, schema, fingerprint)
+            except OSError:
+                pass  # sistema de arquivos somente leitura: gera a cada processo
+        app.openapi_schema = schema
+        return schema
+    
+    app.openapi = openapi
+
+
+# ==================== AQUECIMENTO ====================
+
+class StartupState:
+    """Prontidão do processo (/ready)"""
+    
+    def __init__(self):
+        self.ready = False
+        self.warmup_seconds: Optional[float] = None
+        self.warmup_statuses: Dict[str, int] = {}
+    
+    def mark_ready(self):
+        self.ready = True
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": "ready" if self.ready else "warming_up",
+            "warmup_seconds": self.warmup_seconds,
+            "warmup": self.warmup_statuses,
+        }
+
+
+startup_state = StartupState()
+
+
+async def asgi_request(app: ASGIApp, method: str, path: str, body: bytes = b"") -> int:
+    """
+    Uma requisição HTTP direto no app ASGI (sem socket)
+    
+    Returns:
+        Status da resposta
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"warmup"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("warmup", 0),
+        "server": ("warmup", 80),
+    }
+    status = 0
+    received = False
+    done = anyio.Event()
+    
+    async def receive() -> Message:
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await done.wait()
+        return {"type": "http.disconnect"}
+    
+    async def send(message: Message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body" and not message.get("more_body", False):
+            done.set()
+    
+    await app(scope, receive, send)
+    return status
+
+
+async def warm_up(app: ASGIApp, requests: Iterable[WarmupRequest], state: StartupState = startup_state):
+    """
+    Passa cada requisição pela cadeia completa e marca o processo pronto
+    
+    Falhas não impedem a prontidão: o status de cada rota fica em
+    state.warmup_statuses (0 = exceção).
+    
+    Args:
+        app: Aplicação ASGI (com middleware)
+        requests: (método, caminho, corpo JSON)
+        state: Estado exposto em /ready
+    """
+    started = time.perf_counter()
+    for method, path, payload in requests:
+        body = json.dumps(payload).encode() if payload is not None else b""
+        try:
+            status = await asgi_request(app, method, path, body)
+        except Exception:
+            status = 0
+        state.warmup_statuses[f"{method} {path}"] = status
+    state.warmup_seconds = round(time.perf_counter() - started, 4)
+    state.mark_ready()
+
+
+# ==================== CLI ====================
+
+def main():
+    parser = argparse.ArgumentParser(description="Artefatos de inicialização rápida")
+    sub = parser.add_subparsers(dest="command", required=True)
+    openapi = sub.add_parser("openapi", help="Gera o documento OpenAPI para settings.openapi_cache")
+    openapi.add_argument("--output", type=Path, default=None, help="Padrão: OPENAPI_CACHE ou openapi.json")
+    args = parser.parse_args()
+    
+    from main import app
+    
+    output = args.output or Path(settings.openapi_cache or "openapi.json")
+    fingerprint = openapi_fingerprint(app)
+    app.openapi_schema = None
+    save_openapi(output, fastapi.FastAPI.openapi(app), fingerprint)
+    print(f"OpenAPI gravado em {output} ({fingerprint[:12]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,14 @@
 Testes Package
 """
 
+import os
 import sys
 from pathlib import Path
 
 # Adiciona diretório pai ao path para imports
 api_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(api_dir))
+
+# Limites folgados: a suíte inteira roda do mesmo cliente
+os.environ.setdefault("RATE_LIMIT_PER_MINUTE", "1000000")
+os.environ.setdefault("RATE_LIMIT_PER_HOUR", "1000000")
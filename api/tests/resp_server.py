@@ -0,0 +1,213 @@
+"""
+Servidor RESP de Teste
+
+Substituto local do Redis para os testes: só os comandos
+usados pelo rate limiter (PING, GET, SET, INCR, DECR, EXPIRE,
+DEL, FLUSHDB, AUTH, SELECT, MULTI, EXEC, EVAL, EVALSHA,
+SCRIPT FLUSH), com transação atômica.
+
+Sem interpretador Lua: EVAL/EVALSHA só aceitam scripts com um
+equivalente em Python registrado em SCRIPTS (pelo SHA1 do texto),
+executado sob o mesmo lock dos demais comandos.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import hashlib
+import socket
+import socketserver
+import threading
+import time
+
+from ratelimit import RATE_LIMIT_SCRIPT
+
+
+def _rate_limit_script(store: "RespStore", keys: List[bytes], args: List[bytes]) -> int:
+    """Equivalente de ratelimit.RATE_LIMIT_SCRIPT"""
+    limits = len(keys) // 2
+    for i in range(limits):
+        current = int(store.execute([b"GET", keys[2 * i]]) or 0)
+        previous = int(store.execute([b"GET", keys[2 * i + 1]]) or 0)
+        if previous * float(args[3 * i + 1]) + current >= float(args[3 * i]):
+            return i
+    for i in range(limits):
+        store.execute([b"INCR", keys[2 * i]])
+        store.execute([b"EXPIRE", keys[2 * i], args[3 * i + 2]])
+    return -1
+
+
+ScriptFunction = Callable[["RespStore", List[bytes], List[bytes]], Any]
+
+SCRIPTS: Dict[bytes, ScriptFunction] = {
+    hashlib.sha1(RATE_LIMIT_SCRIPT.encode()).hexdigest().encode(): _rate_limit_script,
+}
+
+
+class RespStore:
+    """Chaves em memória com expiração"""
+    
+    def __init__(self):
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self.scripts: Dict[bytes, ScriptFunction] = {}
+        self.lock = threading.Lock()
+    
+    def _eval(self, sha: bytes, args: List[bytes]) -> Any:
+        count = int(args[0])
+        return self.scripts[sha](self, args[1:1 + count], args[1 + count:])
+    
+    def _get(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self.data[key]
+            return None
+        return value
+    
+    def _add(self, key: bytes, delta: int) -> int:
+        value = int(self._get(key) or 0) + delta
+        expires_at = self.data.get(key, (None, None))[1]
+        self.data[key] = (str(value).encode(), expires_at)
+        return value
+    
+    def execute(self, command: List[bytes]) -> Any:
+        """Executa um comando (chamador segura o lock)"""
+        name = command[0].upper()
+        args = command[1:]
+        
+        if name == b"PING":
+            return "PONG"
+        if name in (b"AUTH", b"SELECT"):
+            return "OK"
+        if name == b"GET":
+            return self._get(args[0])
+        if name == b"SET":
+            self.data[args[0]] = (args[1], None)
+            return "OK"
+        if name == b"INCR":
+            return self._add(args[0], 1)
+        if name == b"DECR":
+            return self._add(args[0], -1)
+        if name == b"EXPIRE":
+            if self._get(args[0]) is None:
+                return 0
+            self.data[args[0]] = (self.data[args[0]][0], time.monotonic() + int(args[1]))
+            return 1
+        if name == b"DEL":
+            return sum(1 for key in args if self.data.pop(key, None) is not None)
+        if name == b"FLUSHDB":
+            self.data.clear()
+            return "OK"
+        if name == b"EVAL":
+            sha = hashlib.sha1(args[0]).hexdigest().encode()
+            if sha not in SCRIPTS:
+                return Exception("ERR script sem equivalente no servidor de teste")
+            self.scripts[sha] = SCRIPTS[sha]
+            return self._eval(sha, args[1:])
+        if name == b"EVALSHA":
+            if args[0].lower() not in self.scripts:
+                return Exception("NOSCRIPT No matching script. Please use EVAL.")
+            return self._eval(args[0].lower(), args[1:])
+        if name == b"SCRIPT" and args[0].upper() == b"FLUSH":
+            self.scripts.clear()
+            return "OK"
+        
+        return Exception(f"ERR unknown command '{name.decode()}'")
+
+
+def encode_reply(reply: Any) -> bytes:
+    """Codifica resposta RESP"""
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, Exception):
+        return b"-%s\r\n" % str(reply).encode()
+    if isinstance(reply, str):
+        return b"+%s\r\n" % reply.encode()
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    if isinstance(reply, list):
+        return b"*%d\r\n" % len(reply) + b"".join(encode_reply(r) for r in reply)
+    raise TypeError(reply)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    
+    def _read_command(self) -> Optional[List[bytes]]:
+        line = self.rfile.readline()
+        if not line:
+            return None
+        count = int(line[1:-2])
+        command = []
+        for _ in range(count):
+            length = int(self.rfile.readline()[1:-2])
+            command.append(self.rfile.read(length + 2)[:-2])
+        return command
+    
+    def handle(self):
+        server: "RespTestServer" = self.server
+        server.connections += 1
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        queued: Optional[List[List[bytes]]] = None
+        
+        while True:
+            command = self._read_command()
+            if command is None:
+                return
+            
+            server.commands += 1
+            name = command[0].upper()
+            
+            if name == b"MULTI":
+                queued = []
+                reply = "OK"
+            elif name == b"EXEC":
+                with server.store.lock:
+                    reply = [server.store.execute(c) for c in queued or []]
+                queued = None
+            elif queued is not None:
+                queued.append(command)
+                reply = "QUEUED"
+            else:
+                with server.store.lock:
+                    reply = server.store.execute(command)
+            
+            self.wfile.write(encode_reply(reply))
+
+
+class RespTestServer(socketserver.ThreadingTCPServer):
+    """
+    Servidor RESP em thread, porta efêmera
+    
+    Uso:
+        with RespTestServer() as server:
+            url = server.url
+    """
+    
+    daemon_threads = True
+    allow_reuse_address = True
+    
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.store = RespStore()
+        self.connections = 0
+        self.commands = 0
+        self._thread = threading.Thread(
+            target=self.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True
+        )
+    
+    @property
+    def url(self) -> str:
+        host, port = self.server_address
+        return f"redis://{host}:{port}/0"
+    
+    def __enter__(self) -> "RespTestServer":
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,123 @@
+"""
+Testes do Cache de Respostas
+
+Testa LRU, estatísticas e ETag nos endpoints de protocolo.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from cache import ResponseCache, etag_matches
+from main import app
+
+client = TestClient(app)
+
+PAYLOAD = {
+    "goal": {
+        "target_amount": 1000,
+        "periods": 12
+    },
+    "protocol": {
+        "start_value": 1,
+        "increment": 2,
+        "cap": 100
+    }
+}
+
+
+class TestResponseCache:
+    """Testes do LRU de respostas"""
+    
+    def test_hit_and_miss(self):
+        """Testa contagem de hits e misses"""
+        cache = ResponseCache(max_entries=2)
+        
+        assert cache.get("a") is None
+        cache.put("a", b"{}")
+        assert cache.get("a").body == b"{}"
+        
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+    
+    def test_eviction(self):
+        """Testa descarte da entrada menos usada"""
+        cache = ResponseCache(max_entries=2)
+        cache.put("a", b"1")
+        cache.put("b", b"2")
+        cache.get("a")
+        cache.put("c", b"3")
+        
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats()["evictions"] == 1
+    
+    def test_ttl_expiration(self):
+        """Testa expiração por idade"""
+        cache = ResponseCache(max_entries=2, ttl_seconds=0)
+        cache.put("a", b"1")
+        
+        assert cache.get("a") is None
+    
+    def test_strong_etag_depends_on_body(self):
+        """Testa ETag forte derivado dos bytes"""
+        cache = ResponseCache()
+        
+        first = cache.put("a", b"1")
+        second = cache.put("b", b"2")
+        
+        assert first.etag.startswith('"')
+        assert first.etag != second.etag
+    
+    def test_etag_matching(self):
+        """Testa parsing de If-None-Match"""
+        assert etag_matches('"x"', '"x"')
+        assert etag_matches('"y", W/"x"', '"x"')
+        assert etag_matches("*", '"x"')
+        assert not etag_matches('"y"', '"x"')
+        assert not etag_matches(None, '"x"')
+
+
+class TestCachedEndpoints:
+    """Testes de cache nos endpoints de protocolo"""
+    
+    @pytest.mark.parametrize("path,payload", [
+        ("/api/v1/protocols/progressive", PAYLOAD),
+        ("/api/v1/protocols/optimized", PAYLOAD["goal"]),
+        ("/api/v1/protocols/compare", PAYLOAD),
+    ])
+    def test_etag_not_modified(self, path, payload):
+        """Testa 304 com If-None-Match igual ao ETag"""
+        first = client.post(path, json=payload)
+        etag = first.headers["etag"]
+        
+        second = client.post(path, json=payload, headers={"If-None-Match": etag})
+        
+        assert first.status_code == 200
+        assert second.status_code == 304
+        assert second.headers["etag"] == etag
+        assert second.content == b""
+    
+    def test_normalized_key(self):
+        """Testa que payloads equivalentes compartilham a resposta"""
+        equivalent = {
+            "protocol": {"cap": 100.0, "increment": 2.0, "start_value": 1.0},
+            "goal": {"periods": 12, "target_amount": 1000.0}
+        }
+        
+        first = client.post("/api/v1/protocols/progressive", json=PAYLOAD)
+        second = client.post("/api/v1/protocols/progressive", json=equivalent)
+        
+        assert first.content == second.content
+        assert first.headers["etag"] == second.headers["etag"]
+    
+    def test_cache_stats(self):
+        """Testa endpoint de estatísticas"""
+        client.post("/api/v1/protocols/progressive", json=PAYLOAD)
+        client.post("/api/v1/protocols/progressive", json=PAYLOAD)
+        
+        response = client.get("/api/v1/cache/stats")
+        
+        assert response.status_code == 200
+        stats = response.json()["response_cache"]
+        assert stats["hits"] >= 1
+        assert 0 < stats["hit_ratio"] <= 1
@@ -0,0 +1,169 @@
+"""
+Testes do Buffer de Decisões
+
+Testa capacidade fixa, índices e consulta admin.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+from config import settings
+from decisionlog import DecisionRingBuffer
+from main import app
+from middleware import decision_logger
+
+
+class StepClock:
+    """Relógio que avança 1s a cada leitura"""
+    
+    def __init__(self, start: float = 1_000_000.0):
+        self.now = start - 1
+    
+    def __call__(self) -> float:
+        self.now += 1
+        return self.now
+
+
+class TestDecisionRingBuffer:
+    """Testes do anel indexado"""
+    
+    def test_bounded_capacity(self):
+        """Testa que o buffer não cresce além da capacidade"""
+        buffer = DecisionRingBuffer(capacity=10)
+        
+        for i in range(25):
+            buffer.append("rate_limit", "rejected", f"motivo {i}")
+        
+        assert len(buffer) == 10
+        assert buffer.evicted == 15
+        assert buffer.stats()["by_type"] == {"rate_limit": 10}
+        assert [r["reason"] for r in buffer.recent(3)] == ["motivo 22", "motivo 23", "motivo 24"]
+    
+    def test_query_by_type_and_outcome(self):
+        """Testa filtros pelos índices secundários"""
+        buffer = DecisionRingBuffer(capacity=100)
+        buffer.append("rate_limit", "rejected", "limite")
+        buffer.append("absurd_goal", "rejected", "meta absurda")
+        buffer.append("protocol_creation", "approved", "ok")
+        buffer.append("rate_limit", "rejected", "limite")
+        
+        rate_limits = buffer.query(decision_type="rate_limit")
+        rejected = buffer.query(outcome="rejected")
+        
+        assert [r["seq"] for r in rate_limits] == [3, 0]
+        assert len(rejected) == 3
+        assert buffer.query(decision_type="rate_limit", outcome="approved") == []
+        assert buffer.query(decision_type="unknown") == []
+    
+    def test_query_time_range(self):
+        """Testa intervalo [since, until) por busca binária"""
+        buffer = DecisionRingBuffer(capacity=100, clock=StepClock(start=100.0))
+        
+        for i in range(20):
+            buffer.append("rate_limit" if i % 2 else "absurd_goal", "rejected", str(i))
+        
+        # Timestamps 100..119; tipo rate_limit nos ímpares
+        results = buffer.query(decision_type="rate_limit", since=105.0, until=111.0)
+        
+        assert [r["reason"] for r in results] == ["9", "7", "5"]
+    
+    def test_query_after_wraparound(self):
+        """Testa índices coerentes depois de sobrescrever o anel"""
+        buffer = DecisionRingBuffer(capacity=50, clock=StepClock(start=0.0))
+        
+        for i in range(1000):
+            buffer.append(f"type_{i % 3}", "rejected", str(i))
+        
+        results = buffer.query(decision_type="type_0", limit=1000)
+        
+        assert [int(r["reason"]) for r in results] == [i for i in range(999, 949, -1) if i % 3 == 0]
+        assert sum(buffer.stats()["by_type"].values()) == 50
+    
+    def test_limit(self):
+        """Testa limite de resultados, mais recentes primeiro"""
+        buffer = DecisionRingBuffer(capacity=100)
+        
+        for i in range(30):
+            buffer.append("rate_limit", "rejected", str(i))
+        
+        assert [r["reason"] for r in buffer.query(limit=2)] == ["29", "28"]
+    
+    def test_concurrent_writers(self):
+        """Escritas de várias threads não perdem registros nem índices"""
+        buffer = DecisionRingBuffer(capacity=500)
+        
+        def write(worker):
+            for i in range(2000):
+                buffer.append(f"tipo{worker % 2}", "rejected", str(i))
+        
+        # Troca de thread a cada poucas instruções: sem lock, seq e slots colidem
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                list(pool.map(write, range(4)))
+        finally:
+            sys.setswitchinterval(interval)
+        
+        stats = buffer.stats()
+        assert stats["total"] == 8000
+        assert stats["evicted"] == 7500
+        assert sum(stats["by_type"].values()) == stats["by_outcome"]["rejected"] == 500
+        assert [r["seq"] for r in buffer.recent(500)] == list(range(7500, 8000))
+    
+    def test_invalid_capacity(self):
+        """Testa capacidade inválida"""
+        with pytest.raises(ValueError):
+            DecisionRingBuffer(capacity=0)
+
+
+class TestAdminDecisions:
+    """Testes da rota admin de decisões"""
+    
+    def test_disabled_without_token(self, monkeypatch):
+        """Testa rota fechada sem ADMIN_TOKEN"""
+        monkeypatch.setattr(settings, "admin_token", None)
+        
+        response = TestClient(app).get("/api/v1/admin/decisions")
+        
+        assert response.status_code == 403
+    
+    def test_wrong_token(self, monkeypatch):
+        """Testa token inválido"""
+        monkeypatch.setattr(settings, "admin_token", "segredo")
+        
+        response = TestClient(app).get(
+            "/api/v1/admin/decisions",
+            headers={"X-Admin-Token": "errado"}
+        )
+        
+        assert response.status_code == 403
+    
+    def test_query_rejections(self, monkeypatch):
+        """Testa consulta de rejeições por tipo e intervalo"""
+        monkeypatch.setattr(settings, "admin_token", "segredo")
+        client = TestClient(app)
+        since = datetime.now().isoformat()
+        
+        payload = {
+            "goal": {"target_amount": 500_000, "periods": 6},
+            "protocol": {"start_value": 1, "increment": 2, "cap": 100}
+        }
+        client.post("/api/v1/protocols/compare", json=payload)
+        decision_logger.log_decision("protocol_creation", "approved", "ok")
+        
+        response = client.get(
+            "/api/v1/admin/decisions",
+            params={"decision_type": "behavior_validation", "since": since},
+            headers={"X-Admin-Token": "segredo"}
+        )
+        data = response.json()
+        
+        assert response.status_code == 200
+        assert data["count"] >= 1
+        assert all(d["decision_type"] == "behavior_validation" for d in data["decisions"])
+        assert all(d["outcome"] == "rejected" for d in data["decisions"])
+        assert data["decisions"][0]["metadata"]["endpoint"] == "/api/v1/protocols/compare"
@@ -4,8 +4,11 @@ Testes dos Endpoints da API
 Testa validação, rate limiting, respostas.
 """
 
+import json
+
 import pytest
 from fastapi.testclient import TestClient
+from config import settings
 from main import app
 
 client = TestClient(app)
@@ -141,6 +144,133 @@ class TestCompareProtocols:
         assert "insight" in data
 
 
+class TestBatchProtocols:
+    """Testes do endpoint de lote (NDJSON)"""
+    
+    def test_batch_matches_single_endpoint(self):
+        """Cada linha tem o mesmo conteúdo do endpoint progressivo"""
+        items = [
+            {
+                "goal": {"target_amount": 1000, "periods": 12},
+                "protocol": {"start_value": 1, "increment": 2, "cap": 100}
+            },
+            {
+                "goal": {"target_amount": 500, "periods": 24},
+                "protocol": {"start_value": 5, "increment": 3, "cap": 50}
+            }
+        ]
+        
+        response = client.post("/api/v1/protocols/batch", json={"items": items})
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["index"] for line in lines] == [0, 1]
+        
+        for item, line in zip(items, lines):
+            single = client.post("/api/v1/protocols/progressive", json=item).json()
+            for key in ("protocol_type", "goal", "result", "status"):
+                assert line[key] == single[key]
+    
+    def test_batch_rejects_items_individually(self):
+        """Item inválido vira rejeição sem derrubar o lote"""
+        items = [
+            {
+                "goal": {"target_amount": 2_000_000, "periods": 12},
+                "protocol": {"start_value": 1, "increment": 2, "cap": 100}
+            },
+            {
+                "goal": {"target_amount": 1000, "periods": 12},
+                "protocol": {"start_value": 1, "increment": 2, "cap": 100}
+            }
+        ]
+        
+        response = client.post("/api/v1/protocols/batch", json={"items": items})
+        
+        assert response.status_code == 200
+        rejected, accepted = [json.loads(line) for line in response.text.splitlines()]
+        
+        assert rejected["decision"] == "rejected"
+        assert rejected["field"] == "goal.target_amount"
+        assert "educacional" in rejected["reason"].lower()
+        assert accepted["protocol_type"] == "progressive"
+    
+    def test_batch_streams_in_chunks(self):
+        """Lote maior que um bloco mantém ordem e tamanho"""
+        item = {
+            "goal": {"target_amount": 1000, "periods": 12},
+            "protocol": {"start_value": 1, "increment": 2, "cap": 100}
+        }
+        
+        response = client.post("/api/v1/protocols/batch", json={"items": [item] * 2500})
+        lines = response.text.splitlines()
+        
+        assert len(lines) == 2500
+        assert json.loads(lines[-1])["index"] == 2499
+    
+    def test_batch_applies_behavior_validation(self):
+        """Item aceito pelo schema mas recusado pelas regras comportamentais"""
+        items = [
+            {
+                "goal": {"target_amount": 500_000, "periods": 6},
+                "protocol": {"start_value": 1, "increment": 2, "cap": 100}
+            },
+            {
+                "goal": {"target_amount": 1000, "periods": 12},
+                "protocol": {"start_value": 1, "increment": 2, "cap": 100}
+            }
+        ]
+        single = client.post("/api/v1/protocols/progressive", json=items[0])
+        
+        response = client.post("/api/v1/protocols/batch", json={"items": items})
+        
+        assert response.status_code == 200
+        rejected, accepted = [json.loads(line) for line in response.text.splitlines()]
+        
+        assert single.status_code == 422
+        assert rejected["index"] == 0
+        assert rejected["decision"] == "rejected"
+        assert rejected["reason"] == single.json()["reason"]
+        assert accepted["protocol_type"] == "progressive"
+    
+    def test_batch_rejects_non_object_items(self):
+        """Item que não é objeto vira rejeição na sua posição"""
+        item = {
+            "goal": {"target_amount": 1000, "periods": 12},
+            "protocol": {"start_value": 1, "increment": 2, "cap": 100}
+        }
+        
+        response = client.post("/api/v1/protocols/batch", json={"items": [5, item, "x", None]})
+        
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        
+        assert [line["index"] for line in lines] == [0, 1, 2, 3]
+        assert [line.get("decision") for line in lines] == ["rejected", None, "rejected", "rejected"]
+        assert lines[1]["protocol_type"] == "progressive"
+    
+    def test_batch_max_items_from_settings(self, monkeypatch):
+        """Limite de itens vem de settings.batch_max_items"""
+        item = {
+            "goal": {"target_amount": 1000, "periods": 12},
+            "protocol": {"start_value": 1, "increment": 2, "cap": 100}
+        }
+        monkeypatch.setattr(settings, "batch_max_items", 3)
+        
+        assert client.post("/api/v1/protocols/batch", json={"items": [item] * 3}).status_code == 200
+        
+        response = client.post("/api/v1/protocols/batch", json={"items": [item] * 4})
+        assert response.status_code == 413
+        assert response.json()["field"] == "items"
+    
+    def test_batch_rejects_empty(self):
+        """Lote vazio é rejeitado"""
+        response = client.post("/api/v1/protocols/batch", json={"items": []})
+        
+        assert response.status_code == 422
+
+
 class TestProtocolInfo:
     """Testes do endpoint de informações"""
     
@@ -5,7 +5,7 @@ Testa matemática pura, isoladamente da API.
 """
 
 import pytest
-from engine.progression import ProgressiveEngine, ProgressionResult
+from engine.progression import SMALL_PERIODS, CappedProgression, ProgressionResult, ProgressiveEngine
 
 
 class TestProgressiveEngine:
@@ -97,3 +97,142 @@ class TestProgressionEdgeCases:
         
         assert result.total > 0
         assert len(result.progression) == 120
+
+
+def _loop_progression(start, increment, cap, periods):
+    """Referência: laço período a período"""
+    progression = []
+    current = start
+    for _ in range(periods):
+        progression.append(current)
+        current = min(current + increment, cap)
+    return progression
+
+
+class TestCappedProgression:
+    """Testes da forma fechada da progressão com teto"""
+    
+    @pytest.mark.parametrize("start,increment,cap,periods", [
+        (1, 2, 100, 12),
+        (1, 10, 50, 10),
+        (1, 0.5, 10, 120),
+        (100, 50, 2000, 120),
+        (10, 0, 50, 10),
+        (60, 5, 50, 6),
+        (50, -3, 40, 8),
+        (30, -3, 40, 8),
+        (1, 1, 500, 0),
+    ])
+    def test_matches_loop(self, start, increment, cap, periods):
+        """Total, pico e termos batem com o laço"""
+        expected = _loop_progression(start, increment, cap, periods)
+        progression = CappedProgression(start, increment, cap, periods)
+        
+        assert progression.total == pytest.approx(sum(expected))
+        assert progression.peak == pytest.approx(max(expected) if expected else 0)
+        assert list(progression) == pytest.approx(expected)
+    
+    def test_cap_period(self):
+        """Teto começa a valer no período certo"""
+        progression = CappedProgression(start=1, increment=10, cap=50, periods=10)
+        
+        assert progression.uncapped == 5
+        assert progression[4] == 41
+        assert progression[5] == 50
+    
+    def test_lazy_indexing(self):
+        """Visão preguiçosa suporta índice negativo e fatias"""
+        progression = CappedProgression(start=1, increment=2, cap=100, periods=12)
+        
+        assert len(progression) == 12
+        assert progression[-1] == 23
+        assert progression[:3] == [1, 3, 5]
+        
+        with pytest.raises(IndexError):
+            progression[12]
+    
+    def test_engine_result(self):
+        """Engine usa a forma fechada sem alterar o resultado"""
+        engine = ProgressiveEngine(target=1000, periods=12)
+        result = engine.calculate(start=1, increment=2, cap=100)
+        
+        assert result.total == 144
+        assert result.average == 12
+        assert result.peak == 23
+        assert result.progression == _loop_progression(1, 2, 100, 12)
+    
+    @pytest.mark.parametrize("start,increment,cap", [
+        (97.6, 49.95, 2000),
+        (1, 10, 25),
+        (10, 0, 50),
+        (60, 5, 50),
+        (50, -3, 40),
+        (30, -3.3, 40),
+    ])
+    def test_small_periods_as_list(self, start, increment, cap):
+        """Poucos períodos: lista pronta, idêntica à forma fechada"""
+        for periods in range(-1, SMALL_PERIODS + 2):
+            result = ProgressiveEngine(target=1000, periods=periods).calculate(start, increment, cap)
+            progression = CappedProgression(start, increment, cap, periods)
+            
+            assert isinstance(result.progression, list) == (periods <= SMALL_PERIODS)
+            assert list(result.progression) == list(progression)
+            assert result.total == round(progression.total, 2)
+            assert result.average == (round(progression.average, 2) if periods > 0 else 0)
+            assert result.peak == round(progression.peak, 2)
+
+
+class TestCalculateBatch:
+    """Testes do engine vetorizado"""
+    
+    def test_matches_scalar_engine(self):
+        """Cada posição do lote bate exatamente com o engine escalar"""
+        np = pytest.importorskip("numpy")
+        from engine.insights import classify_status
+        
+        rng = np.random.default_rng(42)
+        size = 2000
+        target = np.round(rng.uniform(10, 1_000_000, size), 2)
+        periods = rng.integers(3, 121, size)
+        start = np.round(rng.uniform(1, 100, size), 1)
+        increment = np.round(rng.uniform(0.5, 50, size), 2)
+        cap = np.round(rng.uniform(10, 2000, size), 2)
+        
+        batch = ProgressiveEngine.calculate_batch(target, periods, start, increment, cap)
+        labels = batch.status_labels()
+        
+        for i in range(size):
+            engine = ProgressiveEngine(target=float(target[i]), periods=int(periods[i]))
+            result = engine.calculate(float(start[i]), float(increment[i]), float(cap[i]))
+            viability = engine.calculate_viability(result.total)
+            
+            assert batch.total[i] == result.total
+            assert batch.average[i] == result.average
+            assert batch.peak[i] == result.peak
+            assert batch.viability[i] == viability
+            assert labels[i] == classify_status(viability)
+    
+    def test_broadcast_scalars(self):
+        """Escalares são propagados contra arrays"""
+        pytest.importorskip("numpy")
+        
+        batch = ProgressiveEngine.calculate_batch(
+            target=[100, 1000],
+            periods=12,
+            start=1,
+            increment=2,
+            cap=100
+        )
+        
+        assert len(batch) == 2
+        assert list(batch.total) == [144, 144]
+        assert list(batch.status_labels()) == ["reached", "incomplete"]
+    
+    def test_python_rounding(self):
+        """Empates de meio centavo seguem round() do Python"""
+        np = pytest.importorskip("numpy")
+        from engine.batch import round2
+        
+        values = np.array([2.675, 1.005, 0.125, 10.555, 3.14159])
+        
+        assert list(round2(values)) == [round(v, 2) for v in values.tolist()]
@@ -0,0 +1,138 @@
+"""
+Testes do Pipeline de Logs
+
+Testa enfileiramento, escrita em lote, amostragem e descarte.
+"""
+
+import json
+
+from fastapi.testclient import TestClient
+from logpipeline import LogPipeline
+from main import app
+from middleware import DecisionLogger
+
+
+def _read_lines(path) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestLogPipeline:
+    """Testes do logger com fila"""
+    
+    def test_writes_json_lines(self, tmp_path):
+        """Testa serialização em JSON lines no arquivo"""
+        sink = tmp_path / "api.jsonl"
+        pipeline = LogPipeline(sink=str(sink), autostart=False)
+        
+        pipeline.emit("request", {"path": "/health", "status_code": 200})
+        pipeline.emit("decision", {"outcome": "rejected"})
+        
+        # Nada escrito antes do flush: emit não faz I/O
+        assert not sink.exists()
+        
+        assert pipeline.flush() == 2
+        lines = _read_lines(sink)
+        
+        assert [line["event"] for line in lines] == ["request", "decision"]
+        assert lines[0]["path"] == "/health"
+        assert "timestamp" in lines[0]
+    
+    def test_batches(self, tmp_path):
+        """Testa escrita em lotes de batch_size"""
+        pipeline = LogPipeline(sink=str(tmp_path / "api.jsonl"), batch_size=10, autostart=False)
+        
+        for i in range(25):
+            pipeline.emit("request", {"i": i})
+        pipeline.flush()
+        
+        assert pipeline.batches == 3
+        assert pipeline.written == 25
+    
+    def test_drops_when_full(self, tmp_path):
+        """Testa descarte contado com fila cheia"""
+        pipeline = LogPipeline(sink=str(tmp_path / "api.jsonl"), max_queue=5, autostart=False)
+        
+        accepted = [pipeline.emit("decision", {"i": i}) for i in range(8)]
+        
+        assert accepted.count(True) == 5
+        assert pipeline.stats()["dropped"] == 3
+        assert pipeline.stats()["queue_depth"] == 5
+    
+    def test_adaptive_sampling(self, tmp_path):
+        """Testa amostragem só dos registros amostráveis sob carga"""
+        pipeline = LogPipeline(
+            sink=str(tmp_path / "api.jsonl"),
+            max_queue=100,
+            sample_high_water=0.5,
+            min_sample_rate=0.1,
+            autostart=False
+        )
+        
+        for i in range(50):
+            pipeline.emit("request", {"i": i}, sampled=True)
+        assert pipeline.sampled_out == 0
+        
+        # Acima da marca d'água: parte das requisições OK é descartada
+        for i in range(40):
+            pipeline.emit("request", {"i": i}, sampled=True)
+        assert pipeline.sampled_out > 0
+        assert pipeline.sample_rate() < 1.0
+        
+        # Decisões (não amostráveis) continuam entrando
+        depth = len(pipeline._queue)
+        pipeline.emit("decision", {"outcome": "rejected"})
+        assert len(pipeline._queue) == depth + 1
+        
+        pipeline.flush()
+        sampled = [line for line in _read_lines(tmp_path / "api.jsonl") if "sample_rate" in line]
+        assert sampled and all(line["sample_rate"] < 1.0 for line in sampled)
+    
+    def test_close_flushes_background_writer(self, tmp_path):
+        """Testa flush dos pendentes no desligamento"""
+        sink = tmp_path / "api.jsonl"
+        pipeline = LogPipeline(sink=str(sink), flush_interval=60)
+        
+        for i in range(10):
+            pipeline.emit("request", {"i": i})
+        pipeline.close()
+        
+        assert len(_read_lines(sink)) == 10
+        assert pipeline.stats()["queue_depth"] == 0
+    
+    def test_unwritable_sink_counts_errors(self, tmp_path):
+        """Testa que destino inválido não derruba quem loga"""
+        pipeline = LogPipeline(sink=str(tmp_path / "missing" / "api.jsonl"), autostart=False)
+        
+        pipeline.emit("request", {})
+        pipeline.flush()
+        
+        assert pipeline.errors == 1
+        assert pipeline.dropped == 1
+
+
+class TestDecisionLogging:
+    """Testes da integração com o logger de decisões e o middleware"""
+    
+    def test_decision_logger_enqueues(self, tmp_path):
+        """Testa que log_decision vai para o pipeline"""
+        pipeline = LogPipeline(sink=str(tmp_path / "api.jsonl"), autostart=False)
+        logger = DecisionLogger(pipeline=pipeline)
+        
+        logger.log_decision("rate_limit", "rejected", "limite", {"client_id": "a"})
+        pipeline.flush()
+        
+        line = _read_lines(tmp_path / "api.jsonl")[0]
+        assert line["event"] == "decision"
+        assert line["decision_type"] == "rate_limit"
+        assert line["metadata"] == {"client_id": "a"}
+    
+    def test_stats_endpoint(self):
+        """Testa contadores expostos pela API"""
+        client = TestClient(app)
+        client.get("/health")
+        
+        data = client.get("/api/v1/logs/stats").json()
+        
+        assert data["log_pipeline"]["emitted"] >= 1
+        assert "dropped" in data["log_pipeline"]
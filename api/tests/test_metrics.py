@@ -0,0 +1,145 @@
+"""
+Testes das Métricas
+
+Testa registro, formato Prometheus e instrumentação da API.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from metrics import (
+    BEHAVIOR_REJECTIONS,
+    REQUESTS_TOTAL,
+    MetricsRegistry,
+)
+
+client = TestClient(app)
+
+
+class TestRegistry:
+    """Testes do registro e da exposição em texto"""
+    
+    def test_counter_with_labels(self):
+        """Testa contador por combinação de labels"""
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs", ["kind"])
+        
+        counter.labels("a").inc()
+        counter.labels("a").inc(2)
+        counter.labels("b").inc()
+        
+        text = registry.render()
+        assert '# TYPE jobs_total counter' in text
+        assert 'jobs_total{kind="a"} 3' in text
+        assert 'jobs_total{kind="b"} 1' in text
+    
+    def test_histogram_cumulative_buckets(self):
+        """Testa buckets cumulativos, soma e contagem"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latência", buckets=(0.1, 1.0))
+        
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.observe(value)
+        
+        text = registry.render()
+        assert 'latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{le="1"} 3' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+        assert 'latency_seconds_sum 4.25' in text
+        assert 'latency_seconds_count 4' in text
+    
+    def test_quantile_estimate(self):
+        """Testa quantil por interpolação no bucket"""
+        histogram = MetricsRegistry().histogram("x", "x", buckets=(1.0, 2.0, 3.0))
+        child = histogram.labels()
+        
+        for value in (0.5, 1.5, 1.5, 2.5):
+            child.observe(value)
+        
+        assert child.quantile(0.5) == pytest.approx(1.5)
+        assert child.quantile(1.0) == pytest.approx(3.0)
+    
+    def test_label_escaping(self):
+        """Testa escape de aspas e quebras de linha"""
+        registry = MetricsRegistry()
+        registry.counter("c_total", "c", ["path"]).labels('a"b\nc').inc()
+        
+        assert 'c_total{path="a\\"b\\nc"} 1' in registry.render()
+    
+    def test_wrong_label_count(self):
+        """Testa labels faltando"""
+        counter = MetricsRegistry().counter("c_total", "c", ["a", "b"])
+        
+        with pytest.raises(ValueError):
+            counter.labels("x")
+    
+    def test_duplicate_metric(self):
+        """Testa nome duplicado"""
+        registry = MetricsRegistry()
+        registry.counter("c_total", "c")
+        
+        with pytest.raises(ValueError):
+            registry.counter("c_total", "c")
+    
+    def test_callback_metric(self):
+        """Testa valor lido na coleta"""
+        registry = MetricsRegistry()
+        state = {"value": 0.25}
+        registry.callback("ratio", "Razão", lambda: state["value"])
+        
+        state["value"] = 0.75
+        
+        assert "ratio 0.75" in registry.render()
+
+
+class TestMetricsEndpoint:
+    """Testes do /metrics e da instrumentação"""
+    
+    def test_content_type(self):
+        """Testa formato de exposição Prometheus"""
+        response = client.get("/metrics")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    
+    def test_route_latency_uses_template(self):
+        """Testa label da rota e rota desconhecida agrupada"""
+        client.get("/health")
+        client.get("/nao-existe-123")
+        
+        assert REQUESTS_TOTAL.value("/health", "GET", "200") >= 1
+        assert REQUESTS_TOTAL.value("unmatched", "GET", "404") >= 1
+        assert 'route="/nao-existe-123"' not in client.get("/metrics").text
+    
+    def test_stage_histograms(self):
+        """Testa estágios engine, insights e serialização do compare"""
+        payload = {
+            # Entrada única: cache miss, estágios executados
+            "goal": {"target_amount": 4321, "periods": 17},
+            "protocol": {"start_value": 3, "increment": 1.5, "cap": 250}
+        }
+        client.post("/api/v1/protocols/compare", json=payload)
+        
+        text = client.get("/metrics").text
+        for stage in ("engine", "insights", "serialization"):
+            assert f'protocol_stage_duration_seconds_count{{route="compare",stage="{stage}"}}' in text
+    
+    def test_rejection_counters(self):
+        """Testa contagem de rejeições comportamentais"""
+        before = BEHAVIOR_REJECTIONS.value("behavior_validation")
+        payload = {
+            "goal": {"target_amount": 500_000, "periods": 6},
+            "protocol": {"start_value": 1, "increment": 2, "cap": 100}
+        }
+        
+        client.post("/api/v1/protocols/compare", json=payload)
+        
+        assert BEHAVIOR_REJECTIONS.value("behavior_validation") == before + 1
+        assert "\nrate_limit_rejections_total " in client.get("/metrics").text
+    
+    def test_cache_ratio_exposed(self):
+        """Testa hit ratio do cache de respostas"""
+        text = client.get("/metrics").text
+        
+        assert "response_cache_hit_ratio" in text
+        assert "log_records_dropped_total" in text
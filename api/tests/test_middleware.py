@@ -0,0 +1,320 @@
+"""
+Testes do Middleware de Governança
+
+Testa rate limiting e proteção do usuário.
+"""
+
+import socket
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+from main import app
+from middleware import RateLimiter, RateLimitMiddleware
+from ratelimit import MemoryRateLimitBackend, RedisRateLimitBackend, SlidingWindowCounter
+from resp import RespConnectionPool
+from tests.resp_server import RespTestServer
+
+
+class FakeClock:
+    """Relógio controlado pelo teste"""
+    
+    def __init__(self, now: float = 10_000.0):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+class TestSlidingWindowCounter:
+    """Testes do contador de janela deslizante"""
+    
+    def test_counts_current_window(self):
+        """Testa contagem dentro da janela"""
+        counter = SlidingWindowCounter(60)
+        
+        for _ in range(5):
+            counter.estimate(120.0)
+            counter.hit()
+        
+        assert counter.estimate(130.0) == 5
+    
+    def test_previous_window_decays(self):
+        """Testa peso decrescente da janela anterior"""
+        counter = SlidingWindowCounter(60)
+        counter.estimate(120.0)
+        for _ in range(10):
+            counter.hit()
+        
+        # Metade da janela seguinte: metade do peso
+        assert counter.estimate(210.0) == pytest.approx(5)
+        
+        # Duas janelas depois: zerado
+        assert counter.estimate(300.0) == 0
+
+
+class TestRateLimiter:
+    """Testes do rate limiter"""
+    
+    def test_minute_limit(self):
+        """Testa bloqueio por minuto"""
+        clock = FakeClock()
+        limiter = RateLimiter(requests_per_minute=3, requests_per_hour=100, clock=clock)
+        
+        results = [limiter.check_limit("a")[0] for _ in range(4)]
+        
+        assert results == [True, True, True, False]
+        assert "minuto" in limiter.check_limit("a")[1]
+    
+    def test_hour_limit(self):
+        """Testa bloqueio por hora"""
+        clock = FakeClock()
+        limiter = RateLimiter(requests_per_minute=100, requests_per_hour=5, clock=clock)
+        
+        for _ in range(5):
+            assert limiter.check_limit("a")[0]
+            clock.advance(30)
+        
+        allowed, message = limiter.check_limit("a")
+        assert allowed is False
+        assert "hora" in message
+    
+    def test_window_recovers(self):
+        """Testa liberação após a janela passar"""
+        clock = FakeClock()
+        limiter = RateLimiter(requests_per_minute=2, requests_per_hour=100, clock=clock)
+        
+        limiter.check_limit("a")
+        limiter.check_limit("a")
+        assert limiter.check_limit("a")[0] is False
+        
+        clock.advance(120)
+        assert limiter.check_limit("a")[0] is True
+    
+    def test_clients_are_independent(self):
+        """Testa isolamento entre clientes"""
+        limiter = RateLimiter(requests_per_minute=1, clock=FakeClock())
+        
+        assert limiter.check_limit("a")[0] is True
+        assert limiter.check_limit("b")[0] is True
+        assert limiter.check_limit("a")[0] is False
+    
+    def test_idle_clients_evicted(self):
+        """Testa remoção de clientes ociosos"""
+        clock = FakeClock()
+        backend = MemoryRateLimitBackend(idle_timeout=600)
+        limiter = RateLimiter(backend=backend, clock=clock)
+        
+        for i in range(100):
+            limiter.check_limit(f"client-{i}")
+        
+        clock.advance(601)
+        limiter.check_limit("active")
+        
+        # Varredura incremental limitada por verificação
+        assert len(backend.clients) == 100 - backend.sweep_batch + 1
+        
+        assert limiter.sweep() == 100 - backend.sweep_batch
+        assert list(backend.clients) == ["active"]
+
+
+@pytest.fixture
+def resp_server():
+    """Servidor RESP local (substituto do Redis)"""
+    with RespTestServer() as server:
+        yield server
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestRedisRateLimitBackend:
+    """Testes do backend distribuído (protocolo Redis)"""
+    
+    def test_minute_limit(self, resp_server):
+        """Testa bloqueio por minuto via RESP"""
+        limiter = RateLimiter(
+            requests_per_minute=3,
+            requests_per_hour=100,
+            backend=RedisRateLimitBackend.from_url(resp_server.url),
+            clock=FakeClock()
+        )
+        
+        results = [limiter.check_limit("a")[0] for _ in range(4)]
+        
+        assert results == [True, True, True, False]
+        assert "minuto" in limiter.check_limit("a")[1]
+    
+    def test_quota_shared_between_workers(self, resp_server):
+        """Testa cota única para vários processos"""
+        clock = FakeClock()
+        workers = [
+            RateLimiter(
+                requests_per_minute=4,
+                requests_per_hour=100,
+                backend=RedisRateLimitBackend.from_url(resp_server.url),
+                clock=clock
+            )
+            for _ in range(4)
+        ]
+        
+        results = [worker.check_limit("a")[0] for worker in workers * 2]
+        
+        assert results.count(True) == 4
+    
+    def test_rejected_requests_not_counted(self, resp_server):
+        """Testa que rejeições não consomem cota"""
+        clock = FakeClock(now=6000.0)
+        limiter = RateLimiter(
+            requests_per_minute=2,
+            requests_per_hour=100,
+            backend=RedisRateLimitBackend.from_url(resp_server.url),
+            clock=clock
+        )
+        
+        for _ in range(10):
+            limiter.check_limit("a")
+        
+        # Janela seguinte completa: só as 2 aceitas pesam na anterior
+        clock.advance(60)
+        assert limiter.check_limit("a")[0] is False
+        clock.advance(30)
+        assert limiter.check_limit("a")[0] is True
+    
+    def test_single_round_trip_and_pooling(self, resp_server):
+        """Testa uma conexão reaproveitada e um script por verificação"""
+        limiter = RateLimiter(
+            backend=RedisRateLimitBackend.from_url(resp_server.url),
+            clock=FakeClock()
+        )
+        
+        for _ in range(20):
+            limiter.check_limit("a")
+        
+        assert resp_server.connections == 1
+        # EVAL na primeira, EVALSHA nas seguintes
+        assert resp_server.commands == 20
+    
+    def test_script_reloaded_after_flush(self, resp_server):
+        """Testa volta ao EVAL quando o servidor perde o script"""
+        backend = RedisRateLimitBackend.from_url(resp_server.url)
+        limiter = RateLimiter(requests_per_minute=2, backend=backend, clock=FakeClock())
+        
+        assert limiter.check_limit("a")[0] is True
+        backend.pool.pipeline([("SCRIPT", "FLUSH")])
+        
+        assert [limiter.check_limit("a")[0] for _ in range(2)] == [True, False]
+    
+    def test_fail_open_when_unavailable(self):
+        """Testa que backend fora do ar não bloqueia a API"""
+        pool = RespConnectionPool(port=_free_port(), timeout=0.2)
+        limiter = RateLimiter(backend=RedisRateLimitBackend(pool))
+        
+        assert limiter.check_limit("a") == (True, None)
+    
+    def test_backoff_before_reconnecting(self, resp_server, monkeypatch):
+        """Testa que, após falha, o pool recusa sem tentar conectar até o backoff vencer"""
+        pool = RespConnectionPool.from_url(resp_server.url, retry_backoff=0.2)
+        limiter = RateLimiter(backend=RedisRateLimitBackend(pool), clock=FakeClock())
+        attempts = []
+        connect = pool._connect
+        
+        def refuse():
+            attempts.append(time.monotonic())
+            raise ConnectionRefusedError("fora do ar")
+        
+        monkeypatch.setattr(pool, "_connect", refuse)
+        results = [limiter.check_limit("a") for _ in range(50)]
+        
+        assert results == [(True, None)] * 50
+        assert len(attempts) == 1
+        
+        # Backoff vencido: uma nova tentativa, que reconecta e fecha o circuito
+        monkeypatch.setattr(pool, "_connect", connect)
+        time.sleep(0.25)
+        assert limiter.check_limit("a") == (True, None)
+        assert resp_server.commands == 1
+        assert pool._failures == 0
+
+
+PROTOCOL_PAYLOAD = {
+    "goal": {
+        "target_amount": 1000,
+        "periods": 12
+    },
+    "protocol": {
+        "start_value": 1,
+        "increment": 2,
+        "cap": 100
+    }
+}
+
+
+class TestGovernanceChain:
+    """Testes da cadeia ASGI montada em main.app"""
+    
+    def test_security_headers(self):
+        """Testa headers de segurança em toda resposta"""
+        response = TestClient(app).get("/health")
+        
+        assert response.headers["x-content-type-options"] == "nosniff"
+        assert response.headers["x-frame-options"] == "DENY"
+    
+    def test_behavior_rejection(self):
+        """Testa rejeição comportamental antes do endpoint"""
+        payload = {
+            "goal": {"target_amount": 500_000, "periods": 6},
+            "protocol": PROTOCOL_PAYLOAD["protocol"]
+        }
+        
+        response = TestClient(app).post("/api/v1/protocols/compare", json=payload)
+        
+        assert response.status_code == 422
+        assert response.json()["decision"] == "rejected"
+        assert "educação" in response.json()["reason"].lower()
+    
+    def test_body_parsed_once(self, monkeypatch):
+        """Testa que o endpoint reaproveita o JSON do middleware"""
+        def fail(self):
+            raise AssertionError("corpo parseado duas vezes")
+        
+        monkeypatch.setattr(Request, "json", fail)
+        
+        response = TestClient(app).post("/api/v1/protocols/compare", json=PROTOCOL_PAYLOAD)
+        
+        assert response.status_code == 200
+    
+    def test_invalid_json_reaches_schema(self):
+        """Testa que JSON inválido segue para a validação do FastAPI"""
+        response = TestClient(app).post(
+            "/api/v1/protocols/progressive",
+            content=b"{not json",
+            headers={"content-type": "application/json"}
+        )
+        
+        assert response.status_code == 422
+    
+    def test_rate_limit_rejection(self):
+        """Testa 429 pelo middleware de rate limit"""
+        limited = FastAPI()
+        limited.add_middleware(
+            RateLimitMiddleware,
+            limiter=RateLimiter(requests_per_minute=2, clock=FakeClock())
+        )
+        
+        @limited.get("/")
+        async def root():
+            return {}
+        
+        client = TestClient(limited)
+        statuses = [client.get("/").status_code for _ in range(3)]
+        
+        assert statuses == [200, 200, 429]
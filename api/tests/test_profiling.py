@@ -0,0 +1,237 @@
+"""
+Testes do Profiling por Requisição
+
+Testa coletores, formatos, middleware opt-in e rotas admin.
+"""
+
+import json
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from config import Settings, settings
+from main import app
+from middleware import install_governance_middleware
+from profiling import (
+    ProfilingMiddleware,
+    RequestProfiler,
+    StackSampler,
+    TracingProfiler,
+    to_collapsed,
+    to_speedscope,
+)
+import profiling
+
+
+def busy(seconds: float, sampler=None, samples: int = 0):
+    """
+    Laço ocupado (aparece nas amostras)
+    
+    Args:
+        seconds: Duração (limite, se sampler for dado)
+        sampler: Sai assim que o amostrador tirar `samples` amostras
+            dentro do laço: não depende de quantas cabem no tempo
+    """
+    deadline = time.perf_counter() + seconds
+    target = sampler.samples + samples if sampler is not None else 0
+    while time.perf_counter() < deadline:
+        if sampler is not None and sampler.samples >= target:
+            break
+
+
+PAYLOAD = {
+    "goal": {"target_amount": 1000, "periods": 12},
+    "protocol": {"start_value": 1, "increment": 2, "cap": 100}
+}
+
+
+class TestCollectors:
+    """Testes dos coletores de pilha"""
+    
+    def test_sampler_sees_busy_function(self):
+        """Testa amostragem da thread observada"""
+        sampler = StackSampler(threading.get_ident(), interval=0.001)
+        sampler.start()
+        busy(30, sampler, samples=12)
+        stacks = sampler.stop()
+        
+        assert sampler.samples > 10
+        leaves = {stack[-1] for stack in stacks}
+        assert any(leaf.startswith("busy ") for leaf in leaves)
+        assert all(";" not in label for stack in stacks for label in stack)
+    
+    def test_tracing_profiler_attributes_self_time(self):
+        """Testa tempo próprio por pilha completa"""
+        def inner():
+            busy(0.02)
+        
+        def outer():
+            inner()
+        
+        profiler = TracingProfiler()
+        profiler.start()
+        outer()
+        stacks = profiler.stop()
+        
+        paths = {tuple(label.split(" ")[0] for label in stack): weight for stack, weight in stacks.items()}
+        key = next(k for k in paths if k[-1].endswith("busy") and any(p.endswith("inner") for p in k))
+        assert [p.rsplit(".", 1)[-1] for p in key[-3:]] == ["outer", "inner", "busy"]
+        assert sum(w for k, w in paths.items() if k[:len(key)] == key) >= 15_000
+
+
+class TestFormats:
+    """Testes dos formatos de saída"""
+    
+    def test_collapsed(self):
+        """Testa uma linha por pilha, pesos inteiros"""
+        text = to_collapsed({("main", "f"): 30, ("main", "g"): 10, ("main",): 0})
+        
+        assert text == "main;f 30\nmain;g 10\n"
+    
+    def test_speedscope(self):
+        """Testa frames compartilhados e pesos"""
+        data = to_speedscope({("main", "f"): 30, ("main", "g"): 10}, "perfil")
+        profile = data["profiles"][0]
+        
+        assert [f["name"] for f in data["shared"]["frames"]] == ["main", "f", "g"]
+        assert profile["samples"] == [[0, 1], [0, 2]]
+        assert profile["weights"] == [30, 10]
+        assert profile["endValue"] == 40
+
+
+class TestRequestProfiler:
+    """Testes da gravação e listagem"""
+    
+    def test_one_profile_at_a_time(self, tmp_path):
+        """Testa que um segundo perfil simultâneo é recusado"""
+        profiler = RequestProfiler(tmp_path)
+        first = profiler.begin()
+        
+        assert first is not None
+        assert profiler.begin() is None
+        
+        profiler.end(first)
+        assert profiler.end(profiler.begin()) is not None
+    
+    def test_prune_keeps_most_recent(self, tmp_path):
+        """Testa rotação por max_files"""
+        profiler = RequestProfiler(tmp_path, max_files=3)
+        
+        names = [f"20240101T00000{i}-abcdef-GET-root.collapsed.txt" for i in range(5)]
+        for name in names:
+            profiler.save({("main",): 1}, "GET", "/", 200, 0.001, name=name)
+        
+        assert [p["name"] for p in profiler.recent()] == names[:1:-1]
+    
+    def test_resolve_rejects_traversal(self, tmp_path):
+        """Testa que só nomes gerados são servidos"""
+        profiler = RequestProfiler(tmp_path)
+        path = profiler.save({("main",): 1}, "GET", "/health", 200, 0.001)
+        
+        assert profiler.resolve(path.name) == path
+        assert profiler.resolve("../config.py") is None
+        assert profiler.resolve("20240101T000000-abcdef-GET-x.collapsed.txt") is None
+    
+    def test_invalid_mode(self, tmp_path):
+        """Testa modo desconhecido"""
+        with pytest.raises(ValueError):
+            RequestProfiler(tmp_path, mode="perf")
+
+
+class TestProfilingMiddleware:
+    """Testes do middleware opt-in"""
+    
+    @pytest.fixture
+    def profiler(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "admin_token", "segredo")
+        return RequestProfiler(tmp_path, interval=0.0005)
+    
+    def test_not_installed_by_default(self):
+        """Testa custo zero: fora da cadeia quando desligado"""
+        target = FastAPI()
+        install_governance_middleware(target, Settings(profiling_enabled=False))
+        
+        assert ProfilingMiddleware not in {m.cls for m in target.user_middleware}
+        
+        install_governance_middleware(target, Settings(profiling_enabled=True))
+        assert target.user_middleware[0].cls is ProfilingMiddleware
+    
+    def test_header_requires_admin_token(self, profiler):
+        """Testa que X-Profile sem token válido não perfila"""
+        client = TestClient(ProfilingMiddleware(app, profiler))
+        
+        response = client.post(
+            "/api/v1/protocols/progressive", json=PAYLOAD,
+            headers={"X-Profile": "1", "X-Admin-Token": "errado"}
+        )
+        
+        assert response.status_code == 200
+        assert "x-profile-id" not in response.headers
+        assert profiler.recent() == []
+    
+    @pytest.mark.parametrize("mode", ["sampling", "deterministic"])
+    def test_admin_header_writes_profile(self, profiler, mode):
+        """Testa perfil sob demanda, nos dois modos"""
+        profiler.mode = mode
+        client = TestClient(ProfilingMiddleware(app, profiler))
+        
+        response = client.post(
+            "/api/v1/protocols/progressive", json=PAYLOAD,
+            headers={"X-Profile": "1", "X-Admin-Token": "segredo"}
+        )
+        name = response.headers["x-profile-id"]
+        
+        assert response.status_code == 200
+        assert [p["name"] for p in profiler.recent()] == [name]
+        
+        text = profiler.resolve(name).read_text(encoding="utf-8")
+        assert text.startswith("# POST /api/v1/protocols/progressive → 200")
+        if mode == "deterministic":
+            assert "create_progressive_protocol" in text
+    
+    def test_sample_rate(self, profiler):
+        """Testa amostragem sem header, em speedscope"""
+        profiler.sample_rate = 0.5
+        profiler.output_format = "speedscope"
+        draws = iter([0.9, 0.1])
+        client = TestClient(ProfilingMiddleware(app, profiler, rng=lambda: next(draws)))
+        
+        skipped = client.get("/health")
+        sampled = client.get("/health")
+        
+        assert "x-profile-id" not in skipped.headers
+        data = json.loads(profiler.resolve(sampled.headers["x-profile-id"]).read_text(encoding="utf-8"))
+        assert data["profiles"][0]["unit"] == "microseconds"
+
+
+class TestAdminProfiles:
+    """Testes das rotas admin de perfis"""
+    
+    def test_requires_admin(self, monkeypatch):
+        """Testa rota fechada sem ADMIN_TOKEN"""
+        monkeypatch.setattr(settings, "admin_token", None)
+        
+        assert TestClient(app).get("/api/v1/admin/profiles").status_code == 403
+    
+    def test_list_and_download(self, tmp_path, monkeypatch):
+        """Testa listagem e download de um perfil"""
+        monkeypatch.setattr(settings, "admin_token", "segredo")
+        monkeypatch.setattr(profiling.request_profiler, "directory", tmp_path)
+        path = profiling.request_profiler.save({("main", "f"): 5}, "POST", "/api/v1/protocols/compare", 200, 0.002)
+        client = TestClient(app)
+        headers = {"X-Admin-Token": "segredo"}
+        
+        listing = client.get("/api/v1/admin/profiles", headers=headers).json()
+        
+        assert listing["count"] == 1
+        assert listing["profiles"][0]["name"] == path.name
+        assert listing["profiles"][0]["method"] == "POST"
+        
+        download = client.get(f"/api/v1/admin/profiles/{path.name}", headers=headers)
+        assert download.status_code == 200
+        assert "main;f 5" in download.text
+        
+        missing = client.get("/api/v1/admin/profiles/..%2Fmain.py", headers=headers)
+        assert missing.status_code == 404
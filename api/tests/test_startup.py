@@ -0,0 +1,149 @@
+"""
+Testes da Inicialização Rápida
+
+Testa OpenAPI pré-gerado, aquecimento e readiness.
+"""
+
+import json
+import time
+
+import anyio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from config import settings
+from main import app
+from startup import (
+    StartupState,
+    asgi_request,
+    install_openapi_cache,
+    load_openapi,
+    openapi_fingerprint,
+    startup_state,
+    warm_up,
+)
+
+
+def small_app() -> FastAPI:
+    target = FastAPI(title="Teste", version="1.0")
+    
+    @target.get("/ping")
+    async def ping():
+        return {"ok": True}
+    
+    return target
+
+
+class TestOpenAPICache:
+    """Testes do documento pré-gerado"""
+    
+    def test_generates_then_reads_file(self, tmp_path):
+        """Testa gravação no primeiro acesso e leitura nos seguintes"""
+        path = tmp_path / "openapi.json"
+        first = small_app()
+        install_openapi_cache(first, path, directory=tmp_path)
+        
+        schema = first.openapi()
+        assert "/ping" in schema["paths"]
+        
+        # Arquivo alterado com a mesma impressão digital: prova que foi lido
+        data = json.loads(path.read_text(encoding="utf-8"))
+        data["openapi"]["info"]["title"] = "Do arquivo"
+        path.write_text(json.dumps(data), encoding="utf-8")
+        
+        second = small_app()
+        install_openapi_cache(second, path, directory=tmp_path)
+        assert second.openapi()["info"]["title"] == "Do arquivo"
+        assert TestClient(second).get("/openapi.json").json()["info"]["title"] == "Do arquivo"
+    
+    def test_stale_file_is_regenerated(self, tmp_path):
+        """Testa invalidação quando a fonte muda"""
+        path = tmp_path / "openapi.json"
+        first = small_app()
+        install_openapi_cache(first, path, directory=tmp_path)
+        first.openapi()
+        before = openapi_fingerprint(first, tmp_path)
+        
+        (tmp_path / "schemas.py").write_text("X = 1\n", encoding="utf-8")
+        second = small_app()
+        after = openapi_fingerprint(second, tmp_path)
+        
+        assert before != after
+        assert load_openapi(path, after) is None
+        
+        install_openapi_cache(second, path, directory=tmp_path)
+        second.openapi()
+        assert load_openapi(path, after) is not None
+    
+    def test_read_only_destination(self, tmp_path):
+        """Testa que falha de escrita não quebra o /openapi.json"""
+        target = small_app()
+        install_openapi_cache(target, tmp_path / "missing" / "openapi.json", directory=tmp_path)
+        
+        assert TestClient(target).get("/openapi.json").status_code == 200
+    
+    def test_same_document_as_fastapi(self, tmp_path):
+        """Testa que o documento do cache é o mesmo gerado pelo FastAPI"""
+        path = tmp_path / "openapi.json"
+        expected = FastAPI.openapi(app)
+        app.openapi_schema = None
+        
+        install_openapi_cache(app, path)
+        try:
+            assert app.openapi() == expected
+            assert load_openapi(path, openapi_fingerprint(app)) == expected
+        finally:
+            del app.openapi  # volta ao método da classe
+            app.openapi_schema = None
+
+
+class TestWarmup:
+    """Testes do aquecimento e do /ready"""
+    
+    def test_asgi_request(self):
+        """Testa requisição interna pela cadeia completa"""
+        body = json.dumps({"target_amount": 1200, "periods": 12}).encode()
+        
+        assert anyio.run(asgi_request, app, "POST", "/api/v1/protocols/optimized", body) == 200
+        assert anyio.run(asgi_request, app, "GET", "/nao-existe") == 404
+    
+    def test_warm_up_marks_ready(self):
+        """Testa status por rota e prontidão mesmo com falha"""
+        state = StartupState()
+        requests = [("GET", "/health", None), ("GET", "/nao-existe", None)]
+        
+        anyio.run(warm_up, app, requests, state)
+        
+        assert state.ready
+        assert state.warmup_statuses == {"GET /health": 200, "GET /nao-existe": 404}
+        assert state.warmup_seconds is not None
+    
+    def test_ready_without_warmup(self, monkeypatch):
+        """Testa /ready imediato com o aquecimento desligado"""
+        monkeypatch.setattr(settings, "startup_warmup", False)
+        monkeypatch.setattr(startup_state, "ready", False)
+        
+        assert TestClient(app).get("/ready").status_code == 503  # sem lifespan
+        
+        with TestClient(app) as client:
+            assert client.get("/ready").status_code == 200
+    
+    def test_ready_after_warmup(self, monkeypatch):
+        """Testa /health imediato e /ready após o aquecimento"""
+        monkeypatch.setattr(settings, "startup_warmup", True)
+        monkeypatch.setattr(startup_state, "ready", False)
+        monkeypatch.setattr(startup_state, "warmup_statuses", {})
+        
+        with TestClient(app) as client:
+            assert client.get("/health").status_code == 200
+            
+            deadline = time.monotonic() + 10
+            response = client.get("/ready")
+            while response.status_code == 503 and time.monotonic() < deadline:
+                time.sleep(0.01)
+                response = client.get("/ready")
+        
+        data = response.json()
+        assert response.status_code == 200
+        assert data["status"] == "ready"
+        assert set(data["warmup"].values()) == {200}
+        assert "POST /api/v1/protocols/progressive" in data["warmup"]
@@ -0,0 +1,15 @@
+"""
+Benchmarks dos Módulos da Raiz
+
+Executar a partir da raiz do repositório:
+    python -m benchmarks.<módulo>
+
+(Benchmarks da API ficam em api/benchmarks.)
+"""
+
+import sys
+from pathlib import Path
+
+# Adiciona a raiz ao path para imports
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
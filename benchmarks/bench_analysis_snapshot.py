@@ -0,0 +1,97 @@
+"""
+Benchmark do Snapshot de Análise
+
+export_to_json com e sem memoização por versão, em cargas com
+proporções diferentes de leituras por escrita (add_transaction).
+Sem snapshot, cada leitura refaz visão geral três vezes
+(overview, insights, previsões) e serializa de novo.
+
+Uso (a partir da raiz):
+    python -m benchmarks.bench_analysis_snapshot
+    python -m benchmarks.bench_analysis_snapshot --reads 50000 --ratios 1 10 1000
+"""
+
+import argparse
+import json
+import time
+
+from benchmarks.bench_transaction_store import make_transactions
+from financial_analysis import FinancialAnalyzer
+
+
+class UncachedAnalyzer(FinancialAnalyzer):
+    """Caminho anterior ao snapshot (referência)"""
+    
+    def export_to_json(self) -> str:
+        overview = self.get_overview()
+        insights = self._build_insights(self.get_overview())
+        predictions = self.predict_future_balance()
+        
+        data = {
+            "overview": {
+                "income": overview.total_income,
+                "expenses": overview.total_expenses,
+                "balance": overview.balance,
+                "status": overview.status
+            },
+            "categories": [
+                {
+                    "name": cat.category,
+                    "total": cat.total,
+                    "percentage": round(cat.percentage, 2),
+                    "count": cat.transactions_count
+                }
+                for cat in overview.categories
+            ],
+            "insights": insights,
+            "predictions": predictions
+        }
+        
+        return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def run(cls, history, stream, reads: int, ratio: int) -> float:
+    """µs por leitura: uma escrita a cada `ratio` leituras"""
+    analyzer = cls()
+    for t in history:
+        analyzer.add_transaction(t)
+    
+    writes = iter(stream)
+    started = time.perf_counter()
+    for i in range(reads):
+        if i % ratio == 0:
+            analyzer.add_transaction(next(writes))
+        analyzer.export_to_json()
+    return (time.perf_counter() - started) / reads * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do snapshot de análise")
+    parser.add_argument("--history", type=int, default=10_000, help="Transações iniciais")
+    parser.add_argument("--reads", type=int, default=20_000, help="Leituras por cenário")
+    parser.add_argument("--ratios", type=int, nargs="+", default=[1, 10, 100, 1000])
+    args = parser.parse_args()
+    
+    transactions = make_transactions(args.history + args.reads)
+    history, stream = transactions[:args.history], transactions[args.history:]
+    
+    # Mesma saída nos dois caminhos
+    cached, uncached = FinancialAnalyzer(), UncachedAnalyzer()
+    for t in history:
+        cached.add_transaction(t)
+        uncached.add_transaction(t)
+    assert cached.export_to_json() == uncached.export_to_json()
+    
+    print("=" * 64)
+    print(f"SNAPSHOT — export_to_json, {args.history:,} transações (µs por leitura)")
+    print("=" * 64)
+    print(f"{'leituras/escrita':>18}{'sem snapshot':>16}{'snapshot':>12}{'ganho':>10}")
+    
+    for ratio in args.ratios:
+        before = run(UncachedAnalyzer, history, stream, args.reads, ratio)
+        after = run(FinancialAnalyzer, history, stream, args.reads, ratio)
+        print(f"{ratio:>18,}{before:>16.2f}{after:>12.2f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark do Detector de Anomalias
+
+1. Vazão: transações/s de observe_batch (TransactionBatch) e de
+   observe (uma Transaction por vez)
+2. Memória: bytes por usuário com N detectores vivos (tracemalloc)
+   e tamanho do estado persistido (save_detectors)
+3. Ingestão: LedgerIngestor com e sem detector
+
+Uso (a partir da raiz):
+    python -m benchmarks.bench_anomaly_detection
+    python -m benchmarks.bench_anomaly_detection --rows 1000000 --users 1000000
+"""
+
+from pathlib import Path
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+
+from anomaly_detection import AnomalyDetector, save_detectors
+from benchmarks.bench_ingestion import write_ledger
+from benchmarks.bench_multiuser_runner import synthetic_user
+from benchmarks.bench_transaction_store import make_transactions
+from financial_analysis import ColumnarTransactionStore, FinancialAnalyzer, TransactionBatch
+from ledger_ingest import LedgerIngestor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do detector de anomalias")
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--users", type=int, default=100_000)
+    args = parser.parse_args()
+    
+    print("=" * 64)
+    print("DETECTOR DE ANOMALIAS")
+    print("=" * 64)
+    
+    transactions = sorted(make_transactions(args.rows), key=lambda t: t.date)
+    batch = TransactionBatch.from_transactions(transactions)
+    
+    detector = AnomalyDetector()
+    started = time.perf_counter()
+    found = detector.observe_batch(batch)
+    seconds = time.perf_counter() - started
+    print(f"{'observe_batch':<28}{args.rows / seconds:>14,.0f} transações/s  ({len(found):,} anomalias)")
+    
+    detector = AnomalyDetector()
+    started = time.perf_counter()
+    for t in transactions:
+        detector.observe(t)
+    seconds = time.perf_counter() - started
+    print(f"{'observe (uma a uma)':<28}{args.rows / seconds:>14,.0f} transações/s  ({seconds / args.rows * 1e6:.2f} µs)")
+    
+    # Memória de N usuários (6 meses de histórico cada): estados de
+    # 200 usuários sintéticos, restaurados em cópias independentes
+    states = []
+    for seed in range(200):
+        detector = AnomalyDetector()
+        detector.observe_batch(synthetic_user(seed))
+        states.append(detector.to_bytes())
+    
+    gc.collect()
+    tracemalloc.start()
+    detectors = {str(i): AnomalyDetector.from_bytes(states[i % len(states)]) for i in range(args.users)}
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    categories = sum(len(d) for d in detectors.values()) / len(detectors)
+    print()
+    print(f"{args.users:,} usuários, {categories:.1f} categorias em média:")
+    print(f"  {'memória (com user_id e dict)':<34}{current / args.users:>8.0f} bytes/usuário  ({current / 1e6:,.0f} MB)")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        path = tmp / "detectores.bin"
+        started = time.perf_counter()
+        save_detectors(path, detectors)
+        print(f"  {'persistido':<34}{path.stat().st_size / args.users:>8.0f} bytes/usuário  (gravado em {time.perf_counter() - started:.2f}s)")
+        del detectors
+        
+        # Ingestão com e sem detector
+        csv_path = tmp / "extrato.csv"
+        write_ledger(csv_path, args.rows, bad_every=10**12)
+        print()
+        for name, make_detector in (("ingestão sem detector", lambda: None), ("ingestão com detector", AnomalyDetector)):
+            ingestor = LedgerIngestor(FinancialAnalyzer(ColumnarTransactionStore()), detector=make_detector())
+            report = ingestor.ingest(csv_path)
+            print(f"{name:<28}{report.rows_per_second:>14,.0f} linhas/s  ({report.anomalies:,} anomalias)")
+
+
+if __name__ == "__main__":
+    main()
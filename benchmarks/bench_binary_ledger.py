@@ -0,0 +1,154 @@
+"""
+Benchmark do Formato Binário
+
+1. Grava um histórico sintético de N linhas (padrão 10M) e mede
+   abrir + primeira visão geral, contra reimportar CSV.
+2. Abre o mesmo arquivo em vários processos e lê as colunas inteiras:
+   páginas do mmap compartilhadas (Rss sem páginas privadas; Pss
+   divide o compartilhado entre os processos) em vez de cópias
+   privadas por processo (Linux, /proc/self/smaps_rollup).
+
+Uso (a partir da raiz):
+    python -m benchmarks.bench_binary_ledger
+    python -m benchmarks.bench_binary_ledger --rows 2000000 --workers 4
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.bench_ingestion import write_ledger
+from benchmarks.bench_transaction_store import CATEGORIES
+from financial_analysis import ColumnarTransactionStore, FinancialAnalyzer
+from ledger_binary import open_ledger, save_ledger
+from ledger_ingest import LedgerIngestor
+
+
+def synthetic_store(n: int, seed: int = 42) -> ColumnarTransactionStore:
+    """Colunas geradas direto em numpy (sem Transaction por linha)"""
+    rng = np.random.default_rng(seed)
+    is_income = np.arange(n) % 20 == 0
+    codes = np.where(is_income, len(CATEGORIES), rng.integers(0, len(CATEGORIES), n)).astype(np.int32)
+    amounts = np.round(np.where(is_income, rng.uniform(5, 5000, n), rng.uniform(5, 400, n)), 2)
+    days = (737791 + rng.integers(0, 5 * 365, n)).astype(np.int32)  # 2021-01-01 + 5 anos
+    
+    categories = CATEGORIES + ["Salário"]
+    expense_order = list(dict.fromkeys(codes[~is_income][:10_000].tolist()))
+    
+    return ColumnarTransactionStore.from_columns(
+        amounts=amounts,
+        days=days,
+        is_income=is_income,
+        category_codes=codes,
+        categories=categories,
+        ids=[str(i) for i in range(n)],
+        descriptions=[""] * n,
+        expense_order=expense_order
+    )
+
+
+def memory_rollup() -> dict:
+    """Rss/Pss/Shared_Clean/Private do processo (kB → MB)"""
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return {}
+    
+    values = {}
+    for line in lines[1:]:
+        parts = line.split()
+        if len(parts) >= 2 and parts[1].isdigit():
+            values[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return values
+
+
+def worker(path: str) -> dict:
+    """Abre o arquivo e lê todas as colunas numéricas"""
+    before = memory_rollup()
+    started = time.perf_counter()
+    
+    analyzer = open_ledger(path)
+    store = analyzer.store
+    checksum = float(store.amounts.sum()) + int(store.days.sum()) + int(store.category_codes.sum())
+    seconds = time.perf_counter() - started
+    
+    after = memory_rollup()
+    keys = ("Rss", "Pss", "Private_Clean", "Private_Dirty")
+    delta = {key: after.get(key, 0) - before.get(key, 0) for key in keys}
+    return {"pid": os.getpid(), "seconds": seconds, "checksum": checksum, **delta}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do formato binário")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--csv-rows", type=int, default=500_000, help="Linhas da referência CSV")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "ledger.gfl"
+        
+        store = synthetic_store(args.rows)
+        started = time.perf_counter()
+        save_ledger(path, store)
+        save_seconds = time.perf_counter() - started
+        del store
+        
+        started = time.perf_counter()
+        analyzer = open_ledger(path)
+        open_seconds = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        analyzer.get_overview()
+        overview_seconds = time.perf_counter() - started
+        
+        # Primeira leitura de uma coluna inteira (páginas do arquivo)
+        started = time.perf_counter()
+        float(analyzer.store.amounts.sum())
+        scan_seconds = time.perf_counter() - started
+        del analyzer
+        
+        csv_path = Path(tmp) / "ledger.csv"
+        write_ledger(csv_path, args.csv_rows, bad_every=10**12)
+        started = time.perf_counter()
+        LedgerIngestor(FinancialAnalyzer(ColumnarTransactionStore())).ingest(csv_path)
+        csv_seconds = time.perf_counter() - started
+        
+        print("=" * 64)
+        print(f"FORMATO BINÁRIO — {args.rows:,} linhas, {path.stat().st_size / 1e6:,.0f} MB")
+        print("=" * 64)
+        print(f"{'gravar':<42}{save_seconds * 1000:>12.0f} ms")
+        print(f"{'abrir (mmap + agregados)':<42}{open_seconds * 1000:>12.2f} ms")
+        print(f"{'primeira visão geral':<42}{overview_seconds * 1000:>12.2f} ms")
+        print(f"{'varrer amounts (sum)':<42}{scan_seconds * 1000:>12.1f} ms")
+        print(
+            f"{'reimportar CSV (estimado p/ N linhas)':<42}"
+            f"{csv_seconds * args.rows / args.csv_rows * 1000:>12.0f} ms"
+            f"  ({args.csv_rows:,} linhas em {csv_seconds:.2f}s)"
+        )
+        
+        if not args.workers:
+            return
+        
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            results = list(pool.map(worker, [str(path)] * args.workers))
+        
+        print()
+        print(f"{args.workers} processos lendo o mesmo arquivo (MB por processo):")
+        print(f"{'pid':>8}{'tempo (ms)':>12}{'Rss':>10}{'Pss':>10}{'Shared':>10}{'Privado':>10}")
+        for r in results:
+            private = r["Private_Clean"] + r["Private_Dirty"]
+            print(
+                f"{r['pid']:>8}{r['seconds'] * 1000:>12.1f}{r['Rss']:>10.1f}"
+                f"{r['Pss']:>10.1f}{r['Rss'] - private:>10.1f}{private:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,479 @@
+"""
+Microbenchmarks do Motor de Protocolos
+
+Cobre ProgressiveEngine (calculate, optimize, simulate_scenarios,
+calculate_batch), ArithmeticProgression, ProgressiveSavingProtocol,
+ProtocolValidator e BehavioralInsights:
+- por período (--periods, 3 a 120): uma chamada por operação
+- por lote (--batches, 1 a 1M): protocolos por chamada, laço escalar
+  vs calculate_batch (NumPy)
+
+Métricas de cada caso:
+- ops/s: melhor de --repeat rodadas intercaladas, cada medição com
+  pelo menos --min-time segundos (gc desligado, como timeit)
+- custo relativo: tempo por operação / tempo de uma carga fixa de
+  referência medida logo antes (mediana das rodadas); é o que a
+  comparação usa, porque não muda com a velocidade da máquina
+- pico: bytes alocados além do início durante uma chamada
+  (tracemalloc; temporários + resultado)
+- blocos: blocos de memória que sobrevivem a cada chamada
+  (sys.getallocatedblocks, resultado mantido vivo)
+
+Baselines versionadas: benchmarks/baselines/engine/<commit>.json.
+--ref mede outro commit num git worktree temporário com este mesmo
+script; compare aponta regressões entre dois commits (código 1).
+
+Uso (a partir da raiz):
+    python -m benchmarks.bench_engine run
+    python -m benchmarks.bench_engine run --save
+    python -m benchmarks.bench_engine run --ref HEAD~5 --save
+    python -m benchmarks.bench_engine compare HEAD~5 HEAD
+    python -m benchmarks.bench_engine run --periods 3 120 --batches 1 1000000
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines" / "engine"
+
+SCHEMA_VERSION = 1
+
+DEFAULT_PERIODS = [3, 12, 36, 120]
+DEFAULT_BATCHES = [1, 100, 10_000, 1_000_000]
+
+# Laço escalar acima disso fica de fora (só muda a escala, não o perfil)
+DEFAULT_LOOP_LIMIT = 100_000
+
+# Memória só entra na comparação acima disso (ruído de blocos pequenos)
+MIN_MEMORY_DELTA = 1024
+
+
+@dataclass
+class Case:
+    """Uma operação medida: fn() executa `ops` operações"""
+    group: str
+    name: str
+    param: str
+    fn: Callable[[], Any]
+    ops: int = 1
+    
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.param}]"
+
+
+# ==================== CASOS ====================
+
+def build_cases(periods: List[int], batches: List[int], loop_limit: int) -> List[Case]:
+    """
+    Casos dos alvos importados da raiz atual (sys.path)
+    
+    Operações ausentes no commit medido (ex.: calculate_batch em
+    commits antigos) são puladas.
+    """
+    from api.engine import ProgressiveEngine
+    from financial_engine import (
+        ArithmeticProgression,
+        BehavioralInsights,
+        ProgressiveSavingProtocol,
+        ProtocolValidator,
+    )
+    
+    cases: List[Case] = []
+    
+    def add(group: str, name: str, param: str, make: Callable[[], Callable[[], Any]], ops: int = 1):
+        try:
+            fn = make()
+        except (AttributeError, ImportError):
+            return
+        cases.append(Case(group, name, param, fn, ops))
+    
+    def add_periods(n: int):
+        param = f"n={n}"
+        target = 150.0 * n
+        rng = random.Random(n)
+        actual = [max(0.0, 1 + 2 * i + rng.uniform(-5, 5)) for i in range(n)]
+        sequence = ArithmeticProgression.generate_sequence(1, 2, n)
+        engine = ProgressiveEngine(target, n)
+        protocol = ProgressiveSavingProtocol(target, n)
+        expected = protocol.optimize_for_target().progression
+        
+        add("engine", "ProgressiveEngine.calculate", param, lambda: lambda: engine.calculate(1, 2, 100))
+        add("engine", "ProgressiveEngine.calculate+lista", param, lambda: lambda: list(engine.calculate(1, 2, 100).progression))
+        add("engine", "ProgressiveEngine.optimize", param, lambda: engine.optimize)
+        add("engine", "ProgressiveEngine.simulate_scenarios", param, lambda: lambda: engine.simulate_scenarios((1, 10), (1, 5), 100))
+        
+        add("progression", "ArithmeticProgression.generate_sequence", param, lambda: lambda: ArithmeticProgression.generate_sequence(1, 2, n))
+        add("progression", "ArithmeticProgression.validate_progression", param, lambda: lambda: ArithmeticProgression.validate_progression(sequence))
+        add("progression", "ArithmeticProgression.apply_psychological_cap", param, lambda: lambda: ArithmeticProgression.apply_psychological_cap(sequence, 100))
+        add("progression", "ArithmeticProgression.find_difference_for_sum", param, lambda: lambda: ArithmeticProgression.find_difference_for_sum(1, target, n))
+        
+        add("goals", "ProgressiveSavingProtocol.generate_progression", param, lambda: lambda: protocol.generate_progression(1, 2, 100))
+        add("goals", "ProgressiveSavingProtocol.optimize_for_target", param, lambda: protocol.optimize_for_target)
+        add("goals", "ProgressiveSavingProtocol.linear_distribution", param, lambda: protocol.linear_distribution)
+        add("goals", "ProgressiveSavingProtocol.calculate_maturity_score", param, lambda: lambda: protocol.calculate_maturity_score(actual))
+        
+        add("validation", "ProtocolValidator.validate_feasibility", param, lambda: lambda: ProtocolValidator.validate_feasibility(target, n, 5000))
+        add("validation", "ProtocolValidator.validate_consistency", param, lambda: lambda: ProtocolValidator.validate_consistency(expected, actual))
+        add("validation", "ProtocolValidator.calculate_sustainability_score", param, lambda: lambda: ProtocolValidator.calculate_sustainability_score(n // 2, n, n // 10))
+        
+        add("insights", "BehavioralInsights.behavioral_pattern_analysis", param, lambda: lambda: BehavioralInsights.behavioral_pattern_analysis(actual))
+        add("insights", "BehavioralInsights.interpret_progress", param, lambda: lambda: BehavioralInsights.interpret_progress(n // 2, n, target * 0.4, target))
+        add("insights", "BehavioralInsights.readiness_for_investment", param, lambda: lambda: BehavioralInsights.readiness_for_investment(0.85, n))
+        add("insights", "BehavioralInsights.generate_next_action", param, lambda: lambda: BehavioralInsights.generate_next_action("in_progress", n // 2, 0.7))
+    
+    def add_batch(size: int):
+        param = f"lote={size}"
+        rng = random.Random(size)
+        targets = [float(rng.randrange(500, 20_000, 50)) for _ in range(size)]
+        months = [rng.randint(3, 120) for _ in range(size)]
+        starts = [float(rng.randint(1, 5)) for _ in range(size)]
+        increments = [float(rng.randint(1, 5)) for _ in range(size)]
+        caps = [float(rng.randrange(100, 501, 50)) for _ in range(size)]
+        rows = list(zip(targets, months, starts, increments, caps))
+        
+        def calculate_loop():
+            return [ProgressiveEngine(t, p).calculate(s, d, c) for t, p, s, d, c in rows]
+        
+        def make_batch():
+            import numpy as np
+            
+            batch = ProgressiveEngine.calculate_batch
+            arrays = [np.asarray(column, dtype=np.float64) for column in (targets, months, starts, increments, caps)]
+            return lambda: batch(*arrays)
+        
+        if size <= loop_limit:
+            add("batch", "ProgressiveEngine.calculate (laço)", param, lambda: calculate_loop, ops=size)
+        add("batch", "ProgressiveEngine.calculate_batch", param, make_batch, ops=size)
+    
+    # Funções por período/lote: cada caso enxerga os próprios valores
+    for n in periods:
+        add_periods(n)
+    for size in batches:
+        add_batch(size)
+    
+    return cases
+
+
+# ==================== MEDIÇÃO ====================
+
+def _clock(fn: Callable[[], Any], number: int) -> float:
+    started = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return time.perf_counter() - started
+
+
+def calibrate(fn: Callable[[], Any], min_time: float) -> int:
+    """Chamadas necessárias para uma medição durar min_time"""
+    number = 1
+    while True:
+        elapsed = _clock(fn, number)
+        if elapsed >= min_time:
+            return number
+        # Próxima tentativa mira min_time (no máximo 10x)
+        number = int(number * min(10.0, 1.2 * min_time / max(elapsed, 1e-9))) + 1
+
+
+def reference_workload() -> float:
+    """Carga fixa de referência (dict, lista, float, str): mede a velocidade da máquina no momento"""
+    values = {}
+    for i in range(200):
+        values[i] = [i * 1.5, str(i)]
+    return sum(v[0] for v in values.values())
+
+
+def memory_case(fn: Callable[[], Any], ops: int) -> Dict[str, float]:
+    """Pico alocado numa chamada e blocos retidos por chamada"""
+    calls = 1 if ops >= 10_000 else 20
+    fn()  # caches preguiçosos fora da medição
+    gc.collect()
+    gc.disable()
+    try:
+        tracemalloc.start()
+        start = tracemalloc.get_traced_memory()[0]
+        result = fn()
+        peak = tracemalloc.get_traced_memory()[1] - start
+        tracemalloc.stop()
+        del result
+        
+        kept: List[Any] = [None] * calls
+        before = sys.getallocatedblocks()
+        for i in range(calls):
+            kept[i] = fn()
+        blocks = (sys.getallocatedblocks() - before) / calls
+        del kept
+    finally:
+        gc.enable()
+    return {"peak_bytes": peak, "blocks": round(blocks, 1)}
+
+
+def run_suite(cases: List[Case], min_time: float, repeat: int, memory: bool) -> Dict[str, Dict[str, Any]]:
+    """
+    Mede todos os casos em `repeat` rodadas intercaladas
+    
+    Cada medição vem logo depois de uma da carga de referência:
+    custo relativo = tempo do caso / tempo da referência, mediana
+    das rodadas. Máquinas compartilhadas mudam de velocidade ao longo
+    da execução; o relativo se cancela, o ops/s bruto (melhor rodada)
+    não. compare usa o relativo.
+    """
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        numbers = [calibrate(case.fn, min_time) for case in cases]
+        reference_number = calibrate(reference_workload, min_time / 5)
+        
+        seconds: List[List[float]] = [[] for _ in cases]
+        relative: List[List[float]] = [[] for _ in cases]
+        for _ in range(repeat):
+            for i, case in enumerate(cases):
+                reference = _clock(reference_workload, reference_number) / reference_number
+                elapsed = _clock(case.fn, numbers[i]) / numbers[i]
+                seconds[i].append(elapsed)
+                relative[i].append(elapsed / case.ops / reference)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    
+    results = {}
+    for i, case in enumerate(cases):
+        best = min(seconds[i])
+        result = {
+            "group": case.group,
+            "ops": case.ops,
+            "ops_per_sec": round(case.ops / best, 1),
+            "ns_per_op": round(best / case.ops * 1e9, 1),
+            "relative_cost": round(statistics.median(relative[i]), 6),
+        }
+        if memory:
+            result.update(memory_case(case.fn, case.ops))
+        results[case.key] = result
+    return results
+
+
+# ==================== BASELINES ====================
+
+def _git(*args: str, cwd: Path = ROOT) -> str:
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def current_label(root: Path) -> str:
+    """Commit curto; '-dirty' se o motor tem mudanças não commitadas"""
+    commit = _git("rev-parse", "--short", "HEAD", cwd=root)
+    dirty = _git("status", "--porcelain", "--", "api/engine", "financial_engine", cwd=root)
+    return f"{commit}-dirty" if dirty else commit
+
+
+def baseline_path(label: str) -> Path:
+    return BASELINE_DIR / f"{label}.json"
+
+
+def resolve_baseline(reference: str) -> Path:
+    """Arquivo JSON, rótulo já gravado ou commit (resolvido com git)"""
+    candidate = Path(reference)
+    if candidate.suffix == ".json" and candidate.exists():
+        return candidate
+    if baseline_path(reference).exists():
+        return baseline_path(reference)
+    try:
+        return baseline_path(_git("rev-parse", "--short", reference))
+    except subprocess.CalledProcessError:
+        return baseline_path(reference)
+
+
+def print_results(results: Dict[str, Dict[str, Any]], reference: Optional[Dict[str, Dict[str, Any]]] = None):
+    print(f"{'caso':<62}{'ops/s':>14}{'ns/op':>12}{'pico KiB':>12}{'blocos':>10}{'Δ veloc.':>9}")
+    group = None
+    for key, r in results.items():
+        if r["group"] != group:
+            group = r["group"]
+            print(f"— {group}")
+        delta = ""
+        if reference and key in reference:
+            delta = f"{speed_change(reference[key], r):>+9.1%}"
+        memory = f"{r['peak_bytes'] / 1024:>12,.1f}{r['blocks']:>10,.1f}" if "peak_bytes" in r else f"{'':>22}"
+        print(f"  {key:<60}{r['ops_per_sec']:>14,.0f}{r['ns_per_op']:>12,.1f}{memory}{delta}")
+
+
+def speed_change(before: Dict[str, Any], now: Dict[str, Any]) -> float:
+    """Variação de velocidade (+ = mais rápido): custo relativo se houver, senão ops/s"""
+    if "relative_cost" in before and "relative_cost" in now:
+        return before["relative_cost"] / now["relative_cost"] - 1
+    return now["ops_per_sec"] / before["ops_per_sec"] - 1
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], threshold: float) -> List[str]:
+    """Regressões de old → new: velocidade caiu ou pico de memória subiu além do limite"""
+    regressions = []
+    for key, now in new["results"].items():
+        before = old["results"].get(key)
+        if before is None:
+            continue
+        
+        change = speed_change(before, now)
+        if change < -threshold:
+            regressions.append(f"{key}: velocidade {change:+.1%} (ops/s {before['ops_per_sec']:,.0f} → {now['ops_per_sec']:,.0f})")
+        
+        if "peak_bytes" in now and "peak_bytes" in before:
+            grown = now["peak_bytes"] - before["peak_bytes"]
+            if grown > MIN_MEMORY_DELTA and grown > threshold * max(before["peak_bytes"], 1):
+                regressions.append(f"{key}: pico {before['peak_bytes']:,} → {now['peak_bytes']:,} bytes")
+    return regressions
+
+
+# ==================== COMANDOS ====================
+
+def command_run(args):
+    if args.ref:
+        return run_at_ref(args)
+    
+    root = Path(args.root).resolve() if args.root else ROOT
+    # Alvos importados da raiz escolhida (worktree de outro commit)
+    sys.path.insert(0, str(root))
+    sys.path.insert(1, str(root / "api"))
+    
+    cases = build_cases(args.periods, args.batches, args.loop_limit)
+    label = args.label or current_label(root)
+    
+    started = time.perf_counter()
+    results = run_suite(cases, args.min_time, args.repeat, not args.no_memory)
+    
+    baseline = {
+        "schema": SCHEMA_VERSION,
+        "label": label,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "config": {
+            "periods": args.periods,
+            "batches": args.batches,
+            "loop_limit": args.loop_limit,
+            "min_time": args.min_time,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    
+    reference = None
+    if args.against:
+        path = resolve_baseline(args.against)
+        reference = json.loads(path.read_text(encoding="utf-8"))["results"]
+    
+    print("=" * 119)
+    print(f"MOTOR DE PROTOCOLOS — {label}, {len(cases)} casos em {time.perf_counter() - started:.1f}s")
+    print("=" * 119)
+    print_results(results, reference)
+    
+    if args.save:
+        path = baseline_path(label)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(baseline, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"\nBaseline gravada em {path}")
+
+
+def run_at_ref(args):
+    """Mede outro commit: worktree temporário, este script, baseline aqui"""
+    commit = _git("rev-parse", "--short", args.ref)
+    worktree = Path(tempfile.mkdtemp(prefix=f"bench-engine-{commit}-"))
+    _git("worktree", "add", "--detach", str(worktree), commit)
+    try:
+        command = [
+            sys.executable, "-m", "benchmarks.bench_engine", "run",
+            "--root", str(worktree), "--label", args.label or commit,
+            "--periods", *map(str, args.periods),
+            "--batches", *map(str, args.batches),
+            "--loop-limit", str(args.loop_limit),
+            "--min-time", str(args.min_time),
+            "--repeat", str(args.repeat),
+        ]
+        command += ["--save"] * args.save + ["--no-memory"] * args.no_memory
+        if args.against:
+            command += ["--against", args.against]
+        subprocess.run(command, cwd=ROOT, check=True)
+    finally:
+        _git("worktree", "remove", "--force", str(worktree))
+        shutil.rmtree(worktree, ignore_errors=True)
+
+
+def command_compare(args):
+    old_path, new_path = resolve_baseline(args.old), resolve_baseline(args.new)
+    for path, name in ((old_path, args.old), (new_path, args.new)):
+        if not path.exists():
+            print(f"❌ Sem baseline para {name} ({path}); grave com: run --ref {name} --save")
+            sys.exit(2)
+    
+    old = json.loads(old_path.read_text(encoding="utf-8"))
+    new = json.loads(new_path.read_text(encoding="utf-8"))
+    
+    print("=" * 119)
+    print(f"MOTOR DE PROTOCOLOS — {old['label']} → {new['label']}")
+    print("=" * 119)
+    print_results(new["results"], old["results"])
+    
+    if old["environment"] != new["environment"] or old["config"] != new["config"]:
+        print("\n⚠️  Ambiente ou configuração diferentes: comparação aproximada")
+    
+    missing = sorted(set(old["results"]) - set(new["results"]))
+    if missing:
+        print(f"\nCasos ausentes em {new['label']}: {', '.join(missing)}")
+    
+    regressions = compare(old, new, args.threshold)
+    if regressions:
+        print(f"\n❌ Regressões além de {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\n✅ Sem regressões além de {args.threshold:.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks do motor de protocolos")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    run = commands.add_parser("run", help="Mede os casos (commit atual ou --ref)")
+    run.add_argument("--periods", type=int, nargs="+", default=DEFAULT_PERIODS)
+    run.add_argument("--batches", type=int, nargs="+", default=DEFAULT_BATCHES)
+    run.add_argument("--loop-limit", type=int, default=DEFAULT_LOOP_LIMIT, help="Maior lote do laço escalar")
+    run.add_argument("--min-time", type=float, default=0.02, help="Segundos mínimos por medição")
+    run.add_argument("--repeat", type=int, default=5, help="Rodadas intercaladas")
+    run.add_argument("--no-memory", action="store_true", help="Sem medição de alocações")
+    run.add_argument("--save", action="store_true", help="Grava baselines/engine/<rótulo>.json")
+    run.add_argument("--label", help="Rótulo da baseline (padrão: commit curto)")
+    run.add_argument("--against", help="Baseline para a coluna Δ (commit, rótulo ou arquivo)")
+    run.add_argument("--ref", help="Mede outro commit num worktree temporário")
+    run.add_argument("--root", help=argparse.SUPPRESS)
+    run.set_defaults(handler=command_run)
+    
+    diff = commands.add_parser("compare", help="Compara duas baselines (commit, rótulo ou arquivo)")
+    diff.add_argument("old")
+    diff.add_argument("new")
+    diff.add_argument("--threshold", type=float, default=0.2, help="Piora tolerada (fração)")
+    diff.set_defaults(handler=command_compare)
+    
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
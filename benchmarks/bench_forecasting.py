@@ -0,0 +1,81 @@
+"""
+Benchmark da Previsão em Lote
+
+Séries sintéticas (tendência + sazonalidade + ruído, históricos de
+tamanhos diferentes) para N usuários × 36 meses. Compara:
+- loop: um ajuste por usuário (forecast_series)
+- lote: forecast_batch com a matriz inteira
+
+Mede usuários/s e confere que o lote dá o mesmo resultado do loop e
+que as faixas de 80% cobrem ~80% dos meses seguintes.
+
+Uso (a partir da raiz):
+    python -m benchmarks.bench_forecasting
+    python -m benchmarks.bench_forecasting --users 10000 1000000 --loop-users 2000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from forecasting import forecast_batch, forecast_series
+
+
+MONTHS = 36
+HORIZON = 6
+
+
+def synthetic_series(users: int, seed: int = 42) -> np.ndarray:
+    """Fluxo mensal: usuários × (histórico + meses a prever); NaN antes do início"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(MONTHS + HORIZON)
+    level = rng.uniform(-500, 3000, (users, 1))
+    trend = rng.normal(0, 15, (users, 1))
+    season = rng.uniform(0, 400, (users, 1)) * np.sin(2 * np.pi * (t + rng.integers(0, 12, (users, 1))) / 12)
+    noise = rng.normal(0, 1, (users, len(t))) * rng.uniform(50, 300, (users, 1))
+    values = level + trend * t + season + noise
+    
+    # Início do histórico variável (usuários novos)
+    starts = rng.choice([0, 0, 0, 12, 24, 30, 34], users)
+    values[t[None, :] < starts[:, None]] = np.nan
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da previsão em lote")
+    parser.add_argument("--users", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--loop-users", type=int, default=2_000, help="Usuários medidos no loop (extrapolado)")
+    args = parser.parse_args()
+    
+    print("=" * 72)
+    print(f"PREVISÃO — {MONTHS} meses de histórico, {HORIZON} à frente")
+    print("=" * 72)
+    
+    series = synthetic_series(args.loop_users)
+    history, future = series[:, :MONTHS], series[:, MONTHS:]
+    loop_rates = {}
+    
+    for method in ("linear", "ewma"):
+        started = time.perf_counter()
+        looped = np.vstack([forecast_series(row, HORIZON, method=method).balance for row in history])
+        loop_rates[method] = len(history) / (time.perf_counter() - started)
+        
+        batch = forecast_batch(history, HORIZON, method=method)
+        same = np.allclose(batch.balance, looped)
+        covered = ((future >= batch.flow_lower) & (future <= batch.flow_upper)).mean()
+        print(f"{method}: loop {loop_rates[method]:,.0f} usuários/s; lote = loop: {same}; cobertura 80%: {covered:.1%}")
+    
+    print()
+    print(f"{'usuários':>12}{'método':>10}{'segundos':>12}{'usuários/s':>14}{'vs loop':>10}")
+    for users in args.users:
+        history = synthetic_series(users)[:, :MONTHS]
+        for method in ("linear", "ewma"):
+            started = time.perf_counter()
+            forecast_batch(history, HORIZON, method=method)
+            seconds = time.perf_counter() - started
+            print(f"{users:>12,}{method:>10}{seconds:>12.2f}{users / seconds:>14,.0f}{users / seconds / loop_rates[method]:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
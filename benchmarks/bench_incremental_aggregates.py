@@ -0,0 +1,87 @@
+"""
+Benchmark dos Agregados Incrementais
+
+Compara o FinancialAnalyzer (agregados mantidos em add/remove)
+com o caminho anterior, que recalculava tudo a cada leitura:
+duas passadas para totais, uma para categorias, reagrupamento
+e ordenação — e export_to_json repetia isso três vezes.
+
+Uso (a partir da raiz):
+    python -m benchmarks.bench_incremental_aggregates
+    python -m benchmarks.bench_incremental_aggregates --sizes 1000 100000
+"""
+
+from typing import List, Tuple
+import argparse
+import time
+
+from benchmarks.bench_transaction_store import best_of, make_transactions
+from financial_analysis import CategorySummary, FinancialAnalyzer
+
+
+class RecomputingAnalyzer(FinancialAnalyzer):
+    """Comportamento anterior: varre as transações a cada leitura (referência)"""
+    
+    def calculate_totals(self) -> Tuple[float, float, float]:
+        income, expenses = self.store.totals()
+        return income, expenses, income - expenses
+    
+    def analyze_by_category(self) -> List[CategorySummary]:
+        total_expenses, categories = self.store.expense_by_category()
+        summaries = [
+            CategorySummary(
+                category=category,
+                total=total,
+                percentage=(total / total_expenses * 100) if total_expenses > 0 else 0,
+                transactions_count=count
+            )
+            for category, total, count in categories
+        ]
+        summaries.sort(key=lambda x: x.total, reverse=True)
+        return summaries
+    
+    def snapshot(self):
+        # Sem memoização: cada leitura recalcula
+        self._snapshot = None
+        return super().snapshot()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos agregados incrementais")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+    
+    print("=" * 78)
+    print("AGREGADOS INCREMENTAIS — recálculo por leitura vs O(categorias)")
+    print("=" * 78)
+    print(f"{'n':>9}  {'analyzer':<14}{'add (µs)':>10}{'overview':>12}{'insights':>12}{'export':>12}")
+    
+    for n in args.sizes:
+        transactions = make_transactions(n)
+        results = {}
+        
+        for name, cls in (("recálculo", RecomputingAnalyzer), ("incremental", FinancialAnalyzer)):
+            analyzer = cls()
+            
+            started = time.perf_counter()
+            for t in transactions:
+                analyzer.add_transaction(t)
+            add_us = (time.perf_counter() - started) / n * 1e6
+            
+            results[name] = (
+                best_of(analyzer.get_overview),
+                best_of(analyzer.generate_insights),
+                best_of(analyzer.export_to_json),
+            )
+            overview, insights, export = results[name]
+            print(
+                f"{n:>9,}  {name:<14}{add_us:>10.2f}"
+                f"{overview * 1000:>10.3f}ms{insights * 1000:>10.3f}ms{export * 1000:>10.3f}ms"
+            )
+        
+        speedup = results["recálculo"][2] / results["incremental"][2]
+        print(f"{'':>11}→ export_to_json {speedup:.0f}x mais rápido")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Benchmark da Ingestão em Streaming
+
+Extrato CSV (e JSONL) dos usuários do gerador de carga
+(workload_generator, concatenados) com ~0,1% de linhas inválidas;
+compara:
+- ingênuo: lê o arquivo inteiro (csv.DictReader → lista) e chama
+  add_transaction linha a linha
+- LedgerIngestor: blocos de chunk_size, conversão por coluna,
+  rejeitados em arquivo (também com pause_gc=True)
+
+Mede vazão (linhas/s) e memória de pico da ingestão
+(pico menos o que fica retido no armazenamento do analisador).
+
+Uso (a partir da raiz):
+    python -m benchmarks.bench_ingestion
+    python -m benchmarks.bench_ingestion --sizes 100000 1000000 --chunk-size 20000
+"""
+
+from datetime import date
+from pathlib import Path
+import argparse
+import csv
+import gc
+import json
+import tempfile
+import time
+import tracemalloc
+
+from financial_analysis import ColumnarTransactionStore, FinancialAnalyzer, Transaction
+from ledger_ingest import LedgerIngestor
+from workload_generator import WorkloadGenerator
+
+
+def write_ledger(path: Path, n: int, seed: int = 42, bad_every: int = 1000):
+    """Extrato do gerador de carga (~5 anos por usuário): CSV ou JSONL pelo sufixo"""
+    batch = WorkloadGenerator(seed=seed, months=60, start=date(2021, 1, 1)).transactions(n)
+    as_jsonl = path.suffix == ".jsonl"
+    
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = None if as_jsonl else csv.writer(f)
+        if writer:
+            writer.writerow(["id", "date", "category", "amount", "type", "description"])
+        
+        rows = zip(batch.ids, batch.dates, batch.categories, batch.amounts, batch.types, batch.descriptions)
+        for i, (id, day, category, amount, kind, description) in enumerate(rows):
+            row = [id, day, category, f"{amount:.2f}", kind, description]
+            if i % bad_every == bad_every - 1:
+                row[3] = "N/A"  # valor inválido
+            
+            if writer:
+                writer.writerow(row)
+            else:
+                f.write(json.dumps(dict(zip(("id", "date", "category", "amount", "type", "description"), row))) + "\n")
+
+
+def naive_ingest(path: Path, analyzer: FinancialAnalyzer) -> int:
+    """Referência: arquivo inteiro em memória, uma Transaction por vez"""
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    
+    accepted = 0
+    for row in rows:
+        try:
+            analyzer.add_transaction(Transaction(
+                id=row["id"],
+                date=row["date"],
+                category=row["category"],
+                amount=float(row["amount"]),
+                type=row["type"],
+                description=row["description"]
+            ))
+            accepted += 1
+        except ValueError:
+            pass
+    return accepted
+
+
+def measure(run) -> tuple:
+    """(segundos, pico da ingestão em MB)"""
+    gc.collect()
+    started = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - started
+    
+    gc.collect()
+    tracemalloc.start()
+    analyzer = run()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del analyzer
+    return seconds, (peak - retained) / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da ingestão em streaming")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 500_000])
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        
+        print("=" * 78)
+        print(f"INGESTÃO — ColumnarTransactionStore, blocos de {args.chunk_size:,} linhas")
+        print("=" * 78)
+        print(f"{'linhas':>10}  {'caminho':<22}{'linhas/s':>12}{'pico (MB)':>12}{'rejeitadas':>12}")
+        
+        for n in args.sizes:
+            csv_path, jsonl_path = tmp / f"extrato_{n}.csv", tmp / f"extrato_{n}.jsonl"
+            write_ledger(csv_path, n)
+            write_ledger(jsonl_path, n)
+            
+            def naive():
+                analyzer = FinancialAnalyzer(ColumnarTransactionStore())
+                naive_ingest(csv_path, analyzer)
+                return analyzer
+            
+            reports = {}
+            
+            def streaming(path, pause_gc=False):
+                def run():
+                    analyzer = FinancialAnalyzer(ColumnarTransactionStore())
+                    reports[path.suffix] = LedgerIngestor(
+                        analyzer,
+                        chunk_size=args.chunk_size,
+                        reject_path=tmp / "rejeitados.jsonl",
+                        pause_gc=pause_gc
+                    ).ingest(path)
+                    return analyzer
+                return run
+            
+            rows = [
+                ("ingênuo (CSV)", naive, n // 1000),
+                ("streaming (CSV)", streaming(csv_path), None),
+                ("streaming (pause_gc)", streaming(csv_path, pause_gc=True), None),
+                ("streaming (JSONL)", streaming(jsonl_path), None),
+            ]
+            for name, run, rejected in rows:
+                seconds, peak_mb = measure(run)
+                if rejected is None:
+                    rejected = reports[".jsonl" if "JSONL" in name else ".csv"].rejected
+                print(f"{n:>10,}  {name:<22}{n / seconds:>12,.0f}{peak_mb:>12.1f}{rejected:>12,}")
+        
+        # Vazão por bloco, do último arquivo
+        print()
+        print(f"Vazão por bloco ({args.sizes[-1]:,} linhas, CSV):")
+        LedgerIngestor(
+            FinancialAnalyzer(ColumnarTransactionStore()),
+            chunk_size=args.chunk_size,
+            on_chunk=lambda c: print(
+                f"  bloco {c.index:>3}: {c.rows:>7,} linhas, {c.rejected:>4} rejeitadas, "
+                f"{c.rows_per_second:>10,.0f} linhas/s"
+            )
+        ).ingest(tmp / f"extrato_{args.sizes[-1]}.csv")
+
+
+if __name__ == "__main__":
+    main()
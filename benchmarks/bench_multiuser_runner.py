@@ -0,0 +1,90 @@
+"""
+Benchmark da Análise em Lote (vários usuários)
+
+Compara o job noturno atual (um loop: FinancialAnalyzer +
+export_to_json por usuário) com o MultiUserRunner em 1, 2, 4...
+processos, até os núcleos disponíveis. As transações de cada usuário
+são geradas no worker (functools.partial com a semente): o processo
+principal só distribui lotes e grava o JSONL.
+
+Escala esperada: quase linear com os núcleos (lotes independentes,
+sem estado compartilhado); a utilização por worker mostra se o
+processo principal virou gargalo.
+
+Uso (a partir da raiz):
+    python -m benchmarks.bench_multiuser_runner
+    python -m benchmarks.bench_multiuser_runner --users 1000000 --batch-size 512
+"""
+
+from functools import partial
+from pathlib import Path
+from typing import Iterator, List
+import argparse
+import os
+import tempfile
+import time
+
+from financial_analysis import FinancialAnalyzer, Transaction
+from ledger_runner import MultiUserRunner, UserLedger
+from workload_generator import WorkloadGenerator
+
+
+def synthetic_user(seed: int, months: int = 6) -> List[Transaction]:
+    """Extrato do usuário `seed` no gerador de carga"""
+    return list(WorkloadGenerator(months=months).user(seed).ledger)
+
+
+def ledgers(users: int) -> Iterator[UserLedger]:
+    for seed in range(users):
+        yield str(seed), partial(synthetic_user, seed)
+
+
+def nightly_loop(users: int, output: Path) -> float:
+    """Referência: o job atual, um usuário por vez"""
+    started = time.perf_counter()
+    with open(output, "w", encoding="utf-8") as f:
+        for seed in range(users):
+            analyzer = FinancialAnalyzer()
+            for transaction in synthetic_user(seed):
+                analyzer.add_transaction(transaction)
+            f.write(analyzer.export_to_json() + "\n")
+    return time.perf_counter() - started
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Benchmark da análise em lote")
+    parser.add_argument("--users", type=int, default=50_000, help="Use 1000000 para a carga completa")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--workers", type=int, nargs="+", default=None)
+    args = parser.parse_args()
+    
+    workers = args.workers or sorted({1, 2, 4, 8, 16, cores} & set(range(1, cores + 1)))
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        
+        print("=" * 72)
+        print(f"ANÁLISE EM LOTE — {args.users:,} usuários, lotes de {args.batch_size}, {cores} núcleo(s)")
+        print("=" * 72)
+        print(f"{'caminho':<28}{'usuários/s':>14}{'aceleração':>12}{'utilização média':>18}")
+        
+        baseline = args.users / nightly_loop(args.users, tmp / "loop.jsonl")
+        print(f"{'loop atual':<28}{baseline:>14,.0f}{1.0:>11.2f}x{'-':>18}")
+        
+        for count in [0] + workers:
+            report = MultiUserRunner(workers=count, batch_size=args.batch_size).run(
+                ledgers(args.users), tmp / f"runner_{count}.jsonl"
+            )
+            utilization = sum(w.utilization for w in report.workers) / len(report.workers)
+            name = "runner sem pool" if count == 0 else f"runner, {count} processo(s)"
+            print(f"{name:<28}{report.users_per_second:>14,.0f}{report.users_per_second / baseline:>11.2f}x{utilization:>17.0%}")
+        
+        print()
+        print(f"Workers ({workers[-1]} processo(s)):")
+        for w in report.workers:
+            print(f"  {w.worker:>10}: {w.batches:>5} lotes, {w.users:>8,} usuários, {w.utilization:>5.0%} ocupado")
+
+
+if __name__ == "__main__":
+    main()
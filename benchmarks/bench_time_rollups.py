@@ -0,0 +1,116 @@
+"""
+Benchmark dos Rollups por Período
+
+Consultas do dashboard (MonthBar/MonthsCarousel):
+- últimos 24 meses, por mês
+- últimos 90 dias (intervalo exato)
+
+Compara varrer o histórico a cada consulta (loop Python na lista;
+máscara numpy no colunar) com os rollups do FinancialAnalyzer
+(busca binária nas chaves + soma dos períodos). Mede também a
+construção inicial dos rollups e o custo extra por add_transaction.
+
+Uso (a partir da raiz):
+    python -m benchmarks.bench_time_rollups
+    python -m benchmarks.bench_time_rollups --sizes 100000 1000000
+"""
+
+from datetime import date, timedelta
+from typing import Dict, List
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.bench_transaction_store import best_of, make_transactions
+from financial_analysis import ColumnarTransactionStore, FinancialAnalyzer, Transaction
+
+
+END = date(2025, 12, 31)
+MONTHS_START = date(2024, 1, 1)
+DAYS_START = END - timedelta(days=89)
+
+
+def scan_months_list(transactions: List[Transaction]) -> Dict[str, float]:
+    """Referência: gastos por mês varrendo a lista"""
+    start = MONTHS_START.isoformat()
+    months: Dict[str, float] = {}
+    for t in transactions:
+        if t.type == 'expense' and t.date >= start:
+            months[t.date[:7]] = months.get(t.date[:7], 0.0) + t.amount
+    return months
+
+
+def scan_months_columnar(store: ColumnarTransactionStore) -> np.ndarray:
+    """Referência: máscara + bincount por mês sobre as colunas"""
+    n = store.size
+    days = store.days[:n]
+    mask = (days >= MONTHS_START.toordinal()) & ~store.is_income[:n]
+    months = (days[mask].astype(np.int64) - date(1970, 1, 1).toordinal()).astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    return np.bincount(months - months.min(), weights=store.amounts[:n][mask])
+
+
+def scan_days_columnar(store: ColumnarTransactionStore) -> float:
+    n = store.size
+    days = store.days[:n]
+    mask = (days >= DAYS_START.toordinal()) & (days <= END.toordinal()) & ~store.is_income[:n]
+    return float(store.amounts[:n][mask].sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos rollups por período")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+    
+    print("=" * 78)
+    print("ROLLUPS — 24 meses e 90 dias (ms por consulta)")
+    print("=" * 78)
+    print(f"{'n':>10}  {'caminho':<32}{'construir':>11}{'24 meses':>11}{'90 dias':>11}")
+    
+    for n in args.sizes:
+        transactions = make_transactions(n)
+        
+        # Lista: varredura Python × rollups
+        listed = FinancialAnalyzer()
+        listed.add_transactions(transactions)
+        months_scan = best_of(lambda: scan_months_list(listed.transactions), repeat=3)
+        print(f"{n:>10,}  {'lista: varredura':<32}{'-':>11}{months_scan * 1000:>11.2f}{'-':>11}")
+        
+        started = time.perf_counter()
+        listed.rollup("month")
+        build = time.perf_counter() - started
+        months = best_of(lambda: listed.rollup("month", start=MONTHS_START, end=END))
+        days = best_of(lambda: listed.summarize_range(DAYS_START, END))
+        print(f"{'':>10}  {'lista: rollups':<32}{build * 1000:>11.1f}{months * 1000:>11.3f}{days * 1000:>11.3f}")
+        
+        # Colunar: máscara numpy × rollups (construção vetorizada)
+        columnar = FinancialAnalyzer(ColumnarTransactionStore.from_transactions(transactions))
+        months_scan = best_of(lambda: scan_months_columnar(columnar.store))
+        days_scan = best_of(lambda: scan_days_columnar(columnar.store))
+        print(f"{'':>10}  {'colunar: máscara numpy':<32}{'-':>11}{months_scan * 1000:>11.2f}{days_scan * 1000:>11.2f}")
+        
+        started = time.perf_counter()
+        columnar.rollup("month")
+        build = time.perf_counter() - started
+        months = best_of(lambda: columnar.rollup("month", start=MONTHS_START, end=END))
+        days = best_of(lambda: columnar.summarize_range(DAYS_START, END))
+        print(f"{'':>10}  {'colunar: rollups':<32}{build * 1000:>11.1f}{months * 1000:>11.3f}{days * 1000:>11.3f}")
+    
+    # Custo incremental por transação
+    transactions = make_transactions(50_000, seed=7)
+    results = {}
+    for name, warm in (("sem rollups", False), ("com rollups", True)):
+        analyzer = FinancialAnalyzer()
+        if warm:
+            analyzer.rollup()
+        started = time.perf_counter()
+        for t in transactions:
+            analyzer.add_transaction(t)
+        results[name] = (time.perf_counter() - started) / len(transactions) * 1e6
+    
+    print()
+    print("add_transaction (µs): " + ", ".join(f"{name} {us:.2f}" for name, us in results.items()))
+
+
+if __name__ == "__main__":
+    main()
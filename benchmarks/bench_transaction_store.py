@@ -0,0 +1,112 @@
+"""
+Benchmark do Armazenamento de Transações
+
+Compara ListTransactionStore (lista de dataclasses) com
+ColumnarTransactionStore (colunas numpy) no FinancialAnalyzer:
+memória retida e tempo de calculate_totals, analyze_by_category
+e get_overview.
+
+Uso (a partir da raiz):
+    python -m benchmarks.bench_transaction_store
+    python -m benchmarks.bench_transaction_store --sizes 10000 100000 1000000
+"""
+
+from datetime import date
+from typing import Callable, List
+import argparse
+import gc
+import time
+import tracemalloc
+
+from financial_analysis import (
+    ColumnarTransactionStore,
+    FinancialAnalyzer,
+    ListTransactionStore,
+    Transaction,
+)
+from workload_generator import WorkloadGenerator
+
+
+CATEGORIES = [
+    "Aluguel", "Alimentação", "Transporte", "Assinaturas", "Lazer",
+    "Saúde", "Educação", "Mercado", "Restaurantes", "Outros",
+]
+
+
+def make_transactions(n: int, seed: int = 42) -> List[Transaction]:
+    """~5 anos de histórico: usuários do gerador de carga, concatenados"""
+    generator = WorkloadGenerator(seed=seed, months=60, start=date(2021, 1, 1))
+    return list(generator.transactions(n))
+
+
+def retained_bytes(build: Callable[[], object]) -> int:
+    """Memória retida pelo objeto construído"""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return current
+
+
+def best_of(fn: Callable[[], object], repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do armazenamento de transações")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    args = parser.parse_args()
+    
+    print("=" * 78)
+    print("ARMAZENAMENTO DE TRANSAÇÕES — lista vs colunar")
+    print("=" * 78)
+    print(f"{'n':>9}  {'store':<9}{'memória':>12}{'totals':>12}{'categorias':>12}{'overview':>12}")
+    
+    for n in args.sizes:
+        transactions = make_transactions(n)
+        
+        def build_list():
+            store = ListTransactionStore()
+            # Transações recriadas: a lista retém os próprios objetos
+            for t in make_transactions(n):
+                store.add(t)
+            return store
+        
+        def build_columnar():
+            return ColumnarTransactionStore.from_transactions(transactions)
+        
+        stores = {
+            "lista": (retained_bytes(build_list), FinancialAnalyzer()),
+            "colunar": (retained_bytes(build_columnar), FinancialAnalyzer(build_columnar())),
+        }
+        for t in transactions:
+            stores["lista"][1].add_transaction(t)
+        
+        timings = {}
+        for name, (memory, analyzer) in stores.items():
+            timings[name] = (
+                best_of(analyzer.calculate_totals),
+                best_of(analyzer.analyze_by_category),
+                best_of(analyzer.get_overview),
+            )
+            t_totals, t_categories, t_overview = timings[name]
+            print(
+                f"{n:>9,}  {name:<9}{memory / 2**20:>10.1f}MB"
+                f"{t_totals * 1000:>10.2f}ms{t_categories * 1000:>10.2f}ms{t_overview * 1000:>10.2f}ms"
+            )
+        
+        memory_ratio = stores["lista"][0] / stores["colunar"][0]
+        speedup = timings["lista"][2] / timings["colunar"][2]
+        print(f"{'':>11}→ memória {memory_ratio:.1f}x menor, overview {speedup:.1f}x mais rápido")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,8 @@ Não faz previsões especulativas. Apenas cálculos determinísticos.
 from typing import Dict, List, Tuple
 from dataclasses import dataclass
 
+from financial_engine.progression import CappedProgression
+
 
 @dataclass
 class LinearPlan:
@@ -84,14 +86,8 @@ class FinancialGoalPlanner:
         Returns:
             Desafio progressivo com valores por período
         """
-        values = []
-        current = start
-
-        for _ in range(self.months):
-            values.append(current)
-            current = min(current + increment, max_increment)
-
-        total = sum(values)
+        values = CappedProgression(start, increment, max_increment, self.months)
+        total = values.total
         goal_reached = total >= self.target_amount
 
         return ProgressiveChallenge(
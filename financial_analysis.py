@@ -3,10 +3,19 @@
 Calcula estatísticas e previsões com base nos inputs do usuário
 """
 
-from typing import Dict, List, Tuple
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import chain
 import json
+import math
+
+try:
+    import numpy as np
+except ImportError:  # numpy só é necessário para o armazenamento colunar
+    np = None
 
 
 @dataclass
@@ -40,32 +49,176 @@ class FinancialOverview:
     status: str  # 'excellent', 'good', 'warning', 'critical'
 
 
-class FinancialAnalyzer:
-    """Motor de análise financeira"""
+@dataclass
+class AnalysisSnapshot:
+    """
+    Análise completa de uma versão do histórico
+    
+    Compartilhada entre leituras da mesma versão: tratar como somente leitura.
+    """
+    version: int
+    overview: FinancialOverview
+    insights: List[str]
+    predictions: Dict[str, float]
+
+
+# (categoria, total, quantidade) na ordem da primeira despesa de cada categoria
+CategoryTotals = List[Tuple[str, float, int]]
+
+
+@dataclass
+class TransactionBatch:
+    """
+    Bloco de transações em colunas (ingestão em lote)
+    
+    Sem um objeto Transaction por linha: o armazenamento colunar
+    copia as colunas direto; o de lista cria os objetos ao iterar.
+    Datas em ISO (AAAA-MM-DD).
+    """
+    ids: List[str]
+    dates: List[str]
+    categories: List[str]
+    amounts: List[float]
+    types: List[str]
+    descriptions: List[str]
+    
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction]) -> "TransactionBatch":
+        transactions = list(transactions)
+        return cls(
+            ids=[t.id for t in transactions],
+            dates=[t.date for t in transactions],
+            categories=[t.category for t in transactions],
+            amounts=[t.amount for t in transactions],
+            types=[t.type for t in transactions],
+            descriptions=[t.description for t in transactions]
+        )
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def __iter__(self) -> Iterator[Transaction]:
+        return map(Transaction, self.ids, self.dates, self.categories, self.amounts, self.types, self.descriptions)
+
+
+def _is_income(kind: str) -> bool:
+    """Tipo da transação como bool (ValueError se não é 'income' nem 'expense')"""
+    if kind == 'income':
+        return True
+    if kind == 'expense':
+        return False
+    raise ValueError(f"Tipo de transação inválido: {kind!r} (esperado 'income' ou 'expense')")
+
+
+@lru_cache(maxsize=4096)
+def _date_ordinal(value: str) -> int:
+    """Ordinal do dia de uma data ISO (ValueError se inválida; poucas datas distintas)"""
+    return date.fromisoformat(value[:10]).toordinal()
+
+
+def _date_ordinals(dates: Iterable[str]) -> Dict[str, int]:
+    """
+    Ordinal de cada data distinta (ValueError na primeira inválida)
+    
+    Poucas datas distintas por bloco: cada uma convertida uma vez.
+    """
+    return {day: _date_ordinal(day) for day in set(dates)}
+
+
+class _TrackedList(list):
+    """
+    Lista que conta as escritas feitas direto nela
+    
+    Leitura igual à de list. Cada método que altera a lista (append,
+    troca no lugar, remoção, ordenação...) incrementa `writes`: o
+    analisador percebe também mudanças que não alteram o tamanho.
+    ListTransactionStore escreve pelos métodos de list, sem contar.
+    """
+    
+    writes = 0
+    
+    def __reduce_ex__(self, protocol):
+        # Itens pelo construtor (não conta): cópia e pickle mantêm `writes`
+        return (_TrackedList, (list(self),), {"writes": self.writes})
+
+
+def _counted(name: str):
+    method = getattr(list, name)
+    
+    def counted(self, *args, **kwargs):
+        self.writes += 1
+        return method(self, *args, **kwargs)
+    
+    counted.__name__ = name
+    return counted
+
+
+for _name in (
+    "__setitem__", "__delitem__", "__iadd__", "__imul__",
+    "append", "extend", "insert", "pop", "remove", "clear", "sort", "reverse",
+):
+    setattr(_TrackedList, _name, _counted(_name))
+del _name
+
+
+class ListTransactionStore:
+    """
+    Armazenamento em lista de Transaction (padrão)
+    
+    Um objeto Python por transação; totais por varredura.
+    Aceita qualquer linha, como antes do colunar: tipo fora de
+    income/expense fica fora dos totais e data inválida fica fora
+    dos rollups (contada em TimeRollups.undated).
+    """
     
     def __init__(self):
-        self.transactions: List[Transaction] = []
+        self.transactions: List[Transaction] = _TrackedList()
     
-    def add_transaction(self, transaction: Transaction):
-        """Adiciona uma transação"""
-        self.transactions.append(transaction)
+    def __len__(self) -> int:
+        return len(self.transactions)
     
-    def calculate_totals(self) -> Tuple[float, float, float]:
-        """Calcula receitas, gastos e saldo total"""
-        income = sum(t.amount for t in self.transactions if t.type == 'income')
-        expenses = sum(t.amount for t in self.transactions if t.type == 'expense')
-        balance = income - expenses
-        return income, expenses, balance
+    def __iter__(self) -> Iterator[Transaction]:
+        return iter(self.transactions)
     
-    def analyze_by_category(self) -> List[CategorySummary]:
-        """Agrupa e analisa gastos por categoria"""
+    # Escritas do armazenamento pelos métodos de list: mudam o tamanho,
+    # que o analisador já acompanha, e não passam pelo contador
+    
+    def add(self, transaction: Transaction):
+        list.append(self.transactions, transaction)
+    
+    def extend(self, transactions: Union[Iterable[Transaction], TransactionBatch]):
+        """Adiciona em bloco"""
+        list.extend(self.transactions, transactions)
+    
+    def to_list(self) -> List[Transaction]:
+        return self.transactions
+    
+    def remove(self, transaction_id: str) -> Transaction:
+        """Remove a primeira transação com o id (KeyError se não existe)"""
+        for i, transaction in enumerate(self.transactions):
+            if transaction.id == transaction_id:
+                return list.pop(self.transactions, i)
+        raise KeyError(transaction_id)
+    
+    def totals(self) -> Tuple[float, float]:
+        """Receitas e gastos (somas exatas, arredondadas uma vez)"""
+        income = math.fsum(t.amount for t in self.transactions if t.type == 'income')
+        expenses = math.fsum(t.amount for t in self.transactions if t.type == 'expense')
+        return income, expenses
+    
+    def income_count(self) -> int:
+        """Quantidade de receitas"""
+        return sum(1 for t in self.transactions if t.type == 'income')
+    
+    def expense_by_category(self) -> Tuple[float, CategoryTotals]:
+        """Total de gastos e (categoria, total, quantidade) por categoria"""
         # Filtra apenas despesas
         expenses = [t for t in self.transactions if t.type == 'expense']
         
         if not expenses:
-            return []
+            return 0.0, []
         
-        total_expenses = sum(t.amount for t in expenses)
+        total_expenses = math.fsum(t.amount for t in expenses)
         
         # Agrupa por categoria
         categories_dict: Dict[str, List[float]] = {}
@@ -74,21 +227,971 @@ class FinancialAnalyzer:
                 categories_dict[transaction.category] = []
             categories_dict[transaction.category].append(transaction.amount)
         
-        # Cria resumos
+        return total_expenses, [
+            (category, math.fsum(amounts), len(amounts))
+            for category, amounts in categories_dict.items()
+        ]
+
+
+class ColumnarTransactionStore:
+    """
+    Armazenamento colunar (numpy)
+    
+    Uma coluna por campo, em vez de um objeto por transação:
+    - amount: float64
+    - date: int32 (ordinal do dia)
+    - type: bool (True = receita)
+    - category: int32 (código num dicionário de categorias)
+    - id / description: listas de str (só para reconstruir Transaction)
+    
+    Colunas podem ser views de um arquivo mapeado (from_columns):
+    leitura sem cópia até a primeira escrita.
+    
+    Totais e agrupamentos são reduções vetorizadas.
+    Somas em ordem de numpy (pairwise): podem diferir da lista
+    (math.fsum) na última casa de ponto flutuante.
+    """
+    
+    def __init__(self, capacity: int = 1024):
+        """
+        Args:
+            capacity: Capacidade inicial das colunas (cresce dobrando)
+        """
+        if np is None:
+            raise ImportError("ColumnarTransactionStore requer numpy")
+        
+        self.size = 0
+        self.amounts = np.empty(capacity, dtype=np.float64)
+        self.days = np.empty(capacity, dtype=np.int32)
+        self.is_income = np.empty(capacity, dtype=np.bool_)
+        self.category_codes = np.empty(capacity, dtype=np.int32)
+        self.ids: List[str] = []
+        self.descriptions: List[str] = []
+        
+        # Dicionário de categorias: nome ↔ código
+        self.categories: List[str] = []
+        self._category_index: Dict[str, int] = {}
+        
+        # Códigos na ordem da primeira despesa (ordem de desempate da lista)
+        self._expense_order: List[int] = []
+        self._has_expense: List[bool] = []
+        
+        # Totais pré-calculados (arquivo): válidos até a primeira escrita
+        self._summary: Optional[Tuple[Tuple[float, float], Tuple[float, CategoryTotals]]] = None
+    
+    @classmethod
+    def from_columns(
+        cls,
+        amounts,
+        days,
+        is_income,
+        category_codes,
+        categories: Sequence[str],
+        ids: Sequence[str],
+        descriptions: Sequence[str],
+        expense_order: Sequence[int],
+        summary: Optional[Tuple[Tuple[float, float], Tuple[float, CategoryTotals]]] = None
+    ) -> "ColumnarTransactionStore":
+        """
+        Armazenamento sobre colunas existentes, sem cópia
+        
+        Args:
+            amounts, days, is_income, category_codes: Arrays de mesmo tamanho
+                (podem ser views de um mmap)
+            categories: Dicionário de categorias (código = posição)
+            ids, descriptions: Sequências de str (lidas sob demanda)
+            expense_order: Códigos na ordem da primeira despesa
+            summary: ((receitas, gastos), expense_by_category()) já calculados
+        
+        Returns:
+            ColumnarTransactionStore
+        """
+        store = cls(capacity=0)
+        store.size = len(amounts)
+        store.amounts = amounts
+        store.days = days
+        store.is_income = is_income
+        store.category_codes = category_codes
+        store.ids = ids
+        store.descriptions = descriptions
+        store.categories = list(categories)
+        store._category_index = {category: code for code, category in enumerate(store.categories)}
+        store._expense_order = list(expense_order)
+        store._has_expense = [False] * len(store.categories)
+        for code in store._expense_order:
+            store._has_expense[code] = True
+        store._summary = summary
+        return store
+    
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction]) -> "ColumnarTransactionStore":
+        """Cria o armazenamento a partir de transações existentes"""
+        transactions = list(transactions)
+        store = cls(capacity=max(len(transactions), 1))
+        store.extend(transactions)
+        return store
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def __iter__(self) -> Iterator[Transaction]:
+        for i in range(self.size):
+            yield self._row(i)
+    
+    def _prepare_write(self):
+        """
+        Antes de qualquer escrita: totais do arquivo deixam de valer,
+        colunas somente leitura (mmap) são copiadas e strings viram listas
+        """
+        self._summary = None
+        if not self.amounts.flags.writeable:
+            for name in ("amounts", "days", "is_income", "category_codes"):
+                setattr(self, name, np.array(getattr(self, name)[:self.size]))
+        if not isinstance(self.ids, list):
+            self.ids = list(self.ids)
+            self.descriptions = list(self.descriptions)
+    
+    def _grow(self, needed: int):
+        capacity = len(self.amounts)
+        if needed <= capacity:
+            return
+        
+        new_capacity = max(needed, capacity * 2)
+        for name in ("amounts", "days", "is_income", "category_codes"):
+            column = getattr(self, name)
+            grown = np.empty(new_capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+    
+    def _category_code(self, category: str) -> int:
+        code = self._category_index.get(category)
+        if code is None:
+            code = self._category_index[category] = len(self.categories)
+            self.categories.append(category)
+            self._has_expense.append(False)
+        return code
+    
+    def _track_expense(self, code: int, is_income: bool):
+        if not is_income and not self._has_expense[code]:
+            self._has_expense[code] = True
+            self._expense_order.append(code)
+    
+    def add(self, transaction: Transaction):
+        # Valida antes de qualquer escrita: linha inválida não deixa rastro
+        is_income = _is_income(transaction.type)
+        day = _date_ordinal(transaction.date)
+        
+        self._prepare_write()
+        self._grow(self.size + 1)
+        i = self.size
+        
+        code = self._category_code(transaction.category)
+        self._track_expense(code, is_income)
+        
+        self.amounts[i] = transaction.amount
+        self.days[i] = day
+        self.is_income[i] = is_income
+        self.category_codes[i] = code
+        self.ids.append(transaction.id)
+        self.descriptions.append(transaction.description)
+        
+        self.size = i + 1
+    
+    def extend(self, transactions: Union[Iterable[Transaction], TransactionBatch]):
+        """Adiciona em bloco (colunas preenchidas de uma vez)"""
+        if isinstance(transactions, TransactionBatch):
+            batch = transactions
+        else:
+            batch = TransactionBatch.from_transactions(transactions)
+        if not len(batch):
+            return
+        
+        # Valida tipos e datas do bloco inteiro antes de qualquer escrita
+        for kind in set(batch.types):
+            _is_income(kind)
+        ordinals = _date_ordinals(batch.dates)
+        
+        self._prepare_write()
+        start, end = self.size, self.size + len(batch)
+        
+        is_income = [kind == 'income' for kind in batch.types]
+        days = list(map(ordinals.__getitem__, batch.dates))
+        
+        # Poucas categorias distintas por bloco: cada uma codificada uma vez
+        table = {category: self._category_code(category) for category in dict.fromkeys(batch.categories)}
+        codes = list(map(table.__getitem__, batch.categories))
+        for code, income in zip(codes, is_income):
+            self._track_expense(code, income)
+        
+        self._grow(end)
+        self.amounts[start:end] = batch.amounts
+        self.days[start:end] = days
+        self.is_income[start:end] = is_income
+        self.category_codes[start:end] = codes
+        self.ids.extend(batch.ids)
+        self.descriptions.extend(batch.descriptions)
+        
+        self.size = end
+    
+    def _row(self, i: int) -> Transaction:
+        return Transaction(
+            id=self.ids[i],
+            date=date.fromordinal(int(self.days[i])).isoformat(),
+            category=self.categories[self.category_codes[i]],
+            amount=float(self.amounts[i]),
+            type='income' if self.is_income[i] else 'expense',
+            description=self.descriptions[i]
+        )
+    
+    def to_list(self) -> List[Transaction]:
+        return list(self)
+    
+    def remove(self, transaction_id: str) -> Transaction:
+        """
+        Remove a primeira transação com o id (KeyError se não existe)
+        
+        Colunas deslocadas por cópia contígua (memmove), ordem preservada.
+        """
+        self._prepare_write()
+        try:
+            i = self.ids.index(transaction_id)
+        except ValueError:
+            raise KeyError(transaction_id) from None
+        
+        removed = self._row(i)
+        last = self.size - 1
+        
+        for column in (self.amounts, self.days, self.is_income, self.category_codes):
+            column[i:last] = column[i + 1:self.size]
+        del self.ids[i]
+        del self.descriptions[i]
+        self.size = last
+        
+        if removed.type == 'expense':
+            self._rebuild_expense_order()
+        
+        return removed
+    
+    def _rebuild_expense_order(self):
+        """Recalcula a ordem da primeira despesa por categoria (após remoção)"""
+        codes = self.category_codes[:self.size][~self.is_income[:self.size]]
+        present, first_seen = np.unique(codes, return_index=True)
+        
+        self._expense_order = present[np.argsort(first_seen, kind="stable")].tolist()
+        self._has_expense = [False] * len(self.categories)
+        for code in self._expense_order:
+            self._has_expense[code] = True
+    
+    def totals(self) -> Tuple[float, float]:
+        """Receitas e gastos (duas reduções mascaradas)"""
+        if self._summary is not None:
+            return self._summary[0]
+        
+        amounts = self.amounts[:self.size]
+        income_mask = self.is_income[:self.size]
+        
+        income = float(amounts[income_mask].sum())
+        expenses = float(amounts[~income_mask].sum())
+        return income, expenses
+    
+    def income_count(self) -> int:
+        """Quantidade de receitas"""
+        return int(np.count_nonzero(self.is_income[:self.size]))
+    
+    def expense_by_category(self) -> Tuple[float, CategoryTotals]:
+        """
+        Total de gastos e (categoria, total, quantidade) via bincount
+        
+        Receitas entram com peso zero: sem cópia mascarada. A soma por
+        categoria segue a ordem das linhas (a da lista é exata, math.fsum:
+        podem diferir na última casa).
+        """
+        if self._summary is not None:
+            return self._summary[1]
+        if not self._expense_order:
+            return 0.0, []
+        
+        income_mask = self.is_income[:self.size]
+        amounts = self.amounts[:self.size]
+        codes = self.category_codes[:self.size]
+        n_categories = len(self.categories)
+        
+        expense_amounts = np.where(income_mask, 0.0, amounts)
+        totals = np.bincount(codes, weights=expense_amounts, minlength=n_categories)
+        counts = np.bincount(codes, weights=~income_mask, minlength=n_categories)
+        
+        return float(amounts[~income_mask].sum()), [
+            (self.categories[code], float(totals[code]), int(counts[code]))
+            for code in self._expense_order
+        ]
+
+
+TransactionStore = Union[ListTransactionStore, ColumnarTransactionStore]
+
+
+# ==================== ROLLUPS POR PERÍODO ====================
+
+GRANULARITIES = ("day", "week", "month")
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+DateLike = Union[date, str]
+
+
+def _period_key(granularity: str, ordinal: int) -> int:
+    """Chave inteira do período: ordinal do dia, da segunda-feira ou ano*12+mês"""
+    if granularity == "day":
+        return ordinal
+    if granularity == "week":
+        # Ordinal 1 (0001-01-01) é segunda-feira
+        return ordinal - (ordinal - 1) % 7
+    day = date.fromordinal(ordinal)
+    return day.year * 12 + day.month - 1
+
+
+def _period_bounds(granularity: str, key: int) -> Tuple[date, date]:
+    """Primeiro e último dia do período"""
+    if granularity == "day":
+        return date.fromordinal(key), date.fromordinal(key)
+    if granularity == "week":
+        # Última semana do calendário termina em date.max
+        return date.fromordinal(key), date.fromordinal(min(key + 6, date.max.toordinal()))
+    year, month = divmod(key, 12)
+    first = date(year, month + 1, 1)
+    if (year, month) == (date.max.year, 11):
+        return first, date.max
+    following = date(year + (month + 1) // 12, (month + 1) % 12 + 1, 1)
+    return first, date.fromordinal(following.toordinal() - 1)
+
+
+def _period_label(granularity: str, key: int) -> str:
+    if granularity == "day":
+        return date.fromordinal(key).isoformat()
+    if granularity == "week":
+        year, week, _ = date.fromordinal(key).isocalendar()
+        return f"{year:04d}-W{week:02d}"
+    year, month = divmod(key, 12)
+    return f"{year:04d}-{month + 1:02d}"
+
+
+def _to_ordinal(value: DateLike) -> int:
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    return value.toordinal()
+
+
+@dataclass
+class PeriodSummary:
+    """Resumo de um período (dia, semana ou mês) ou intervalo de datas"""
+    period: str  # '2026-01-05', '2026-W02', '2026-01' ou 'início..fim'
+    start: str
+    end: str
+    total_income: float
+    total_expenses: float
+    balance: float
+    transactions_count: int
+    categories: List[CategorySummary]  # despesas, maior primeiro
+    status: str
+
+
+@dataclass
+class Forecast:
+    """Previsão mensal de fluxo (receitas - gastos) e saldo acumulado"""
+    months: List[str]  # '2026-02', '2026-03', ...
+    net_flow: List[float]
+    flow_lower: List[float]
+    flow_upper: List[float]
+    balance: List[float]
+    lower: List[float]  # faixa do saldo
+    upper: List[float]
+    level: float  # cobertura das faixas (0.8 = 80%)
+    method: str
+    history: int  # meses do histórico usados no ajuste
+
+
+class _PeriodAggregate:
+    """Somas de um período: receitas, gastos e gastos por categoria"""
+    
+    __slots__ = ("income", "expenses", "income_count", "expense_count", "categories")
+    
+    def __init__(self):
+        self.income = 0.0
+        self.expenses = 0.0
+        self.income_count = 0
+        self.expense_count = 0
+        # categoria → [total, quantidade]
+        self.categories: Dict[str, List] = {}
+    
+    def merge(self, other: "_PeriodAggregate"):
+        self.income += other.income
+        self.expenses += other.expenses
+        self.income_count += other.income_count
+        self.expense_count += other.expense_count
+        for category, (total, count) in other.categories.items():
+            entry = self.categories.get(category)
+            if entry is None:
+                self.categories[category] = [total, count]
+            else:
+                entry[0] += total
+                entry[1] += count
+
+
+class TimeRollups:
+    """
+    Somas por dia, semana (ISO, começa na segunda) e mês, por categoria
+    
+    Cada granularidade: dict chave → agregado + lista ordenada das chaves.
+    Atualizado a cada transação (O(1) amortizado por granularidade);
+    consultas por intervalo com busca binária nas chaves, custo
+    proporcional aos períodos do intervalo, não às transações.
+    """
+    
+    def __init__(self):
+        self._periods: Dict[str, Dict[int, _PeriodAggregate]] = {g: {} for g in GRANULARITIES}
+        self._keys: Dict[str, List[int]] = {g: [] for g in GRANULARITIES}
+        # ordinal → chaves (dia, semana, mês), calculadas uma vez por dia
+        self._day_keys: Dict[int, Tuple[int, int, int]] = {}
+        # Transações com data inválida (fora dos rollups)
+        self.undated = 0
+    
+    @classmethod
+    def from_store(cls, store: "TransactionStore") -> "TimeRollups":
+        """Constrói a partir do histórico (uma passada; vetorizado com numpy)"""
+        rollups = cls()
+        
+        if isinstance(store, ColumnarTransactionStore):
+            n = store.size
+            if n:
+                rollups._build_columns(
+                    store.days[:n], store.is_income[:n], store.category_codes[:n],
+                    store.amounts[:n], store.categories
+                )
+            return rollups
+        
+        ordinals: Dict[str, Optional[int]] = {}
+        
+        if np is None:
+            for transaction in store:
+                ordinal = ordinals.get(transaction.date, -1)
+                if ordinal == -1:
+                    ordinal = ordinals[transaction.date] = _parse_ordinal(transaction.date)
+                rollups.apply(ordinal, transaction.type, transaction.category, transaction.amount, +1)
+            return rollups
+        
+        # Colunas das transações datadas de receita/despesa, em ordem
+        codes: Dict[str, int] = {}
+        days, is_income, category_codes, amounts = [], [], [], []
+        for transaction in store:
+            ordinal = ordinals.get(transaction.date, -1)
+            if ordinal == -1:
+                ordinal = ordinals[transaction.date] = _parse_ordinal(transaction.date)
+            if ordinal is None:
+                rollups.undated += 1
+                continue
+            if transaction.type != 'income' and transaction.type != 'expense':
+                continue
+            
+            days.append(ordinal)
+            is_income.append(transaction.type == 'income')
+            category_codes.append(codes.setdefault(transaction.category, len(codes)))
+            amounts.append(transaction.amount)
+        
+        if days:
+            rollups._build_columns(
+                np.array(days, dtype=np.int64), np.array(is_income, dtype=bool),
+                np.array(category_codes, dtype=np.int64), np.array(amounts, dtype=np.float64), list(codes)
+            )
+        return rollups
+    
+    def _build_columns(self, days, is_income, codes, amounts, categories: Sequence[str]):
+        """
+        Agrupa por (período, categoria, tipo) com np.unique + bincount
+        
+        Só os períodos e células (período, categoria) presentes viram
+        posições: uma data absurda (ex.: ano 0206) não abre um intervalo
+        denso de séculos. bincount soma na ordem das linhas: mesmo
+        resultado das somas incrementais.
+        """
+        days = days.astype(np.int64)
+        codes = codes.astype(np.int64)
+        n_codes = len(categories)
+        
+        # Valores separados por tipo (zeros não alteram as somas)
+        expense_amounts = np.where(is_income, 0.0, amounts)
+        income_amounts = np.where(is_income, amounts, 0.0)
+        
+        months = (days - _EPOCH_ORDINAL).astype("datetime64[D]").astype("datetime64[M]").astype(np.int64) + 1970 * 12
+        keys_by_granularity = {
+            "day": days,
+            "week": days - (days - 1) % 7,
+            "month": months,
+        }
+        
+        for granularity, keys in keys_by_granularity.items():
+            unique_keys, positions = np.unique(keys, return_inverse=True)
+            unique_keys = unique_keys.tolist()
+            
+            income = np.bincount(positions, weights=income_amounts)
+            income_count = np.bincount(positions, weights=is_income)
+            expenses = np.bincount(positions, weights=expense_amounts)
+            expense_count = np.bincount(positions, weights=~is_income)
+            
+            cells, cell_positions = np.unique(positions * n_codes + codes, return_inverse=True)
+            totals = np.bincount(cell_positions, weights=expense_amounts)
+            counts = np.bincount(cell_positions, weights=~is_income)
+            
+            periods = self._periods[granularity]
+            for index, key in enumerate(unique_keys):
+                aggregate = periods[key] = _PeriodAggregate()
+                aggregate.income_count = int(income_count[index])
+                aggregate.expense_count = int(expense_count[index])
+                aggregate.income = float(income[index]) if aggregate.income_count else 0.0
+                aggregate.expenses = float(expenses[index]) if aggregate.expense_count else 0.0
+            
+            for cell in np.flatnonzero(counts).tolist():
+                index, code = divmod(int(cells[cell]), n_codes)
+                periods[unique_keys[index]].categories[categories[code]] = [float(totals[cell]), int(counts[cell])]
+            
+            self._keys[granularity] = unique_keys
+    
+    def apply(self, ordinal: Optional[int], kind: str, category: str, amount: float, sign: int):
+        """Aplica (+1) ou desfaz (-1) uma transação em todas as granularidades"""
+        if ordinal is None:
+            self.undated += sign
+            return
+        if kind not in ('income', 'expense'):
+            return
+        
+        signed = amount if sign > 0 else -amount
+        
+        day_keys = self._day_keys.get(ordinal)
+        if day_keys is None:
+            day_keys = self._day_keys[ordinal] = tuple(_period_key(g, ordinal) for g in GRANULARITIES)
+        
+        for granularity, key in zip(GRANULARITIES, day_keys):
+            periods = self._periods[granularity]
+            aggregate = periods.get(key)
+            if aggregate is None:
+                aggregate = periods[key] = _PeriodAggregate()
+                insort(self._keys[granularity], key)
+            
+            if kind == 'income':
+                aggregate.income_count += sign
+                aggregate.income = aggregate.income + signed if aggregate.income_count else 0.0
+            else:
+                aggregate.expense_count += sign
+                aggregate.expenses = aggregate.expenses + signed if aggregate.expense_count else 0.0
+                
+                entry = aggregate.categories.get(category)
+                if entry is None:
+                    entry = aggregate.categories[category] = [0.0, 0]
+                entry[1] += sign
+                if entry[1]:
+                    entry[0] += signed
+                else:
+                    del aggregate.categories[category]
+            
+            if not aggregate.income_count and not aggregate.expense_count:
+                # Período vazio sai do índice
+                del periods[key]
+                keys = self._keys[granularity]
+                del keys[bisect_left(keys, key)]
+    
+    def periods(self, granularity: str, start: Optional[int] = None, end: Optional[int] = None) -> List[Tuple[int, _PeriodAggregate]]:
+        """
+        Períodos com chave entre os períodos de `start` e `end` (ordinais, inclusive)
+        
+        Busca binária na lista ordenada de chaves.
+        """
+        if granularity not in self._periods:
+            raise ValueError(f"Granularidade inválida: {granularity!r} (esperado {', '.join(GRANULARITIES)})")
+        
+        keys = self._keys[granularity]
+        lo = 0 if start is None else bisect_left(keys, _period_key(granularity, start))
+        hi = len(keys) if end is None else bisect_right(keys, _period_key(granularity, end))
+        
+        periods = self._periods[granularity]
+        return [(key, periods[key]) for key in keys[lo:hi]]
+    
+    def date_range(self) -> Optional[Tuple[int, int]]:
+        """Primeiro e último dia com transações (ordinais)"""
+        days = self._keys["day"]
+        return (days[0], days[-1]) if days else None
+
+
+def _parse_ordinal(value: str) -> Optional[int]:
+    try:
+        return date.fromisoformat(value[:10]).toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+def _add_exact(partials: List[float], values: Sequence[float]):
+    """
+    Soma valores a uma soma exata (parcelas de Shewchuk, como math.fsum)
+    
+    As parcelas não se sobrepõem e somam exatamente tudo o que entrou:
+    math.fsum(partials) é o total corretamente arredondado. Somar e
+    depois subtrair o mesmo valor não deixa resíduo, ao contrário de
+    += / -= em sequência. Poucas parcelas na prática (2 ou 3).
+    
+    Bloco com vários valores: reduzido em C a hi + lo (math.fsum), se
+    a soma couber exatamente nos dois (conferido por um terceiro fsum:
+    o resto exato é zero); senão, valor a valor.
+    """
+    if len(values) > 2:
+        hi = math.fsum(values)
+        lo = math.fsum(chain(values, (-hi,)))
+        if not math.fsum(chain(values, (-hi, -lo))):
+            values = (hi, lo) if lo else (hi,)
+    
+    for x in values:
+        i = 0
+        for y in partials:
+            if abs(x) < abs(y):
+                x, y = y, x
+            hi = x + y
+            lo = y - (hi - x)
+            if lo:
+                partials[i] = lo
+                i += 1
+            x = hi
+        partials[i:] = [x]
+
+
+class _CategoryAggregate:
+    """Soma (exata) e contagem de gastos de uma categoria"""
+    
+    __slots__ = ("partials", "total", "count", "order")
+    
+    def __init__(self, order: int):
+        self.partials: List[float] = []
+        self.total = 0.0  # math.fsum(partials)
+        self.count = 0
+        # Ordem da primeira despesa: desempate entre totais iguais
+        self.order = order
+    
+    def add(self, values: Sequence[float]):
+        _add_exact(self.partials, values)
+        self.total = math.fsum(self.partials)
+    
+    @property
+    def key(self) -> Tuple[float, int]:
+        return (-self.total, self.order)
+
+
+class FinancialAnalyzer:
+    """
+    Motor de análise financeira
+    
+    Totais e somas por categoria mantidos a cada add/remove:
+    visão geral e insights custam O(categorias), não O(transações).
+    As somas são exatas (parcelas, arredondadas uma vez): qualquer
+    sequência de add/remove dá o mesmo total que math.fsum sobre as
+    transações restantes, sem resíduo acumulado.
+    
+    Cada mutação incrementa `version`; a análise completa (snapshot)
+    é calculada uma vez por versão e reaproveitada até a próxima mutação.
+    `version` serve de chave de cache (ex.: ETag) nas camadas de API.
+    
+    Rollups por dia/semana/mês (TimeRollups) são montados na primeira
+    consulta por período (rollup, summarize_range) e, a partir daí,
+    mantidos a cada mutação. Previsão e exportação usam rollups
+    descartáveis: a mutação seguinte os descarta em vez de atualizá-los.
+    """
+    
+    def __init__(self, store: Optional[TransactionStore] = None):
+        """
+        Args:
+            store: Armazenamento das transações
+                (ListTransactionStore por padrão; ColumnarTransactionStore
+                para históricos grandes)
+        """
+        self.store = store if store is not None else ListTransactionStore()
+        self.version = 0
+        self._snapshot: Optional[AnalysisSnapshot] = None
+        self._snapshot_json: Optional[str] = None
+        self._rollups: Optional[TimeRollups] = None
+        self._rollups_maintained = False
+        self._ordinals: Dict[str, Optional[int]] = {}
+        self._rebuild_aggregates()
+    
+    @property
+    def transactions(self) -> List[Transaction]:
+        """
+        Transações em lista
+        
+        Com ListTransactionStore (padrão) é a própria lista do
+        armazenamento: acesso O(1), e escrita direta (append, troca no
+        lugar) vale, com os agregados reconstruídos na próxima consulta.
+        Com o colunar, lista montada a cada acesso: escrever nela não
+        altera o armazenamento.
+        
+        Leitura sem risco de alteração: frozen_transactions().
+        """
+        return self.store.to_list()
+    
+    def frozen_transactions(self) -> Tuple[Transaction, ...]:
+        """Cópia somente leitura das transações (tupla montada a cada chamada)"""
+        return tuple(self.store)
+    
+    # ==================== AGREGADOS ====================
+    
+    def _rebuild_aggregates(self):
+        """Recalcula os agregados a partir do armazenamento (uma passada)"""
+        income, expenses = self.store.totals()
+        total_expenses, categories = self.store.expense_by_category()
+        
+        # Parcelas partem dos totais do armazenamento (já arredondados)
+        self._income_partials = [income] if income else []
+        self._expense_partials = [expenses] if expenses else []
+        self._income = income
+        self._expenses = expenses
+        self._income_count = self.store.income_count()
+        self._expense_count = 0
+        self._count = len(self.store)
+        self._categories: Dict[str, _CategoryAggregate] = {}
+        self._next_order = 0
+        
+        for category, total, count in categories:
+            aggregate = self._new_category(category)
+            aggregate.add((total,))
+            aggregate.count = count
+            self._expense_count += count
+        
+        # Ranking por total (maior primeiro): lista ordenada, atualizada por bisect
+        self._ranking: List[Tuple[float, int, str]] = sorted(
+            (*aggregate.key, category) for category, aggregate in self._categories.items()
+        )
+        
+        # Rollups remontados sob demanda
+        self._rollups = None
+        self._rollups_maintained = False
+        
+        # Lista do armazenamento padrão: escrita direta contada por ela
+        tracked = getattr(self.store, "transactions", None)
+        self._tracked = tracked if isinstance(tracked, _TrackedList) else None
+        self._writes = tracked.writes if self._tracked is not None else 0
+    
+    def _new_category(self, category: str) -> _CategoryAggregate:
+        aggregate = self._categories[category] = _CategoryAggregate(self._next_order)
+        self._next_order += 1
+        return aggregate
+    
+    def _sync(self):
+        """
+        Reconstrói se o armazenamento mudou por fora do analisador
+        
+        Escrita direta (ex.: analyzer.transactions.append ou troca de
+        item no lugar) é detectada pelo contador de escritas da lista
+        do ListTransactionStore; nos demais, pela quantidade de linhas.
+        """
+        tracked = self._tracked
+        if tracked is not None:
+            # Lista trocada, tamanho diferente ou escrita direta
+            changed = (
+                tracked is not self.store.transactions
+                or len(tracked) != self._count
+                or tracked.writes != self._writes
+            )
+        else:
+            changed = len(self.store) != self._count
+        
+        if changed:
+            self._rebuild_aggregates()
+            self.version += 1
+    
+    def _day(self, value: str) -> Optional[int]:
+        """Ordinal da data (convertida uma vez por string distinta)"""
+        ordinal = self._ordinals.get(value, -1)
+        if ordinal == -1:
+            ordinal = self._ordinals[value] = _parse_ordinal(value)
+        return ordinal
+    
+    def _apply_batch(self, rows: Iterable[Tuple[str, str, float, str]], count: int):
+        """
+        Aplica um bloco de novas transações nos agregados
+        
+        Args:
+            rows: (tipo, categoria, valor, data) de cada transação, em ordem
+            count: Quantidade de transações do bloco
+        
+        Mesmo resultado de _apply transação a transação (somas exatas
+        não dependem da ordem). Valores agrupados por destino e somados
+        de uma vez; o ranking é reordenado uma vez no fim do bloco.
+        """
+        incomes: List[float] = []
+        expenses: List[float] = []
+        by_category: Dict[str, List[float]] = {}
+        if not self._rollups_maintained:
+            self._rollups = None
+        rollups = self._rollups
+        
+        for kind, category, amount, day in rows:
+            if rollups is not None:
+                rollups.apply(self._day(day), kind, category, amount, +1)
+            if kind == 'income':
+                incomes.append(amount)
+            elif kind == 'expense':
+                expenses.append(amount)
+                amounts = by_category.get(category)
+                if amounts is None:
+                    amounts = by_category[category] = []
+                amounts.append(amount)
+        
+        if incomes:
+            _add_exact(self._income_partials, incomes)
+            self._income = math.fsum(self._income_partials)
+            self._income_count += len(incomes)
+        if expenses:
+            _add_exact(self._expense_partials, expenses)
+            self._expenses = math.fsum(self._expense_partials)
+            self._expense_count += len(expenses)
+        
+        categories = self._categories
+        for category, amounts in by_category.items():
+            aggregate = categories.get(category)
+            if aggregate is None:
+                aggregate = self._new_category(category)
+            aggregate.add(amounts)
+            aggregate.count += len(amounts)
+        
+        self._count += count
+        self.version += 1
+        
+        if by_category:
+            self._ranking = sorted(
+                (*aggregate.key, category) for category, aggregate in categories.items()
+            )
+    
+    def _apply(self, transaction: Transaction, sign: int):
+        """
+        Aplica (+1) ou desfaz (-1) uma transação nos agregados
+        
+        Somas exatas: desfazer devolve exatamente o total anterior, e o
+        resultado é o de math.fsum sobre as transações restantes.
+        Grupo que fica vazio volta a zero.
+        """
+        amount = transaction.amount if sign > 0 else -transaction.amount
+        self._count += sign
+        self.version += 1
+        
+        if not self._rollups_maintained:
+            self._rollups = None
+        elif self._rollups is not None:
+            self._rollups.apply(
+                self._day(transaction.date), transaction.type, transaction.category, transaction.amount, sign
+            )
+        
+        if transaction.type == 'income':
+            self._income_count += sign
+            if self._income_count:
+                _add_exact(self._income_partials, (amount,))
+            else:
+                self._income_partials = []
+            self._income = math.fsum(self._income_partials)
+            return
+        
+        if transaction.type != 'expense':
+            return
+        
+        self._expense_count += sign
+        if self._expense_count:
+            _add_exact(self._expense_partials, (amount,))
+        else:
+            self._expense_partials = []
+        self._expenses = math.fsum(self._expense_partials)
+        
+        aggregate = self._categories.get(transaction.category)
+        if aggregate is None:
+            aggregate = self._new_category(transaction.category)
+        else:
+            # Sai do ranking: posição por bisect, sem reordenar
+            position = bisect_left(self._ranking, (*aggregate.key, transaction.category))
+            del self._ranking[position]
+        
+        aggregate.count += sign
+        if aggregate.count == 0:
+            # Se voltar, entra como categoria nova (última no desempate)
+            del self._categories[transaction.category]
+            return
+        
+        aggregate.add((amount,))
+        insort(self._ranking, (*aggregate.key, transaction.category))
+    
+    def add_transaction(self, transaction: Transaction):
+        """Adiciona uma transação"""
+        self._sync()
+        self.store.add(transaction)
+        self._apply(transaction, +1)
+    
+    def add_transactions(self, transactions: Union[Iterable[Transaction], TransactionBatch]):
+        """
+        Adiciona um bloco de transações (ingestão em lote)
+        
+        Uma escrita no armazenamento e uma atualização dos agregados
+        por bloco: mesmo resultado de add_transaction em sequência.
+        """
+        if isinstance(transactions, TransactionBatch):
+            rows = zip(transactions.types, transactions.categories, transactions.amounts, transactions.dates)
+        else:
+            transactions = list(transactions)
+            rows = ((t.type, t.category, t.amount, t.date) for t in transactions)
+        
+        if not len(transactions):
+            return
+        
+        self._sync()
+        self.store.extend(transactions)
+        self._apply_batch(rows, len(transactions))
+    
+    def remove_transaction(self, transaction_id: str) -> Transaction:
+        """
+        Remove uma transação pelo id
+        
+        Returns:
+            Transação removida
+        
+        Raises:
+            KeyError: Se não existe transação com o id
+        """
+        self._sync()
+        transaction = self.store.remove(transaction_id)
+        self._apply(transaction, -1)
+        return transaction
+    
+    # ==================== ANÁLISE ====================
+    
+    def calculate_totals(self) -> Tuple[float, float, float]:
+        """Calcula receitas, gastos e saldo total"""
+        self._sync()
+        income, expenses = self._income, self._expenses
+        balance = income - expenses
+        return income, expenses, balance
+    
+    def analyze_by_category(self) -> List[CategorySummary]:
+        """Agrupa e analisa gastos por categoria (já ordenado por valor)"""
+        self._sync()
+        
+        if not self._ranking:
+            return []
+        
+        total_expenses = self._expenses
+        
+        # Cria resumos, maior valor primeiro
         summaries = []
-        for category, amounts in categories_dict.items():
-            total = sum(amounts)
+        for _, _, category in self._ranking:
+            aggregate = self._categories[category]
+            total = aggregate.total
             percentage = (total / total_expenses * 100) if total_expenses > 0 else 0
             
             summaries.append(CategorySummary(
                 category=category,
                 total=total,
                 percentage=percentage,
-                transactions_count=len(amounts)
+                transactions_count=aggregate.count
             ))
         
-        # Ordena por valor (maior primeiro)
-        summaries.sort(key=lambda x: x.total, reverse=True)
         return summaries
     
     def get_financial_status(self, balance: float, income: float) -> str:
@@ -132,7 +1235,10 @@ class FinancialAnalyzer:
     
     def generate_insights(self) -> List[str]:
         """Gera insights automáticos"""
-        overview = self.get_overview()
+        return list(self.snapshot().insights)
+    
+    def _build_insights(self, overview: FinancialOverview) -> List[str]:
+        """Insights a partir de uma visão geral já calculada"""
         insights = []
         
         # Insight sobre maior categoria
@@ -160,25 +1266,223 @@ class FinancialAnalyzer:
         return insights
     
     def predict_future_balance(self, months: int = 3) -> Dict[str, float]:
-        """Prevê saldo futuro baseado no padrão atual"""
-        income, expenses, balance = self.calculate_totals()
+        """
+        Prevê o saldo ao fim de cada um dos próximos meses
         
-        monthly_savings = balance
-        predictions = {}
+        Saldo atual + fluxo mensal previsto por forecast(); sem numpy,
+        + média do fluxo mensal do histórico.
+        """
+        if np is not None:
+            forecast = self.forecast(months)
+            return {f"month_{month}": balance for month, balance in enumerate(forecast.balance, 1)}
         
-        for month in range(1, months + 1):
-            future_balance = balance + (monthly_savings * month)
-            predictions[f"month_{month}"] = future_balance
+        balance = self.calculate_totals()[2]
+        _, flows = self.monthly_net_flow()
+        monthly_savings = sum(flows) / len(flows) if flows else 0
+        return {f"month_{month}": balance + monthly_savings * month for month in range(1, months + 1)}
+    
+    # ==================== PERÍODOS ====================
+    
+    def _time_rollups(self, maintain: bool = True) -> TimeRollups:
+        """
+        Rollups atuais
         
-        return predictions
+        Args:
+            maintain: Manter os rollups nas mutações seguintes; com False
+                (previsão, exportação) valem até a próxima mutação, e quem
+                nunca consulta períodos não paga a atualização a cada add
+        """
+        self._sync()
+        if self._rollups is None:
+            self._rollups = TimeRollups.from_store(self.store)
+        if maintain:
+            self._rollups_maintained = True
+        return self._rollups
     
-    def export_to_json(self) -> str:
-        """Exporta análise para JSON"""
+    def _period_summary(self, label: str, first: date, last: date, aggregate: _PeriodAggregate) -> PeriodSummary:
+        expenses = aggregate.expenses
+        categories = [
+            CategorySummary(
+                category=category,
+                total=total,
+                percentage=(total / expenses * 100) if expenses > 0 else 0,
+                transactions_count=count
+            )
+            for category, (total, count) in sorted(
+                aggregate.categories.items(), key=lambda item: (-item[1][0], item[0])
+            )
+        ]
+        balance = aggregate.income - expenses
+        
+        return PeriodSummary(
+            period=label,
+            start=first.isoformat(),
+            end=last.isoformat(),
+            total_income=aggregate.income,
+            total_expenses=expenses,
+            balance=balance,
+            transactions_count=aggregate.income_count + aggregate.expense_count,
+            categories=categories,
+            status=self.get_financial_status(balance, aggregate.income)
+        )
+    
+    def rollup(
+        self,
+        granularity: str = "month",
+        start: Optional[DateLike] = None,
+        end: Optional[DateLike] = None
+    ) -> List[PeriodSummary]:
+        """
+        Resumo por período, em ordem cronológica (só períodos com transações)
+        
+        Args:
+            granularity: "day", "week" (ISO, segunda a domingo) ou "month"
+            start: Data inicial; inclui o período que a contém
+            end: Data final; inclui o período que a contém
+        
+        Returns:
+            Lista de PeriodSummary
+        
+        Ex.: últimos 24 meses do dashboard (MonthBar/MonthsCarousel):
+            analyzer.rollup("month", start="2024-11-01")
+        """
+        rollups = self._time_rollups()
+        periods = rollups.periods(
+            granularity,
+            _to_ordinal(start) if start is not None else None,
+            _to_ordinal(end) if end is not None else None
+        )
+        
+        summaries = []
+        for key, aggregate in periods:
+            first, last = _period_bounds(granularity, key)
+            summaries.append(self._period_summary(_period_label(granularity, key), first, last, aggregate))
+        return summaries
+    
+    def summarize_range(self, start: Optional[DateLike] = None, end: Optional[DateLike] = None) -> PeriodSummary:
+        """
+        Resumo exato de um intervalo de datas (inclusive), pelos rollups diários
+        
+        Ex.: últimos 90 dias:
+            analyzer.summarize_range(start=date.today() - timedelta(days=89))
+        """
+        rollups = self._time_rollups()
+        start_ordinal = _to_ordinal(start) if start is not None else None
+        end_ordinal = _to_ordinal(end) if end is not None else None
+        
+        total = _PeriodAggregate()
+        for _, aggregate in rollups.periods("day", start_ordinal, end_ordinal):
+            total.merge(aggregate)
+        
+        bounds = rollups.date_range()
+        first = start_ordinal if start_ordinal is not None else (bounds[0] if bounds else date.today().toordinal())
+        last = end_ordinal if end_ordinal is not None else (bounds[1] if bounds else first)
+        first_day, last_day = date.fromordinal(first), date.fromordinal(last)
+        
+        return self._period_summary(f"{first_day.isoformat()}..{last_day.isoformat()}", first_day, last_day, total)
+    
+    # ==================== PREVISÃO ====================
+    
+    def monthly_net_flow(self) -> Tuple[Optional[int], List[float]]:
+        """
+        Fluxo (receitas - gastos) de cada mês, do primeiro ao último com transações
+        
+        Returns:
+            (chave do primeiro mês = ano*12 + mês - 1, fluxos);
+            meses sem transações entram com 0
+        """
+        periods = self._time_rollups(maintain=False).periods("month")
+        if not periods:
+            return None, []
+        
+        first = periods[0][0]
+        flows = [0.0] * (periods[-1][0] - first + 1)
+        for key, aggregate in periods:
+            flows[key - first] = aggregate.income - aggregate.expenses
+        return first, flows
+    
+    def forecast(self, months: int = 3, method: str = "linear", level: float = 0.8) -> Forecast:
+        """
+        Prevê fluxo e saldo dos próximos meses a partir do fluxo mensal
+        
+        Args:
+            months: Meses à frente (a partir do último mês com transações)
+            method: "linear" (tendência + sazonalidade) ou "ewma" (Holt)
+            level: Cobertura das faixas
+        
+        Returns:
+            Forecast com previsões pontuais e faixas
+        
+        Para muitos usuários de uma vez: forecasting.forecast_batch.
+        """
+        if np is None:
+            raise ImportError("forecast requer numpy")
+        from forecasting import forecast_series
+        
+        first, flows = self.monthly_net_flow()
+        if first is None:
+            today = date.today()
+            first = last = today.year * 12 + today.month - 2
+        else:
+            last = first + len(flows) - 1
+        
+        result = forecast_series(
+            flows, months,
+            balance=self.calculate_totals()[2],
+            method=method,
+            level=level,
+            first_month=first % 12 + 1
+        )
+        
+        return Forecast(
+            months=[_period_label("month", last + step) for step in range(1, months + 1)],
+            net_flow=result.net_flow[0].tolist(),
+            flow_lower=result.flow_lower[0].tolist(),
+            flow_upper=result.flow_upper[0].tolist(),
+            balance=result.balance[0].tolist(),
+            lower=result.lower[0].tolist(),
+            upper=result.upper[0].tolist(),
+            level=level,
+            method=method,
+            history=len(flows)
+        )
+    
+    # ==================== SNAPSHOT ====================
+    
+    def snapshot(self) -> AnalysisSnapshot:
+        """
+        Visão geral, insights e previsões da versão atual
+        
+        Calculado uma vez por versão: leituras repetidas sem mutação
+        devolvem o mesmo objeto.
+        
+        Returns:
+            AnalysisSnapshot (somente leitura)
+        """
+        self._sync()
+        
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self.version:
+            return snapshot
+        
         overview = self.get_overview()
-        insights = self.generate_insights()
-        predictions = self.predict_future_balance()
+        snapshot = AnalysisSnapshot(
+            version=self.version,
+            overview=overview,
+            insights=self._build_insights(overview),
+            predictions=self.predict_future_balance()
+        )
         
-        data = {
+        self._snapshot = snapshot
+        self._snapshot_json = None
+        return snapshot
+    
+    def export_data(self) -> Dict:
+        """Análise exportável (dict serializável em JSON)"""
+        snapshot = self.snapshot()
+        overview = snapshot.overview
+        
+        return {
             "overview": {
                 "income": overview.total_income,
                 "expenses": overview.total_expenses,
@@ -194,11 +1498,16 @@ class FinancialAnalyzer:
                 }
                 for cat in overview.categories
             ],
-            "insights": insights,
-            "predictions": predictions
+            "insights": snapshot.insights,
+            "predictions": snapshot.predictions
         }
-        
-        return json.dumps(data, ensure_ascii=False, indent=2)
+    
+    def export_to_json(self) -> str:
+        """Exporta análise para JSON (serializado uma vez por versão)"""
+        self.snapshot()
+        if self._snapshot_json is None:
+            self._snapshot_json = json.dumps(self.export_data(), ensure_ascii=False, indent=2)
+        return self._snapshot_json
 
 
 # 📊 Exemplo de uso
@@ -10,18 +10,38 @@ Não é um sistema de cálculos.
 Antes de investir dinheiro, o usuário aprende a investir comportamento.
 """
 
-from .goals import ProgressiveSavingProtocol
-from .progression import ArithmeticProgression
-from .validation import ProtocolValidator
-from .insights import BehavioralInsights
-from .narrative import NarrativeEngine
+from importlib import import_module
+
+# Submódulo de cada nome público: importado no primeiro acesso
+# (import financial_engine não carrega o pacote inteiro)
+_EXPORTS = {
+    'ProgressiveSavingProtocol': '.goals',
+    'ArithmeticProgression': '.progression',
+    'CappedProgression': '.progression',
+    'ProtocolValidator': '.validation',
+    'BehavioralInsights': '.insights',
+    'NarrativeEngine': '.narrative',
+}
 
 __all__ = [
     'ProgressiveSavingProtocol',
     'ArithmeticProgression',
+    'CappedProgression',
     'ProtocolValidator',
     'BehavioralInsights',
     'NarrativeEngine',
 ]
 
 __version__ = '1.0.0'
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value  # próximos acessos não passam por aqui
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
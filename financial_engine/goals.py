@@ -4,14 +4,16 @@ Goals Module - Protocolos de Meta
 Sistema determinístico. Sem probabilidade. Apenas método.
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Sequence
 from dataclasses import dataclass
 
+from .progression import CappedProgression
+
 
 @dataclass
 class ProtocolResult:
     """Resultado de um protocolo de economia"""
-    progression: List[float]
+    progression: Sequence[float]
     total: float
     target: float
     status: str  # 'reached' | 'in_progress' | 'incomplete'
@@ -56,14 +58,8 @@ class ProgressiveSavingProtocol:
         Returns:
             Resultado do protocolo
         """
-        progression = []
-        value = start
-
-        for _ in range(self.periods):
-            progression.append(value)
-            value = min(value + step, cap)
-
-        total = sum(progression)
+        progression = CappedProgression(start, step, cap, self.periods)
+        total = progression.total
         
         # Determina status
         if total >= self.target:
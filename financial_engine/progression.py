@@ -6,6 +6,10 @@ Matemática robusta. Invisível ao usuário.
 
 from typing import List, Tuple
 
+# Forma fechada da progressão com teto: uma única implementação,
+# a do motor da API, reexportada aqui
+from api.engine.progression import CappedProgression
+
 
 class ArithmeticProgression:
     """
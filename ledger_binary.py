@@ -0,0 +1,348 @@
+"""
+💾 Formato Binário de Histórico (mapeado em memória)
+Salva e abre históricos do FinancialAnalyzer sem reconverter CSV/JSON
+
+Layout (little-endian, seções alinhadas em 8 bytes):
+
+    cabeçalho (256 bytes)
+        magic "GFLEDGER", versão do esquema, linhas, categorias,
+        tabela de seções (offset, bytes)
+    colunas de largura fixa
+        amounts float64 · days int32 (ordinal) · is_income bool ·
+        category_codes int32
+    dicionário de categorias
+        offsets uint64 + blob UTF-8; ordem da primeira despesa (int32)
+    totais pré-calculados
+        receitas/gastos + total e quantidade por categoria
+    strings (id, description)
+        offsets uint64 + blob UTF-8, decodificadas sob demanda
+
+Abrir = mmap somente leitura: as colunas são views do arquivo, não
+cópias. Os totais do arquivo dispensam varrer as linhas para montar
+os agregados do analisador, e processos que abrem o mesmo arquivo
+compartilham as páginas (page cache). A primeira escrita copia.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from financial_analysis import (
+    ColumnarTransactionStore,
+    FinancialAnalyzer,
+    ListTransactionStore,
+    Transaction,
+)
+
+
+MAGIC = b"GFLEDGER"
+SCHEMA_VERSION = 1
+HEADER_SIZE = 256
+ALIGNMENT = 8
+
+# Ordem fixa das seções no arquivo: (nome, dtype)
+SECTIONS: Tuple[Tuple[str, str], ...] = (
+    ("amounts", "<f8"),
+    ("days", "<i4"),
+    ("is_income", "|b1"),
+    ("category_codes", "<i4"),
+    ("category_offsets", "<u8"),
+    ("category_blob", "|u1"),
+    ("expense_order", "<i4"),
+    ("totals", "<f8"),
+    ("category_totals", "<f8"),
+    ("category_counts", "<i8"),
+    ("id_offsets", "<u8"),
+    ("id_blob", "|u1"),
+    ("description_offsets", "<u8"),
+    ("description_blob", "|u1"),
+)
+
+# magic, versão, flags, linhas, categorias, seções
+_HEADER = struct.Struct("<8sHHQII")
+_SECTION = struct.Struct("<QQ")
+
+assert _HEADER.size + _SECTION.size * len(SECTIONS) <= HEADER_SIZE
+
+LedgerSource = Union[FinancialAnalyzer, ColumnarTransactionStore, ListTransactionStore, Iterable[Transaction]]
+
+
+class LedgerFormatError(ValueError):
+    """Arquivo que não é um histórico binário válido"""
+
+
+@dataclass
+class LedgerHeader:
+    """Cabeçalho do arquivo"""
+    version: int
+    rows: int
+    categories: int
+    sections: Dict[str, Tuple[int, int]]  # nome → (offset, bytes)
+
+
+class StringColumn(Sequence[str]):
+    """
+    Coluna de strings sobre offsets + blob UTF-8 (sem cópia)
+    
+    Cada acesso decodifica só a string pedida.
+    """
+    
+    __slots__ = ("offsets", "blob")
+    
+    def __init__(self, offsets: np.ndarray, blob: np.ndarray):
+        self.offsets = offsets
+        self.blob = blob
+    
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        
+        start, end = int(self.offsets[index]), int(self.offsets[index + 1])
+        return self.blob[start:end].tobytes().decode("utf-8")
+    
+    def __iter__(self) -> Iterator[str]:
+        blob = self.blob
+        offsets = self.offsets.tolist()
+        for start, end in zip(offsets, offsets[1:]):
+            yield blob[start:end].tobytes().decode("utf-8")
+
+
+# ==================== ESCRITA ====================
+
+def _encode_strings(values: Iterable[str]) -> Tuple[np.ndarray, bytes]:
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u8")
+    if encoded:
+        np.cumsum([len(item) for item in encoded], out=offsets[1:])
+    return offsets, b"".join(encoded)
+
+
+def _as_columnar(source: LedgerSource) -> ColumnarTransactionStore:
+    if isinstance(source, FinancialAnalyzer):
+        source = source.store
+    if isinstance(source, ColumnarTransactionStore):
+        return source
+    return ColumnarTransactionStore.from_transactions(source)
+
+
+def save_ledger(path: Union[str, Path], source: LedgerSource) -> LedgerHeader:
+    """
+    Grava o histórico no formato binário
+    
+    Escrita em arquivo temporário + rename: quem já tem o arquivo
+    mapeado continua vendo a versão anterior.
+    
+    Args:
+        path: Arquivo de destino
+        source: Analisador, armazenamento ou transações
+    
+    Returns:
+        LedgerHeader do arquivo gravado
+    """
+    store = _as_columnar(source)
+    n = len(store)
+    categories = store.categories
+    category_index = {category: code for code, category in enumerate(categories)}
+    
+    if isinstance(source, FinancialAnalyzer):
+        # Totais do próprio analisador: reabrir reproduz a mesma análise
+        income, expenses, _ = source.calculate_totals()
+        total_expenses = expenses
+        by_category = [
+            (summary.category, summary.total, summary.transactions_count)
+            for summary in source.analyze_by_category()
+        ]
+    else:
+        income, expenses = store.totals()
+        total_expenses, by_category = store.expense_by_category()
+    
+    category_totals = np.zeros(len(categories), dtype="<f8")
+    category_counts = np.zeros(len(categories), dtype="<i8")
+    for category, total, count in by_category:
+        category_totals[category_index[category]] = total
+        category_counts[category_index[category]] = count
+    
+    category_offsets, category_blob = _encode_strings(categories)
+    id_offsets, id_blob = _encode_strings(store.ids[:n])
+    description_offsets, description_blob = _encode_strings(store.descriptions[:n])
+    
+    payloads = {
+        "amounts": store.amounts[:n],
+        "days": store.days[:n],
+        "is_income": store.is_income[:n],
+        "category_codes": store.category_codes[:n],
+        "category_offsets": category_offsets,
+        "category_blob": category_blob,
+        "expense_order": store._expense_order,
+        "totals": [income, expenses, total_expenses],
+        "category_totals": category_totals,
+        "category_counts": category_counts,
+        "id_offsets": id_offsets,
+        "id_blob": id_blob,
+        "description_offsets": description_offsets,
+        "description_blob": description_blob,
+    }
+    
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    sections: Dict[str, Tuple[int, int]] = {}
+    
+    with open(tmp_path, "wb") as f:
+        f.write(b"\0" * HEADER_SIZE)
+        offset = HEADER_SIZE
+        
+        for name, dtype in SECTIONS:
+            payload = payloads[name]
+            data = payload if isinstance(payload, bytes) else np.ascontiguousarray(payload, dtype=dtype).tobytes()
+            
+            padding = -offset % ALIGNMENT
+            f.write(b"\0" * padding)
+            offset += padding
+            
+            f.write(data)
+            sections[name] = (offset, len(data))
+            offset += len(data)
+        
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, SCHEMA_VERSION, 0, n, len(categories), len(SECTIONS)))
+        for name, _ in SECTIONS:
+            f.write(_SECTION.pack(*sections[name]))
+    
+    os.replace(tmp_path, path)
+    return LedgerHeader(version=SCHEMA_VERSION, rows=n, categories=len(categories), sections=sections)
+
+
+# ==================== LEITURA ====================
+
+def _parse_header(buffer, size: int) -> LedgerHeader:
+    if size < HEADER_SIZE:
+        raise LedgerFormatError("arquivo menor que o cabeçalho")
+    
+    magic, version, _flags, rows, categories, count = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise LedgerFormatError("assinatura inválida (não é um histórico binário)")
+    if version != SCHEMA_VERSION:
+        raise LedgerFormatError(f"versão de esquema não suportada: {version} (esperado {SCHEMA_VERSION})")
+    if count != len(SECTIONS):
+        raise LedgerFormatError(f"tabela de seções inválida: {count} seções")
+    
+    sections = {}
+    for i, (name, _) in enumerate(SECTIONS):
+        offset, nbytes = _SECTION.unpack_from(buffer, _HEADER.size + i * _SECTION.size)
+        if offset < HEADER_SIZE or offset + nbytes > size:
+            raise LedgerFormatError(f"seção {name} fora do arquivo")
+        sections[name] = (offset, nbytes)
+    
+    return LedgerHeader(version=version, rows=rows, categories=categories, sections=sections)
+
+
+def read_header(path: Union[str, Path]) -> LedgerHeader:
+    """Lê só o cabeçalho (linhas, categorias, versão)"""
+    with open(path, "rb") as f:
+        data = f.read(HEADER_SIZE)
+        size = os.fstat(f.fileno()).st_size
+    return _parse_header(data, size)
+
+
+def _views(buffer, header: LedgerHeader) -> Dict[str, np.ndarray]:
+    """Uma view numpy por seção, sem cópia"""
+    expected = {
+        "amounts": header.rows,
+        "days": header.rows,
+        "is_income": header.rows,
+        "category_codes": header.rows,
+        "category_offsets": header.categories + 1,
+        "totals": 3,
+        "category_totals": header.categories,
+        "category_counts": header.categories,
+        "id_offsets": header.rows + 1,
+        "description_offsets": header.rows + 1,
+    }
+    
+    views = {}
+    for name, dtype in SECTIONS:
+        offset, nbytes = header.sections[name]
+        dtype = np.dtype(dtype)
+        if nbytes % dtype.itemsize:
+            raise LedgerFormatError(f"seção {name} com tamanho inválido")
+        
+        count = nbytes // dtype.itemsize
+        if name in expected and count != expected[name]:
+            raise LedgerFormatError(f"seção {name}: {count} itens, esperado {expected[name]}")
+        
+        views[name] = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset)
+    return views
+
+
+def load_store(path: Union[str, Path]) -> ColumnarTransactionStore:
+    """
+    Abre o arquivo como ColumnarTransactionStore mapeado
+    
+    Args:
+        path: Arquivo gravado por save_ledger
+    
+    Returns:
+        Armazenamento com colunas-view do mmap (somente leitura até a
+        primeira escrita, que copia)
+    
+    Raises:
+        LedgerFormatError: Arquivo inválido ou de outra versão
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < HEADER_SIZE:
+            raise LedgerFormatError("arquivo menor que o cabeçalho")
+        # O mapa continua válido depois de fechar o arquivo
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    header = _parse_header(buffer, size)
+    views = _views(buffer, header)
+    
+    categories: List[str] = list(StringColumn(views["category_offsets"], views["category_blob"]))
+    expense_order = views["expense_order"].tolist()
+    
+    income, expenses, total_expenses = views["totals"].tolist()
+    category_totals = views["category_totals"].tolist()
+    category_counts = views["category_counts"].tolist()
+    summary = (
+        (income, expenses),
+        (total_expenses, [
+            (categories[code], category_totals[code], category_counts[code])
+            for code in expense_order
+        ])
+    )
+    
+    return ColumnarTransactionStore.from_columns(
+        amounts=views["amounts"],
+        days=views["days"],
+        is_income=views["is_income"],
+        category_codes=views["category_codes"],
+        categories=categories,
+        ids=StringColumn(views["id_offsets"], views["id_blob"]),
+        descriptions=StringColumn(views["description_offsets"], views["description_blob"]),
+        expense_order=expense_order,
+        summary=summary
+    )
+
+
+def open_ledger(path: Union[str, Path]) -> FinancialAnalyzer:
+    """
+    Abre o arquivo pronto para análise
+    
+    Agregados montados a partir dos totais gravados: custo
+    O(categorias), não O(linhas).
+    """
+    return FinancialAnalyzer(load_store(path))
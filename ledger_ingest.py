@@ -0,0 +1,588 @@
+"""
+📥 Ingestão de Extratos em Streaming
+Lê CSV ou JSONL em blocos e alimenta o FinancialAnalyzer
+
+- Memória da ingestão limitada ao bloco (chunk_size linhas),
+  independente do tamanho do arquivo
+- Datas e valores convertidos por coluna, de uma vez por bloco;
+  linha a linha só quando o bloco tem linha inválida
+- Linhas inválidas vão para um arquivo de rejeitados (JSONL),
+  sem abortar a importação
+- Vazão (linhas/s) reportada a cada bloco
+
+O histórico importado fica no armazenamento do analisador:
+para milhões de linhas, use ColumnarTransactionStore.
+"""
+
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+import csv
+import gc
+import json
+import math
+import threading
+import time
+
+from anomaly_detection import Anomaly, AnomalyDetector
+from financial_analysis import FinancialAnalyzer, TransactionBatch
+from transaction_categorizer import TransactionCategorizer
+
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+FIELDS = ("id", "date", "category", "amount", "type", "description")
+
+# Tipos aceitos nos extratos → tipo da Transaction
+TYPE_ALIASES = {
+    "income": "income",
+    "receita": "income",
+    "credit": "income",
+    "credito": "income",
+    "crédito": "income",
+    "expense": "expense",
+    "despesa": "expense",
+    "debit": "expense",
+    "debito": "expense",
+    "débito": "expense",
+}
+
+Source = Union[str, Path, IO[str]]
+
+
+@dataclass
+class ChunkReport:
+    """Resultado de um bloco"""
+    index: int
+    rows: int  # linhas lidas, inclusive vazias
+    accepted: int
+    rejected: int
+    seconds: float
+    anomalies: int = 0
+    
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass
+class IngestionReport:
+    """Resultado da importação (sem guardar os blocos: memória constante)"""
+    source: str
+    rows: int = 0
+    accepted: int = 0
+    rejected: int = 0
+    chunks: int = 0
+    seconds: float = 0.0
+    reject_path: Optional[str] = None
+    anomalies: int = 0
+    
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass
+class Chunk:
+    """Bloco lido: linhas válidas em colunas + malformadas"""
+    size: int = 0
+    lines: List[int] = field(default_factory=list)
+    raws: List[Any] = field(default_factory=list)
+    columns: Dict[str, Sequence[Any]] = field(default_factory=dict)
+    malformed: List[Tuple[int, str, Any]] = field(default_factory=list)
+
+
+class RejectWriter:
+    """Arquivo de rejeitados (JSONL), aberto só na primeira rejeição"""
+    
+    def __init__(self, path: Optional[Union[str, Path]]):
+        self.path = Path(path) if path is not None else None
+        self._file: Optional[IO[str]] = None
+    
+    def write(self, line: int, error: str, raw: Any):
+        if self.path is None:
+            return
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "w", encoding="utf-8")
+        record = {"line": line, "error": error, "raw": raw}
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class LedgerIngestor:
+    """
+    Importador de extratos em blocos
+    
+    Uso:
+        analyzer = FinancialAnalyzer(ColumnarTransactionStore())
+        ingestor = LedgerIngestor(analyzer, reject_path="rejeitados.jsonl")
+        report = ingestor.ingest("extrato.csv")
+    """
+    
+    def __init__(
+        self,
+        analyzer: FinancialAnalyzer,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        reject_path: Optional[Union[str, Path]] = None,
+        columns: Optional[Dict[str, str]] = None,
+        date_format: Optional[str] = None,
+        decimal: str = ".",
+        default_category: str = "Outros",
+        on_chunk: Optional[Callable[[ChunkReport], None]] = None,
+        detector: Optional[AnomalyDetector] = None,
+        on_anomaly: Optional[Callable[[Anomaly], None]] = None,
+        categorizer: Optional[TransactionCategorizer] = None,
+        pause_gc: bool = False
+    ):
+        """
+        Args:
+            analyzer: Analisador que recebe as transações
+            chunk_size: Linhas por bloco (limite de memória da ingestão)
+            reject_path: Arquivo JSONL das linhas rejeitadas (None = só contar)
+            columns: Nome da coluna no arquivo para cada campo
+                (ex.: {"amount": "Valor", "date": "Data"}); padrão = nome do campo
+            date_format: Formato strptime das datas (None = ISO 8601)
+            decimal: Separador decimal dos valores ("," para "1.234,56")
+            default_category: Categoria quando a coluna está vazia ou ausente
+            on_chunk: Chamado ao fim de cada bloco (progresso/vazão)
+            detector: AnomalyDetector atualizado com cada bloco aceito
+            on_anomaly: Chamado para cada anomalia detectada
+            categorizer: Categoria pela descrição nas linhas sem
+                categoria (antes de default_category)
+            pause_gc: Pausa o coletor cíclico durante a importação.
+                Os blocos só criam objetos acíclicos e, com o heap
+                crescendo, as varreduras custam ~1/3 do tempo em
+                arquivos grandes. Vale para o processo inteiro enquanto
+                durar; importações sobrepostas compartilham a pausa e o
+                estado anterior volta quando a última termina.
+        
+        Sem coluna de tipo, o sinal do valor decide: negativo = despesa.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size deve ser positivo")
+        if decimal not in (".", ","):
+            raise ValueError("decimal deve ser '.' ou ','")
+        
+        self.analyzer = analyzer
+        self.chunk_size = chunk_size
+        self.reject_path = reject_path
+        self.columns = {field: field for field in FIELDS}
+        self.columns.update(columns or {})
+        self.date_format = date_format
+        self.decimal = decimal
+        self.default_category = default_category
+        self.on_chunk = on_chunk
+        self.detector = detector
+        self.on_anomaly = on_anomaly
+        self.categorizer = categorizer
+        self.pause_gc = pause_gc
+    
+    # ==================== ENTRADA ====================
+    
+    def ingest(self, source: Union[str, Path]) -> IngestionReport:
+        """Importa pelo sufixo do arquivo (.jsonl/.ndjson ou CSV)"""
+        if Path(source).suffix.lower() in (".jsonl", ".ndjson"):
+            return self.ingest_jsonl(source)
+        return self.ingest_csv(source)
+    
+    def ingest_csv(self, source: Source, delimiter: str = ",") -> IngestionReport:
+        """
+        Importa CSV com cabeçalho
+        
+        Args:
+            source: Caminho ou arquivo texto aberto
+            delimiter: Separador de colunas (";" em extratos brasileiros)
+        
+        Returns:
+            IngestionReport
+        """
+        with _open(source) as f:
+            reader = csv.reader(f, delimiter=delimiter)
+            header = next(reader, None)
+            if header is None:
+                return self._run(_name(source), iter(()))
+            
+            positions = {name.strip(): i for i, name in enumerate(header)}
+            fields = [
+                (field, positions[column])
+                for field, column in self.columns.items() if column in positions
+            ]
+            if not any(field == "amount" for field, _ in fields):
+                raise ValueError(f"Coluna de valor ausente: {self.columns['amount']!r}")
+            
+            width = len(header)
+            
+            def chunks() -> Iterator[Chunk]:
+                while True:
+                    chunk = Chunk()
+                    for row in islice(reader, self.chunk_size):
+                        chunk.size += 1
+                        if len(row) != width:
+                            if row:
+                                chunk.malformed.append((reader.line_num, "linha malformada", row))
+                            continue
+                        chunk.lines.append(reader.line_num)
+                        chunk.raws.append(row)
+                    
+                    if not chunk.size:
+                        return
+                    
+                    # Transposição em C: uma tupla por coluna
+                    if chunk.raws:
+                        transposed = list(zip(*chunk.raws))
+                        chunk.columns = {field: transposed[i] for field, i in fields}
+                    yield chunk
+            
+            return self._run(_name(source), chunks())
+    
+    def ingest_jsonl(self, source: Source) -> IngestionReport:
+        """
+        Importa JSONL (um objeto por linha)
+        
+        Args:
+            source: Caminho ou arquivo texto aberto
+        
+        Returns:
+            IngestionReport
+        """
+        with _open(source) as f:
+            numbered = enumerate(f, start=1)
+            
+            def chunks() -> Iterator[Chunk]:
+                while True:
+                    chunk = Chunk()
+                    lines = []
+                    for line_number, line in islice(numbered, self.chunk_size):
+                        chunk.size += 1
+                        line = line.strip()
+                        if line:
+                            chunk.lines.append(line_number)
+                            lines.append(line)
+                    
+                    if not chunk.size:
+                        return
+                    
+                    # Bloco inteiro num único json.loads (array); se alguma
+                    # linha for inválida, volta para linha a linha
+                    try:
+                        records = json.loads("[" + ",".join(lines) + "]")
+                    except ValueError:
+                        records = None
+                    if records is None or len(records) != len(lines):
+                        records = list(map(_loads_or_none, lines))
+                    
+                    if not all(isinstance(record, dict) for record in records):
+                        valid = [i for i, record in enumerate(records) if isinstance(record, dict)]
+                        chunk.malformed = [
+                            (chunk.lines[i], "linha malformada", line)
+                            for i, (record, line) in enumerate(zip(records, lines))
+                            if not isinstance(record, dict)
+                        ]
+                        chunk.lines = [chunk.lines[i] for i in valid]
+                        lines = [lines[i] for i in valid]
+                        records = [records[i] for i in valid]
+                    
+                    chunk.raws = lines
+                    chunk.columns = {
+                        field: [record.get(column) for record in records]
+                        for field, column in self.columns.items()
+                    }
+                    yield chunk
+            
+            return self._run(_name(source), chunks())
+    
+    # ==================== BLOCOS ====================
+    
+    def _run(self, source: str, chunks: Iterator[Chunk]) -> IngestionReport:
+        report = IngestionReport(
+            source=source,
+            reject_path=str(self.reject_path) if self.reject_path is not None else None
+        )
+        rejects = RejectWriter(self.reject_path)
+        started = time.perf_counter()
+        
+        try:
+            with _paused_gc() if self.pause_gc else nullcontext():
+                chunk_started = time.perf_counter()
+                for chunk in chunks:
+                    batch = self._parse_chunk(chunk, rejects)
+                    self.analyzer.add_transactions(batch)
+                    
+                    anomalies = self.detector.observe_batch(batch) if self.detector is not None else []
+                    if self.on_anomaly is not None:
+                        for anomaly in anomalies:
+                            self.on_anomaly(anomaly)
+                    
+                    chunk_report = ChunkReport(
+                        index=report.chunks,
+                        rows=chunk.size,
+                        accepted=len(batch),
+                        rejected=len(chunk.lines) + len(chunk.malformed) - len(batch),
+                        seconds=time.perf_counter() - chunk_started,
+                        anomalies=len(anomalies)
+                    )
+                    report.chunks += 1
+                    report.rows += chunk_report.rows
+                    report.accepted += chunk_report.accepted
+                    report.rejected += chunk_report.rejected
+                    report.anomalies += chunk_report.anomalies
+                    
+                    if self.on_chunk is not None:
+                        self.on_chunk(chunk_report)
+                    chunk_started = time.perf_counter()
+        finally:
+            rejects.close()
+            report.seconds = time.perf_counter() - started
+        
+        return report
+    
+    def _parse_chunk(self, chunk: Chunk, rejects: RejectWriter) -> TransactionBatch:
+        """
+        Converte um bloco coluna a coluna; rejeitados vão para o arquivo
+        
+        Valores e textos: map() na coluna inteira, elemento a elemento
+        só se a coluna tiver valor inválido. Datas, tipos e categorias
+        se repetem muito: cada valor distinto é convertido uma vez.
+        """
+        for line, error, raw in chunk.malformed:
+            rejects.write(line, error, raw)
+        
+        n = len(chunk.lines)
+        if not n:
+            return TransactionBatch([], [], [], [], [], [])
+        
+        columns = chunk.columns
+        missing = (None,) * n
+        errors: Dict[int, str] = {}
+        
+        fast_amount = float if self.decimal == "." else self._parse_amount
+        amounts = _convert(fast_amount, self._parse_amount, columns.get("amount", missing), errors)
+        if not all(map(math.isfinite, (a for a in amounts if a is not None))):
+            for i, amount in enumerate(amounts):
+                if amount is not None and not math.isfinite(amount):
+                    errors.setdefault(i, f"valor inválido: {amount!r}")
+        
+        dates = _convert_unique(self._parse_date, columns.get("date", missing), errors)
+        
+        if "type" in columns:
+            kinds = _convert_unique(self._parse_type, columns["type"], errors)
+            kinds = [
+                kind if kind or amount is None else ("expense" if amount < 0 else "income")
+                for kind, amount in zip(kinds, amounts)
+            ]
+        else:
+            kinds = ["expense" if amount is not None and amount < 0 else "income" for amount in amounts]
+        
+        ids = _convert(str.strip, _text, columns["id"], errors) if "id" in columns else [""] * n
+        categories = _convert_unique(_text, columns["category"], errors) if "category" in columns else [""] * n
+        descriptions = _convert(str.strip, _text, columns["description"], errors) if "description" in columns else [""] * n
+        
+        lines = chunk.lines
+        if errors:
+            for i in sorted(errors):
+                rejects.write(lines[i], errors[i], chunk.raws[i])
+            keep = [i for i in range(n) if i not in errors]
+            lines, ids, dates, categories, amounts, kinds, descriptions = (
+                [column[i] for i in keep]
+                for column in (lines, ids, dates, categories, amounts, kinds, descriptions)
+            )
+        
+        if self.categorizer is not None and not all(categories):
+            blank = [i for i, category in enumerate(categories) if not category]
+            labels = self.categorizer.categorize_many([descriptions[i] for i in blank])
+            for i, label in zip(blank, labels):
+                if label:
+                    categories[i] = label
+        
+        default_category = self.default_category
+        return TransactionBatch(
+            ids=[id or str(line) for id, line in zip(ids, lines)],
+            dates=dates,
+            categories=[category or default_category for category in categories],
+            amounts=list(map(abs, amounts)),
+            types=kinds,
+            descriptions=descriptions
+        )
+    
+    # ==================== CAMPOS ====================
+    
+    def _parse_amount(self, value: Any) -> float:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+        
+        text = _text(value)
+        if not text:
+            raise ValueError("valor ausente")
+        if self.decimal == ",":
+            text = text.replace(".", "").replace(",", ".")
+        try:
+            return float(text)
+        except ValueError:
+            raise ValueError(f"valor inválido: {value!r}") from None
+    
+    def _parse_date(self, value: Any) -> str:
+        text = _text(value)
+        if not text:
+            raise ValueError("data ausente")
+        try:
+            if self.date_format is not None:
+                return datetime.strptime(text, self.date_format).date().isoformat()
+            return date.fromisoformat(text[:10]).isoformat()
+        except ValueError:
+            raise ValueError(f"data inválida: {value!r}") from None
+    
+    @staticmethod
+    def _parse_type(value: Any) -> str:
+        text = _text(value)
+        if not text:
+            return ""
+        kind = TYPE_ALIASES.get(text.lower())
+        if kind is None:
+            raise ValueError(f"tipo inválido: {value!r}")
+        return kind
+
+
+def _convert(
+    fast: Callable[[Any], Any],
+    slow: Callable[[Any], Any],
+    values: Sequence[Any],
+    errors: Dict[int, str]
+) -> List[Any]:
+    """
+    Converte uma coluna: map(fast) de uma vez; se falhar, elemento
+    a elemento, com slow nos que fast recusa (None + erro nos inválidos)
+    """
+    try:
+        return list(map(fast, values))
+    except (AttributeError, KeyError, TypeError, ValueError):
+        pass
+    
+    converted = []
+    for i, value in enumerate(values):
+        try:
+            converted.append(fast(value))
+            continue
+        except (AttributeError, KeyError, TypeError, ValueError):
+            pass
+        try:
+            converted.append(slow(value))
+        except (TypeError, ValueError) as error:
+            converted.append(None)
+            errors.setdefault(i, str(error))
+    return converted
+
+
+def _loads_or_none(line: str) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+def _convert_unique(
+    parse: Callable[[Any], Any],
+    values: Sequence[Any],
+    errors: Dict[int, str]
+) -> List[Any]:
+    """Converte cada valor distinto uma vez e espalha pela coluna"""
+    try:
+        distinct = set(values)
+    except TypeError:  # JSON com listas/objetos: sem tabela
+        return _convert(parse, parse, values, errors)
+    
+    table: Dict[Any, Any] = {}
+    failed: Dict[Any, str] = {}
+    for value in distinct:
+        try:
+            table[value] = parse(value)
+        except (TypeError, ValueError) as error:
+            failed[value] = str(error)
+    
+    if failed:
+        for i, value in enumerate(values):
+            if value in failed:
+                errors.setdefault(i, failed[value])
+    
+    return list(map(table.get, values))
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    return value.strip() if isinstance(value, str) else str(value)
+
+
+def _name(source: Source) -> str:
+    return str(source) if isinstance(source, (str, Path)) else getattr(source, "name", "<stream>")
+
+
+class _paused_gc:
+    """
+    Coletor cíclico desligado enquanto houver alguma pausa ativa
+    
+    Contagem de referências compartilhada pelo processo: a primeira
+    pausa guarda gc.isenabled() e desliga; a última restaura esse
+    estado. Uma importação que termina não religa o coletor sob
+    outra ainda em andamento.
+    """
+    
+    _lock = threading.Lock()
+    _active = 0
+    _was_enabled = False
+    
+    def __enter__(self):
+        cls = type(self)
+        with cls._lock:
+            if cls._active == 0:
+                cls._was_enabled = gc.isenabled()
+                gc.disable()
+            cls._active += 1
+    
+    def __exit__(self, *exc):
+        cls = type(self)
+        with cls._lock:
+            cls._active -= 1
+            if cls._active == 0 and cls._was_enabled:
+                gc.enable()
+
+
+class _open:
+    """Abre caminhos; arquivos já abertos não são fechados aqui"""
+    
+    def __init__(self, source: Source):
+        self.source = source
+        self._file: Optional[IO[str]] = None
+    
+    def __enter__(self) -> IO[str]:
+        if isinstance(self.source, (str, Path)):
+            self._file = open(self.source, "r", encoding="utf-8-sig", newline="")
+            return self._file
+        return self.source
+    
+    def __exit__(self, *exc):
+        if self._file is not None:
+            self._file.close()
+
+
+def ingest_file(
+    path: Union[str, Path],
+    analyzer: Optional[FinancialAnalyzer] = None,
+    **options
+) -> Tuple[FinancialAnalyzer, IngestionReport]:
+    """
+    Atalho: importa um arquivo para um analisador (novo se não informado)
+    
+    Returns:
+        (analisador, relatório)
+    """
+    analyzer = analyzer if analyzer is not None else FinancialAnalyzer()
+    report = LedgerIngestor(analyzer, **options).ingest(path)
+    return analyzer, report
@@ -0,0 +1,283 @@
+"""
+⚙️ Análise em Lote de Vários Usuários
+Um FinancialAnalyzer por usuário, distribuído entre processos
+
+- Usuários enviados em lotes (batch_size) para um ProcessPoolExecutor
+  (ou InterpreterPoolExecutor no Python 3.14+): uma tarefa por lote,
+  não por usuário
+- Poucos lotes em andamento por vez (max_pending): memória limitada,
+  independente da quantidade de usuários
+- Resultados gravados em streaming num arquivo JSONL, na ordem de
+  entrada (uma linha por usuário)
+- Relatório com usuários/s e utilização de cada worker
+
+Fonte de cada usuário: caminho de extrato (.csv, .jsonl ou .gfl),
+lista de Transaction ou função sem argumentos que devolve as
+transações. Funções precisam ser serializáveis (pickle): funções de
+módulo ou functools.partial, não lambdas. Carregar no worker (caminho
+ou função) evita serializar as transações no processo principal.
+"""
+
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import json
+import os
+import threading
+import time
+
+from financial_analysis import FinancialAnalyzer, Transaction
+
+
+DEFAULT_BATCH_SIZE = 256
+
+POOLS = ("process", "interpreter")
+
+UserSource = Union[str, Path, Sequence[Transaction], Callable[[], Iterable[Transaction]]]
+UserLedger = Tuple[str, UserSource]
+
+
+@dataclass
+class WorkerReport:
+    """Trabalho de um worker"""
+    worker: str  # pid (processos) ou pid/thread (interpretadores)
+    batches: int = 0
+    users: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    utilization: float = 0.0  # tempo ocupado / duração da execução
+
+
+@dataclass
+class RunReport:
+    """Resultado da execução"""
+    output: str
+    users: int = 0
+    failed: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    workers: List[WorkerReport] = field(default_factory=list)
+    
+    @property
+    def users_per_second(self) -> float:
+        return self.users / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass
+class BatchResult:
+    """Resultado de um lote, devolvido pelo worker"""
+    worker: str
+    lines: List[str]
+    failed: int
+    busy_seconds: float
+
+
+# ==================== WORKER ====================
+
+def load_analyzer(source: UserSource) -> FinancialAnalyzer:
+    """
+    Monta o analisador de um usuário
+    
+    Args:
+        source: Caminho (.gfl = formato binário; demais via
+            LedgerIngestor), lista de transações ou função que as devolve
+    """
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        if path.suffix == ".gfl":
+            from ledger_binary import open_ledger
+            return open_ledger(path)
+        
+        from ledger_ingest import ingest_file
+        analyzer, _ = ingest_file(path)
+        return analyzer
+    
+    analyzer = FinancialAnalyzer()
+    analyzer.add_transactions(source() if callable(source) else source)
+    return analyzer
+
+
+def analyze_user(user_id: str, source: UserSource) -> str:
+    """Linha JSONL com a análise do usuário (export_data)"""
+    data = load_analyzer(source).export_data()
+    return json.dumps({"user_id": user_id, "analysis": data}, ensure_ascii=False)
+
+
+def _worker_id() -> str:
+    pid = os.getpid()
+    if threading.current_thread() is threading.main_thread():
+        return str(pid)
+    return f"{pid}/{threading.get_ident()}"
+
+
+def run_batch(batch: List[UserLedger]) -> BatchResult:
+    """
+    Analisa um lote de usuários (executado no worker)
+    
+    Erro num usuário vira linha {"user_id", "error"}: o lote continua.
+    """
+    started = time.perf_counter()
+    lines = []
+    failed = 0
+    
+    for user_id, source in batch:
+        try:
+            lines.append(analyze_user(user_id, source))
+        except Exception as exc:
+            failed += 1
+            error = f"{type(exc).__name__}: {exc}"
+            lines.append(json.dumps({"user_id": user_id, "error": error}, ensure_ascii=False))
+    
+    return BatchResult(
+        worker=_worker_id(),
+        lines=lines,
+        failed=failed,
+        busy_seconds=time.perf_counter() - started
+    )
+
+
+# ==================== EXECUÇÃO ====================
+
+class _InlineExecutor(Executor):
+    """Executa no próprio processo (workers=0): referência sem pool"""
+    
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+
+def _executor(pool: str, workers: int) -> Executor:
+    if workers == 0:
+        return _InlineExecutor()
+    if pool == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+    if pool == "interpreter":
+        try:
+            from concurrent.futures import InterpreterPoolExecutor
+        except ImportError:
+            raise ValueError("pool='interpreter' requer Python 3.14+ (InterpreterPoolExecutor)") from None
+        return InterpreterPoolExecutor(max_workers=workers)
+    raise ValueError(f"Pool inválido: {pool!r} (esperado {', '.join(POOLS)})")
+
+
+class MultiUserRunner:
+    """
+    Executor da análise noturna de todos os usuários
+    
+    Uso:
+        runner = MultiUserRunner(workers=8)
+        report = runner.run(ledgers, "analises.jsonl")
+        print(f"{report.users_per_second:,.0f} usuários/s")
+    """
+    
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_pending: Optional[int] = None,
+        pool: str = "process",
+        on_batch: Optional[Callable[[BatchResult], None]] = None
+    ):
+        """
+        Args:
+            workers: Processos (padrão: núcleos disponíveis; 0 = sem pool)
+            batch_size: Usuários por tarefa enviada ao pool
+            max_pending: Lotes em andamento (padrão: 4 por worker)
+            pool: 'process' ou 'interpreter' (Python 3.14+)
+            on_batch: Chamado a cada lote concluído (progresso)
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size deve ser positivo")
+        if pool not in POOLS:
+            raise ValueError(f"Pool inválido: {pool!r} (esperado {', '.join(POOLS)})")
+        
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.batch_size = batch_size
+        self.max_pending = max_pending or max(1, self.workers) * 4
+        self.pool = pool
+        self.on_batch = on_batch
+    
+    def _batches(self, ledgers: Iterable[UserLedger]) -> Iterable[List[UserLedger]]:
+        iterator = iter(ledgers)
+        while True:
+            batch = list(islice(iterator, self.batch_size))
+            if not batch:
+                return
+            yield batch
+    
+    def run(self, ledgers: Iterable[UserLedger], output: Union[str, Path]) -> RunReport:
+        """
+        Analisa todos os usuários e grava um JSONL
+        
+        Escrita em arquivo temporário + rename: o arquivo final só
+        aparece completo. Se a execução falhar (exceção fora de um
+        usuário, como pool quebrado), o temporário é apagado e a
+        exceção propagada.
+        
+        Args:
+            ledgers: (user_id, fonte) de cada usuário; consumido aos poucos
+            output: Arquivo JSONL de saída
+        
+        Returns:
+            RunReport com vazão e utilização por worker
+        """
+        output = Path(output)
+        tmp_path = output.with_name(output.name + ".tmp")
+        report = RunReport(output=str(output))
+        workers: Dict[str, WorkerReport] = {}
+        pending: Deque[Future] = deque()
+        
+        def collect(result: BatchResult):
+            f.write("\n".join(result.lines) + "\n")
+            report.users += len(result.lines)
+            report.failed += result.failed
+            report.batches += 1
+            
+            stats = workers.get(result.worker)
+            if stats is None:
+                stats = workers[result.worker] = WorkerReport(worker=result.worker)
+            stats.batches += 1
+            stats.users += len(result.lines)
+            stats.failed += result.failed
+            stats.busy_seconds += result.busy_seconds
+            
+            if self.on_batch:
+                self.on_batch(result)
+        
+        started = time.perf_counter()
+        output.parent.mkdir(parents=True, exist_ok=True)
+        
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f, _executor(self.pool, self.workers) as executor:
+                for batch in self._batches(ledgers):
+                    pending.append(executor.submit(run_batch, batch))
+                    # Ordem de entrada: espera o lote mais antigo
+                    while len(pending) >= self.max_pending:
+                        collect(pending.popleft().result())
+                
+                while pending:
+                    collect(pending.popleft().result())
+        except BaseException:
+            # Pool quebrado, fonte ou on_batch com erro, Ctrl+C: sem .tmp pela metade
+            tmp_path.unlink(missing_ok=True)
+            raise
+        
+        os.replace(tmp_path, output)
+        report.seconds = time.perf_counter() - started
+        
+        for stats in workers.values():
+            stats.utilization = stats.busy_seconds / report.seconds if report.seconds > 0 else 0.0
+        report.workers = sorted(workers.values(), key=lambda stats: stats.worker)
+        return report
+
+
+def run_analyses(ledgers: Iterable[UserLedger], output: Union[str, Path], **options) -> RunReport:
+    """Atalho: MultiUserRunner(**options).run(ledgers, output)"""
+    return MultiUserRunner(**options).run(ledgers, output)
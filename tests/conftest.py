@@ -0,0 +1,10 @@
+"""
+Configuração dos testes dos módulos da raiz
+"""
+
+import sys
+from pathlib import Path
+
+# Adiciona a raiz ao path para imports
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
@@ -0,0 +1,177 @@
+"""
+Testes da Detecção de Anomalias
+
+Welford por transação e por mês (virada de mês, meses vazios),
+sinalização, lote e persistência do estado.
+"""
+
+import math
+import random
+import statistics
+
+import pytest
+from anomaly_detection import (
+    AnomalyDetector,
+    DetectorConfig,
+    load_detectors,
+    save_detectors,
+)
+from financial_analysis import Transaction, TransactionBatch
+
+
+def expense(i, day, amount, category="Alimentação"):
+    return Transaction(f"t{i}", day, category, amount, "expense")
+
+
+def month_day(month: int, day: int = 10) -> str:
+    """Mês 0 = 2023-01"""
+    return f"{2023 + month // 12}-{month % 12 + 1:02d}-{day:02d}"
+
+
+class TestWelford:
+    """Estatísticas incrementais iguais às calculadas sobre o histórico"""
+    
+    def test_transaction_stats(self):
+        rng = random.Random(1)
+        amounts = [round(rng.uniform(5, 300), 2) for _ in range(200)]
+        detector = AnomalyDetector()
+        for i, amount in enumerate(amounts):
+            detector.observe(expense(i, month_day(0), amount))
+        
+        logs = [math.log1p(amount) for amount in amounts]
+        stats = detector.category_stats("Alimentação")
+        assert stats["transactions"] == 200
+        assert stats["typical_amount"] == pytest.approx(math.expm1(statistics.fmean(logs)))
+        assert stats["std"] == pytest.approx(statistics.stdev(logs))
+    
+    def test_month_roll_over(self):
+        """Mês entra nas médias mensais quando o seguinte começa"""
+        detector = AnomalyDetector()
+        detector.observe(expense(1, "2024-01-05", 100.0))
+        detector.observe(expense(2, "2024-01-20", 50.0))
+        assert detector.category_stats("Alimentação")["months"] == 0
+        
+        detector.observe(expense(3, "2024-02-01", 80.0))
+        stats = detector.category_stats("Alimentação")
+        assert stats["months"] == 1
+        assert stats["monthly_mean"] == pytest.approx(150.0)
+        
+        detector.observe(expense(4, "2024-03-01", 10.0))
+        stats = detector.category_stats("Alimentação")
+        assert stats["months"] == 2
+        assert stats["monthly_mean"] == pytest.approx(115.0)
+        assert stats["monthly_std"] == pytest.approx(statistics.stdev([150.0, 80.0]))
+    
+    def test_empty_months_count_as_zero(self):
+        """Lacunas (inclusive na virada do ano) entram como meses de gasto zero"""
+        rng = random.Random(2)
+        months = sorted(rng.sample(range(30), 14))
+        totals = {}
+        detector = AnomalyDetector()
+        for i, month in enumerate(months):
+            for day in (3, 17):
+                amount = round(rng.uniform(10, 200), 2)
+                totals[month] = totals.get(month, 0.0) + amount
+                detector.observe(expense(f"{i}-{day}", month_day(month, day), amount))
+        
+        # Encerrados: do primeiro mês até o anterior ao último
+        closed = [totals.get(month, 0.0) for month in range(months[0], months[-1])]
+        stats = detector.category_stats("Alimentação")
+        assert stats["months"] == len(closed)
+        assert stats["monthly_mean"] == pytest.approx(statistics.fmean(closed))
+        assert stats["monthly_std"] == pytest.approx(statistics.stdev(closed))
+    
+    def test_past_month_updates_only_transaction_stats(self):
+        detector = AnomalyDetector()
+        detector.observe(expense(1, "2024-03-05", 100.0))
+        detector.observe(expense(2, "2024-04-05", 100.0))
+        before = detector.category_stats("Alimentação")
+        
+        detector.observe(expense(3, "2024-01-05", 500.0))
+        after = detector.category_stats("Alimentação")
+        assert after["transactions"] == before["transactions"] + 1
+        assert (after["months"], after["monthly_mean"]) == (before["months"], before["monthly_mean"])
+
+
+class TestSignals:
+    """Transações atípicas e picos"""
+    
+    def test_outlier_after_min_samples(self):
+        config = DetectorConfig(min_samples=8)
+        detector = AnomalyDetector(config)
+        rng = random.Random(3)
+        for i in range(7):
+            assert detector.observe(expense(i, "2024-01-05", 5000.0 if i == 6 else rng.uniform(40, 60))) == []
+        
+        for i in range(7, 30):
+            detector.observe(expense(i, "2024-01-05", rng.uniform(40, 60)))
+        anomalies = detector.observe(expense("big", "2024-01-06", 5000.0))
+        assert [a.kind for a in anomalies] == ["outlier"]
+        assert anomalies[0].transaction_id == "tbig"
+        assert 40 < anomalies[0].expected < 60
+    
+    def test_spike_flagged_once_per_month(self):
+        detector = AnomalyDetector(DetectorConfig(min_samples=1000))
+        for month in range(6):
+            detector.observe(expense(month, month_day(month), 100.0 + month))
+        
+        kinds = [
+            [a.kind for a in detector.observe(expense(f"s{i}", month_day(6, 10 + i), 400.0))]
+            for i in range(3)
+        ]
+        assert kinds == [["spike"], [], []]
+        
+        # Próximo mês: pode sinalizar de novo
+        assert [a.kind for a in detector.observe(expense("n", month_day(7), 2000.0))] == ["spike"]
+    
+    def test_income_ignored(self):
+        detector = AnomalyDetector()
+        assert detector.observe(Transaction("r", "2024-01-01", "Salário", 1e6, "income")) == []
+        assert len(detector) == 0
+
+
+class TestBatchAndPersistence:
+    """Lote = uma a uma; estado sobrevive à serialização"""
+    
+    @pytest.fixture
+    def transactions(self):
+        rng = random.Random(4)
+        rows = [
+            expense(i, month_day(i // 20, 1 + i % 28), rng.uniform(10, 90), rng.choice(["A", "B", "C"]))
+            for i in range(240)
+        ]
+        rows[200] = expense("big", rows[200].date, 9000.0, "A")
+        rows.insert(50, Transaction("r", "2023-03-01", "Salário", 3000.0, "income"))
+        return rows
+    
+    def test_batch_equals_single(self, transactions):
+        single, batch, columns = AnomalyDetector(), AnomalyDetector(), AnomalyDetector()
+        expected = [a for t in transactions for a in single.observe(t)]
+        
+        assert batch.observe_batch(transactions) == expected
+        assert columns.observe_batch(TransactionBatch.from_transactions(transactions)) == expected
+        assert any(a.transaction_id == "tbig" for a in expected)
+    
+    def test_round_trip(self, tmp_path, transactions):
+        """Continuar de um estado restaurado = nunca ter parado"""
+        whole = AnomalyDetector()
+        expected = whole.observe_batch(transactions)
+        
+        first = AnomalyDetector()
+        found = first.observe_batch(transactions[:120])
+        path = tmp_path / "detectores.bin"
+        save_detectors(path, {"u1": first, "vazio": AnomalyDetector()})
+        restored = load_detectors(path)
+        
+        assert len(restored["vazio"]) == 0
+        found += restored["u1"].observe_batch(transactions[120:])
+        assert found == expected
+        assert restored["u1"].to_bytes() == whole.to_bytes()
+    
+    def test_invalid_state(self):
+        data = AnomalyDetector().to_bytes()
+        
+        with pytest.raises(ValueError, match="assinatura"):
+            AnomalyDetector.from_bytes(b"X" * len(data))
+        with pytest.raises(ValueError, match="truncado"):
+            AnomalyDetector.from_bytes(data[:4])
@@ -0,0 +1,298 @@
+"""
+Testes da Análise Financeira
+
+Armazenamentos (lista e colunar), agregados incrementais e snapshot.
+"""
+
+import math
+import random
+
+import pytest
+from financial_analysis import (
+    ColumnarTransactionStore,
+    FinancialAnalyzer,
+    ListTransactionStore,
+    Transaction,
+    TransactionBatch,
+)
+
+
+CATEGORIES = ["Alimentação", "Transporte", "Lazer", "Saúde", "Moradia"]
+
+STORES = [ListTransactionStore, ColumnarTransactionStore]
+
+
+def make_transactions(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [
+        Transaction(
+            id=f"t{i}",
+            date=f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            category="Salário" if i % 10 == 0 else rng.choice(CATEGORIES),
+            amount=round(rng.uniform(1, 500), 2),
+            type="income" if i % 10 == 0 else "expense",
+            description=f"transação {i}"
+        )
+        for i in range(n)
+    ]
+
+
+class TestTransactionStores:
+    """Paridade entre lista e colunar"""
+    
+    def test_same_rows_and_totals(self):
+        """Mesmas linhas, totais e agrupamento por categoria"""
+        transactions = make_transactions(300)
+        listed, columnar = ListTransactionStore(), ColumnarTransactionStore(capacity=4)
+        for transaction in transactions[:100]:
+            listed.add(transaction)
+            columnar.add(transaction)
+        listed.extend(TransactionBatch.from_transactions(transactions[100:]))
+        columnar.extend(TransactionBatch.from_transactions(transactions[100:]))
+        
+        assert list(columnar) == list(listed) == transactions
+        assert columnar.totals() == pytest.approx(listed.totals())
+        
+        list_total, list_categories = listed.expense_by_category()
+        columnar_total, columnar_categories = columnar.expense_by_category()
+        assert columnar_total == pytest.approx(list_total)
+        assert [c[0] for c in columnar_categories] == [c[0] for c in list_categories]
+        assert [c[2] for c in columnar_categories] == [c[2] for c in list_categories]
+        assert [c[1] for c in columnar_categories] == pytest.approx([c[1] for c in list_categories])
+    
+    def test_remove_keeps_order_and_first_expense_order(self):
+        """Remoção preserva a ordem das linhas e a ordem de desempate"""
+        transactions = make_transactions(50)
+        stores = [store() for store in STORES]
+        for store in stores:
+            store.extend(transactions)
+            assert store.remove("t1") == transactions[1]
+            with pytest.raises(KeyError):
+                store.remove("t1")
+        
+        listed, columnar = stores
+        assert list(columnar) == list(listed) == transactions[:1] + transactions[2:]
+        assert [c[0] for c in columnar.expense_by_category()[1]] == [c[0] for c in listed.expense_by_category()[1]]
+    
+    @pytest.mark.parametrize("bad", [
+        Transaction("x", "2024-13-40", "Fantasma", 10.0, "expense"),
+        Transaction("x", "ontem", "Fantasma", 10.0, "expense"),
+        Transaction("x", "2024-01-10", "Fantasma", 10.0, "refund"),
+    ])
+    def test_columnar_rejects_invalid_row_without_trace(self, bad):
+        """Colunar: data ou tipo inválido dá ValueError e nada gravado (nem categoria)"""
+        store = ColumnarTransactionStore()
+        store.add(Transaction("a", "2024-01-01", "Alimentação", 5.0, "expense"))
+        
+        with pytest.raises(ValueError):
+            store.add(bad)
+        with pytest.raises(ValueError):
+            store.extend([Transaction("b", "2024-01-02", "Lazer", 1.0, "expense"), bad])
+        
+        assert [t.id for t in store] == ["a"]
+        assert store.expense_by_category()[1] == [("Alimentação", 5.0, 1)]
+        assert store.categories == ["Alimentação"]
+    
+    def test_list_accepts_any_row(self):
+        """Lista: grava tudo; fora dos totais o que não é income/expense"""
+        rows = [
+            Transaction("a", "2024-01-01", "Alimentação", 5.0, "expense"),
+            Transaction("b", "05/01/2026", "Lazer", 7.0, "expense"),
+            Transaction("c", "", "Salário", 100.0, "income"),
+            Transaction("d", "2024-01-10", "Reserva", 50.0, "transfer"),
+        ]
+        store = ListTransactionStore()
+        store.add(rows[0])
+        store.extend(rows[1:3])
+        store.extend(TransactionBatch.from_transactions(rows[3:]))
+        
+        assert list(store) == rows
+        assert store.totals() == (100.0, 12.0)
+        assert store.expense_by_category() == (12.0, [("Alimentação", 5.0, 1), ("Lazer", 7.0, 1)])
+
+
+class TestIncrementalAggregates:
+    """Agregados mantidos em add/remove"""
+    
+    def test_remove_leaves_no_residue(self):
+        """200 gastos, 199 removidos: sobra exatamente o último"""
+        analyzer = FinancialAnalyzer()
+        for i in range(200):
+            analyzer.add_transaction(Transaction(f"t{i}", "2024-01-01", "Alimentação", 49.98 + i * 0.37, "expense"))
+        for i in range(1, 200):
+            analyzer.remove_transaction(f"t{i}")
+        
+        assert analyzer.calculate_totals() == (0.0, 49.98, -49.98)
+        assert analyzer.analyze_by_category()[0].total == 49.98
+    
+    @pytest.mark.parametrize("store_class", STORES)
+    def test_interleaved_add_remove_matches_sum(self, store_class):
+        """Adições (unitárias e em bloco) e remoções intercaladas batem com a soma das restantes"""
+        rng = random.Random(3)
+        pool = make_transactions(600, seed=11)
+        analyzer = FinancialAnalyzer(store_class())
+        alive = {}
+        
+        while pool:
+            step = rng.random()
+            if step < 0.4:
+                transaction = pool.pop()
+                analyzer.add_transaction(transaction)
+                alive[transaction.id] = transaction
+            elif step < 0.6:
+                block, pool = pool[-25:], pool[:-25]
+                analyzer.add_transactions(block)
+                alive.update((t.id, t) for t in block)
+            elif alive:
+                alive.pop(analyzer.remove_transaction(rng.choice(list(alive))).id)
+            
+            rows = list(alive.values())
+            incomes = [t.amount for t in rows if t.type == "income"]
+            expenses = [t.amount for t in rows if t.type == "expense"]
+            income, spent, _ = analyzer.calculate_totals()
+            
+            assert (income, spent) == (math.fsum(incomes), math.fsum(expenses))
+            assert (round(income, 2), round(spent, 2)) == (round(sum(incomes), 2), round(sum(expenses), 2))
+            
+            for summary in analyzer.analyze_by_category():
+                amounts = [t.amount for t in rows if t.type == "expense" and t.category == summary.category]
+                assert summary.total == math.fsum(amounts)
+                assert summary.transactions_count == len(amounts)
+    
+    def test_batch_same_as_sequential(self):
+        """add_transactions dá exatamente o mesmo que add_transaction em sequência"""
+        transactions = make_transactions(500)
+        sequential, batched = FinancialAnalyzer(), FinancialAnalyzer()
+        for transaction in transactions:
+            sequential.add_transaction(transaction)
+        batched.add_transactions(TransactionBatch.from_transactions(transactions))
+        
+        assert batched.calculate_totals() == sequential.calculate_totals()
+        assert batched.analyze_by_category() == sequential.analyze_by_category()
+    
+    def test_income_counted_explicitly(self):
+        """Linhas de outro tipo (gravadas por fora) não contam como receita"""
+        store = ListTransactionStore()
+        store.transactions.extend([
+            Transaction("a", "2024-01-01", "Salário", 100.0, "income"),
+            Transaction("b", "2024-01-02", "Alimentação", 30.0, "expense"),
+            Transaction("c", "2024-01-03", "Reserva", 50.0, "transfer"),
+        ])
+        
+        analyzer = FinancialAnalyzer(store)
+        
+        assert (analyzer._income_count, analyzer._expense_count, analyzer._count) == (1, 1, 3)
+    
+    @pytest.mark.parametrize("rollups_first", [False, True])
+    def test_undated_and_other_types_outside_rollups(self, rollups_first):
+        """Data inválida conta em undated; tipo desconhecido fica fora, montado ou incremental"""
+        analyzer = FinancialAnalyzer()
+        analyzer.add_transaction(Transaction("a", "2024-01-05", "Lazer", 10.0, "expense"))
+        if rollups_first:
+            analyzer.rollup("month")
+        
+        analyzer.add_transaction(Transaction("b", "05/01/2026", "Lazer", 7.0, "expense"))
+        analyzer.add_transactions([
+            Transaction("c", "", "Salário", 100.0, "income"),
+            Transaction("d", "2024-01-10", "Reserva", 50.0, "transfer"),
+        ])
+        
+        [january] = analyzer.rollup("month")
+        assert (january.period, january.total_expenses, january.transactions_count) == ("2024-01", 10.0, 1)
+        assert analyzer._time_rollups().undated == 2
+        assert analyzer.calculate_totals() == (100.0, 17.0, 83.0)
+        
+        analyzer.remove_transaction("b")
+        assert analyzer._time_rollups().undated == 1
+    
+    def test_far_dates_stay_sparse(self):
+        """Data digitada errada (ano 206, 9999) não materializa os séculos entre elas"""
+        analyzer = FinancialAnalyzer()
+        analyzer.add_transactions([
+            Transaction("a", "0206-01-05", "Lazer", 10.0, "expense"),
+            Transaction("b", "2024-03-10", "Salário", 100.0, "income"),
+            Transaction("c", "9999-12-31", "Lazer", 5.0, "expense"),
+        ])
+        
+        months = analyzer.rollup("month")
+        assert [m.period for m in months] == ["0206-01", "2024-03", "9999-12"]
+        assert (months[0].start, months[-1].end) == ("0206-01-01", "9999-12-31")
+        assert len(analyzer.rollup("week")) == len(analyzer.rollup("day")) == 3
+        assert analyzer.summarize_range("2024-01-01", "2024-12-31").total_income == 100.0
+    
+    def test_forecast_rollups_not_maintained(self):
+        """Previsão e exportação não fazem cada add atualizar rollups; rollup() faz"""
+        analyzer = FinancialAnalyzer()
+        analyzer.add_transactions(make_transactions(100))
+        analyzer.export_to_json()
+        assert analyzer._rollups is not None
+        
+        analyzer.add_transaction(Transaction("x", "2024-02-01", "Lazer", 1.0, "expense"))
+        assert analyzer._rollups is None
+        
+        before = analyzer.predict_future_balance(3)
+        analyzer.rollup("month")
+        analyzer.add_transactions([Transaction("y", "2024-02-02", "Lazer", 2.0, "expense")])
+        assert analyzer._rollups is not None
+        
+        analyzer.remove_transaction("y")
+        assert analyzer.predict_future_balance(3) == before
+        assert analyzer._rollups is not None
+
+
+class TestSnapshot:
+    """Versão e análise memoizada"""
+    
+    def test_transactions_is_live_list(self):
+        """Escrita direta em transactions (inclusive troca no lugar) reconstrói os agregados"""
+        analyzer = FinancialAnalyzer()
+        analyzer.add_transaction(Transaction("a", "2024-01-01", "Lazer", 10.0, "expense"))
+        first = analyzer.snapshot()
+        
+        analyzer.transactions.append(Transaction("b", "2024-01-02", "Lazer", 5.0, "expense"))
+        assert analyzer.calculate_totals() == (0.0, 15.0, -15.0)
+        
+        analyzer.transactions[0] = Transaction("a", "2024-01-01", "Salário", 10.0, "income")
+        assert analyzer.calculate_totals() == (10.0, 5.0, 5.0)
+        
+        second = analyzer.snapshot()
+        assert second.version > first.version
+        assert second.overview.total_income == 10.0
+        assert analyzer.transactions is analyzer.store.transactions
+    
+    def test_frozen_transactions(self):
+        """Cópia somente leitura, igual ao armazenamento"""
+        analyzer = FinancialAnalyzer()
+        analyzer.add_transactions(make_transactions(20))
+        version = analyzer.version
+        frozen = analyzer.frozen_transactions()
+        
+        with pytest.raises(TypeError):
+            frozen[0] = Transaction("x", "2024-01-01", "Lazer", 1.0, "expense")
+        
+        assert analyzer.version == version
+        assert list(frozen) == list(analyzer.store) == analyzer.transactions
+    
+    def test_snapshot_reused_until_mutation(self):
+        """Mesmo snapshot por versão; nova versão a cada mutação"""
+        analyzer = FinancialAnalyzer()
+        analyzer.add_transactions(make_transactions(50))
+        
+        first = analyzer.snapshot()
+        assert analyzer.snapshot() is first
+        
+        analyzer.remove_transaction("t3")
+        second = analyzer.snapshot()
+        assert second is not first
+        assert second.version == analyzer.version > first.version
+    
+    def test_direct_store_write_resyncs(self):
+        """Escrita direta no armazenamento reconstrói os agregados"""
+        analyzer = FinancialAnalyzer()
+        analyzer.add_transaction(Transaction("a", "2024-01-01", "Lazer", 10.0, "expense"))
+        version = analyzer.version
+        
+        analyzer.store.transactions.append(Transaction("b", "2024-01-02", "Lazer", 5.0, "expense"))
+        
+        assert analyzer.calculate_totals() == (0.0, 15.0, -15.0)
+        assert analyzer.version > version
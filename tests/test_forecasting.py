@@ -0,0 +1,141 @@
+"""
+Testes da Previsão de Fluxo Mensal
+
+Casos de borda (sem histórico, um mês, lacunas), recuperação de
+tendência e sazonalidade, lote = um a um e integração com o analisador.
+"""
+
+import numpy as np
+import pytest
+from financial_analysis import FinancialAnalyzer, Transaction
+from forecasting import METHODS, forecast_batch, forecast_series
+
+
+class TestEdgeCases:
+    """Históricos vazios ou curtos"""
+    
+    @pytest.mark.parametrize("method", METHODS)
+    def test_empty_history(self, method):
+        """Sem meses: fluxo e saldo 0, faixas fechadas"""
+        result = forecast_series([], 3, method=method)
+        
+        assert result.net_flow.tolist() == [[0.0, 0.0, 0.0]]
+        assert result.balance.tolist() == [[0.0, 0.0, 0.0]]
+        assert result.lower.tolist() == result.upper.tolist() == [[0.0, 0.0, 0.0]]
+        assert result.observations.tolist() == [0]
+    
+    @pytest.mark.parametrize("method", METHODS)
+    def test_single_month(self, method):
+        """Um mês: repete o fluxo; sem resíduos, faixa de largura zero"""
+        result = forecast_series([100.0], 3, balance=50.0, method=method)
+        
+        assert result.net_flow.tolist() == [[100.0, 100.0, 100.0]]
+        assert result.balance.tolist() == [[150.0, 250.0, 350.0]]
+        assert result.sigma.tolist() == [0.0]
+        assert result.lower.tolist() == result.upper.tolist() == result.balance.tolist()
+    
+    def test_two_months_use_mean(self):
+        """Dois meses não sustentam tendência: média, com faixa aberta"""
+        result = forecast_series([100.0, 200.0], 2, method="linear")
+        
+        assert result.net_flow[0] == pytest.approx([150.0, 150.0])
+        assert (result.flow_lower[0] < 150.0).all() and (result.flow_upper[0] > 150.0).all()
+        # Saldo padrão: soma da série
+        assert result.balance[0] == pytest.approx([450.0, 600.0])
+    
+    def test_all_missing_row(self):
+        """Usuário sem dado no lote não contamina os outros"""
+        series = np.array([[np.nan] * 4, [1.0, 2.0, np.nan, 4.0]])
+        result = forecast_batch(series, 2)
+        
+        assert result.net_flow[0].tolist() == [0.0, 0.0]
+        assert result.net_flow[1] == pytest.approx([5.0, 6.0])
+        assert result.observations.tolist() == [0, 3]
+    
+    @pytest.mark.parametrize("options,message", [
+        ({"method": "arima"}, "Método"),
+        ({"horizon": 0}, "horizon"),
+        ({"level": 1.0}, "level"),
+    ])
+    def test_invalid_arguments(self, options, message):
+        with pytest.raises(ValueError, match=message):
+            forecast_batch(np.ones((1, 3)), **{"horizon": 2, **options})
+
+
+class TestFit:
+    """Tendência, sazonalidade e lote"""
+    
+    def test_linear_trend(self):
+        result = forecast_series([10.0, 20.0, 30.0, 40.0], 3, method="linear")
+        
+        assert result.net_flow[0] == pytest.approx([50.0, 60.0, 70.0])
+    
+    def test_seasonality(self):
+        """Dois anos com o mesmo padrão mensal: próximo ano igual"""
+        pattern = [100.0, 80.0, 120.0, 90.0, 110.0, 60.0, 140.0, 100.0, 95.0, 105.0, 70.0, 300.0]
+        result = forecast_series(pattern * 2, 12, method="linear", first_month=1)
+        
+        assert result.net_flow[0] == pytest.approx(pattern)
+    
+    def test_bands_contain_point(self):
+        rng = np.random.default_rng(3)
+        series = 500 + rng.normal(0, 50, size=(20, 18))
+        
+        for method in METHODS:
+            result = forecast_batch(series, 6, method=method)
+            assert (result.lower <= result.balance).all() and (result.balance <= result.upper).all()
+            # Incerteza do saldo cresce com o horizonte
+            assert (np.diff(result.upper - result.lower, axis=1) > 0).all()
+    
+    @pytest.mark.parametrize("method", METHODS)
+    def test_batch_equals_one_by_one(self, method):
+        rng = np.random.default_rng(5)
+        series = rng.normal(100, 30, size=(8, 15))
+        series[rng.random(series.shape) < 0.2] = np.nan
+        series[:3, :6] = np.nan  # usuários que começaram depois
+        
+        batch = forecast_batch(series, 4, method=method, first_month=3)
+        for i, row in enumerate(series):
+            single = forecast_series(row, 4, balance=np.nansum(row), method=method, first_month=3)
+            assert batch.balance[i] == pytest.approx(single.balance[0])
+            assert batch.upper[i] == pytest.approx(single.upper[0])
+
+
+class TestAnalyzerForecast:
+    """FinancialAnalyzer.forecast e predict_future_balance"""
+    
+    def test_gap_months_count_as_zero(self):
+        analyzer = FinancialAnalyzer()
+        analyzer.add_transactions([
+            Transaction("1", "2024-01-05", "Salário", 1000.0, "income"),
+            Transaction("2", "2024-03-05", "Lazer", 100.0, "expense"),
+        ])
+        
+        first, flows = analyzer.monthly_net_flow()
+        assert first == 2024 * 12
+        assert flows == [1000.0, 0.0, -100.0]
+        
+        forecast = analyzer.forecast(2)
+        assert forecast.months == ["2024-04", "2024-05"]
+        assert forecast.history == 3
+        assert analyzer.predict_future_balance(2) == {
+            "month_1": pytest.approx(forecast.balance[0]),
+            "month_2": pytest.approx(forecast.balance[1]),
+        }
+    
+    def test_empty_analyzer(self):
+        forecast = FinancialAnalyzer().forecast(2)
+        
+        assert forecast.history == 0
+        assert forecast.balance == [0.0, 0.0]
+        assert len(forecast.months) == 2
+    
+    def test_balance_starts_from_current(self):
+        """Saldo previsto parte do saldo atual, não da soma dos meses previstos"""
+        analyzer = FinancialAnalyzer()
+        analyzer.add_transactions([
+            Transaction(str(month), f"2024-{month:02d}-10", "Salário", 100.0, "income")
+            for month in range(1, 7)
+        ])
+        
+        assert analyzer.forecast(3).balance == pytest.approx([700.0, 800.0, 900.0])
@@ -0,0 +1,172 @@
+"""
+Testes do Formato Binário de Histórico
+
+Ida e volta (save_ledger → load_store/open_ledger) e rejeição de
+cabeçalhos corrompidos.
+"""
+
+import pytest
+from financial_analysis import (
+    ColumnarTransactionStore,
+    FinancialAnalyzer,
+    ListTransactionStore,
+    Transaction,
+)
+from ledger_binary import (
+    HEADER_SIZE,
+    MAGIC,
+    SCHEMA_VERSION,
+    SECTIONS,
+    LedgerFormatError,
+    StringColumn,
+    _HEADER,
+    _SECTION,
+    load_store,
+    open_ledger,
+    read_header,
+    save_ledger,
+)
+
+from test_financial_analysis import make_transactions
+
+
+@pytest.fixture
+def transactions():
+    rows = make_transactions(200)
+    rows.append(Transaction("ç1", "2024-06-01", "Educação", 99.9, "expense", "Livro — edição ñ"))
+    return rows
+
+
+@pytest.fixture
+def ledger(tmp_path, transactions):
+    path = tmp_path / "historico.gfl"
+    save_ledger(path, FinancialAnalyzer(ColumnarTransactionStore.from_transactions(transactions)))
+    return path
+
+
+class TestRoundTrip:
+    """Reabrir reproduz as linhas e a análise"""
+    
+    @pytest.mark.parametrize("kind", ["analyzer", "columnar", "list", "iterable"])
+    def test_same_rows_and_analysis(self, tmp_path, transactions, kind):
+        """Mesmas transações, totais e categorias, qualquer que seja a origem"""
+        sources = {
+            "analyzer": lambda: FinancialAnalyzer(ListTransactionStore()),
+            "columnar": lambda: ColumnarTransactionStore.from_transactions(transactions),
+            "list": lambda: ListTransactionStore(),
+            "iterable": lambda: iter(transactions),
+        }
+        source = sources[kind]()
+        if kind == "analyzer":
+            source.add_transactions(transactions)
+        elif kind == "list":
+            source.extend(transactions)
+        
+        path = tmp_path / "historico.gfl"
+        header = save_ledger(path, source)
+        assert header.rows == len(transactions)
+        assert not path.with_name(path.name + ".tmp").exists()
+        
+        expected = FinancialAnalyzer(ListTransactionStore())
+        expected.add_transactions(transactions)
+        opened = open_ledger(path)
+        
+        assert list(opened.transactions) == transactions
+        assert opened.calculate_totals() == pytest.approx(expected.calculate_totals())
+        assert [
+            (s.category, s.transactions_count) for s in opened.analyze_by_category()
+        ] == [
+            (s.category, s.transactions_count) for s in expected.analyze_by_category()
+        ]
+    
+    def test_read_header(self, ledger, transactions):
+        """Cabeçalho sem abrir as colunas"""
+        header = read_header(ledger)
+        
+        assert header.version == SCHEMA_VERSION
+        assert header.rows == len(transactions)
+        assert header.categories == len({t.category for t in transactions})
+        assert list(header.sections) == [name for name, _ in SECTIONS]
+        assert all(offset >= HEADER_SIZE and offset % 8 == 0 for offset, _ in header.sections.values())
+    
+    def test_columns_are_views_until_written(self, ledger, transactions):
+        """Colunas do mmap somente leitura; a primeira escrita copia"""
+        store = load_store(ledger)
+        assert not store.amounts.flags.writeable
+        assert isinstance(store.descriptions, StringColumn)
+        assert store.descriptions[-1] == "Livro — edição ñ"
+        
+        extra = Transaction("x1", "2024-07-01", "Lazer", 10.0, "expense", "extra")
+        store.add(extra)
+        assert store.amounts.flags.writeable
+        assert list(store) == transactions + [extra]
+        
+        # O arquivo não muda
+        assert list(load_store(ledger)) == transactions
+    
+    def test_empty_ledger(self, tmp_path):
+        """Histórico vazio grava e reabre"""
+        path = tmp_path / "vazio.gfl"
+        save_ledger(path, [])
+        
+        analyzer = open_ledger(path)
+        assert list(analyzer.transactions) == []
+        assert analyzer.calculate_totals() == (0, 0, 0)
+
+
+def corrupt(path, offset: int, data: bytes):
+    with open(path, "r+b") as f:
+        f.seek(offset)
+        f.write(data)
+
+
+class TestCorruptHeader:
+    """Arquivos inválidos: LedgerFormatError antes de ler as colunas"""
+    
+    def test_bad_magic(self, ledger):
+        corrupt(ledger, 0, b"NOTALEDG")
+        
+        with pytest.raises(LedgerFormatError, match="assinatura"):
+            load_store(ledger)
+        with pytest.raises(LedgerFormatError, match="assinatura"):
+            read_header(ledger)
+    
+    def test_other_version(self, ledger):
+        corrupt(ledger, len(MAGIC), (SCHEMA_VERSION + 1).to_bytes(2, "little"))
+        
+        with pytest.raises(LedgerFormatError, match="versão"):
+            load_store(ledger)
+    
+    def test_truncated_file(self, ledger):
+        """Menor que o cabeçalho, ou seções além do fim do arquivo"""
+        data = ledger.read_bytes()
+        
+        ledger.write_bytes(data[:HEADER_SIZE - 1])
+        with pytest.raises(LedgerFormatError, match="menor"):
+            load_store(ledger)
+        
+        ledger.write_bytes(data[:len(data) - 1])
+        with pytest.raises(LedgerFormatError, match="fora do arquivo"):
+            load_store(ledger)
+    
+    def test_section_out_of_range(self, ledger):
+        size = ledger.stat().st_size
+        corrupt(ledger, _HEADER.size, _SECTION.pack(size, 8))
+        
+        with pytest.raises(LedgerFormatError, match="seção amounts"):
+            load_store(ledger)
+    
+    def test_section_size_mismatch(self, ledger):
+        """Seção dentro do arquivo, mas com quantidade de itens errada"""
+        offset, nbytes = read_header(ledger).sections["amounts"]
+        corrupt(ledger, _HEADER.size, _SECTION.pack(offset, nbytes - 8))
+        
+        with pytest.raises(LedgerFormatError, match="esperado"):
+            load_store(ledger)
+    
+    def test_is_value_error(self, ledger):
+        """LedgerFormatError é ValueError: quem já trata ValueError continua funcionando"""
+        corrupt(ledger, 0, b"\0" * len(MAGIC))
+        
+        with pytest.raises(ValueError):
+            open_ledger(ledger)
@@ -0,0 +1,194 @@
+"""
+Testes da Ingestão em Streaming
+
+CSV e JSONL em blocos, linhas rejeitadas e formatos brasileiros.
+"""
+
+import gc
+import io
+import json
+
+import pytest
+from financial_analysis import ColumnarTransactionStore, FinancialAnalyzer
+from ledger_ingest import LedgerIngestor, ingest_file
+
+
+CSV_LEDGER = """id,date,category,amount,type,description
+t1,2024-01-05,Salário,3000.00,income,Salário janeiro
+t2,2024-01-06,Alimentação,120.50,expense,Mercado
+t3,2024-01-07,Transporte,abc,expense,Uber
+t4,2024-02-30,Lazer,80.00,expense,Cinema
+t5,2024-01-08,Lazer,45.00,transferencia,Show
+t6,2024-01-09,Alimentação,30.00
+t7,2024-01-10,Transporte,15.25,despesa,Ônibus
+,2024-01-11,,200.00,receita,
+"""
+
+
+def read_rejects(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestRejectPath:
+    """Linhas inválidas vão para o arquivo de rejeitados, sem abortar"""
+    
+    def test_csv_rejects(self, tmp_path):
+        """Valor, data, tipo e largura inválidos: rejeitados com linha e motivo"""
+        path = tmp_path / "extrato.csv"
+        path.write_text(CSV_LEDGER, encoding="utf-8")
+        rejects = tmp_path / "rejeitados" / "rejeitados.jsonl"
+        
+        analyzer, report = ingest_file(path, reject_path=rejects)
+        
+        assert (report.rows, report.accepted, report.rejected) == (8, 4, 4)
+        assert report.reject_path == str(rejects)
+        
+        records = {r["line"]: r for r in read_rejects(rejects)}
+        assert sorted(records) == [4, 5, 6, 7]
+        assert "valor inválido" in records[4]["error"]
+        assert "data inválida" in records[5]["error"]
+        assert "tipo inválido" in records[6]["error"]
+        assert records[7]["error"] == "linha malformada"
+        assert records[4]["raw"][0] == "t3"
+        
+        ids = [t.id for t in analyzer.transactions]
+        assert ids == ["t1", "t2", "t7", "9"]  # sem id: número da linha
+        assert analyzer.transactions[-1].category == "Outros"
+        assert analyzer.calculate_totals() == (3200.0, 135.75, 3064.25)
+    
+    def test_no_reject_file_without_rejects(self, tmp_path):
+        """Arquivo de rejeitados só é criado na primeira rejeição"""
+        path = tmp_path / "extrato.csv"
+        path.write_text("id,date,amount,type\nt1,2024-01-01,10,income\n", encoding="utf-8")
+        rejects = tmp_path / "rejeitados.jsonl"
+        
+        _, report = ingest_file(path, reject_path=rejects)
+        
+        assert report.rejected == 0
+        assert not rejects.exists()
+    
+    def test_jsonl_rejects_and_chunks(self, tmp_path):
+        """JSONL malformado e não-objeto rejeitados; blocos reportados em ordem"""
+        lines = [
+            json.dumps({"id": "a", "date": "2024-03-01", "category": "Lazer", "amount": 10, "type": "expense"}),
+            "{quebrado",
+            json.dumps([1, 2, 3]),
+            "",
+            json.dumps({"id": "b", "date": "2024-03-02", "category": "Lazer", "amount": "x", "type": "expense"}),
+            json.dumps({"id": "c", "date": "2024-03-03", "amount": -7.5}),
+        ]
+        rejects = tmp_path / "rejeitados.jsonl"
+        chunks = []
+        analyzer = FinancialAnalyzer()
+        ingestor = LedgerIngestor(analyzer, chunk_size=2, reject_path=rejects, on_chunk=chunks.append)
+        
+        report = ingestor.ingest_jsonl(io.StringIO("\n".join(lines) + "\n"))
+        
+        assert (report.rows, report.accepted, report.rejected, report.chunks) == (6, 2, 3, 3)
+        assert [c.index for c in chunks] == [0, 1, 2]
+        assert [c.rows for c in chunks] == [2, 2, 2]
+        assert [r["line"] for r in read_rejects(rejects)] == [2, 3, 5]
+        
+        # Sem tipo: valor negativo vira despesa, em módulo
+        assert [(t.id, t.type, t.amount) for t in analyzer.transactions] == [
+            ("a", "expense", 10.0),
+            ("c", "expense", 7.5),
+        ]
+
+
+class TestFormats:
+    """Formatos de extrato"""
+    
+    def test_brazilian_csv(self):
+        """Separador ';', decimal ',', data dd/mm/aaaa e colunas renomeadas"""
+        ledger = io.StringIO(
+            "Data;Histórico;Valor\n"
+            "05/01/2024;Salário;3.500,00\n"
+            "06/01/2024;Padaria;-12,40\n"
+        )
+        analyzer = FinancialAnalyzer()
+        ingestor = LedgerIngestor(
+            analyzer,
+            columns={"date": "Data", "description": "Histórico", "amount": "Valor"},
+            date_format="%d/%m/%Y",
+            decimal=","
+        )
+        
+        report = ingestor.ingest_csv(ledger, delimiter=";")
+        
+        assert report.accepted == 2
+        assert [(t.date, t.type, t.amount) for t in analyzer.transactions] == [
+            ("2024-01-05", "income", 3500.0),
+            ("2024-01-06", "expense", 12.4),
+        ]
+    
+    def test_csv_and_jsonl_same_result(self, tmp_path):
+        """Mesmo extrato em CSV e JSONL: mesmas transações, inclusive no colunar"""
+        csv_path = tmp_path / "extrato.csv"
+        csv_path.write_text(CSV_LEDGER, encoding="utf-8")
+        
+        header, *rows = CSV_LEDGER.strip().splitlines()
+        names = header.split(",")
+        jsonl_path = tmp_path / "extrato.jsonl"
+        jsonl_path.write_text(
+            "".join(json.dumps(dict(zip(names, row.split(",")))) + "\n" for row in rows if row.count(",") == 5),
+            encoding="utf-8"
+        )
+        
+        from_csv, _ = ingest_file(csv_path)
+        from_jsonl, _ = ingest_file(jsonl_path, analyzer=FinancialAnalyzer(ColumnarTransactionStore()))
+        
+        assert [t.id for t in from_jsonl.transactions] == ["t1", "t2", "t7", "7"]  # sem cabeçalho
+        assert from_jsonl.calculate_totals() == from_csv.calculate_totals()
+    
+    def test_missing_amount_column(self):
+        """CSV sem coluna de valor é erro de configuração, não rejeição"""
+        with pytest.raises(ValueError):
+            LedgerIngestor(FinancialAnalyzer()).ingest_csv(io.StringIO("id,date\n1,2024-01-01\n"))
+
+
+class TestPauseGC:
+    """Coletor cíclico: intocado por padrão; pausa opcional e compartilhada"""
+    
+    def gc_states(self, analyzer=None, **options):
+        """gc.isenabled() ao fim de cada bloco"""
+        states = []
+        LedgerIngestor(
+            analyzer or FinancialAnalyzer(),
+            chunk_size=3,
+            on_chunk=lambda _: states.append(gc.isenabled()),
+            **options
+        ).ingest_csv(io.StringIO(CSV_LEDGER))
+        return states
+    
+    def test_untouched_by_default(self):
+        assert self.gc_states() == [True, True, True]
+        assert gc.isenabled()
+    
+    def test_pause_restores_previous_state(self):
+        assert self.gc_states(pause_gc=True) == [False, False, False]
+        assert gc.isenabled()
+        
+        gc.disable()
+        try:
+            self.gc_states(pause_gc=True)
+            assert not gc.isenabled()
+        finally:
+            gc.enable()
+    
+    def test_overlapping_ingestions(self):
+        """Importação que termina no meio de outra não religa o coletor"""
+        outer = []
+        
+        def on_chunk(report):
+            if report.index == 0:
+                assert self.gc_states(pause_gc=True) == [False, False, False]
+            outer.append(gc.isenabled())
+        
+        LedgerIngestor(FinancialAnalyzer(), chunk_size=3, on_chunk=on_chunk, pause_gc=True).ingest_csv(
+            io.StringIO(CSV_LEDGER)
+        )
+        
+        assert outer == [False, False, False]
+        assert gc.isenabled()
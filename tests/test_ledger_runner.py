@@ -0,0 +1,111 @@
+"""
+Testes da Análise em Lote
+
+Ordem de saída, erros por usuário, relatório e limpeza do
+arquivo temporário quando a execução falha.
+"""
+
+import json
+from functools import partial
+
+import pytest
+from financial_analysis import Transaction
+from ledger_runner import MultiUserRunner, run_analyses
+
+from test_financial_analysis import make_transactions
+
+
+def user_ledgers(n: int):
+    return [(f"u{i}", partial(make_transactions, 5 + i % 7, i)) for i in range(n)]
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestOrdering:
+    """Uma linha por usuário, na ordem de entrada"""
+    
+    @pytest.mark.parametrize("workers,max_pending", [(0, None), (2, 2)])
+    def test_input_order(self, tmp_path, workers, max_pending):
+        """Mesma ordem com e sem pool, mesmo com poucos lotes em andamento"""
+        output = tmp_path / "analises.jsonl"
+        ledgers = user_ledgers(23)
+        
+        report = run_analyses(ledgers, output, workers=workers, batch_size=3, max_pending=max_pending)
+        
+        lines = read_lines(output)
+        assert [line["user_id"] for line in lines] == [user_id for user_id, _ in ledgers]
+        assert report.users == 23
+        assert report.batches == 8
+        assert report.failed == 0
+        assert sum(worker.users for worker in report.workers) == 23
+    
+    def test_same_analysis_as_inline(self, tmp_path):
+        """Pool de processos e execução local produzem o mesmo arquivo"""
+        ledgers = user_ledgers(10)
+        
+        run_analyses(ledgers, tmp_path / "local.jsonl", workers=0, batch_size=4)
+        run_analyses(ledgers, tmp_path / "pool.jsonl", workers=2, batch_size=4)
+        
+        assert (tmp_path / "local.jsonl").read_text(encoding="utf-8") == (tmp_path / "pool.jsonl").read_text(encoding="utf-8")
+    
+    def test_user_error_keeps_going(self, tmp_path):
+        """Erro num usuário vira linha com 'error'; os demais seguem"""
+        output = tmp_path / "analises.jsonl"
+        ledgers = [
+            ("ok", [Transaction("t1", "2024-01-01", "Salário", 100.0, "income")]),
+            ("ausente", tmp_path / "nao-existe.csv"),
+            ("ok2", partial(make_transactions, 3)),
+        ]
+        
+        report = MultiUserRunner(workers=0, batch_size=2).run(ledgers, output)
+        
+        lines = read_lines(output)
+        assert [line["user_id"] for line in lines] == ["ok", "ausente", "ok2"]
+        assert "analysis" in lines[0] and "analysis" in lines[2]
+        assert lines[1]["error"].startswith("FileNotFoundError")
+        assert report.failed == 1
+
+
+class TestTemporaryFile:
+    """Falha fora de um usuário: exceção propagada, sem .tmp nem saída"""
+    
+    def test_worker_exception(self, tmp_path):
+        """Lote que não chega ao worker (lambda não serializável)"""
+        output = tmp_path / "analises.jsonl"
+        ledgers = user_ledgers(4) + [("lambda", lambda: [])]
+        
+        with pytest.raises(Exception):
+            run_analyses(ledgers, output, workers=1, batch_size=2)
+        
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_callback_exception(self, tmp_path):
+        """on_batch com erro no meio da execução"""
+        output = tmp_path / "analises.jsonl"
+        
+        def on_batch(result):
+            raise RuntimeError("progresso")
+        
+        with pytest.raises(RuntimeError, match="progresso"):
+            run_analyses(user_ledgers(6), output, workers=0, batch_size=2, on_batch=on_batch)
+        
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_source_iterator_exception(self, tmp_path):
+        """Fonte de usuários que falha depois de alguns lotes"""
+        output = tmp_path / "analises.jsonl"
+        output.write_text("anterior\n", encoding="utf-8")
+        
+        def ledgers():
+            yield from user_ledgers(5)
+            raise OSError("fonte")
+        
+        with pytest.raises(OSError, match="fonte"):
+            run_analyses(ledgers(), output, workers=0, batch_size=2)
+        
+        # Saída anterior intacta
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["analises.jsonl"]
+        assert output.read_text(encoding="utf-8") == "anterior\n"
@@ -0,0 +1,44 @@
+"""
+Testes da Progressão com Teto
+
+CappedProgression tem uma única implementação (api/engine);
+financial_engine a reexporta.
+"""
+
+import pytest
+from api.engine.progression import CappedProgression as EngineCappedProgression
+from financial_engine.progression import CappedProgression
+
+
+def _loop_progression(start, increment, cap, periods):
+    progression = []
+    current = start
+    for _ in range(periods):
+        progression.append(current)
+        current = min(current + increment, cap)
+    return progression
+
+
+class TestCappedProgression:
+    """Testes da progressão usada pelos dois motores"""
+    
+    def test_single_implementation(self):
+        """financial_engine usa a mesma classe da API"""
+        assert CappedProgression is EngineCappedProgression
+    
+    @pytest.mark.parametrize("start,increment,cap,periods", [
+        (1, 2, 100, 3),
+        (1, 10, 50, 10),
+        (10, 0, 50, 10),
+        (60, 5, 50, 6),
+        (50, -3, 40, 8),
+        (1, 1, 500, 0),
+    ])
+    def test_matches_loop(self, start, increment, cap, periods):
+        """Total, pico e termos batem com o laço"""
+        expected = _loop_progression(start, increment, cap, periods)
+        progression = CappedProgression(start, increment, cap, periods)
+        
+        assert progression.total == pytest.approx(sum(expected))
+        assert progression.peak == pytest.approx(max(expected) if expected else 0)
+        assert list(progression) == pytest.approx(expected)
@@ -0,0 +1,129 @@
+"""
+Testes da Categorização pela Descrição
+
+Normalização, palavras inteiras, a mais longa vence, paridade com uma
+busca ingênua e uso na ingestão.
+"""
+
+import io
+import random
+import re
+
+import pytest
+from financial_analysis import FinancialAnalyzer
+from ledger_ingest import LedgerIngestor
+from transaction_categorizer import (
+    TransactionCategorizer,
+    default_categorizer,
+    normalize_description,
+)
+
+
+KEYWORDS = {
+    "uber": "Transporte",
+    "uber eats": "Alimentação",
+    "tim": "Telefonia",
+    "posto": "Combustível",
+    "posto shell": "Combustível Shell",
+    "shell": "Marca",
+    "farmacia": "Saúde",
+    "99": "Transporte",
+}
+
+
+def naive(keywords, description):
+    """Referência: cada palavra-chave com regex de palavra inteira, a mais longa vence"""
+    text = f" {normalize_description(description)} "
+    best = None
+    for keyword, category in keywords.items():
+        pattern = f" {normalize_description(keyword)} "
+        match = re.search(re.escape(pattern), text)
+        if match is None:
+            continue
+        end = match.end()
+        if best is None or len(pattern) > best[0] or (len(pattern) == best[0] and end < best[1]):
+            best = (len(pattern), end, category)
+    return best[2] if best else None
+
+
+class TestNormalize:
+    
+    @pytest.mark.parametrize("text,expected", [
+        ("PAG*McDonald's - São Paulo", "pag mcdonalds sao paulo"),
+        ("  FARMÁCIA   Pague-Menos ", "farmacia pague menos"),
+        ("", ""),
+        ("***", ""),
+    ])
+    def test_normalize(self, text, expected):
+        assert normalize_description(text) == expected
+
+
+class TestRules:
+    """Palavras inteiras e a correspondência mais longa"""
+    
+    @pytest.fixture
+    def categorizer(self):
+        return TransactionCategorizer(KEYWORDS)
+    
+    @pytest.mark.parametrize("description", ["Valor estimado", "TIMBRE", "uberlandia centro", "R$ 990,00"])
+    def test_whole_words_only(self, categorizer, description):
+        """Palavra-chave dentro de outra palavra não casa"""
+        assert categorizer.categorize(description) is None
+    
+    @pytest.mark.parametrize("description,category", [
+        ("TIM*RECARGA", "Telefonia"),
+        ("Corrida 99 app", "Transporte"),
+        ("UBER *TRIP", "Transporte"),
+        ("UBER EATS*PEDIDO", "Alimentação"),
+        ("pedido uber eats depois uber", "Alimentação"),
+        ("POSTO SHELL BR-101", "Combustível Shell"),
+        ("Farmácia São João", "Saúde"),
+    ])
+    def test_longest_match_wins(self, categorizer, description, category):
+        assert categorizer.categorize(description) == category
+    
+    def test_tie_goes_to_first_in_description(self):
+        """Mesmo tamanho: vale a que aparece primeiro"""
+        categorizer = TransactionCategorizer({"uber": "Transporte", "taxi": "Táxi"})
+        
+        assert categorizer.categorize("taxi ou uber") == "Táxi"
+        assert categorizer.categorize("uber ou taxi") == "Transporte"
+    
+    def test_same_as_naive_search(self, categorizer):
+        rng = random.Random(6)
+        words = ["uber", "eats", "tim", "estimado", "posto", "shell", "farmácia", "99", "990", "loja", "*", "-"]
+        for _ in range(2000):
+            description = " ".join(rng.choice(words) for _ in range(rng.randint(0, 6)))
+            assert categorizer.categorize(description) == naive(KEYWORDS, description), description
+    
+    def test_default_dictionary(self):
+        categorizer = default_categorizer()
+        
+        assert categorizer is default_categorizer()
+        assert categorizer.categorize("COMPRA CARTAO - IFOOD *RESTAURANTE") == "Alimentação"
+        assert categorizer.categorize("NETFLIX.COM") == "Entretenimento"
+        assert categorizer.categorize("YouTube Premium") == "Assinaturas"
+        assert categorizer.categorize("transferencia entre contas xyz") is None
+    
+    def test_cache_bounded(self):
+        categorizer = TransactionCategorizer(KEYWORDS, cache_size=4)
+        descriptions = [f"uber {i}" for i in range(10)]
+        
+        assert categorizer.categorize_many(descriptions * 2) == ["Transporte"] * 20
+        assert len(categorizer._cache) <= 4
+
+
+class TestIngestion:
+    """Categoria pela descrição só nas linhas sem categoria"""
+    
+    def test_fills_blank_categories(self):
+        ledger = io.StringIO(
+            "id,date,category,amount,type,description\n"
+            "t1,2024-01-05,,25.00,expense,UBER *TRIP\n"
+            "t2,2024-01-06,Lazer,40.00,expense,UBER EATS\n"
+            "t3,2024-01-07,,12.00,expense,Padaria do bairro\n"
+        )
+        analyzer = FinancialAnalyzer()
+        LedgerIngestor(analyzer, categorizer=TransactionCategorizer(KEYWORDS)).ingest_csv(ledger)
+        
+        assert [t.category for t in analyzer.transactions] == ["Transporte", "Lazer", "Outros"]
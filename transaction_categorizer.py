@@ -0,0 +1,318 @@
+"""
+🏷️ Categorização de Transações pela Descrição
+Marcas e palavras-chave → categoria, numa passada por descrição
+
+- Dicionário compilado num autômato Aho-Corasick (transições já
+  resolvidas por estado): cada descrição é lida uma vez, caractere a
+  caractere, qualquer que seja o número de palavras-chave
+- Palavras inteiras: "tim" não casa com "estimado", "uber eats" vence
+  "uber" (a mais longa vence; empate = a primeira na descrição)
+- Autômato compilado uma vez por dicionário (cache no processo);
+  descrições repetidas (mesmo estabelecimento) resolvidas pelo cache
+  de resultados
+- Marcas espelham POPULAR_BRANDS de
+  src/application/services/brand-icons.service.ts (mesmas categorias
+  do front end)
+
+Uso na ingestão: LedgerIngestor(analyzer, categorizer=default_categorizer())
+preenche a categoria das linhas sem categoria.
+"""
+
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+import unicodedata
+
+
+# Marca → (nome de exibição, categoria), como no front end
+BRAND_CATEGORIES: Dict[str, Tuple[str, str]] = {
+    # Streaming
+    "netflix": ("Netflix", "Entretenimento"),
+    "spotify": ("Spotify", "Entretenimento"),
+    "disneyplus": ("Disney+", "Entretenimento"),
+    "primevideo": ("Prime Video", "Entretenimento"),
+    "hbomax": ("HBO Max", "Entretenimento"),
+    "youtube": ("YouTube Premium", "Entretenimento"),
+    "appletv": ("Apple TV+", "Entretenimento"),
+    "crunchyroll": ("Crunchyroll", "Entretenimento"),
+    
+    # Transporte
+    "uber": ("Uber", "Transporte"),
+    "lyft": ("Lyft", "Transporte"),
+    "99": ("99", "Transporte"),
+    
+    # Alimentação
+    "ifood": ("iFood", "Alimentação"),
+    "rappi": ("Rappi", "Alimentação"),
+    "ubereats": ("Uber Eats", "Alimentação"),
+    "mcdonalds": ("McDonald's", "Alimentação"),
+    "starbucks": ("Starbucks", "Alimentação"),
+    "subway": ("Subway", "Alimentação"),
+    "burgerking": ("Burger King", "Alimentação"),
+    
+    # Compras
+    "amazon": ("Amazon", "Compras"),
+    "mercadolivre": ("Mercado Livre", "Compras"),
+    "magazineluiza": ("Magazine Luiza", "Compras"),
+    "americanas": ("Americanas", "Compras"),
+    "shopee": ("Shopee", "Compras"),
+    "aliexpress": ("AliExpress", "Compras"),
+    
+    # Tecnologia
+    "apple": ("Apple", "Tecnologia"),
+    "google": ("Google", "Tecnologia"),
+    "microsoft": ("Microsoft", "Tecnologia"),
+    "samsung": ("Samsung", "Tecnologia"),
+    "playstation": ("PlayStation", "Tecnologia"),
+    "xbox": ("Xbox", "Tecnologia"),
+    "nintendo": ("Nintendo", "Tecnologia"),
+    "steam": ("Steam", "Tecnologia"),
+    
+    # Telecomunicações
+    "vivo": ("Vivo", "Telecomunicações"),
+    "tim": ("TIM", "Telecomunicações"),
+    "claro": ("Claro", "Telecomunicações"),
+    "oi": ("Oi", "Telecomunicações"),
+    
+    # Saúde e Fitness
+    "gympass": ("Gympass", "Saúde"),
+    "smartfit": ("Smart Fit", "Saúde"),
+    
+    # Educação
+    "udemy": ("Udemy", "Educação"),
+    "coursera": ("Coursera", "Educação"),
+    "duolingo": ("Duolingo", "Educação"),
+    
+    # Serviços
+    "dropbox": ("Dropbox", "Serviços"),
+    "notion": ("Notion", "Serviços"),
+    "canva": ("Canva", "Serviços"),
+    "adobe": ("Adobe", "Serviços"),
+}
+
+# Termos comuns em extratos → categoria
+KEYWORD_CATEGORIES: Dict[str, str] = {
+    # Moradia
+    "aluguel": "Aluguel",
+    "condominio": "Moradia",
+    "conta de luz": "Moradia",
+    "energia eletrica": "Moradia",
+    "enel": "Moradia",
+    "cemig": "Moradia",
+    "sabesp": "Moradia",
+    "comgas": "Moradia",
+    
+    # Alimentação
+    "supermercado": "Alimentação",
+    "mercado": "Alimentação",
+    "padaria": "Alimentação",
+    "restaurante": "Alimentação",
+    "lanchonete": "Alimentação",
+    "hortifruti": "Alimentação",
+    "acougue": "Alimentação",
+    "pao de acucar": "Alimentação",
+    "carrefour": "Alimentação",
+    "assai": "Alimentação",
+    "atacadao": "Alimentação",
+    "99food": "Alimentação",
+    
+    # Transporte
+    "posto": "Transporte",
+    "combustivel": "Transporte",
+    "estacionamento": "Transporte",
+    "pedagio": "Transporte",
+    "sem parar": "Transporte",
+    "metro": "Transporte",
+    "bilhete unico": "Transporte",
+    "99app": "Transporte",
+    "99 pop": "Transporte",
+    "uber trip": "Transporte",
+    "ipiranga": "Transporte",
+    "petrobras": "Transporte",
+    
+    # Saúde
+    "farmacia": "Saúde",
+    "drogaria": "Saúde",
+    "drogasil": "Saúde",
+    "droga raia": "Saúde",
+    "pague menos": "Saúde",
+    "hospital": "Saúde",
+    "clinica": "Saúde",
+    "laboratorio": "Saúde",
+    "unimed": "Saúde",
+    
+    # Assinaturas
+    "assinatura": "Assinaturas",
+    "amazon prime": "Assinaturas",
+    "youtube premium": "Assinaturas",
+    
+    # Receitas
+    "salario": "Salário",
+    "folha de pagamento": "Salário",
+    "proventos": "Salário",
+}
+
+# ASCII: maiúscula → minúscula, apóstrofo some, demais símbolos → espaço
+_ASCII_TABLE = str.maketrans({
+    **{code: " " for code in range(128) if not chr(code).isalnum()},
+    **{code: chr(code + 32) for code in range(ord("A"), ord("Z") + 1)},
+    ord("'"): None,
+})
+
+
+def normalize_description(text: str) -> str:
+    """
+    Minúsculas, sem acentos, só letras/dígitos separados por um espaço
+    
+    Ex.: "PAG*McDonald's - São Paulo" → "pag mcdonalds sao paulo"
+    """
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return " ".join(text.translate(_ASCII_TABLE).split())
+
+
+def default_keywords() -> Dict[str, str]:
+    """Marcas (chave e nome de exibição) + termos comuns → categoria (chaves normalizadas)"""
+    keywords: Dict[str, str] = {}
+    for key, (display_name, category) in BRAND_CATEGORIES.items():
+        keywords[key] = category
+        keywords.setdefault(normalize_description(display_name), category)
+    # Termos vencem nomes de exibição iguais ("youtube premium" → Assinaturas)
+    keywords.update(KEYWORD_CATEGORIES)
+    return keywords
+
+
+class _Automaton:
+    """
+    Aho-Corasick com transições resolvidas (DFA) sobre bytes ASCII
+    
+    Estado s ocupa table[s*256 : s*256 + 256]: byte → início do próximo
+    estado (0 = raiz), um índice de lista por caractere.
+    output[s*256]: (tamanho, categoria) do padrão mais longo que
+    termina em s; o próprio padrão do estado é sempre o mais longo, e
+    os sufixos vêm do estado de falha.
+    """
+    
+    __slots__ = ("table", "output")
+    
+    def __init__(self, patterns: Mapping[str, str]):
+        goto: List[Dict[str, int]] = [{}]
+        own: List[Optional[Tuple[int, str]]] = [None]
+        
+        for pattern, category in patterns.items():
+            state = 0
+            for char in pattern:
+                following = goto[state].get(char)
+                if following is None:
+                    following = goto[state][char] = len(goto)
+                    goto.append({})
+                    own.append(None)
+                state = following
+            own[state] = (len(pattern), category)
+        
+        # Largura: falha e transições resolvidas, nível a nível
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        output = list(own)
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        
+        for state in queue:
+            resolved = dict(delta[fail[state]])
+            for char, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(char, 0) if state else 0
+                resolved[char] = child
+                queue.append(child)
+            delta[state] = resolved
+            if output[state] is None:
+                output[state] = output[fail[state]]
+        
+        self.table = [0] * (len(delta) * 256)
+        self.output: List[Optional[Tuple[int, str]]] = [None] * (len(delta) * 256)
+        for state, transitions in enumerate(delta):
+            base = state * 256
+            for char, following in transitions.items():
+                self.table[base + ord(char)] = following * 256
+            self.output[base] = output[state]
+    
+    def best(self, text: str) -> Optional[str]:
+        """Categoria do padrão mais longo (empate: o que termina primeiro); texto normalizado"""
+        table, output = self.table, self.output
+        state = 0
+        best_length = 0
+        best = None
+        for byte in text.encode("ascii"):
+            state = table[state + byte]
+            found = output[state]
+            if found is not None and found[0] > best_length:
+                best_length, best = found
+        return best
+
+
+_AUTOMATA: Dict[Tuple[Tuple[str, str], ...], _Automaton] = {}
+
+
+def _compile(patterns: Dict[str, str]) -> _Automaton:
+    """Autômato do dicionário (compilado uma vez por processo)"""
+    key = tuple(sorted(patterns.items()))
+    automaton = _AUTOMATA.get(key)
+    if automaton is None:
+        automaton = _AUTOMATA[key] = _Automaton(patterns)
+    return automaton
+
+
+class TransactionCategorizer:
+    """
+    Categoria a partir da descrição do extrato
+    
+    Uso:
+        categorizer = default_categorizer()
+        categorizer.categorize("COMPRA CARTAO - IFOOD *RESTAURANTE")  # 'Alimentação'
+    """
+    
+    def __init__(self, keywords: Mapping[str, str], cache_size: int = 100_000):
+        """
+        Args:
+            keywords: Palavra-chave ou marca → categoria (normalizadas
+                como as descrições; a última repetida vence)
+            cache_size: Descrições distintas guardadas no cache de resultados
+        """
+        patterns: Dict[str, str] = {}
+        for keyword, category in keywords.items():
+            normalized = normalize_description(keyword)
+            if normalized:
+                # Espaços nas pontas: só palavras inteiras
+                patterns[f" {normalized} "] = category
+        
+        self.keywords = dict(keywords)
+        self.cache_size = cache_size
+        self._automaton = _compile(patterns)
+        self._cache: Dict[str, Optional[str]] = {}
+    
+    def categorize(self, description: str) -> Optional[str]:
+        """Categoria da descrição (None se nenhuma palavra-chave casar)"""
+        cache = self._cache
+        try:
+            return cache[description]
+        except KeyError:
+            pass
+        
+        category = self._automaton.best(f" {normalize_description(description)} ")
+        if len(cache) >= self.cache_size:
+            cache.clear()
+        cache[description] = category
+        return category
+    
+    def categorize_many(self, descriptions: Iterable[str]) -> List[Optional[str]]:
+        """Categoria de cada descrição (cada distinta analisada uma vez)"""
+        descriptions = list(descriptions)
+        table = {description: self.categorize(description) for description in set(descriptions)}
+        return list(map(table.__getitem__, descriptions))
+
+
+_DEFAULT: Optional[TransactionCategorizer] = None
+
+
+def default_categorizer() -> TransactionCategorizer:
+    """Categorizador com o dicionário padrão (instância compartilhada)"""
+    global _DEFAULT
+    if _DEFAULT is None:
+        _DEFAULT = TransactionCategorizer(default_keywords())
+    return _DEFAULT
@@ -0,0 +1,530 @@
+"""
+🧪 Gerador de Carga Sintética
+Usuários, extratos, metas e históricos de depósito reprodutíveis
+
+Distribuições derivadas dos mocks do front-end
+(src/infrastructure/data):
+- mock-financial-data.ts: salário 4500 + freelance 800 + outras 200;
+  aluguel 1200 (dia 10), internet 150 (dia 5), academia 120 (dia 15),
+  streaming 50 (dia 1); variáveis mercado 800, transporte 300,
+  lazer 400 (crescente), saúde 200; cartão 3200 a 2,5% a.m. e
+  financiamento 8000 a 1,2% a.m.; reserva de emergência = 3 meses de
+  gastos, aporte 300/mês; metas de viagem e curso
+- mockData.ts: salário no dia 5, aluguel ≈ 30% da renda
+- mockGamificationData.ts: constância ~65% (depósitos feitos / planejados)
+- mock-financial-overview.ts: quantidade de lançamentos por categoria
+  no mês (alimentação 8, transporte 4, assinaturas 3, outros 2)
+
+Valores dos mocks são medianas: cada usuário sorteia a própria escala
+(lognormal) e cada mês varia em torno dela.
+
+Reprodutibilidade: o usuário i da semente s usa um gerador próprio
+(random.Random((s << 32) | i)), independente dos demais. O mesmo
+(semente, índice, meses, início) gera o mesmo usuário em qualquer
+máquina e em qualquer fatia (--offset): geração paralela por faixas
+dá o mesmo resultado que a sequencial. GENERATOR_VERSION muda quando
+as distribuições mudam; benchmarks gravam a versão junto do resultado.
+
+Saída em streaming (memória limitada pela fatia, não pelo total):
+- JSONL: um usuário por linha (perfil, metas, depósitos, transações)
+- binário: extratos no formato .gfl (ledger_binary), um arquivo por
+  bloco de usuários, + users.jsonl com perfis e metas
+
+Uso (a partir da raiz):
+    python -m workload_generator --users 1000000 --output users.jsonl
+    python -m workload_generator --users 1000000 --format binary --output ledgers/
+"""
+
+from calendar import monthrange
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+import argparse
+import json
+import math
+import random
+import time
+
+from financial_analysis import ColumnarTransactionStore, TransactionBatch
+
+
+GENERATOR_VERSION = 1
+DEFAULT_SEED = 42
+
+# Renda (mock-financial-data.ts): (nome, mediana, sigma, probabilidade)
+SALARY = ("Salário CLT", 4500.0, 0.45)
+EXTRA_INCOME = (
+    ("Freelance", 800.0, 0.6, 0.35),
+    ("Outras receitas", 200.0, 0.5, 0.20),
+)
+SALARY_DAYS = (5, 5, 5, 5, 1, 10, 15, 20)
+
+# Despesas fixas: (nome, categoria, mediana, sigma, dia, probabilidade)
+FIXED_EXPENSES = (
+    ("Internet + TV", "Assinaturas", 150.0, 0.25, 5, 0.90),
+    ("Academia", "Outros", 120.0, 0.30, 15, 0.45),
+    ("Netflix + Spotify", "Assinaturas", 50.0, 0.35, 1, 0.80),
+)
+RENT_SHARE = (0.18, 0.35)  # fração do salário (1200/4500, 1500/5000)
+RENT_PROBABILITY = 0.85
+
+# Despesas variáveis: (categoria, fração do salário, lançamentos/mês, prob. de tendência crescente)
+VARIABLE_EXPENSES = (
+    ("Alimentação", 800 / 4500, 8, 0.05),
+    ("Transporte", 300 / 4500, 4, 0.05),
+    ("Lazer", 400 / 4500, 3, 0.30),
+    ("Saúde", 200 / 4500, 2, 0.05),
+)
+MONTHLY_NOISE = 0.12  # 850 vs 800, 280 vs 300, 150 vs 200
+TREND_GROWTH = 0.04   # lazer 400 → 520: crescimento ao mês
+
+# Descrições (reconhecidas pelo transaction_categorizer)
+DESCRIPTIONS = {
+    "Salário": ("SALARIO EMPRESA", "PAGAMENTO SALARIO"),
+    "Freelance": ("PIX RECEBIDO FREELANCE", "TED RECEBIDA CLIENTE"),
+    "Outras receitas": ("PIX RECEBIDO", "RENDIMENTO POUPANCA"),
+    "Aluguel": ("ALUGUEL APTO", "PAGAMENTO ALUGUEL"),
+    "Internet + TV": ("VIVO FIBRA", "CLARO NET", "TIM LIVE"),
+    "Academia": ("SMARTFIT MENSALIDADE", "GYMPASS"),
+    "Netflix + Spotify": ("NETFLIX.COM", "SPOTIFY"),
+    "Alimentação": ("SUPERMERCADO EXTRA", "IFOOD *PEDIDO", "PADARIA PAO QUENTE", "HORTIFRUTI", "RESTAURANTE SABOR"),
+    "Transporte": ("UBER *TRIP", "99 *CORRIDA", "POSTO SHELL", "METRO SP"),
+    "Lazer": ("CINEMARK", "STEAM PURCHASE", "INGRESSO SHOW", "BAR DO ZE"),
+    "Saúde": ("DROGASIL", "DROGA RAIA", "CONSULTA MEDICA"),
+    "Cartão de crédito": ("PAGAMENTO FATURA CARTAO",),
+    "Financiamento": ("PARCELA FINANCIAMENTO MOTO",),
+}
+
+# Dívidas: (nome, mediana do saldo, sigma, juros a.m., parcelas (min, max), dia, probabilidade)
+DEBTS = (
+    ("Cartão de crédito", 3200.0, 0.6, 0.025, (3, 12), 8, 0.45),
+    ("Financiamento", 8000.0, 0.5, 0.012, (12, 48), 20, 0.25),
+)
+DEBT_CATEGORY = "Dívidas"
+
+# Metas (mock-financial-data.ts, mockGamificationData.ts):
+# (nome, categoria, prioridade, mediana do alvo, sigma, probabilidade)
+GOALS = (
+    ("Viagem para Europa", "travel", "medium", 8000.0, 0.5, 0.35),
+    ("Curso de Inglês", "education", "high", 2500.0, 0.4, 0.30),
+)
+EMERGENCY_MONTHS = 3            # 13500 = 3 × 4500
+CONTRIBUTION_SHARE = (0.03, 0.10)  # 300/4500
+PROGRESSIVE_PROBABILITY = 0.30  # metas com depósitos progressivos (start/step/cap)
+CONSISTENCY = (5.0, 2.7)        # beta: média ~0,65 (progress 65)
+
+
+@dataclass
+class Deposit:
+    """Depósito numa meta"""
+    date: str
+    amount: float
+
+
+@dataclass
+class SyntheticGoal:
+    """Meta com histórico de depósitos"""
+    id: str
+    name: str
+    category: str
+    priority: str  # 'high' | 'medium' | 'low'
+    target_amount: float
+    initial_amount: float
+    current_amount: float
+    monthly_contribution: float
+    plan: str  # 'fixed' | 'progressive'
+    progression: Optional[Dict[str, float]] = None  # start/step/cap (ProgressiveSavingProtocol)
+    deposits: List[Deposit] = field(default_factory=list)
+
+
+@dataclass
+class SyntheticUser:
+    """Usuário gerado: perfil, metas e extrato"""
+    id: str
+    profile: Dict[str, Any]
+    goals: List[SyntheticGoal]
+    ledger: TransactionBatch
+    
+    def to_dict(self, transactions: bool = True) -> Dict[str, Any]:
+        """Dicionário serializável (transações opcionais)"""
+        data = {
+            "id": self.id,
+            "profile": self.profile,
+            "goals": [asdict(goal) for goal in self.goals],
+        }
+        if transactions:
+            batch = self.ledger
+            data["transactions"] = [
+                {"id": i, "date": d, "category": c, "amount": a, "type": t, "description": s}
+                for i, d, c, a, t, s in zip(
+                    batch.ids, batch.dates, batch.categories, batch.amounts, batch.types, batch.descriptions
+                )
+            ]
+        return data
+
+
+def _lognormal(rng, median: float, sigma: float) -> float:
+    return median * math.exp(rng.gauss(0.0, sigma))
+
+
+def _split(rng, total: float, parts: int) -> List[float]:
+    """Divide um total em `parts` lançamentos de tamanhos variados"""
+    weights = [rng.random() + 0.2 for _ in range(parts)]
+    scale = total / sum(weights)
+    return [round(w * scale, 2) for w in weights]
+
+
+class WorkloadGenerator:
+    """
+    Gerador de usuários sintéticos
+    
+    Cada usuário depende só de (seed, índice, meses, início).
+    """
+    
+    def __init__(self, seed: int = DEFAULT_SEED, months: int = 12, start: date = date(2025, 1, 1)):
+        """
+        Args:
+            seed: Semente da carga
+            months: Meses de histórico por usuário
+            start: Primeiro dia do histórico (dia 1 de um mês)
+        """
+        if months < 1:
+            raise ValueError("months deve ser >= 1")
+        
+        self.seed = seed
+        self.months = months
+        self.start = start.replace(day=1)
+        
+        # Datas ISO pré-formatadas: (último dia, [dia 1..último]) por mês
+        self._calendar: List[Tuple[int, List[str]]] = []
+        year, month = self.start.year, self.start.month
+        for _ in range(months):
+            last = monthrange(year, month)[1]
+            self._calendar.append((last, [f"{year:04d}-{month:02d}-{day:02d}" for day in range(1, last + 1)]))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    
+    def user(self, index: int) -> SyntheticUser:
+        """
+        Gera o usuário `index`
+        
+        Args:
+            index: Posição do usuário na carga (0, 1, 2...)
+        
+        Returns:
+            SyntheticUser
+        """
+        rng = random.Random((self.seed << 32) | index)
+        user_id = f"u{index}"
+        rows = _Rows(user_id)
+        
+        # ---- Perfil ----
+        salary = round(max(1412.0, _lognormal(rng, SALARY[1], SALARY[2])), 2)
+        salary_day = rng.choice(SALARY_DAYS)
+        extra_income = [
+            (name, round(_lognormal(rng, median, sigma), 2))
+            for name, median, sigma, probability in EXTRA_INCOME
+            if rng.random() < probability
+        ]
+        
+        fixed = []
+        if rng.random() < RENT_PROBABILITY:
+            fixed.append(("Aluguel", "Aluguel", round(salary * rng.uniform(*RENT_SHARE), 2), 10))
+        for name, category, median, sigma, day, probability in FIXED_EXPENSES:
+            if rng.random() < probability:
+                fixed.append((name, category, round(_lognormal(rng, median, sigma), 2), day))
+        
+        variable = []
+        for category, share, per_month, trend_probability in VARIABLE_EXPENSES:
+            average = salary * share * math.exp(rng.gauss(0.0, 0.3))
+            trend = "increasing" if rng.random() < trend_probability else "stable"
+            variable.append((category, average, per_month, trend))
+        
+        debts = []
+        for name, median, sigma, rate, (low, high), day, probability in DEBTS:
+            if rng.random() < probability:
+                balance = round(_lognormal(rng, median, sigma), 2)
+                remaining = rng.randint(low, high)
+                # Parcela da tabela Price
+                installment = round(balance * rate / (1 - (1 + rate) ** -remaining), 2)
+                debts.append({
+                    "name": name,
+                    "total_amount": balance,
+                    "installment_amount": installment,
+                    "interest_rate": rate,
+                    "remaining_installments": remaining,
+                    "due_day": day,
+                })
+        
+        # ---- Extrato ----
+        for month, (last, days) in enumerate(self._calendar):
+            rows.add(days[min(salary_day, last) - 1], "Salário", salary, "income", rng.choice(DESCRIPTIONS["Salário"]))
+            for name, amount in extra_income:
+                value = round(amount * rng.uniform(0.7, 1.3), 2)
+                rows.add(days[rng.randrange(last)], name, value, "income", rng.choice(DESCRIPTIONS[name]))
+            
+            for name, category, amount, day in fixed:
+                rows.add(days[min(day, last) - 1], category, amount, "expense", rng.choice(DESCRIPTIONS[name]))
+            
+            for debt in debts:
+                if month < debt["remaining_installments"]:
+                    rows.add(
+                        days[debt["due_day"] - 1], DEBT_CATEGORY, debt["installment_amount"], "expense",
+                        DESCRIPTIONS[debt["name"]][0]
+                    )
+            
+            for category, average, per_month, trend in variable:
+                growth = (1 + TREND_GROWTH) ** month if trend == "increasing" else 1.0
+                total = average * growth * max(0.3, rng.gauss(1.0, MONTHLY_NOISE))
+                count = max(1, round(rng.gauss(per_month, math.sqrt(per_month))))
+                descriptions = DESCRIPTIONS[category]
+                for amount in _split(rng, total, count):
+                    rows.add(days[rng.randrange(last)], category, amount, "expense", rng.choice(descriptions))
+        
+        # ---- Metas ----
+        monthly_expenses = sum(f[2] for f in fixed) + sum(v[1] for v in variable)
+        consistency = rng.betavariate(*CONSISTENCY)
+        templates = [("Reserva de emergência", "emergency", "high", EMERGENCY_MONTHS * monthly_expenses)]
+        templates += [
+            (name, category, priority, _lognormal(rng, median, sigma))
+            for name, category, priority, median, sigma, probability in GOALS
+            if rng.random() < probability
+        ]
+        if debts:
+            # Meta de quitação (mockGamificationData.ts)
+            templates.append(("Quitar dívidas", "debt", "high", sum(d["total_amount"] for d in debts)))
+        
+        goals = [
+            self._goal(rng, f"{user_id}-g{number}", template, salary, consistency)
+            for number, template in enumerate(templates)
+        ]
+        
+        profile = {
+            "monthly_income": round(salary + sum(amount for _, amount in extra_income), 2),
+            "recurring_income": [{"name": SALARY[0], "amount": salary, "day": salary_day}]
+            + [{"name": name, "amount": amount} for name, amount in extra_income],
+            "fixed_expenses": [
+                {"name": name, "category": category, "amount": amount, "due_day": day}
+                for name, category, amount, day in fixed
+            ],
+            "variable_expenses": [
+                {"category": category, "average_amount": round(average, 2), "transactions_per_month": per_month, "trend": trend}
+                for category, average, per_month, trend in variable
+            ],
+            "debts": debts,
+            "consistency": round(consistency, 3),
+        }
+        
+        return SyntheticUser(id=user_id, profile=profile, goals=goals, ledger=rows.batch())
+    
+    def _goal(self, rng, goal_id: str, template, salary: float, consistency: float) -> SyntheticGoal:
+        name, category, priority, target = template
+        target = round(max(target, 100.0), 2)
+        initial = round(target * rng.betavariate(2, 3) * 0.5, 2)
+        contribution = round(salary * rng.uniform(*CONTRIBUTION_SHARE), 2)
+        
+        progression = None
+        if rng.random() < PROGRESSIVE_PROBABILITY:
+            # Valor inicial simbólico, crescimento até um teto (CappedProgression)
+            progression = {
+                "start": float(rng.randint(1, 50)),
+                "step": round(contribution * rng.uniform(0.05, 0.15), 2),
+                "cap": round(contribution * rng.uniform(1.0, 2.0), 2),
+            }
+        
+        deposits = []
+        saved = initial
+        for month, (last, days) in enumerate(self._calendar):
+            if saved >= target:
+                break
+            if rng.random() >= consistency:
+                continue  # mês sem depósito
+            if progression:
+                planned = min(progression["start"] + progression["step"] * month, progression["cap"])
+            else:
+                planned = contribution
+            amount = round(min(planned * rng.uniform(0.9, 1.1), target - saved), 2)
+            deposits.append(Deposit(date=days[rng.randrange(last)], amount=amount))
+            saved += amount
+        
+        return SyntheticGoal(
+            id=goal_id,
+            name=name,
+            category=category,
+            priority=priority,
+            target_amount=target,
+            initial_amount=initial,
+            current_amount=round(saved, 2),
+            monthly_contribution=contribution,
+            plan="progressive" if progression else "fixed",
+            progression=progression,
+            deposits=deposits,
+        )
+    
+    def users(self, count: int, offset: int = 0) -> Iterator[SyntheticUser]:
+        """Usuários offset, offset+1... (gerados sob demanda)"""
+        for index in range(offset, offset + count):
+            yield self.user(index)
+    
+    def transactions(self, count: int) -> TransactionBatch:
+        """
+        Extrato único com `count` linhas (usuários concatenados)
+        
+        Para benchmarks que medem um só histórico grande.
+        """
+        batch = TransactionBatch([], [], [], [], [], [])
+        index = 0
+        while len(batch) < count:
+            ledger = self.user(index).ledger
+            for column in ("ids", "dates", "categories", "amounts", "types", "descriptions"):
+                getattr(batch, column).extend(getattr(ledger, column))
+            index += 1
+        
+        for column in ("ids", "dates", "categories", "amounts", "types", "descriptions"):
+            del getattr(batch, column)[count:]
+        return batch
+
+
+class _Rows:
+    """Colunas do extrato de um usuário (TransactionBatch sem Transaction por linha)"""
+    
+    def __init__(self, user_id: str):
+        self.prefix = user_id + "-t"
+        self.dates: List[str] = []
+        self.categories: List[str] = []
+        self.amounts: List[float] = []
+        self.types: List[str] = []
+        self.descriptions: List[str] = []
+    
+    def add(self, day: str, category: str, amount: float, kind: str, description: str):
+        self.dates.append(day)
+        self.categories.append(category)
+        self.amounts.append(amount)
+        self.types.append(kind)
+        self.descriptions.append(description)
+    
+    def batch(self) -> TransactionBatch:
+        # Ordem cronológica, como num extrato
+        order = sorted(range(len(self.dates)), key=self.dates.__getitem__)
+        return TransactionBatch(
+            ids=[f"{self.prefix}{i}" for i in range(len(order))],
+            dates=[self.dates[i] for i in order],
+            categories=[self.categories[i] for i in order],
+            amounts=[self.amounts[i] for i in order],
+            types=[self.types[i] for i in order],
+            descriptions=[self.descriptions[i] for i in order],
+        )
+
+
+# ==================== SAÍDA ====================
+
+def _header(generator: WorkloadGenerator, count: int, offset: int) -> Dict[str, Any]:
+    return {
+        "generator_version": GENERATOR_VERSION,
+        "seed": generator.seed,
+        "months": generator.months,
+        "start": generator.start.isoformat(),
+        "users": count,
+        "offset": offset,
+    }
+
+
+def write_jsonl(path: Union[str, Path], generator: WorkloadGenerator, count: int, offset: int = 0) -> int:
+    """
+    Grava `count` usuários em JSONL (um por linha, com transações)
+    
+    Args:
+        path: Arquivo de destino
+        generator: Gerador configurado
+        count: Quantidade de usuários
+        offset: Índice do primeiro usuário
+    
+    Returns:
+        Total de transações gravadas
+    """
+    rows = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for user in generator.users(count, offset):
+            rows += len(user.ledger)
+            f.write(json.dumps(user.to_dict(), ensure_ascii=False) + "\n")
+    return rows
+
+
+def write_binary(
+    directory: Union[str, Path],
+    generator: WorkloadGenerator,
+    count: int,
+    offset: int = 0,
+    users_per_file: int = 1000
+) -> int:
+    """
+    Grava os extratos em arquivos .gfl e os perfis/metas em users.jsonl
+    
+    Um arquivo por bloco de `users_per_file` usuários
+    (ledger-000000.gfl, ...); o prefixo do id de cada transação
+    (u<índice>-t) identifica o usuário. manifest.json guarda os
+    parâmetros da geração.
+    
+    Args:
+        directory: Diretório de destino (criado se não existir)
+        generator: Gerador configurado
+        count: Quantidade de usuários
+        offset: Índice do primeiro usuário
+        users_per_file: Usuários por arquivo .gfl
+    
+    Returns:
+        Total de transações gravadas
+    """
+    from ledger_binary import save_ledger
+    
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    
+    rows = 0
+    files = []
+    with open(directory / "users.jsonl", "w", encoding="utf-8") as f:
+        for first in range(offset, offset + count, users_per_file):
+            size = min(users_per_file, offset + count - first)
+            store = ColumnarTransactionStore()
+            for user in generator.users(size, first):
+                store.extend(user.ledger)
+                f.write(json.dumps(user.to_dict(transactions=False), ensure_ascii=False) + "\n")
+            
+            name = f"ledger-{first:06d}.gfl"
+            save_ledger(directory / name, store)
+            files.append({"file": name, "first_user": first, "users": size, "rows": len(store)})
+            rows += len(store)
+    
+    manifest = {**_header(generator, count, offset), "rows": rows, "files": files}
+    (directory / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gerador de carga sintética (usuários, extratos, metas)")
+    parser.add_argument("--users", type=int, default=1000, help="Quantidade de usuários")
+    parser.add_argument("--offset", type=int, default=0, help="Índice do primeiro usuário (geração por faixas)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--months", type=int, default=12, help="Meses de histórico por usuário")
+    parser.add_argument("--start", type=date.fromisoformat, default=date(2025, 1, 1), help="Início do histórico (AAAA-MM-DD)")
+    parser.add_argument("--format", choices=("jsonl", "binary"), default="jsonl")
+    parser.add_argument("--users-per-file", type=int, default=1000, help="Usuários por arquivo .gfl (binary)")
+    parser.add_argument("--output", type=Path, required=True, help="Arquivo (jsonl) ou diretório (binary)")
+    args = parser.parse_args()
+    
+    generator = WorkloadGenerator(seed=args.seed, months=args.months, start=args.start)
+    started = time.perf_counter()
+    if args.format == "jsonl":
+        rows = write_jsonl(args.output, generator, args.users, args.offset)
+    else:
+        rows = write_binary(args.output, generator, args.users, args.offset, args.users_per_file)
+    seconds = time.perf_counter() - started
+    
+    print(
+        f"{args.users:,} usuários, {rows:,} transações → {args.output} "
+        f"({seconds:.1f}s, {args.users / seconds:,.0f} usuários/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()